@@ -54,6 +54,9 @@ def build_argparser():
     decoder_args.add_argument('--seq', dest='decoder_seq_size',
                               help='Optional. Length of sequence that decoder takes as input.',
                               default=16, type=int)
+    args.add_argument('--decode_stride', default=1, type=int,
+                      help='Optional. Run the decoder (or the model for -at i3d-rgb) on every N-th frame only. '
+                           'Other frames are shown with the latest prediction. Default value is 1.')
     args.add_argument('-l', '--cpu_extension',
                       help='Optional. For CPU custom layers, if any. Absolute path to a shared library with the '
                            'kernels implementation.', type=str, default=None)
@@ -118,7 +121,8 @@ def main():
     result_presenter = ResultRenderer(no_show=args.no_show, presenter=presenter, output=args.output, limit=args.output_limit, labels=labels,
                                       label_smoothing_window=args.label_smoothing)
     cap = open_images_capture(args.input, args.loop)
-    run_pipeline(cap, args.architecture_type, models, result_presenter.render_frame, seq_size=seq_size, fps=cap.fps())
+    run_pipeline(cap, args.architecture_type, models, result_presenter.render_frame, seq_size=seq_size, fps=cap.fps(),
+                 decode_stride=args.decode_stride)
     print(presenter.reportMeans())
 
 
@@ -32,13 +32,15 @@ def center_crop(frame, crop_size):
     return frame[y0:y1, x0:x1, ...]
 
 
-def adaptive_resize(frame, dst_size):
-    h, w, _ = frame.shape
+def adaptive_resize(frame, dst_size, dst=None):
+    h, w, c = frame.shape
     scale = dst_size / min(h, w)
     ow, oh = int(w * scale), int(h * scale)
 
     if ow == w and oh == h:
         return frame
+    if dst is not None and dst.shape == (oh, ow, c) and dst.dtype == frame.dtype:
+        return cv2.resize(frame, (ow, oh), dst=dst)
     return cv2.resize(frame, (ow, oh))
 
 def preprocess_frame(frame, size=224, crop_size=224):
@@ -49,6 +51,26 @@ def preprocess_frame(frame, size=224, crop_size=224):
     return frame
 
 
+class FramePreprocessor:
+    """
+    Does the same as preprocess_frame, but resizes frames into the buffer kept between calls,
+    so no arrays are allocated for the stream of frames of the same size.
+    Returned CHW view is valid until the next call.
+    """
+
+    def __init__(self, size=224, crop_size=224):
+        self.size = size
+        self.crop_size = crop_size
+        self._resized = None
+
+    def __call__(self, frame):
+        resized = adaptive_resize(frame, self.size, dst=self._resized)
+        if resized is not frame:
+            self._resized = resized
+        frame = center_crop(resized, (self.crop_size, self.crop_size))
+        return frame.transpose((2, 0, 1))  # HWC -> CHW
+
+
 class AsyncWrapper:
     def __init__(self, ie_model, num_requests):
         self.net = ie_model
@@ -31,6 +31,7 @@ class PipelineStep:
         self.timers = TimerGroup()
         self.total_time = IncrementalTimer()
         self.own_time = IncrementalTimer()
+        self.processed = 0
 
         self._start_t = None
         self._thread = None
@@ -67,6 +68,7 @@ class PipelineStep:
 
         self.total_time = IncrementalTimer()
         self.own_time = IncrementalTimer()
+        self.processed = 0
 
         while True:
             self.total_time.tick()
@@ -84,6 +86,7 @@ class PipelineStep:
                 break
 
             self.total_time.tock()
+            self.processed += 1
             self.input_queue.task_done()
             self.output_queue.put(output)
 
@@ -107,12 +110,18 @@ class AsyncPipeline:
         self._void_queue = VoidQueue()
         self._last_step = None
         self._last_parallel = False
-
-    def add_step(self, name, new_pipeline_step, max_size=100, parallel=True):
+        self._run_time = 0
+
+    def add_step(self, name, new_pipeline_step, max_size=100, parallel=True, drop_oldest=False):
+        """
+        Appends step to the pipeline. Parallel step runs in its own thread and gets input from bounded
+        queue of max_size items. If drop_oldest is set, producer never waits for the step, but the oldest
+        queued item is dropped when queue is full.
+        """
         new_pipeline_step.output_queue = self._void_queue
         if self._last_step:
             if parallel or self._last_parallel:
-                queue = AsyncQueue(maxsize=max_size)
+                queue = AsyncQueue(maxsize=max_size, drop_oldest=drop_oldest)
             else:
                 queue = StubQueue()
 
@@ -129,10 +138,13 @@ class AsyncPipeline:
         self._last_parallel = parallel
 
     def run(self):
+        start = time.perf_counter()
         for step in self.steps.values():
             if not step.working:
                 step.start()
         self._run_sync_steps()
+        self._void_queue.wait()
+        self._run_time = time.perf_counter() - start
 
     def close(self):
         for step in self.steps.values():
@@ -144,12 +156,14 @@ class AsyncPipeline:
         for name, step in chain(self.sync_steps.items(), self.steps.items(), ):
             print("{} total: {}".format(name, step.total_time))
             print("{}   own: {}".format(name, step.own_time))
+            if self._run_time:
+                print("{} throughput: {:.2f} items/s".format(name, step.processed / self._run_time))
+            if isinstance(step.input_queue, AsyncQueue):
+                print("{} queue: {}".format(name, step.input_queue.statistics))
 
     def _run_sync_steps(self):
         """Run steps in main thread"""
         if not self.sync_steps:
-            while not self._void_queue.finished:
-                pass
             return
 
         for step in self.sync_steps.values():
@@ -163,6 +177,7 @@ class AsyncPipeline:
             if is_stop_signal(item):
                 step.input_queue.close()
                 step.output_queue.put(item)
+                stop_signal = item
                 break
 
             step.own_time.tick()
@@ -172,11 +187,18 @@ class AsyncPipeline:
             if is_stop_signal(output):
                 step.input_queue.close()
                 step.output_queue.put(output)
+                stop_signal = output
                 break
 
             step.total_time.tock()
+            step.processed += 1
             step.output_queue.put(output)
 
+        # pass stop signal to parallel steps, so they finish processing of queued items
+        last_sync_step = list(self.sync_steps.values())[-1]
+        if step is not last_sync_step:
+            last_sync_step.output_queue.put(stop_signal)
+
         for step in self.sync_steps.values():
             step.working = False
             step.end()
@@ -14,8 +14,11 @@
  limitations under the License.
 """
 
+import time
+from collections import deque
 from enum import Enum
-from queue import Queue
+from queue import Empty, Full
+from threading import Condition, Event
 
 
 class BaseQueue:
@@ -37,7 +40,13 @@ class BaseQueue:
 
 
 class VoidQueue(BaseQueue):
+    def __init__(self):
+        super().__init__()
+        self._stopped = Event()
+
     def put(self, item, *args):
+        if is_stop_signal(item):
+            self._stopped.set()
         if item is Signal.STOP_IMMEDIATELY:
             self.close()
 
@@ -45,44 +54,112 @@ class VoidQueue(BaseQueue):
         if self.finished:
             return Signal.STOP_IMMEDIATELY
 
+    def wait(self, timeout=None):
+        """Blocks until stop signal reaches the end of the pipeline"""
+        return self._stopped.wait(timeout)
+
+
+class QueueStatistics:
+    def __init__(self):
+        self.put_count = 0
+        self.get_count = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.put_wait = 0
+        self.get_wait = 0
+        self._depth_sum = 0
+
+    def on_put(self, depth, wait_time):
+        self.put_count += 1
+        self.put_wait += wait_time
+        self._depth_sum += depth
+        self.max_depth = max(self.max_depth, depth)
+
+    def on_get(self, wait_time):
+        self.get_count += 1
+        self.get_wait += wait_time
+
+    @property
+    def avg_depth(self):
+        return self._depth_sum / self.put_count if self.put_count else 0
+
+    def __repr__(self):
+        return "depth avg {:.2f} max {}, put wait {:.2f}s, get wait {:.2f}s, dropped {}".format(
+            self.avg_depth, self.max_depth, self.put_wait, self.get_wait, self.dropped)
+
 
 class AsyncQueue(BaseQueue):
-    def __init__(self, maxsize=0):
+    """
+    Bounded queue with blocking put and get. With drop_oldest=True put never blocks: the oldest item is
+    discarded when queue is full, so consumer always gets the latest items (e.g. frames of live video).
+    """
+
+    def __init__(self, maxsize=0, drop_oldest=False):
         super().__init__()
-        self._queue = Queue(maxsize=maxsize)
+        self.maxsize = maxsize
+        self.drop_oldest = drop_oldest
+        self.statistics = QueueStatistics()
+        self._queue = deque()
+        self._condition = Condition()
 
     def put(self, item, block=True, timeout=None):
         if self.finished:
             return
         if item is Signal.STOP_IMMEDIATELY:
             self.close()
-        else:
-            self._queue.put(item, block, timeout)
+            return
+        start = time.perf_counter()
+        with self._condition:
+            if self._is_full() and not is_stop_signal(item):
+                if self.drop_oldest:
+                    self._drop_oldest()
+                elif not block or not self._condition.wait_for(lambda: not self._is_full(), timeout):
+                    raise Full
+            if self.finished:
+                return
+            self._queue.append(item)
+            self.statistics.on_put(len(self._queue), time.perf_counter() - start)
+            self._condition.notify_all()
 
     def close(self):
-        self.finished = True
-        with self._queue.mutex:
-            self._queue.queue.clear()
-            self._queue.queue.append(Signal.STOP_IMMEDIATELY)
-            self._queue.unfinished_tasks = 0
-            self._queue.all_tasks_done.notify()
-            self._queue.not_full.notify()
-            self._queue.not_empty.notify()
+        with self._condition:
+            self.finished = True
+            self._queue.clear()
+            self._queue.append(Signal.STOP_IMMEDIATELY)
+            self._condition.notify_all()
 
     def get(self, block=True, timeout=None):
         if self.finished:
             return Signal.STOP_IMMEDIATELY
-        return self._queue.get(block, timeout)
+        start = time.perf_counter()
+        with self._condition:
+            if not self._queue and (not block or not self._condition.wait_for(lambda: self._queue, timeout)):
+                raise Empty
+            if self.finished:
+                return Signal.STOP_IMMEDIATELY
+            item = self._queue.popleft()
+            self.statistics.on_get(time.perf_counter() - start)
+            self._condition.notify_all()
+            return item
 
     def clear(self):
-        while not self._queue.empty():
-            self.get()
-            self.task_done()
-
-    def task_done(self):
-        if self.finished:
-            return
-        super().task_done()
+        with self._condition:
+            self._queue.clear()
+            self._condition.notify_all()
+
+    def qsize(self):
+        with self._condition:
+            return len(self._queue)
+
+    def _is_full(self):
+        return 0 < self.maxsize <= len(self._queue)
+
+    def _drop_oldest(self):
+        for i, item in enumerate(self._queue):
+            if not is_stop_signal(item):
+                del self._queue[i]
+                self.statistics.dropped += 1
+                return
 
 
 class StubQueue(BaseQueue):
@@ -0,0 +1,48 @@
+"""
+ Copyright (c) 2020 Intel Corporation
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Sliding window over the last `size` items. Storage is preallocated on the first append and every item
+    is written twice, at i and i + size, so the window is always a contiguous view of the storage
+    and reading it does not copy. The view is valid until the next append.
+    """
+
+    def __init__(self, size):
+        assert size > 0
+        self.size = size
+        self.appended = 0
+        self._storage = None
+        self._next = 0
+
+    def append(self, item):
+        if self._storage is None:
+            self._storage = np.empty((2 * self.size, ) + item.shape, dtype=item.dtype)
+        self._storage[self._next] = item
+        self._storage[self._next + self.size] = item
+        self._next = (self._next + 1) % self.size
+        self.appended += 1
+
+    @property
+    def full(self):
+        return self.appended >= self.size
+
+    def window(self):
+        """Returns items from the oldest to the newest"""
+        return self._storage[self._next:self._next + self.size]
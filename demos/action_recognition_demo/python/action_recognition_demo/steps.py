@@ -15,28 +15,33 @@
 """
 
 import time
-from collections import deque
 
 import cv2
 import numpy as np
 
 from .meters import MovingAverageMeter
-from .models import AsyncWrapper, preprocess_frame
+from .models import AsyncWrapper, FramePreprocessor
 from .pipeline import AsyncPipeline, PipelineStep
 from .queue import Signal
+from .ring_buffer import RingBuffer
 
 
-def run_pipeline(capture, model_type, model, render_fn, seq_size=16, fps=30):
+def run_pipeline(capture, model_type, model, render_fn, seq_size=16, fps=30, decode_stride=1):
     pipeline = AsyncPipeline()
     pipeline.add_step("Data", DataStep(capture), parallel=False)
 
     if model_type in ('en-de', 'en-mean'):
         pipeline.add_step("Encoder", EncoderStep(model[0]), parallel=False)
-        pipeline.add_step("Decoder", DecoderStep(model[1], sequence_size=seq_size), parallel=False)
+        pipeline.add_step("Decoder", DecoderStep(model[1], sequence_size=seq_size, decode_stride=decode_stride),
+                          parallel=False)
     elif model_type == 'i3d-rgb':
-        pipeline.add_step("I3DRGB", I3DRGBModelStep(model[0], seq_size, 256, 224), parallel=False)
+        pipeline.add_step("I3DRGB", I3DRGBModelStep(model[0], seq_size, 256, 224, decode_stride=decode_stride),
+                          parallel=False)
 
-    pipeline.add_step("Render", RenderStep(render_fn, fps=fps), parallel=True)
+    # for live video it is better to skip stale frames than to accumulate latency
+    live = capture.get_type() == 'CAMERA'
+    pipeline.add_step("Render", RenderStep(render_fn, fps=fps), max_size=2 if live else 100, parallel=True,
+                      drop_oldest=live)
 
     pipeline.run()
     pipeline.close()
@@ -45,32 +50,30 @@ def run_pipeline(capture, model_type, model, render_fn, seq_size=16, fps=30):
 
 class I3DRGBModelStep(PipelineStep):
 
-    def __init__(self, model, sequence_size, frame_size, crop_size):
+    def __init__(self, model, sequence_size, frame_size, crop_size, decode_stride=1):
         super().__init__()
         self.model = model
         assert sequence_size > 0
+        assert decode_stride > 0
         self.sequence_size = sequence_size
+        self.decode_stride = decode_stride
         self.size = frame_size
         self.crop_size = crop_size
-        self.input_seq = deque(maxlen = self.sequence_size)
+        self.preprocess = FramePreprocessor(self.size, self.crop_size)
+        self.input_seq = RingBuffer(self.sequence_size)
         self.async_model = AsyncWrapper(self.model, self.model.num_requests)
+        self._output = None
 
     def process(self, frame):
-        preprocessed = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        preprocessed = preprocess_frame(preprocessed, self.size, self.crop_size)
-        self.input_seq.append(preprocessed)
-        if len(self.input_seq) == self.sequence_size:
-            input_blob = np.array(self.input_seq)
-            input_blob = np.transpose(input_blob, (1, 0, 2, 3))
-            input_blob = np.expand_dims(input_blob, axis=0)
-            output, next_frame = self.async_model.infer(input_blob, frame)
+        preprocessed = self.preprocess(frame)
+        self.input_seq.append(preprocessed[::-1])  # BGR -> RGB
+        if is_decode_frame(self.input_seq, self.decode_stride):
+            input_blob = np.transpose(self.input_seq.window(), (1, 0, 2, 3))[np.newaxis, ...]
+            output, _ = self.async_model.infer(input_blob)
+            if output is not None:
+                self._output = output[0].copy()
 
-            if output is None:
-                return None
-
-            return next_frame, output[0], {'i3d-rgb-model': self.own_time.last}
-
-        return frame, None, {'i3d-rgb-model': self.own_time.last}
+        return frame, self._output, {'i3d-rgb-model': self.own_time.last}
 
 
 class DataStep(PipelineStep):
@@ -98,27 +101,35 @@ class EncoderStep(PipelineStep):
         super().__init__()
         self.encoder = encoder
         self.async_model = AsyncWrapper(self.encoder, self.encoder.num_requests)
+        self.preprocess = FramePreprocessor()
 
     def process(self, frame):
-        preprocessed = preprocess_frame(frame)
+        preprocessed = self.preprocess(frame)
         preprocessed = preprocessed[np.newaxis, ...]  # add batch dimension
         embedding, frame = self.async_model.infer(preprocessed, frame)
 
         if embedding is None:
             return None
 
-        return frame, embedding.reshape((1, -1)), {'encoder': self.own_time.last}
+        return frame, embedding.reshape(-1), {'encoder': self.own_time.last}
 
 
 class DecoderStep(PipelineStep):
+    """
+    Keeps embeddings of the last sequence_size frames in the ring buffer and runs decoder
+    on every decode_stride-th frame. Other frames are returned with the latest prediction.
+    """
 
-    def __init__(self, decoder, sequence_size=16):
+    def __init__(self, decoder, sequence_size=16, decode_stride=1):
         super().__init__()
         assert sequence_size > 0
+        assert decode_stride > 0
         self.sequence_size = sequence_size
+        self.decode_stride = decode_stride
         self.decoder = decoder
         self.async_model = AsyncWrapper(self.decoder, self.decoder.num_requests)
-        self._embeddings = deque(maxlen=self.sequence_size)
+        self._embeddings = RingBuffer(self.sequence_size)
+        self._probs = None
 
     def process(self, item):
         if item is None:
@@ -126,21 +137,21 @@ class DecoderStep(PipelineStep):
 
         frame, embedding, timers = item
         timers['decoder'] = self.own_time.last
+        # embedding may be a view of the encoder output blob, so it is copied to the buffer
         self._embeddings.append(embedding)
 
-        if len(self._embeddings) == self.sequence_size:
-            decoder_input = np.concatenate(self._embeddings, axis=0)
-            decoder_input = np.expand_dims(decoder_input, axis=0)
+        if is_decode_frame(self._embeddings, self.decode_stride):
+            decoder_input = self._embeddings.window()[np.newaxis, ...]  # add batch dimension
+            logits, _ = self.async_model.infer(decoder_input)
 
-            logits, next_frame = self.async_model.infer(decoder_input, frame)
+            if logits is not None:
+                self._probs = softmax(logits - np.max(logits))[0]
 
-            if logits is None:
-                return None
+        return frame, self._probs, timers
 
-            probs = softmax(logits - np.max(logits))
-            return next_frame, probs[0], timers
 
-        return frame, None, timers
+def is_decode_frame(sequence, decode_stride):
+    return sequence.full and (sequence.appended - sequence.size) % decode_stride == 0
 
 
 def softmax(x, axis=None):
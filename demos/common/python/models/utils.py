@@ -72,31 +72,68 @@ def resize_image_letterbox(image, size):
     return resized_image
 
 
-def nms(x1, y1, x2, y2, scores, thresh, include_boundaries=False, keep_top_k=None):
-    b = 1 if include_boundaries else 0
-    areas = (x2 - x1 + b) * (y2 - y1 + b)
-    order = scores.argsort()[::-1]
-
-    if keep_top_k:
-        order = order[:keep_top_k]
-
-    keep = []
-    while order.size > 0:
-        i = order[0]
-        keep.append(i)
+NMS_BLOCK_SIZE = 64
 
-        xx1 = np.maximum(x1[i], x1[order[1:]])
-        yy1 = np.maximum(y1[i], y1[order[1:]])
-        xx2 = np.minimum(x2[i], x2[order[1:]])
-        yy2 = np.minimum(y2[i], y2[order[1:]])
 
-        w = np.maximum(0.0, xx2 - xx1 + b)
-        h = np.maximum(0.0, yy2 - yy1 + b)
-        intersection = w * h
+def _pairwise_iou(boxes_a, boxes_b, b):
+    x1_a, y1_a, x2_a, y2_a, areas_a = (value[:, np.newaxis] for value in boxes_a)
+    x1_b, y1_b, x2_b, y2_b, areas_b = (value[np.newaxis] for value in boxes_b)
+    w = np.maximum(0.0, np.minimum(x2_a, x2_b) - np.maximum(x1_a, x1_b) + b)
+    h = np.maximum(0.0, np.minimum(y2_a, y2_b) - np.maximum(y1_a, y1_b) + b)
+    intersection = w * h
+    union = areas_a + areas_b - intersection
+    return np.divide(intersection, union, out=np.zeros_like(intersection, dtype=float), where=union != 0)
 
-        union = (areas[i] + areas[order[1:]] - intersection)
-        overlap = np.divide(intersection, union, out=np.zeros_like(intersection, dtype=float), where=union != 0)
 
-        order = order[np.where(overlap <= thresh)[0] + 1]
-
-    return keep
+def _greedy_nms(boxes, thresh, b):
+    # boxes are sorted by score, candidates are resolved by blocks to reduce number of numpy calls
+    boxes = np.stack(boxes)
+    positions = np.arange(boxes.shape[1])
+    keep = []
+    while positions.size:
+        block = boxes[:, :NMS_BLOCK_SIZE]
+        block_suppression = _pairwise_iou(block, block, b) > thresh
+        block_suppressed = np.zeros(block.shape[1], dtype=bool)
+        block_keep = []
+        for idx in range(block.shape[1]):
+            if block_suppressed[idx]:
+                continue
+            block_keep.append(idx)
+            block_suppressed[idx + 1:] |= block_suppression[idx, idx + 1:]
+        keep.append(positions[block_keep])
+        boxes, positions = boxes[:, NMS_BLOCK_SIZE:], positions[NMS_BLOCK_SIZE:]
+        if positions.size:
+            remaining = ~(_pairwise_iou(block[:, block_keep], boxes, b) > thresh).any(axis=0)
+            boxes, positions = boxes[:, remaining], positions[remaining]
+    return np.concatenate(keep) if keep else positions
+
+
+def nms(x1, y1, x2, y2, scores, thresh, include_boundaries=False, keep_top_k=None, labels=None):
+    """
+    Greedy NMS, returns indices of kept boxes sorted by score.
+    If labels are provided, NMS is done for each class separately.
+    Same algorithm is used by Accuracy Checker NMS postprocessor.
+    """
+    b = 1 if include_boundaries else 0
+    if not len(scores):
+        return np.array([], dtype=int)
+    order = scores.argsort()[::-1]
+    if labels is not None:
+        order = order[np.argsort(labels[order], kind='stable')]
+        sorted_labels = labels[order]
+        starts = np.r_[0, np.flatnonzero(sorted_labels[1:] != sorted_labels[:-1]) + 1]
+        if keep_top_k:
+            rank = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+            order = order[rank < keep_top_k]
+            sorted_labels = labels[order]
+            starts = np.r_[0, np.flatnonzero(sorted_labels[1:] != sorted_labels[:-1]) + 1]
+    else:
+        order = order[:keep_top_k] if keep_top_k else order
+        starts = np.array([0])
+    x1, y1, x2, y2 = (value[order] for value in (x1, y1, x2, y2))
+    boxes = (x1, y1, x2, y2, (x2 - x1 + b) * (y2 - y1 + b))
+    keep = [
+        start + _greedy_nms(tuple(value[start:end] for value in boxes), thresh, b)
+        for start, end in zip(starts, np.r_[starts[1:], len(order)])
+    ]
+    return order[np.concatenate(keep)]
@@ -16,6 +16,7 @@
 
 import time
 from multiprocessing import Process, Queue, Value
+from queue import Empty
 
 import cv2
 import numpy as np
@@ -56,12 +57,18 @@ class Visualizer:
         return self._tasks[name]
 
     def put_queue(self, frame, name):
-        """Adds frame in the queue of the specified window"""
+        """Adds frame in the queue of the specified window. If the previous frame is not shown yet
+           it is dropped, so that the caller is never blocked by the slow window"""
 
         if name not in self._tasks.keys():
             raise ValueError('Cannot show unregistered window: {}'.format(name))
 
-        self._tasks[name].put(np.copy(frame), True)
+        frame_queue = self._tasks[name]
+        try:
+            frame_queue.get_nowait()
+        except Empty:
+            pass
+        frame_queue.put(np.copy(frame), True)
 
     def start(self):
         """Starts internal threads"""
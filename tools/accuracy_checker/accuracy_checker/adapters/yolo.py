@@ -122,31 +122,37 @@ def entry_index(w, h, n_coords, n_classes, pos, entry):
 
 
 def parse_output(predictions, cells, num, box_size, anchors, processor, threshold=0.001):
+    """
+    Decodes boxes of all grid cells and anchors at once.
+    Boxes are listed in the same order as cells are visited by columns: x, then y, then anchor.
+    """
     cells_x, cells_y = cells, cells
-
-    labels, scores, x_mins, y_mins, x_maxs, y_maxs = [], [], [], [], [], []
-
-    for x, y, n in np.ndindex((cells_x, cells_y, num)):
-        if predictions.shape[0] == predictions.shape[1]:
-            bbox = predictions[y, x, n*box_size:(n + 1)*box_size]
-        else:
-            bbox = predictions[n * box_size:(n + 1) * box_size, y, x]
-
-        raw_bbox = DetectionBox(bbox[0], bbox[1], bbox[2], bbox[3], bbox[4], bbox[5:])
-        processed_box = processor(raw_bbox, x, y, anchors[2*n:2*n+2])
-
-        if processed_box.confidence < threshold:
-            continue
-
-        classes_prob = processed_box.probabilities
-        label = np.argmax(classes_prob)
-
-        labels.append(label)
-        scores.append(processed_box.probabilities[label] * processed_box.confidence)
-        x_mins.append(processed_box.x - processed_box.w / 2.0)
-        y_mins.append(processed_box.y - processed_box.h / 2.0)
-        x_maxs.append(processed_box.x + processed_box.w / 2.0)
-        y_maxs.append(processed_box.y + processed_box.h / 2.0)
+    channels = num * box_size
+    if predictions.shape[0] == predictions.shape[1]:
+        # [Cy, Cx, B] -> [Cx, Cy, num, box_size]
+        boxes = predictions[:cells_y, :cells_x, :channels].reshape(cells_y, cells_x, num, box_size)
+        boxes = boxes.transpose(1, 0, 2, 3)
+    else:
+        # [B, Cy, Cx] -> [Cx, Cy, num, box_size]
+        boxes = predictions[:channels, :cells_y, :cells_x].reshape(num, box_size, cells_y, cells_x)
+        boxes = boxes.transpose(3, 2, 0, 1)
+    boxes = boxes.reshape(-1, box_size)
+    x_idx, y_idx, anchor_idx = (
+        grid.ravel() for grid in np.meshgrid(np.arange(cells_x), np.arange(cells_y), np.arange(num), indexing='ij')
+    )
+    anchors = np.reshape(anchors[:2 * num], (num, 2))[anchor_idx]
+
+    raw_boxes = DetectionBox(boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3], boxes[:, 4], boxes[:, 5:])
+    processed_boxes = processor(raw_boxes, x_idx, y_idx, anchors.T)
+    valid = ~(processed_boxes.confidence < threshold)
+    processed_boxes = DetectionBox(*(value[valid] for value in processed_boxes))
+
+    labels = np.argmax(processed_boxes.probabilities, axis=1)
+    scores = processed_boxes.probabilities[np.arange(len(labels)), labels] * processed_boxes.confidence
+    x_mins = processed_boxes.x - processed_boxes.w / 2.0
+    y_mins = processed_boxes.y - processed_boxes.h / 2.0
+    x_maxs = processed_boxes.x + processed_boxes.w / 2.0
+    y_maxs = processed_boxes.y + processed_boxes.h / 2.0
 
     return labels, scores, x_mins, y_mins, x_maxs, y_maxs
 
@@ -215,7 +221,8 @@ class YoloV2Adapter(Adapter):
         if self.raw_output:
             self.processor = YoloOutputProcessor(coord_correct=lambda x: 1. / (1 + np.exp(-x)),
                                                  conf_correct=lambda x: 1. / (1 + np.exp(-x)),
-                                                 prob_correct=lambda x: np.exp(x) / np.sum(np.exp(x)),
+                                                 prob_correct=lambda x: np.exp(x) / np.sum(
+                                                     np.exp(x), axis=-1, keepdims=True),
                                                  coord_normalizer=(self.cells, self.cells),
                                                  size_normalizer=(self.cells, self.cells))
         else:
@@ -394,7 +401,7 @@ class YoloV3Adapter(Adapter):
 
         box_size = self.coords + 1 + self.classes
         for identifier, prediction, meta in zip(identifiers, predictions, frame_meta):
-            detections = {'labels': [], 'scores': [], 'x_mins': [], 'y_mins': [], 'x_maxs': [], 'y_maxs': []}
+            detections = []
             input_shape = list(meta.get('input_shape', {'data': (1, 3, 416, 416)}).values())[0]
             nchw_layout = input_shape[1] == 3
             self.processor.width_normalizer = input_shape[3 if nchw_layout else 2]
@@ -425,20 +432,10 @@ class YoloV3Adapter(Adapter):
                 self.processor.x_normalizer = cells
                 self.processor.y_normalizer = cells
 
-                labels, scores, x_mins, y_mins, x_maxs, y_maxs = parse_output(p, cells, num,
-                                                                              box_size, anchors,
-                                                                              self.processor, self.threshold)
-                detections['labels'].extend(labels)
-                detections['scores'].extend(scores)
-                detections['x_mins'].extend(x_mins)
-                detections['y_mins'].extend(y_mins)
-                detections['x_maxs'].extend(x_maxs)
-                detections['y_maxs'].extend(y_maxs)
-
-            result.append(DetectionPrediction(
-                identifier, detections['labels'], detections['scores'], detections['x_mins'], detections['y_mins'],
-                detections['x_maxs'], detections['y_maxs']
-            ))
+                detections.append(parse_output(p, cells, num, box_size, anchors, self.processor, self.threshold))
+
+            labels, scores, x_mins, y_mins, x_maxs, y_maxs = (np.concatenate(values) for values in zip(*detections))
+            result.append(DetectionPrediction(identifier, labels, scores, x_mins, y_mins, x_maxs, y_maxs))
 
         return result
 
@@ -470,14 +467,13 @@ class YoloV3ONNX(Adapter):
         for identifier, boxes, scores, indices in zip(
                 identifiers, raw_outputs[self.boxes_out], raw_outputs[self.scores_out], indicies_out
         ):
-            out_boxes, out_scores, out_classes = [], [], []
-            for idx_ in indices:
-                if idx_[0] == -1:
-                    break
-                out_classes.append(idx_[1])
-                out_scores.append(scores[tuple(idx_[1:])])
-                out_boxes.append(boxes[idx_[2]])
-            transposed_boxes = np.array(out_boxes).T if out_boxes else ([], [], [], [])
+            indices = np.asarray(indices)
+            end_positions = np.flatnonzero(indices[:, 0] == -1)
+            if end_positions.size:
+                indices = indices[:end_positions[0]]
+            out_classes = indices[:, 1]
+            out_scores = scores[indices[:, 1], indices[:, 2]]
+            transposed_boxes = boxes[indices[:, 2]].T if indices.size else ([], [], [], [])
             x_mins = transposed_boxes[1]
             y_mins = transposed_boxes[0]
             x_maxs = transposed_boxes[3]
@@ -0,0 +1,274 @@
+"""
+Copyright (c) 2018-2021 Intel Corporation
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import importlib
+import json
+import pickle
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+
+import numpy as np
+
+from ..data_readers import create_identifier_key
+from ..utils import read_json
+
+HEADER_FILE = 'header.json'
+IDENTIFIERS_FILE = 'identifiers.pickle'
+METADATA_FILE = 'metadata.pickle'
+CONVERSION_INFO_FILE = 'conversion_info.pickle'
+RECORD_GROUP_FILE = 'record_group.npy'
+RECORD_POSITION_FILE = 'record_position.npy'
+FORMAT_VERSION = 1
+
+ARRAY_FIELD = 'array'
+SCALAR_FIELD = 'scalar'
+STRING_FIELD = 'string'
+OBJECT_FIELD = 'object'
+EXTRA_FIELDS = '__extra__'
+
+_SCALAR_TYPES = (bool, int, float, np.bool_, np.number)
+
+
+def is_columnar_annotation(annotation_path):
+    return Path(annotation_path).is_dir() and (Path(annotation_path) / HEADER_FILE).exists()
+
+
+def _field_kind(values):
+    if all(isinstance(value, np.ndarray) and value.ndim >= 1 for value in values):
+        non_empty = [value for value in values if value.size]
+        if not non_empty:
+            return ARRAY_FIELD if all(value.ndim == 1 for value in values) else OBJECT_FIELD
+        dtype, tail_shape = non_empty[0].dtype, non_empty[0].shape[1:]
+        if dtype.kind not in 'biufc':
+            return OBJECT_FIELD
+        if all(value.dtype == dtype and value.shape[1:] == tail_shape for value in non_empty):
+            if all(value.size or value.ndim == 1 for value in values):
+                return ARRAY_FIELD
+        return OBJECT_FIELD
+    value_type = type(values[0])
+    if issubclass(value_type, _SCALAR_TYPES) and all(type(value) is value_type for value in values):
+        if np.array(values).dtype.kind != 'O':
+            return SCALAR_FIELD
+    if all(isinstance(value, str) for value in values):
+        return STRING_FIELD
+    return OBJECT_FIELD
+
+
+def _dump_pickle(obj, path):
+    with path.open('wb') as content:
+        pickle.dump(obj, content)
+
+
+def _load_pickle(path):
+    with path.open('rb') as content:
+        return pickle.load(content)
+
+
+def _save_group(records, group_id, annotation_dir):
+    fields_per_record = [
+        {key: value for key, value in vars(record).items() if key not in ['identifier', 'metadata']}
+        for record in records
+    ]
+    common_fields = [field for field in fields_per_record[0] if all(field in rec for rec in fields_per_record)]
+    fields_description = OrderedDict()
+    for field in common_fields:
+        values = [rec[field] for rec in fields_per_record]
+        kind = _field_kind(values)
+        prefix = 'group_{}_{}'.format(group_id, field)
+        if kind == ARRAY_FIELD:
+            non_empty = [value for value in values if value.size]
+            dtype = non_empty[0].dtype if non_empty else np.float64
+            tail_shape = non_empty[0].shape[1:] if non_empty else ()
+            lengths = [len(value) for value in values]
+            offsets = np.zeros(len(values) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=offsets[1:])
+            column = (
+                np.concatenate([value.reshape((-1, ) + tail_shape) for value in non_empty]).astype(dtype, copy=False)
+                if non_empty else np.array([], dtype=dtype)
+            )
+            np.save(str(annotation_dir / '{}.npy'.format(prefix)), column)
+            np.save(str(annotation_dir / '{}_offsets.npy'.format(prefix)), offsets)
+        elif kind == SCALAR_FIELD:
+            np.save(str(annotation_dir / '{}.npy'.format(prefix)), np.array(values))
+        elif kind == STRING_FIELD:
+            np.save(str(annotation_dir / '{}.npy'.format(prefix)), np.array(values, dtype=str))
+        else:
+            _dump_pickle(values, annotation_dir / '{}.pickle'.format(prefix))
+        fields_description[field] = {
+            'kind': kind, 'python_type': type(values[0]).__module__ == 'builtins'
+        }
+    extra_fields = [
+        {key: value for key, value in rec.items() if key not in fields_description} for rec in fields_per_record
+    ]
+    if any(extra_fields):
+        _dump_pickle(extra_fields, annotation_dir / 'group_{}_{}.pickle'.format(group_id, EXTRA_FIELDS))
+        fields_description[EXTRA_FIELDS] = {'kind': OBJECT_FIELD, 'python_type': True}
+
+    return fields_description
+
+
+def save_columnar_annotation(annotation, annotation_dir, conversion_info=None):
+    """
+    Stores annotation as directory with column per representation attribute.
+    Numeric attributes are saved as contiguous .npy arrays which are memory-mapped on reading,
+    variable-length attributes (e.g. boxes coordinates) additionally have offsets array.
+    Attributes which can not be represented as numpy array are pickled as single list per representation type.
+    """
+    annotation_dir = Path(annotation_dir)
+    annotation_dir.mkdir(parents=True, exist_ok=True)
+    groups = OrderedDict()
+    record_group = np.zeros(len(annotation), dtype=np.int32)
+    record_position = np.zeros(len(annotation), dtype=np.int64)
+    identifiers, metadata = [], {}
+    for record_id, representation in enumerate(annotation):
+        group = groups.setdefault(type(representation), [])
+        record_group[record_id] = list(groups).index(type(representation))
+        record_position[record_id] = len(group)
+        group.append(representation)
+        identifiers.append(representation.identifier)
+        if representation.metadata:
+            metadata[record_id] = representation.metadata
+
+    groups_description = []
+    for group_id, (representation_type, records) in enumerate(groups.items()):
+        groups_description.append({
+            'module': representation_type.__module__,
+            'class': representation_type.__qualname__,
+            'size': len(records),
+            'fields': _save_group(records, group_id, annotation_dir)
+        })
+    np.save(str(annotation_dir / RECORD_GROUP_FILE), record_group)
+    np.save(str(annotation_dir / RECORD_POSITION_FILE), record_position)
+    _dump_pickle(identifiers, annotation_dir / IDENTIFIERS_FILE)
+    _dump_pickle(metadata, annotation_dir / METADATA_FILE)
+    if conversion_info:
+        _dump_pickle(conversion_info, annotation_dir / CONVERSION_INFO_FILE)
+    header = {'format_version': FORMAT_VERSION, 'size': len(annotation), 'groups': groups_description}
+    with (annotation_dir / HEADER_FILE).open('w') as header_file:
+        json.dump(header, header_file)
+
+
+class _RepresentationGroup:
+    def __init__(self, annotation_dir, group_id, description):
+        module = importlib.import_module(description['module'])
+        representation_type = module
+        for name in description['class'].split('.'):
+            representation_type = getattr(representation_type, name)
+        self.representation_type = representation_type
+        self.fields = description['fields']
+        self._annotation_dir = annotation_dir
+        self._prefix = 'group_{}_'.format(group_id)
+        self._columns = {}
+
+    def _column(self, field, suffix='', extension='npy'):
+        file_name = '{}{}{}.{}'.format(self._prefix, field, suffix, extension)
+        if file_name not in self._columns:
+            path = self._annotation_dir / file_name
+            self._columns[file_name] = (
+                np.load(str(path), mmap_mode='r') if extension == 'npy' else _load_pickle(path)
+            )
+        return self._columns[file_name]
+
+    def build(self, position, identifier, metadata):
+        representation = self.representation_type.__new__(self.representation_type)
+        state = {'identifier': identifier, 'metadata': metadata}
+        for field, description in self.fields.items():
+            kind = description['kind']
+            if kind == ARRAY_FIELD:
+                offsets = self._column(field, '_offsets')
+                state[field] = np.array(self._column(field)[offsets[position]:offsets[position + 1]])
+            elif kind == SCALAR_FIELD:
+                value = self._column(field)[position]
+                state[field] = value.item() if description['python_type'] else value
+            elif kind == STRING_FIELD:
+                state[field] = str(self._column(field)[position])
+            elif field == EXTRA_FIELDS:
+                state.update(self._column(field, extension='pickle')[position])
+            else:
+                state[field] = self._column(field, extension='pickle')[position]
+        representation.__dict__.update(state)
+        return representation
+
+
+class ColumnarAnnotation(Sequence):
+    """
+    Read-only sequence of representations stored by save_columnar_annotation.
+    Representation objects are created on the first access and cached, so metadata updates made by
+    evaluation pipeline are kept between accesses.
+    """
+    def __init__(self, annotation_dir):
+        self.annotation_dir = Path(annotation_dir)
+        header = read_json(self.annotation_dir / HEADER_FILE)
+        if header.get('format_version') != FORMAT_VERSION:
+            raise ValueError('Unsupported columnar annotation format version: {}'.format(header.get('format_version')))
+        self._size = header['size']
+        self._groups = [
+            _RepresentationGroup(self.annotation_dir, group_id, description)
+            for group_id, description in enumerate(header['groups'])
+        ]
+        self._identifiers = _load_pickle(self.annotation_dir / IDENTIFIERS_FILE)
+        self._record_group = np.load(str(self.annotation_dir / RECORD_GROUP_FILE), mmap_mode='r')
+        self._record_position = np.load(str(self.annotation_dir / RECORD_POSITION_FILE), mmap_mode='r')
+        self._metadata = None
+        self._representations = {}
+        conversion_info_file = self.annotation_dir / CONVERSION_INFO_FILE
+        self.conversion_info = _load_pickle(conversion_info_file) if conversion_info_file.exists() else None
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[idx] for idx in range(*item.indices(self._size))]
+        if item < 0:
+            item += self._size
+        if not 0 <= item < self._size:
+            raise IndexError('annotation index out of range')
+        representation = self._representations.get(item)
+        if representation is None:
+            if self._metadata is None:
+                self._metadata = _load_pickle(self.annotation_dir / METADATA_FILE)
+            group = self._groups[int(self._record_group[item])]
+            representation = group.build(
+                int(self._record_position[item]), self._identifiers[item], self._metadata.get(item, {})
+            )
+            self._representations[item] = representation
+        return representation
+
+    @property
+    def identifiers(self):
+        return self._identifiers
+
+    def by_identifier(self):
+        return ColumnarAnnotationMapping(self)
+
+
+class ColumnarAnnotationMapping(Mapping):
+    def __init__(self, annotation):
+        self._annotation = annotation
+        self._index = OrderedDict(
+            (create_identifier_key(identifier), idx) for idx, identifier in enumerate(annotation.identifiers)
+        )
+
+    def __getitem__(self, key):
+        return self._annotation[self._index[key]]
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
@@ -33,6 +33,7 @@ from ..representation import (
 from ..utils import get_path, OrderedSet
 from ..data_analyzer import BaseDataAnalyzer
 from .format_converter import BaseFormatConverter
+from .columnar_annotation import save_columnar_annotation
 from ..utils import cast_to_bool, is_relative_to
 
 DatasetConversionInfo = namedtuple('DatasetConversionInfo',
@@ -67,6 +68,13 @@ def build_argparser():
         "--subsample_seed", help="Seed for generation dataset subsample", type=int, required=False, default=666
     )
     parser.add_argument('--analyze_dataset', required=False, action='store_true')
+    parser.add_argument(
+        '--annotation_format',
+        help='Format for storing converted annotation. Columnar annotation is saved as directory',
+        choices=['pickle', 'columnar'],
+        required=False,
+        default='pickle'
+    )
     parser.add_argument(
         "--shuffle",
         help="Allow shuffle annotation during creation a subset",
@@ -91,8 +99,9 @@ def make_subset(annotation, size, seed=666, shuffle=True):
     if isinstance(annotation[-1], PlaceRecognitionAnnotation):
         return make_subset_place_recognition(annotation, size, shuffle)
 
-    result_annotation = list(np.random.choice(annotation, size=size, replace=False)) if shuffle else annotation[:size]
-    return result_annotation
+    if not shuffle:
+        return annotation[:size]
+    return [annotation[idx] for idx in np.random.choice(dataset_size, size=size, replace=False)]
 
 
 def make_subset_pairwise(annotation, size, shuffle=True):
@@ -234,7 +243,8 @@ def main():
         'annotation_conversion': converter_config,
         'subsample_size': subsample,
         'subsample_seed': args.subsample_seed,
-        'shuffle': args.shuffle
+        'shuffle': args.shuffle,
+        'annotation_format': args.annotation_format
     }
 
     save_annotation(converted_annotation, meta, annotation_file, meta_file, dataset_config)
@@ -243,6 +253,11 @@ def main():
 def save_annotation(annotation, meta, annotation_file, meta_file, dataset_config=None):
     if annotation_file:
         conversion_meta = get_conversion_attributes(dataset_config, len(annotation)) if dataset_config else None
+        annotation_format = dataset_config.get('annotation_format', 'pickle') if dataset_config else 'pickle'
+        if annotation_format == 'columnar':
+            save_columnar_annotation(annotation, annotation_file, conversion_meta)
+            annotation_file = None
+    if annotation_file:
         annotation_dir = annotation_file.parent
         if not annotation_dir.exists():
             annotation_dir.mkdir(parents=True)
@@ -260,6 +275,32 @@ def save_annotation(annotation, meta, annotation_file, meta_file, dataset_config
             json.dump(meta, file)
 
 
+def build_format_converter_argparser():
+    parser = ArgumentParser(description='Converts pickled Accuracy Checker annotation to columnar format')
+    parser.add_argument('annotation', help='Path to pickled annotation file', type=get_path)
+    parser.add_argument(
+        '-o', '--output_dir', help='Directory to save columnar annotation', type=partial(get_path, check_exists=False),
+        required=True
+    )
+    return parser
+
+
+def convert_annotation_format():
+    args = build_format_converter_argparser().parse_args()
+    annotation, conversion_info = [], None
+    with args.annotation.open('rb') as content:
+        while True:
+            try:
+                representation = pickle.load(content)
+            except EOFError:
+                break
+            if isinstance(representation, DatasetConversionInfo):
+                conversion_info = representation
+                continue
+            annotation.append(representation)
+    save_columnar_annotation(annotation, args.output_dir, conversion_info)
+
+
 def get_conversion_attributes(config, dataset_size):
     dataset_name = config.get('name', '')
     conversion_parameters = copy.deepcopy(config.get('annotation_conversion', {}))
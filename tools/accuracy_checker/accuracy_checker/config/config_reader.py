@@ -339,6 +339,7 @@ class ConfigReader:
     def _provide_cmd_arguments(arguments, config, mode):
         profile_dataset = 'profile' in arguments and arguments.profile
         profile_report_type = arguments.profile_report_type if 'profile_report_type' in arguments else 'csv'
+        profile_storage_limit = arguments.profile_storage_limit if 'profile_storage_limit' in arguments else None
 
         def merge_models(config, arguments, update_launcher_entry):
             def provide_models(launchers):
@@ -371,6 +372,7 @@ class ConfigReader:
 
                 for dataset_entry in model['datasets']:
                     _add_subset_specific_arg(dataset_entry, arguments)
+                    _add_prefetch_specific_arg(dataset_entry, arguments)
 
                     if 'ie_preprocessing' in arguments and arguments.ie_preprocessing:
                         dataset_entry['_ie_preprocessing'] = arguments.ie_preprocessing
@@ -378,6 +380,8 @@ class ConfigReader:
                     if profile_dataset:
                         dataset_entry['_profile'] = profile_dataset
                         dataset_entry['_report_type'] = profile_report_type
+                        if profile_storage_limit:
+                            dataset_entry['_profile_storage_limit'] = profile_storage_limit
 
         def merge_modules(config, arguments, update_launcher_entry):
             for evaluation in config['evaluations']:
@@ -399,6 +403,8 @@ class ConfigReader:
                     _add_subset_specific_arg(dataset, arguments)
                     dataset['_profile'] = profile_dataset
                     dataset['_report_type'] = profile_report_type
+                    if profile_storage_limit:
+                        dataset['_profile_storage_limit'] = profile_storage_limit
 
         functors_by_mode = {
             'models': merge_models,
@@ -838,6 +844,9 @@ def merge_dlsdk_launcher_args(arguments, launcher_entry, update_launcher_entry):
 
         return launcher_entry
 
+    if launcher_entry['framework'].lower() in ['onnx_runtime', 'pytorch', 'opencv']:
+        return _async_evaluation_args(launcher_entry)
+
     if launcher_entry['framework'].lower() != 'dlsdk':
         return launcher_entry
 
@@ -871,6 +880,13 @@ def _add_subset_specific_arg(dataset_entry, arguments):
         dataset_entry['store_subset'] = arguments.store_subset
 
 
+def _add_prefetch_specific_arg(dataset_entry, arguments):
+    if 'prefetch' in arguments and arguments.prefetch is not None:
+        dataset_entry['prefetch'] = arguments.prefetch
+    if 'prefetch_workers' in arguments and arguments.prefetch_workers is not None:
+        dataset_entry['prefetch_workers'] = arguments.prefetch_workers
+
+
 def prepare_commandline_conversion_mapping(commandline_conversion, args):
     mapping = {}
     for key, value in commandline_conversion.items():
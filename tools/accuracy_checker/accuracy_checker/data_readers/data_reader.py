@@ -279,6 +279,13 @@ class BaseReader(ClassProvider):
     def _read_multi_instance_single_object(self, data_id):
         return self.read_dispatcher(data_id.identifier)
 
+    def read_image_size(self, data_id):
+        """
+        Returns shape of data, which will be provided by reader for data_id, without full data decoding
+        or None if it is not supported by reader.
+        """
+        return None
+
     def read_item(self, data_id):
         data_rep = DataRepresentation(
             self.read_dispatcher(data_id),
@@ -344,6 +351,8 @@ class ReaderCombiner(BaseReader):
         raise ConfigError('suitable data reader for {} not found'.format(data_id))
 
 
+EXIF_ORIENTATION_TAG = 0x0112
+
 OPENCV_IMREAD_FLAGS = {
     'color': cv2.IMREAD_COLOR,
     'gray': cv2.IMREAD_GRAYSCALE,
@@ -351,6 +360,20 @@ OPENCV_IMREAD_FLAGS = {
 }
 
 
+def read_image_header_size(image_path, apply_orientation=True):
+    # only image header is parsed by Image.open, pixel data is not decoded
+    try:
+        with Image.open(str(image_path)) as image:
+            width, height = image.size
+            # OpenCV applies EXIF orientation during reading, it can swap image sides
+            if apply_orientation and image.format in ['JPEG', 'TIFF', 'WEBP']:
+                if image.getexif().get(EXIF_ORIENTATION_TAG, 1) in [5, 6, 7, 8]:
+                    width, height = height, width
+    except (OSError, ValueError):
+        return None, None
+    return height, width
+
+
 class OpenCVImageReader(BaseReader):
     __provider__ = 'opencv_imread'
 
@@ -370,6 +393,14 @@ class OpenCVImageReader(BaseReader):
     def read(self, data_id):
         return cv2.imread(str(get_path(self.data_source / data_id)), self.flag)
 
+    def read_image_size(self, data_id):
+        if self.flag not in [cv2.IMREAD_COLOR, cv2.IMREAD_GRAYSCALE] or not isinstance(data_id, str):
+            return None
+        height, width = read_image_header_size(self.data_source / data_id)
+        if height is None:
+            return None
+        return (height, width, 3) if self.flag == cv2.IMREAD_COLOR else (height, width)
+
 
 class PillowImageReader(BaseReader):
     __provider__ = 'pillow_imread'
@@ -384,6 +415,14 @@ class PillowImageReader(BaseReader):
 
             return np.array(img.convert('RGB') if self.convert_to_rgb else img)
 
+    def read_image_size(self, data_id):
+        if not self.convert_to_rgb or not isinstance(data_id, str):
+            return None
+        height, width = read_image_header_size(self.data_source / data_id, apply_orientation=False)
+        if height is None:
+            return None
+        return height, width, 3
+
 
 class ScipyImageReader(BaseReader):
     __provider__ = 'scipy_imread'
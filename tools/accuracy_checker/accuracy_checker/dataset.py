@@ -14,9 +14,14 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-from copy import deepcopy
+from copy import copy, deepcopy
 from pathlib import Path
-from collections import OrderedDict
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+import hashlib
+import json
+import os
 import warnings
 import pickle
 import numpy as np
@@ -25,6 +30,7 @@ import yaml
 from .annotation_converters import (
     BaseFormatConverter, DatasetConversionInfo, save_annotation, make_subset, analyze_dataset
 )
+from .annotation_converters.columnar_annotation import ColumnarAnnotation, is_columnar_annotation
 from .metrics import  Metric
 from .preprocessor import Preprocessor
 from .postprocessor import Postprocessor
@@ -42,7 +48,7 @@ from .config import (
 from .dependency import UnregisteredProviderException
 from .utils import (
     JSONDecoderWithAutoConversion,
-    read_json, read_yaml,
+    read_json, read_yaml, read_pickle,
     get_path, contains_all, set_image_metadata, OrderedSet, contains_any
 )
 
@@ -74,6 +80,10 @@ class Dataset:
             'annotation': PathField(
                 optional=True, check_exists=False, description='file for reading/writing Accuracy Checker annotation'
             ),
+            'annotation_format': StringField(
+                optional=True, choices=['pickle', 'columnar'], default='pickle',
+                description='format for storing converted annotation'
+            ),
             'data_source': PathField(optional=True, check_exists=False, description='data source'),
             'dataset_meta': PathField(optional=True, check_exists=False, description='dataset metadata file'),
             'metrics': ListField(allow_empty=False, optional=True, description='list of metrics for evaluation'),
@@ -97,13 +107,51 @@ class Dataset:
                 description='save subset ids to file specified in subset_file parameter'
             ),
             'batch': NumberField(value_type=int, min_value=1, optional=True, description='batch size for data read'),
+            'prefetch': NumberField(
+                value_type=int, min_value=0, optional=True, default=0,
+                description='number of batches which will be read and preprocessed in advance'
+            ),
+            'prefetch_workers': NumberField(
+                value_type=int, min_value=1, optional=True, default=1,
+                description='number of threads used for data prefetching'
+            ),
+            'image_info_cache': PathField(
+                optional=True, check_exists=False,
+                description='file for storing image sizes, which allows to avoid data reading for metadata filling'
+            ),
+            'preprocessing_cache': PathField(
+                optional=True, is_directory=True, check_exists=False,
+                description='directory for storing preprocessed data, which allows to avoid data reading and '
+                            'preprocessing in next runs with the same preprocessing configuration'
+            ),
+            'preprocessing_cache_size': NumberField(
+                value_type=int, min_value=1, optional=True, default=4096,
+                description='maximal size of preprocessing cache in megabytes'
+            ),
             '_profile': BoolField(optional=True, default=False, description='allow metric profiling'),
             '_report_type': StringField(optional=True, choices=['json', 'csv'], description='type profiling report'),
+            '_profile_storage_limit': NumberField(
+                value_type=int, min_value=1, optional=True,
+                description='maximal number of profiling records kept in memory before writing to report'
+            ),
             '_ie_preprocessing': BoolField(optional=True, default=False)
         }
 
     @staticmethod
     def load_annotation(config):
+        cache_key = annotation_cache.key(config)
+        cached = annotation_cache.get(cache_key)
+        if cached is not None:
+            print_info('Annotation for {dataset_name} dataset is reused from previously loaded dataset'.format(
+                dataset_name=config['name']))
+            return cached
+        annotation, meta = Dataset._load_annotation(config)
+        annotation_cache.put(cache_key, annotation, meta)
+
+        return annotation, meta
+
+    @staticmethod
+    def _load_annotation(config):
         def ignore_subset_settings(config):
             subset_file = config.get('subset_file')
             store_subset = config.get('store_subset')
@@ -135,7 +183,7 @@ class Dataset:
             if annotation_file.exists():
                 print_info('Annotation for {dataset_name} dataset will be loaded from {file}'.format(
                     dataset_name=config['name'], file=annotation_file))
-                annotation = read_annotation(get_path(annotation_file))
+                annotation = read_annotation(get_path(annotation_file, file_or_directory=True))
                 meta = Dataset.load_meta(config)
                 use_converted_annotation = False
         if not annotation and 'annotation_conversion' in config:
@@ -219,6 +267,9 @@ class Dataset:
     def __getitem__(self, item):
         return self.data_provider[item]
 
+    def iterate(self, process_batch=None):
+        return self.data_provider.iterate(process_batch)
+
     @staticmethod
     def load_meta(config):
         meta = None
@@ -254,8 +305,25 @@ class Dataset:
         self.data_provider.set_annotation(annotation, meta)
 
 
-    def provide_data_info(self, annotations, progress_reporter=None):
-        return self.data_provider.provide_data_info(annotations, progress_reporter)
+    def make_subset(self, ids=None, start=0, step=1, end=None, accept_pairs=False):
+        self.data_provider.make_subset(ids, start, step, end, accept_pairs)
+
+    @property
+    def subset(self):
+        return self.data_provider.subset
+
+    def provide_data_info(self, annotations, progress_reporter=None, save_cache=True):
+        return self.data_provider.provide_data_info(annotations, progress_reporter, save_cache)
+
+    def save_image_info_cache(self):
+        self.data_provider.save_image_info_cache()
+
+    def configure_preprocessing_cache(self, preprocessor):
+        self.data_provider.configure_preprocessing_cache(preprocessor)
+
+    @property
+    def annotation(self):
+        return self.data_provider.annotation
 
     @classmethod
     def validate_config(cls, config, fetch_only=False, uri_prefix=''):
@@ -317,6 +385,7 @@ class Dataset:
     def identifiers(self):
         return self.data_provider.identifiers
 
+    @property
     def multi_infer(self):
         return self.data_provider.multi_infer
 
@@ -326,7 +395,12 @@ class Dataset:
 
 
 def read_annotation(annotation_file: Path):
-    annotation_file = get_path(annotation_file)
+    annotation_file = get_path(annotation_file, file_or_directory=True)
+    if is_columnar_annotation(annotation_file):
+        annotation = ColumnarAnnotation(annotation_file)
+        if annotation.conversion_info:
+            describe_cached_dataset(annotation.conversion_info)
+        return annotation
 
     result = []
     with annotation_file.open('rb') as file:
@@ -386,8 +460,11 @@ class AnnotationProvider:
     def __init__(self, annotations, meta, name='', config=None):
         self.name = name
         self.config = config
-        self._data_buffer = OrderedDict()
         self._meta = meta
+        if isinstance(annotations, ColumnarAnnotation):
+            self._data_buffer = annotations.by_identifier()
+            return
+        self._data_buffer = OrderedDict()
         for ann in annotations:
             idx = create_identifier_key(ann.identifier)
             self._data_buffer[idx] = ann
@@ -510,6 +587,9 @@ class DataProvider:
         self.dataset_config = dataset_config or {}
         self.batch = batch
         self.subset = subset
+        image_info_cache = self.dataset_config.get('image_info_cache')
+        self.image_info_cache = ImageInfoCache(image_info_cache) if image_info_cache else None
+        self.preprocessing_cache = None
         self.create_data_list(data_list)
         if self.store_subset:
             self.sava_subset()
@@ -546,16 +626,19 @@ class DataProvider:
         with subset_file.open(mode="w") as sf:
             yaml.safe_dump(identifiers, sf)
 
-    def __getitem__(self, item):
+    def _batch_ids(self, item):
         if self.batch is None:
             self.batch = 1
         if self.size <= item * self.batch:
             raise IndexError
-        batch_annotation = []
         batch_start = item * self.batch
         batch_end = min(self.size, batch_start + self.batch)
         batch_input_ids = self.subset[batch_start:batch_end] if self.subset else range(batch_start, batch_end)
-        batch_identifiers = [self._data_list[idx] for idx in batch_input_ids]
+        return batch_input_ids, [self._data_list[idx] for idx in batch_input_ids]
+
+    def __getitem__(self, item):
+        batch_annotation = []
+        batch_input_ids, batch_identifiers = self._batch_ids(item)
         batch_input = [self.data_reader(identifier=identifier) for identifier in batch_identifiers]
         if self.annotation_provider:
             batch_annotation = [self.annotation_provider[idx] for idx in batch_identifiers]
@@ -570,10 +653,96 @@ class DataProvider:
             return len(self._data_list)
         return len(self.subset)
 
+    @property
+    def num_batches(self):
+        if self.batch is None:
+            self.batch = 1
+        return (self.size + self.batch - 1) // self.batch
+
+    def iterate(self, process_batch=None):
+        prefetch = self.dataset_config.get('prefetch', 0)
+        if not prefetch:
+            for batch_id in range(self.num_batches):
+                yield batch_id, self.read_batch(batch_id, process_batch)
+            return
+        prefetcher = DataPrefetcher(self, prefetch, self.dataset_config.get('prefetch_workers', 1), process_batch)
+        yield from prefetcher
+
+    def read_batch(self, batch_id, process_batch=None):
+        if process_batch is not None and self.preprocessing_cache is not None:
+            return self._read_cached_batch(batch_id, process_batch)
+        batch = self[batch_id]
+        if process_batch is None:
+            return batch
+        return process_batch(*batch)
+
+    def configure_preprocessing_cache(self, preprocessor):
+        cache_dir = self.dataset_config.get('preprocessing_cache')
+        if not cache_dir:
+            return
+        if preprocessor.has_multi_infer_transformations or preprocessor.ie_processor or self.multi_infer:
+            warnings.warn('Preprocessing cache is not supported for multi infer data and Inference Engine '
+                          'preprocessing. preprocessing_cache will be ignored')
+            return
+        self.preprocessing_cache = PreprocessingCache(
+            cache_dir, self.dataset_config.get('preprocessing_cache_size', 4096) * 1024 * 1024
+        )
+        self.preprocessing_cache.set_context(
+            preprocessing=self.dataset_config.get('preprocessing'), reader=self.dataset_config.get('reader'),
+            data_source=self.data_reader.data_source, input_shapes=preprocessor.input_shapes
+        )
+
+    def _read_cached_batch(self, batch_id, process_batch):
+        batch_input_ids, batch_identifiers = self._batch_ids(batch_id)
+        data_source = self.data_reader.data_source
+        batch_annotation = (
+            [self.annotation_provider[idx] for idx in batch_identifiers] if self.annotation_provider else []
+        )
+        batch_input = [None] * len(batch_identifiers)
+        missed = []
+        for position, identifier in enumerate(batch_identifiers):
+            cached = self.preprocessing_cache.get(identifier, data_source)
+            if cached is None:
+                missed.append(position)
+                continue
+            batch_input[position], annotation_meta = cached
+            if batch_annotation:
+                self._set_annotation_sources(batch_annotation[position], data_source)
+                batch_annotation[position].metadata.update(annotation_meta)
+        if not missed:
+            return batch_input_ids, batch_annotation, batch_input, batch_identifiers
+
+        missed_identifiers = [batch_identifiers[position] for position in missed]
+        missed_annotation = [batch_annotation[position] for position in missed] if batch_annotation else []
+        missed_input = [self.data_reader(identifier=identifier) for identifier in missed_identifiers]
+        for annotation, input_data in zip(missed_annotation, missed_input):
+            self.set_annotation_metadata(annotation, input_data, data_source)
+        _, _, processed_input, _ = process_batch(
+            [batch_input_ids[position] for position in missed], missed_annotation, missed_input, missed_identifiers
+        )
+        for idx, position in enumerate(missed):
+            batch_input[position] = processed_input[idx]
+            annotation_meta = {}
+            if missed_annotation:
+                annotation_meta = {
+                    key: value for key, value in missed_annotation[idx].metadata.items()
+                    if key not in PreprocessingCache.ANNOTATION_SOURCES_META
+                }
+            self.preprocessing_cache.put(missed_identifiers[idx], data_source, processed_input[idx], annotation_meta)
+
+        return batch_input_ids, batch_annotation, batch_input, batch_identifiers
+
     @property
     def identifiers(self):
         return self._data_list
 
+    @property
+    def annotation(self):
+        if not self.annotation_provider:
+            return []
+        data_ids = self.subset if self.subset else range(len(self._data_list))
+        return [self.annotation_provider[self._data_list[idx]] for idx in data_ids]
+
     def make_subset(self, ids=None, start=0, step=1, end=None, accept_pairs=False):
         if self.annotation_provider:
             ids = self.annotation_provider.make_subset(ids, start, step, end, accept_pairs)
@@ -627,22 +796,52 @@ class DataProvider:
 
     def set_annotation_metadata(self, annotation, image, data_source):
         set_image_metadata(annotation, image)
+        if self.image_info_cache is not None:
+            self.image_info_cache.update(annotation.identifier, data_source, annotation.metadata['image_size'])
+        self._set_annotation_sources(annotation, data_source)
+
+    def _set_annotation_sources(self, annotation, data_source):
         annotation.set_data_source(data_source)
         segmentation_mask_source = self.dataset_config.get('segmentation_masks_source')
         annotation.set_segmentation_mask_source(segmentation_mask_source)
         annotation.set_additional_data_source(self.dataset_config.get('additional_data_source'))
         annotation.set_dataset_metadata(self.annotation_provider.metadata)
 
-    def provide_data_info(self, annotations, progress_reporter=None):
+    def provide_data_info(self, annotations, progress_reporter=None, save_cache=True):
         if progress_reporter:
             progress_reporter.reset(len(annotations))
+        data_source = self.data_reader.data_source
         for idx, ann in enumerate(annotations):
-            input_data = self.data_reader(ann.identifier)
-            self.set_annotation_metadata(ann, input_data, self.data_reader.data_source)
+            image_size = self._get_image_size(ann.identifier)
+            if image_size is None:
+                input_data = self.data_reader(ann.identifier)
+                self.set_annotation_metadata(ann, input_data, data_source)
+            else:
+                ann.set_image_size(image_size)
+                self._set_annotation_sources(ann, data_source)
             if progress_reporter:
                 progress_reporter.update(idx, 1)
+        if save_cache:
+            self.save_image_info_cache()
         return annotations
 
+    def _get_image_size(self, identifier):
+        data_source = self.data_reader.data_source
+        image_size = None
+        if self.image_info_cache is not None:
+            image_size = self.image_info_cache.get(identifier, data_source)
+        if image_size is None and not self.multi_infer:
+            data_size = self.data_reader.read_image_size(identifier)
+            if data_size is not None:
+                image_size = [data_size]
+                if self.image_info_cache is not None:
+                    self.image_info_cache.update(identifier, data_source, image_size)
+        return image_size
+
+    def save_image_info_cache(self):
+        if self.image_info_cache is not None:
+            self.image_info_cache.save()
+
     def set_annotation(self, annotation, meta):
         subsample_size = self.dataset_config.get('subsample_size')
         if subsample_size is not None:
@@ -662,3 +861,265 @@ class DataProvider:
 
 class DatasetWrapper(DataProvider):
     pass
+
+
+class AnnotationCache:
+    """
+    Process-wide storage of loaded annotation and metadata, which allows to avoid repeated annotation loading,
+    conversion and analysis for evaluation of several models on the same dataset.
+    Entries are keyed by dataset config without parameters, which do not affect annotation.
+    Annotation is stored serialized, so each dataset gets own copy, which can be modified during evaluation.
+    """
+    NOT_AFFECTING_ANNOTATION = [
+        'name', 'data_source', 'reader', 'preprocessing', 'postprocessing', 'metrics', 'batch',
+        'prefetch', 'prefetch_workers', 'image_info_cache', 'preprocessing_cache', 'preprocessing_cache_size',
+        '_profile', '_report_type', '_profile_storage_limit', '_ie_preprocessing'
+    ]
+
+    def __init__(self):
+        self.enabled = False
+        self._storage = {}
+
+    def key(self, config):
+        if not self.enabled:
+            return None
+        annotation_config = {
+            key: value for key, value in config.items() if key not in self.NOT_AFFECTING_ANNOTATION
+        }
+        return json.dumps(annotation_config, sort_keys=True, default=str)
+
+    def get(self, key):
+        if key not in self._storage:
+            return None
+        return pickle.loads(self._storage[key])
+
+    def put(self, key, annotation, meta):
+        # columnar annotation is loaded lazily from memory-mapped files, so it is cheap to load again
+        if key is None or isinstance(annotation, ColumnarAnnotation):
+            return
+        try:
+            self._storage[key] = pickle.dumps((annotation, meta), protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            warnings.warn('Annotation can not be serialized and will not be reused by other dataset instances')
+
+    def clear(self):
+        self._storage = {}
+
+    def __len__(self):
+        return len(self._storage)
+
+
+annotation_cache = AnnotationCache()
+
+
+def data_file_stat(identifier, data_source):
+    """
+    Returns modification time and size of data file, which are used for invalidation of cached data,
+    or None if identifier is not a file in data source.
+    """
+    if not isinstance(identifier, str) or not isinstance(data_source, (str, Path)):
+        return None
+    try:
+        file_stat = (Path(data_source) / identifier).stat()
+    except OSError:
+        return None
+    return file_stat.st_mtime_ns, file_stat.st_size
+
+
+class ImageInfoCache:
+    """
+    Persistent storage for image sizes, which are required for annotation metadata.
+    Entries are keyed by data identifier and are valid only while data file modification time and size are unchanged.
+    """
+    def __init__(self, cache_file):
+        self.cache_file = Path(cache_file)
+        self._data = read_pickle(self.cache_file) if self.cache_file.exists() else {}
+        self._updated = False
+
+    def get(self, identifier, data_source):
+        entry = self._data.get(identifier)
+        if entry is None:
+            return None
+        file_stat, image_size = entry
+        if file_stat != data_file_stat(identifier, data_source):
+            return None
+        return image_size
+
+    def update(self, identifier, data_source, image_size):
+        file_stat = data_file_stat(identifier, data_source)
+        if file_stat is None:
+            return
+        entry = (file_stat, image_size)
+        if self._data.get(identifier) != entry:
+            self._data[identifier] = entry
+            self._updated = True
+
+    def save(self):
+        if not self._updated:
+            return
+        with self.cache_file.open('wb') as cache:
+            pickle.dump(self._data, cache)
+        self._updated = False
+
+    def __len__(self):
+        return len(self._data)
+
+
+class PreprocessingCache:
+    """
+    Persistent storage of preprocessed input data for reuse between evaluations with the same preprocessing.
+    Entries are keyed by data identifier and hash of preprocessing context (preprocessing and reader configuration,
+    model input shapes) and are valid only while data file modification time and size are unchanged.
+    Data arrays are stored in .npy files and memory-mapped on reading. Least recently used entries are removed
+    when total size of stored entries exceeds the limit.
+    """
+    # annotation metadata filled from dataset configuration on each reading
+    ANNOTATION_SOURCES_META = ['data_source', 'segmentation_masks_source', 'additional_data_source', 'dataset_meta']
+
+    def __init__(self, cache_dir, size_limit=None):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.size_limit = size_limit
+        self._context_hash = ''
+        self._lock = Lock()
+        self._entries = OrderedDict()
+        self._total_size = 0
+        sizes, access_times = {}, {}
+        for cache_file in self.cache_dir.iterdir():
+            name = cache_file.stem.split('_')[0]
+            file_stat = cache_file.stat()
+            sizes[name] = sizes.get(name, 0) + file_stat.st_size
+            if cache_file.suffix == '.pickle':
+                access_times[name] = file_stat.st_mtime_ns
+        # entries are ordered by last access time, which is kept as modification time of entry file
+        for name in sorted(access_times, key=access_times.get):
+            self._entries[name] = sizes[name]
+            self._total_size += sizes[name]
+        for name in set(sizes) - set(access_times):
+            # arrays of interrupted writing
+            self._remove_files(name)
+
+    def set_context(self, **context):
+        self._context_hash = hashlib.sha1(json.dumps(context, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _entry_name(self, identifier):
+        return hashlib.sha1('{}:{!r}'.format(self._context_hash, identifier).encode()).hexdigest()
+
+    def _entry_file(self, name):
+        return self.cache_dir / '{}.pickle'.format(name)
+
+    def _array_file(self, name, array_id):
+        return self.cache_dir / '{}_{}.npy'.format(name, array_id)
+
+    @staticmethod
+    def _arrays(data):
+        arrays = data if isinstance(data, list) else [data]
+        if not arrays or not all(isinstance(array, np.ndarray) and array.dtype.kind in 'biufc' for array in arrays):
+            return None
+        return arrays
+
+    def get(self, identifier, data_source):
+        name = self._entry_name(identifier)
+        with self._lock:
+            if name not in self._entries:
+                return None
+            self._entries.move_to_end(name)
+        entry_file = self._entry_file(name)
+        try:
+            entry = read_pickle(entry_file)
+            if entry['file_stat'] != data_file_stat(identifier, data_source):
+                self._remove(name)
+                return None
+            arrays = [
+                np.load(str(self._array_file(name, array_id)), mmap_mode='c') for array_id in range(entry['arrays'])
+            ]
+            os.utime(str(entry_file))
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+            self._remove(name)
+            return None
+        representation = entry['representation']
+        representation.data = arrays if entry['is_list'] else arrays[0]
+        return representation, entry['annotation_meta']
+
+    def put(self, identifier, data_source, representation, annotation_meta):
+        file_stat = data_file_stat(identifier, data_source)
+        arrays = self._arrays(representation.data)
+        if file_stat is None or arrays is None:
+            return
+        name = self._entry_name(identifier)
+        self._remove(name)
+        stored_representation = copy(representation)
+        stored_representation.data = None
+        entry = {
+            'file_stat': file_stat, 'representation': stored_representation, 'annotation_meta': annotation_meta,
+            'is_list': isinstance(representation.data, list), 'arrays': len(arrays)
+        }
+        try:
+            for array_id, array in enumerate(arrays):
+                np.save(str(self._array_file(name, array_id)), array)
+            # entry file is written last, so entry without all arrays is never found
+            with self._entry_file(name).open('wb') as entry_file:
+                pickle.dump(entry, entry_file)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            self._remove_files(name)
+            return
+        size = sum(cache_file.stat().st_size for cache_file in self.cache_dir.glob('{}*'.format(name)))
+        with self._lock:
+            self._entries[name] = size
+            self._total_size += size
+            evicted = []
+            while self.size_limit is not None and self._total_size > self.size_limit and len(self._entries) > 1:
+                evicted_name, evicted_size = self._entries.popitem(last=False)
+                self._total_size -= evicted_size
+                evicted.append(evicted_name)
+        for evicted_name in evicted:
+            self._remove_files(evicted_name)
+
+    def _remove(self, name):
+        with self._lock:
+            if name in self._entries:
+                self._total_size -= self._entries.pop(name)
+        self._remove_files(name)
+
+    def _remove_files(self, name):
+        for cache_file in self.cache_dir.glob('{}*'.format(name)):
+            cache_file.unlink()
+
+    @property
+    def total_size(self):
+        return self._total_size
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DataPrefetcher:
+    """
+    Reads and processes next batches of data provider in background threads while current batch is consumed.
+    Batches are yielded in the same order as for sequential reading. With single worker all reader and
+    preprocessing calls are executed one by one, so readers with internal state remain safe to use.
+    """
+    def __init__(self, data_provider, prefetch, num_workers=1, process_batch=None):
+        self.data_provider = data_provider
+        self.prefetch = max(prefetch, 1)
+        self.num_workers = num_workers
+        self.process_batch = process_batch
+
+    def __iter__(self):
+        num_batches = self.data_provider.num_batches
+        pending = deque()
+        next_batch_id = 0
+        executor = ThreadPoolExecutor(max_workers=self.num_workers)
+        try:
+            while next_batch_id < num_batches or pending:
+                while next_batch_id < num_batches and len(pending) <= self.prefetch:
+                    pending.append((next_batch_id, executor.submit(
+                        self.data_provider.read_batch, next_batch_id, self.process_batch
+                    )))
+                    next_batch_id += 1
+                batch_id, batch_future = pending.popleft()
+                yield batch_id, batch_future.result()
+        finally:
+            for _, batch_future in pending:
+                batch_future.cancel()
+            executor.shutdown(wait=True)
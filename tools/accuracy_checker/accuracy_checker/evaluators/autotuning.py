@@ -0,0 +1,173 @@
+"""
+Copyright (c) 2018-2021 Intel Corporation
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import copy
+import json
+import multiprocessing
+from pathlib import Path
+
+from ..launcher import Launcher
+from ..logging import print_info, warning
+from .model_evaluator import ModelEvaluator
+from .pipeline_benchmark import PipelineBenchmark
+
+DEFAULT_TUNING_CACHE = Path.home() / '.cache' / 'accuracy_checker' / 'tuning_cache.json'
+TUNING_BATCHES = [1, 2, 4, 8]
+TUNED_PARAMETERS = ['num_requests', 'cpu_streams', 'batch']
+
+
+def powers_of_two(max_value):
+    values = [1]
+    while values[-1] * 2 <= max_value:
+        values.append(values[-1] * 2)
+    return values
+
+
+def tuning_key(config_entry):
+    launcher_config = config_entry['launchers'][0]
+    return '|'.join([
+        config_entry['name'], launcher_config['framework'], str(launcher_config.get('model', '')),
+        str(launcher_config.get('device', '')).upper(), config_entry['datasets'][0]['name']
+    ])
+
+
+def tuning_axes(launcher_config, cpu_count=None):
+    """
+    Returns list of (parameter, values) pairs for tuning: numbers of infer requests for launchers with async mode
+    support, CPU throughput streams for DLSDK launcher on CPU and batch sizes for launchers with configurable batch.
+    """
+    cpu_count = cpu_count or multiprocessing.cpu_count()
+    launcher_cls = Launcher.resolve(launcher_config['framework'])
+    launcher_parameters = launcher_cls.parameters()
+    axes = []
+    if 'num_requests' in launcher_parameters:
+        axes.append(('num_requests', powers_of_two(2 * cpu_count)))
+    if 'cpu_streams' in launcher_parameters and 'CPU' in str(launcher_config.get('device', '')).upper():
+        axes.append(('cpu_streams', powers_of_two(cpu_count)))
+    if 'batch' in launcher_parameters:
+        axes.append(('batch', TUNING_BATCHES))
+    return axes
+
+
+def search_best_parameters(axes, measure):
+    """
+    Coordinate search over tuning axes: parameters are swept one by one in order of axes, while already tuned
+    parameters are fixed to the best found values and not tuned ones to the first values (CPU streams are not set
+    until tuned). So number of measured configurations is sum of axes sizes instead of their product
+    (17 instead of 136 for DLSDK launcher on 32 cores CPU). Configurations with more CPU streams than infer requests
+    are skipped. measure(parameters) returns throughput or None for failed configuration.
+    Returns the best parameters and their throughput.
+    """
+    current = {name: values[0] for name, values in axes if name != 'cpu_streams'}
+    measured = {}
+
+    def evaluate(parameters):
+        key = tuple(sorted(parameters.items()))
+        if key not in measured:
+            measured[key] = measure(parameters)
+        return measured[key]
+
+    best_parameters, best_throughput = None, 0
+    for name, values in axes:
+        axis_candidates = [current] + [dict(current, **{name: value}) for value in values]
+        for candidate in axis_candidates:
+            if 'num_requests' in candidate and candidate.get('cpu_streams', 1) > candidate['num_requests']:
+                continue
+            throughput = evaluate(candidate)
+            if throughput is not None and throughput > best_throughput:
+                best_parameters, best_throughput = candidate, throughput
+        if best_parameters is not None:
+            current = best_parameters
+    return best_parameters, best_throughput
+
+
+def apply_tuned_parameters(config_entry, parameters):
+    config_entry = copy.deepcopy(config_entry)
+    launcher_config = config_entry['launchers'][0]
+    for key in TUNED_PARAMETERS:
+        if key in parameters:
+            launcher_config[key] = parameters[key]
+    if 'num_requests' in parameters:
+        launcher_config['async_mode'] = True
+    if 'batch' in parameters:
+        for dataset_config in config_entry['datasets']:
+            dataset_config.pop('batch', None)
+    return config_entry
+
+
+def measure_throughput(config_entry, subsample_size):
+    evaluator = ModelEvaluator.from_configs(config_entry)
+    try:
+        evaluator.dataset.make_subset(end=min(subsample_size, evaluator.dataset_size))
+        benchmark = PipelineBenchmark()
+        evaluator.set_benchmark(benchmark)
+        evaluator.process_dataset(None, None)
+        return benchmark.throughput
+    finally:
+        evaluator.release()
+
+
+class TuningCache:
+    def __init__(self, cache_file=None):
+        self.cache_file = Path(cache_file or DEFAULT_TUNING_CACHE)
+        self._entries = {}
+        if self.cache_file.exists():
+            with self.cache_file.open() as content:
+                self._entries = json.load(content)
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with self.cache_file.open('w') as content:
+            json.dump(self._entries, content, indent=4)
+
+
+def autotune(config_entry, tuning_cache, subsample_size=64):
+    """
+    Selects number of infer requests, CPU streams and batch size with the best end-to-end throughput
+    of evaluation pipeline on dataset subset. Selected configuration is stored in tuning cache
+    and reused for the same model, launcher, device and dataset without new sweep.
+    Returns config entry with tuned launcher parameters.
+    """
+    key = tuning_key(config_entry)
+    tuned = tuning_cache.get(key)
+    if tuned is not None:
+        print_info('Tuned configuration is loaded from cache: {}'.format(tuned['parameters']))
+        return apply_tuned_parameters(config_entry, tuned['parameters'])
+    axes = tuning_axes(config_entry['launchers'][0])
+    if not axes:
+        warning('Launcher {} does not have tunable parameters'.format(config_entry['launchers'][0]['framework']))
+        return config_entry
+
+    def measure(parameters):
+        try:
+            throughput = measure_throughput(apply_tuned_parameters(config_entry, parameters), subsample_size)
+        except Exception as error:  # pylint: disable=W0703
+            warning('Configuration {} is skipped: {}'.format(parameters, error))
+            return None
+        print_info('{}: {:.2f} FPS'.format(parameters, throughput))
+        return throughput
+
+    best_parameters, best_throughput = search_best_parameters(axes, measure)
+    if best_parameters is None:
+        warning('Auto-tuning failed, configuration from config file is used')
+        return config_entry
+    print_info('Selected configuration: {} ({:.2f} FPS)'.format(best_parameters, best_throughput))
+    tuning_cache.put(key, {'parameters': best_parameters, 'throughput': best_throughput})
+    return apply_tuned_parameters(config_entry, best_parameters)
@@ -238,17 +238,15 @@ class ASRModel(BaseModel):
         self._max_symbols_per_step = 30
 
     def predict(self, identifiers, input_data, encoder_callback=None):
-        predictions, raw_outputs = [], []
+        encoder_outputs = []
         for data in input_data:
             encoder_prediction, decoder_inputs = self.encoder.predict(identifiers, data)
             if encoder_callback:
                 encoder_callback(encoder_prediction)
             if self.store_encoder_predictions:
                 self._encoder_predictions.append(encoder_prediction)
-            raw_output, prediction = self.decoder(identifiers, decoder_inputs, callback=encoder_callback)
-            raw_outputs.append(raw_output)
-            predictions.append(prediction)
-        return raw_outputs, predictions
+            encoder_outputs.extend(np.squeeze(decoder_inputs[batch_idx]) for batch_idx in range(len(decoder_inputs)))
+        return self.decoder(identifiers, encoder_outputs, callback=encoder_callback)
 
     def reset(self):
         self.processing_frames_buffer = []
@@ -280,52 +278,57 @@ class ASRModel(BaseModel):
                 {'name': 'joint', 'model': self.joint.network}]
 
     def decoder(self, identifiers, logits, callback=None):
-        output = []
-        raw_outputs = []
-        batches = logits.shape[0]
-        for batch_idx in range(batches):
-            inseq = np.squeeze(logits[batch_idx, :, :])
-            # inseq: TxBxF
-            logitlen = inseq.shape[0]
-            sentence = self._greedy_decode(inseq, logitlen, callback)
-            output.append(sentence)
-        result = self.adapter.process(output, identifiers, [{}])
-
-        return raw_outputs, result
-
-    def _greedy_decode(self, x, out_len, callback=None):
-        hidden_size = 320
-        hidden = (np.zeros([2, 1, hidden_size]), np.zeros([2, 1, hidden_size]))
-        label = []
-        for time_idx in range(out_len):
-            f = np.expand_dims(np.expand_dims(x[time_idx, ...], 0), 0)
+        raw_outputs, predictions = [], []
+        labels = self._greedy_decode(logits, callback)
+        for identifier, label in zip(identifiers, labels):
+            raw_outputs.append([])
+            predictions.append(self.adapter.process([label], [identifier], [{}]))
+        return raw_outputs, predictions
 
-            not_blank = True
+    def _greedy_decode(self, sequences, callback=None):
+        """
+        Decodes encoder outputs of utterances (list of TxF arrays) in lock-step, so joint network is evaluated
+        for all utterances at once. Prediction network output depends only on last emitted label and hidden state,
+        which are not changed by blank, so it is computed again only after non-blank symbol.
+        """
+        batch_size = len(sequences)
+        hidden_size = 320
+        hidden = [(np.zeros([2, 1, hidden_size]), np.zeros([2, 1, hidden_size])) for _ in range(batch_size)]
+        labels = [[] for _ in range(batch_size)]
+        predictions = [None] * batch_size
+        enc_batch, pred_batch = None, None
+        for time_idx in range(max([len(sequence) for sequence in sequences], default=0)):
+            active = [idx for idx, sequence in enumerate(sequences) if time_idx < len(sequence)]
+            for idx in active:
+                if enc_batch is None:
+                    enc_batch = np.zeros((batch_size, 1, *np.shape(sequences[idx][time_idx])))
+                enc_batch[idx, 0] = sequences[idx][time_idx]
             symbols_added = 0
 
-            while not_blank and symbols_added < self._max_symbols_per_step:
-                g, hidden_prime = self._pred_step(
-                    self._get_last_symb(label),
-                    hidden
-                )
-                if callback:
-                    callback(g)
-                hidden_prime = (g[self.prediction.output_layers[0]], g[self.prediction.output_layers[1]])
-                g = g[self.prediction.output_layers[2]]
-                logp = self._joint_step(f, g, log_normalize=False, callback=callback)[0, :]
-
-                k = np.argmax(logp)
-
-                if k == self._blank_id:
-                    not_blank = False
-                else:
-                    label.append(k)
-                    hidden = hidden_prime
+            while active and symbols_added < self._max_symbols_per_step:
+                for idx in active:
+                    if predictions[idx] is None:
+                        predictions[idx] = self._pred_step(self._get_last_symb(labels[idx]), hidden[idx], callback)
+                    g = predictions[idx][0]
+                    if pred_batch is None:
+                        pred_batch = np.zeros((batch_size, *g.shape[1:]))
+                    pred_batch[idx] = g[0]
+                logp = self._joint_step(enc_batch, pred_batch, log_normalize=False, callback=callback)
+
+                not_blank = []
+                for idx in active:
+                    k = np.argmax(logp[idx])
+                    if k != self._blank_id:
+                        labels[idx].append(k)
+                        hidden[idx] = predictions[idx][1]
+                        predictions[idx] = None
+                        not_blank.append(idx)
+                active = not_blank
                 symbols_added += 1
 
-        return label
+        return labels
 
-    def _pred_step(self, label, hidden):
+    def _pred_step(self, label, hidden, callback=None):
         if label == self._sos:
             label = self._blank_id
         if label > self._blank_id:
@@ -335,7 +338,11 @@ class ASRModel(BaseModel):
             self.prediction.input_layers[1]: hidden[0],
             self.prediction.input_layers[2]: hidden[1]
         }
-        return self.prediction.predict(None, inputs)
+        g, _ = self.prediction.predict(None, inputs)
+        if callback:
+            callback(g)
+        hidden_prime = (np.copy(g[self.prediction.output_layers[0]]), np.copy(g[self.prediction.output_layers[1]]))
+        return np.copy(g[self.prediction.output_layers[2]]), hidden_prime
 
     def _joint_step(self, enc, pred, log_normalize=False, callback=None):
         inputs = {self.joint.input_layers[0]: enc, self.joint.input_layers[1]: pred}
@@ -0,0 +1,90 @@
+"""
+Copyright (c) 2018-2021 Intel Corporation
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import numpy as np
+
+
+class BatchedGreedyDecoder:
+    """
+    Greedy autoregressive decoder which runs several sequences in lock-step, one decoder inference per step.
+    Decoder states are stored in preallocated arrays with batch_size slots. Finished sequence (end of sequence token
+    or max_seq_len steps) leaves its slot and the next pending sample takes it, so decoder batch stays filled
+    while there are samples for decoding.
+
+    step(states) gets dictionary of batched states and returns tuple (logits, updated_states), where logits have
+    shape [batch_size, num_tokens] and updated_states contains new values of recurrent states.
+    Selected token is written to token_state for the next step.
+    """
+
+    def __init__(self, step, batch_size, max_seq_len, eos_index, token_state):
+        self.step = step
+        self.batch_size = batch_size
+        self.max_seq_len = max_seq_len
+        self.eos_index = eos_index
+        self.token_state = token_state
+        self._states = None
+
+    def _allocate(self, initial_states):
+        self._states = {
+            name: np.zeros((self.batch_size, *np.shape(value)[1:]), dtype=np.asarray(value).dtype)
+            for name, value in initial_states.items()
+        }
+
+    def _put(self, slot, initial_states):
+        if self._states is None:
+            self._allocate(initial_states)
+        for name, value in initial_states.items():
+            if np.shape(value)[1:] != self._states[name].shape[1:]:
+                raise ValueError('Decoder state {} has shape {}, expected {}'.format(
+                    name, np.shape(value)[1:], self._states[name].shape[1:]
+                ))
+            self._states[name][slot] = value[0]
+
+    def decode(self, samples):
+        """
+        Decodes samples given as iterable of (key, initial_states) pairs, initial states have batch 1.
+        Yields (key, tokens, logits) in order of decoding finish, tokens include end of sequence token.
+        """
+        samples = iter(samples)
+        slots = [None] * self.batch_size
+        has_samples = True
+        while True:
+            for slot in range(self.batch_size):
+                if slots[slot] is not None or not has_samples:
+                    continue
+                sample = next(samples, None)
+                if sample is None:
+                    has_samples = False
+                    break
+                key, initial_states = sample
+                self._put(slot, initial_states)
+                slots[slot] = (key, [], [])
+            active = [slot for slot, sequence in enumerate(slots) if sequence is not None]
+            if not active:
+                return
+            logits, updated_states = self.step(self._states)
+            logits = np.asarray(logits)
+            tokens = np.argmax(logits, axis=1)
+            for name, value in updated_states.items():
+                self._states[name][active] = np.asarray(value)[active]
+            for slot in active:
+                key, sequence, sequence_logits = slots[slot]
+                sequence.append(int(tokens[slot]))
+                sequence_logits.append(np.copy(logits[slot]))
+                self._states[self.token_state][slot] = tokens[slot]
+                if tokens[slot] == self.eos_index or len(sequence) >= self.max_seq_len:
+                    slots[slot] = None
+                    yield key, sequence, sequence_logits
@@ -0,0 +1,186 @@
+"""
+Copyright (c) 2018-2021 Intel Corporation
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import threading
+from collections import OrderedDict
+from queue import Queue, Empty, Full
+from time import perf_counter
+
+from ...logging import print_info
+
+_END = object()
+_POLL_INTERVAL = 0.1
+
+
+class PipelineStage:
+    """
+    Node of cascade pipeline. process(item) returns item for the next stage, skip(item) allows to pass item
+    through stage unchanged (e.g. when previous stage found nothing). Stage is run by num_workers threads,
+    so process should be thread safe if more than one worker is used.
+    Every worker calls process synchronously, so stages are overlapped with each other, but one stage does not
+    keep several infer requests in flight: for parallel inference of a stage num_workers should be increased
+    and the stage model should support concurrent infer calls.
+    """
+
+    def __init__(self, name, process, num_workers=1, skip=None):
+        self.name = name
+        self.process = process
+        self.num_workers = num_workers
+        self.skip = skip
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.processed = 0
+        self.busy_time = 0
+
+    def __call__(self, item):
+        if self.skip is not None and self.skip(item):
+            return item
+        start = perf_counter()
+        result = self.process(item)
+        with self._lock:
+            self.busy_time += perf_counter() - start
+            self.processed += 1
+        return result
+
+
+class CascadePipeline:
+    """
+    Runs items through sequence of stages. In pipelined mode every stage has own workers and bounded queue
+    of inputs, so stage N processes item i while stage N-1 processes item i + 1.
+    Results are returned in order of input items.
+    """
+
+    def __init__(self, stages, queue_size=2):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.wall_time = 0
+
+    def run(self, items, pipelined=True):
+        for stage in self.stages:
+            stage.reset()
+        start = perf_counter()
+        try:
+            if not pipelined:
+                for item in items:
+                    for stage in self.stages:
+                        item = stage(item)
+                    yield item
+            else:
+                yield from self._run_pipelined(items)
+        finally:
+            self.wall_time = perf_counter() - start
+
+    def _run_pipelined(self, items):
+        stop = threading.Event()
+        errors = []
+        queues = [Queue(self.queue_size) for _ in range(len(self.stages) + 1)]
+
+        def put(queue, value):
+            while not stop.is_set():
+                try:
+                    queue.put(value, timeout=_POLL_INTERVAL)
+                    return True
+                except Full:
+                    continue
+            return False
+
+        def get(queue):
+            while not stop.is_set():
+                try:
+                    return queue.get(timeout=_POLL_INTERVAL)
+                except Empty:
+                    continue
+            return _END
+
+        def read():
+            try:
+                for item_id, item in enumerate(items):
+                    if not put(queues[0], (item_id, item)):
+                        return
+            except Exception as error:  # pylint: disable=W0703
+                errors.append(error)
+                stop.set()
+            for _ in range(self.stages[0].num_workers):
+                put(queues[0], _END)
+
+        finished_workers = [0] * len(self.stages)
+        finished_lock = threading.Lock()
+
+        def work(stage_id):
+            stage = self.stages[stage_id]
+            while True:
+                task = get(queues[stage_id])
+                if task is _END:
+                    break
+                item_id, item = task
+                try:
+                    result = stage(item)
+                except Exception as error:  # pylint: disable=W0703
+                    errors.append(error)
+                    stop.set()
+                    return
+                if not put(queues[stage_id + 1], (item_id, result)):
+                    return
+            with finished_lock:
+                finished_workers[stage_id] += 1
+                last_worker = finished_workers[stage_id] == stage.num_workers
+            if last_worker:
+                next_workers = self.stages[stage_id + 1].num_workers if stage_id + 1 < len(self.stages) else 1
+                for _ in range(next_workers):
+                    put(queues[stage_id + 1], _END)
+
+        threads = [threading.Thread(target=read, daemon=True)]
+        for stage_id, stage in enumerate(self.stages):
+            threads.extend(
+                threading.Thread(target=work, args=(stage_id, ), daemon=True) for _ in range(stage.num_workers)
+            )
+        for thread in threads:
+            thread.start()
+        try:
+            ready, next_id = {}, 0
+            while True:
+                task = get(queues[-1])
+                if task is _END:
+                    break
+                item_id, result = task
+                ready[item_id] = result
+                while next_id in ready:
+                    yield ready.pop(next_id)
+                    next_id += 1
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+        if errors:
+            raise errors[0]
+
+    def stage_statistics(self):
+        statistics = OrderedDict()
+        for stage in self.stages:
+            utilization = stage.busy_time / (self.wall_time * stage.num_workers) if self.wall_time else 0
+            statistics[stage.name] = OrderedDict([
+                ('processed', stage.processed), ('busy_time', stage.busy_time), ('utilization', utilization)
+            ])
+        return statistics
+
+    def print_statistics(self):
+        print_info('Pipeline stages utilization (wall time {:.2f} s):'.format(self.wall_time))
+        for name, statistics in self.stage_statistics().items():
+            print_info('\t{}: {} processed, busy {:.2f} s, utilization {:.2f}%'.format(
+                name, statistics['processed'], statistics['busy_time'], statistics['utilization'] * 100
+            ))
@@ -15,6 +15,7 @@ limitations under the License.
 """
 from pathlib import Path
 from collections import OrderedDict
+from itertools import count
 import numpy as np
 
 from ..base_evaluator import BaseEvaluator
@@ -26,6 +27,7 @@ from ...logging import print_info
 from ...metrics import MetricsExecutor
 from ...preprocessor import PreprocessingExecutor
 from ...representation import CharacterRecognitionPrediction
+from .batched_decoding import BatchedGreedyDecoder
 
 
 class Im2latexEvaluator(BaseEvaluator):
@@ -64,18 +66,25 @@ class Im2latexEvaluator(BaseEvaluator):
         if progress_reporter:
             progress_reporter.reset(self.dataset.size)
         self.dataset_meta = self.dataset.metadata
-        for batch_id, (_, batch_annotation, batch_inputs, batch_identifiers) in enumerate(self.dataset):
-
-            batch_inputs = self.preprocessing_executor.process(batch_inputs, batch_annotation)
-            batch_inputs, _ = extract_image_representations(batch_inputs)
-            batch_prediction = self.model.predict(batch_identifiers, batch_inputs)
-            batch_prediction = [CharacterRecognitionPrediction(
-                label=batch_prediction, identifier=batch_annotation[0].identifier)]
-            self._annotations.extend(batch_annotation)
-            self._predictions.extend(batch_prediction)
+        annotations = {}
+        annotation_ids = count()
+
+        def encoded_samples():
+            for _, batch_annotation, batch_inputs, _ in self.dataset:
+                batch_inputs = self.preprocessing_executor.process(batch_inputs, batch_annotation)
+                batch_inputs, _ = extract_image_representations(batch_inputs)
+                for annotation, input_data in zip(batch_annotation, batch_inputs):
+                    annotation_id = next(annotation_ids)
+                    annotations[annotation_id] = annotation
+                    yield annotation_id, self.model.encode(input_data)
+
+        for sample_id, (annotation_id, phrase) in enumerate(self.model.decode(encoded_samples())):
+            annotation = annotations.pop(annotation_id)
+            self._annotations.append(annotation)
+            self._predictions.append(CharacterRecognitionPrediction(label=phrase, identifier=annotation.identifier))
 
             if progress_reporter:
-                progress_reporter.update(batch_id, len(batch_inputs))
+                progress_reporter.update(sample_id, 1)
                 if compute_intermediate_metric_res and progress_reporter.current % metric_interval == 0:
                     self.compute_metrics(print_results=True, ignore_results_formatting=ignore_results_formatting)
 
@@ -265,6 +274,11 @@ class SequentialModel:
         self.sos_index = 0
         self.eos_index = 2
         self.max_seq_len = int(network_info['max_seq_len'])
+        self.decoder_batch_size = int(network_info.get('decoder_batch_size', 1))
+        self.recognizer_decoder.set_batch(self.decoder_batch_size)
+        self.decoder = BatchedGreedyDecoder(
+            self._decoder_step, self.decoder_batch_size, self.max_seq_len, self.eos_index, 'tgt'
+        )
 
     def get_phrase(self, indices):
         res = ''
@@ -275,40 +289,30 @@ class SequentialModel:
                 return res.strip()
         return res.strip()
 
+    def encode(self, input_data):
+        input_data = np.transpose(np.array([input_data]), (0, 3, 1, 2))
+        enc_res = self.recognizer_encoder.predict(inputs={'imgs': input_data})
+        return {
+            'row_enc_out': enc_res['row_enc_out'], 'dec_st_h': enc_res['hidden'], 'dec_st_c': enc_res['context'],
+            'output_prev': enc_res['init_0'], 'tgt': np.array([[self.sos_index]])
+        }
+
+    def _decoder_step(self, states):
+        dec_res = self.recognizer_decoder.predict(inputs=states)
+        return dec_res['logit'], {
+            'dec_st_h': dec_res['dec_st_h_t'], 'dec_st_c': dec_res['dec_st_c_t'], 'output_prev': dec_res['output']
+        }
+
+    def decode(self, encoded_samples):
+        """
+        Decodes encoded samples in batches of decoder_batch_size, yields (key, phrase) in order of decoding finish.
+        """
+        for key, targets, _ in self.decoder.decode(encoded_samples):
+            yield key, self.get_phrase(targets)
+
     def predict(self, identifiers, input_data):
         assert len(identifiers) == 1
-        input_data = np.array(input_data)
-        input_data = np.transpose(input_data, (0, 3, 1, 2))
-        enc_res = self.recognizer_encoder.predict(
-            inputs={'imgs': input_data})
-        row_enc_out = enc_res['row_enc_out']
-        dec_states_h = enc_res['hidden']
-        dec_states_c = enc_res['context']
-        O_t = enc_res['init_0']
-
-        tgt = np.array([[self.sos_index]])
-        logits = []
-        for _ in range(self.max_seq_len):
-
-            dec_res = self.recognizer_decoder.predict(inputs={'row_enc_out': row_enc_out,
-                                                              'dec_st_c': dec_states_c, 'dec_st_h': dec_states_h,
-                                                              'output_prev': O_t, 'tgt': tgt
-                                                              })
-
-            dec_states_h = dec_res['dec_st_h_t']
-            dec_states_c = dec_res['dec_st_c_t']
-            O_t = dec_res['output']
-            logit = dec_res['logit']
-            logits.append(logit)
-            tgt = np.array([[np.argmax(np.array(logit), axis=1)]])
-
-            if tgt[0][0][0] == self.eos_index:
-                break
-
-        logits = np.array(logits)
-        logits = logits.squeeze(axis=1)
-        targets = np.argmax(logits, axis=1)
-        result_phrase = self.get_phrase(targets)
+        _, result_phrase = next(self.decode([(identifiers[0], self.encode(input_data[0]))]))
         return result_phrase
 
     def reset(self):
@@ -322,6 +326,8 @@ class SequentialModel:
 class RecognizerDLSDKModel(BaseModel):
     def __init__(self, network_info, launcher, suffix):
         super().__init__(network_info, launcher, suffix)
+        self.launcher = launcher
+        self.network = None
         model, weights = self.automatic_model_search(network_info)
         if weights is not None:
             self.network = launcher.read_network(str(model), str(weights))
@@ -333,5 +339,17 @@ class RecognizerDLSDKModel(BaseModel):
     def predict(self, inputs, identifiers=None):
         return self.exec_network.infer(inputs)
 
+    def set_batch(self, batch_size):
+        if hasattr(self.exec_network, 'input_info'):
+            input_shapes = {name: data.input_data.shape for name, data in self.exec_network.input_info.items()}
+        else:
+            input_shapes = {name: data.shape for name, data in self.exec_network.inputs.items()}
+        if all(shape[0] == batch_size for shape in input_shapes.values()):
+            return
+        if self.network is None:
+            raise ConfigError('{} batch can not be changed for compiled blob'.format(self.default_model_suffix))
+        self.network.reshape({name: [batch_size, *shape[1:]] for name, shape in input_shapes.items()})
+        self.exec_network = self.launcher.ie_core.load_network(self.network, self.launcher.device)
+
     def release(self):
         del self.exec_network
@@ -31,6 +31,7 @@ from ...utils import extract_image_representations, read_pickle, contains_any, g
 from ...config import ConfigError
 from ...progress_reporters import ProgressReporter
 from ...logging import print_info
+from .cascade_pipeline import CascadePipeline, PipelineStage
 
 
 def build_stages(models_info, preprocessors_config, launcher, model_args, delayed_model_loading=False):
@@ -607,6 +608,10 @@ class MTCNNEvaluator(BaseEvaluator):
     ):
         self.dataset_config = dataset_config
         self.stages = stages
+        self.pipeline = CascadePipeline([
+            PipelineStage(name, partial(self._run_stage, stage), skip=lambda item: item['no_detections'])
+            for name, stage in stages.items()
+        ])
         self.launcher = launcher
         self.dataset = None
         self.postprocessor = None
@@ -623,8 +628,6 @@ class MTCNNEvaluator(BaseEvaluator):
             dump_prediction_to_annotation=False,
             calculate_metrics=True,
             **kwargs):
-        def no_detections(batch_pred):
-            return batch_pred[0].size == 0
         self._prepare_dataset(dataset_tag)
         self._create_subset(subset, num_images, allow_pairwise_subset)
         _progress_reporter = self._prepare_progress_reporter(check_progress, kwargs.get('progress_reporter'))
@@ -633,28 +636,28 @@ class MTCNNEvaluator(BaseEvaluator):
             metric_interval = kwargs.get('metrics_interval', 1000)
             ignore_results_formatting = kwargs.get('ignore_results_formatting', False)
 
-        for batch_id, (batch_input_ids, batch_annotation, batch_inputs, batch_identifiers) in enumerate(self.dataset):
-            batch_prediction = []
-            batch_raw_prediction = []
-            intermediate_callback = None
-            if output_callback:
-                intermediate_callback = partial(output_callback,
-                                                metrics_result=None,
-                                                element_identifiers=batch_identifiers,
-                                                dataset_indices=batch_input_ids)
-            batch_size = 1
-            for stage in self.stages.values():
-                previous_stage_predictions = batch_prediction
-                filled_inputs, batch_meta = stage.preprocess_data(
-                    copy.deepcopy(batch_inputs), batch_annotation, previous_stage_predictions
-                )
-                batch_raw_prediction = stage.predict(filled_inputs, batch_meta, intermediate_callback)
-                batch_size = np.shape(next(iter(filled_inputs[0].values())))[0]
-                batch_prediction = stage.postprocess_result(
-                    batch_identifiers, batch_raw_prediction, batch_meta, previous_stage_predictions
-                )
-                if no_detections(batch_prediction):
-                    break
+        def dataset_items():
+            for batch_input_ids, batch_annotation, batch_inputs, batch_identifiers in self.dataset:
+                intermediate_callback = None
+                if output_callback:
+                    intermediate_callback = partial(output_callback,
+                                                    metrics_result=None,
+                                                    element_identifiers=batch_identifiers,
+                                                    dataset_indices=batch_input_ids)
+                yield {
+                    'batch_input_ids': batch_input_ids, 'batch_annotation': batch_annotation,
+                    'batch_inputs': batch_inputs, 'batch_identifiers': batch_identifiers,
+                    'batch_prediction': [], 'batch_raw_prediction': [], 'batch_size': 1,
+                    'callback': intermediate_callback, 'no_detections': False
+                }
+
+        # intermediate outputs are collected in order of stages, so stages are not overlapped with output_callback
+        pipelined = output_callback is None
+        items = self.pipeline.run(dataset_items(), pipelined=pipelined)
+        for batch_id, item in enumerate(items):
+            batch_input_ids, batch_annotation = item['batch_input_ids'], item['batch_annotation']
+            batch_identifiers, batch_prediction = item['batch_identifiers'], item['batch_prediction']
+            batch_raw_prediction, batch_size = item['batch_raw_prediction'], item['batch_size']
             batch_annotation, batch_prediction = self.postprocessor.process_batch(batch_annotation, batch_prediction)
             metrics_result = None
             if self.metric_executor:
@@ -680,6 +683,22 @@ class MTCNNEvaluator(BaseEvaluator):
 
         if _progress_reporter:
             _progress_reporter.finish()
+        if pipelined:
+            self.pipeline.print_statistics()
+
+    @staticmethod
+    def _run_stage(stage, item):
+        previous_stage_predictions = item['batch_prediction']
+        filled_inputs, batch_meta = stage.preprocess_data(
+            copy.deepcopy(item['batch_inputs']), item['batch_annotation'], previous_stage_predictions
+        )
+        item['batch_raw_prediction'] = stage.predict(filled_inputs, batch_meta, item['callback'])
+        item['batch_size'] = np.shape(next(iter(filled_inputs[0].values())))[0]
+        item['batch_prediction'] = stage.postprocess_result(
+            item['batch_identifiers'], item['batch_raw_prediction'], batch_meta, previous_stage_predictions
+        )
+        item['no_detections'] = item['batch_prediction'][0].size == 0
+        return item
 
     def compute_metrics(self, print_results=True, ignore_results_formatting=False):
         if self._metrics_results:
@@ -27,6 +27,8 @@ from ...launcher import create_launcher
 from ...utils import contains_all, extract_image_representations, get_path
 from ...progress_reporters import ProgressReporter
 from ...logging import print_info
+from .batched_decoding import BatchedGreedyDecoder
+from .cascade_pipeline import CascadePipeline, PipelineStage
 
 
 def softmax(x):
@@ -44,6 +46,9 @@ class TextSpottingEvaluator(BaseEvaluator):
         self.metric_executor = None
         self.launcher = launcher
         self.model = model
+        self.pipeline = CascadePipeline([
+            PipelineStage('detector', self._detect), PipelineStage('recognizer', self._recognize)
+        ])
         self._metrics_results = []
 
     @classmethod
@@ -84,19 +89,30 @@ class TextSpottingEvaluator(BaseEvaluator):
         if compute_intermediate_metric_res:
             metric_interval = kwargs.get('metrics_interval', 1000)
             ignore_results_formatting = kwargs.get('ignore_results_formatting', False)
-        for batch_id, (batch_input_ids, batch_annotation, batch_inputs, batch_identifiers) in enumerate(self.dataset):
-            batch_inputs = self.preprocessor.process(batch_inputs, batch_annotation)
-            batch_data, batch_meta = extract_image_representations(batch_inputs)
-            temporal_output_callback = None
-            if output_callback:
-                temporal_output_callback = partial(output_callback,
-                                                   metrics_result=None,
-                                                   element_identifiers=batch_identifiers,
-                                                   dataset_indices=batch_input_ids)
 
-            batch_raw_prediction, batch_prediction = self.model.predict(
-                batch_identifiers, batch_data, batch_meta, callback=temporal_output_callback
-            )
+        def dataset_items():
+            for batch_input_ids, batch_annotation, batch_inputs, batch_identifiers in self.dataset:
+                batch_inputs = self.preprocessor.process(batch_inputs, batch_annotation)
+                batch_data, batch_meta = extract_image_representations(batch_inputs)
+                temporal_output_callback = None
+                if output_callback:
+                    temporal_output_callback = partial(output_callback,
+                                                       metrics_result=None,
+                                                       element_identifiers=batch_identifiers,
+                                                       dataset_indices=batch_input_ids)
+                yield {
+                    'batch_input_ids': batch_input_ids, 'batch_annotation': batch_annotation,
+                    'batch_data': batch_data, 'batch_meta': batch_meta, 'batch_identifiers': batch_identifiers,
+                    'callback': temporal_output_callback
+                }
+
+        # intermediate outputs are collected in order of models, so stages are not overlapped with output_callback
+        pipelined = output_callback is None
+        items = self.pipeline.run(dataset_items(), pipelined=pipelined)
+        for batch_id, item in enumerate(items):
+            batch_input_ids, batch_annotation = item['batch_input_ids'], item['batch_annotation']
+            batch_identifiers, batch_meta = item['batch_identifiers'], item['batch_meta']
+            batch_raw_prediction, batch_prediction = item['batch_raw_prediction'], item['batch_prediction']
             batch_annotation, batch_prediction = self.postprocessor.process_batch(
                 batch_annotation, batch_prediction, batch_meta
             )
@@ -125,6 +141,18 @@ class TextSpottingEvaluator(BaseEvaluator):
 
         if _progress_reporter:
             _progress_reporter.finish()
+        if pipelined:
+            self.pipeline.print_statistics()
+
+    def _detect(self, item):
+        item['detector_outputs'] = self.model.detect(item['batch_identifiers'], item['batch_data'])
+        return item
+
+    def _recognize(self, item):
+        item['batch_raw_prediction'], item['batch_prediction'] = self.model.recognize(
+            item['batch_identifiers'], item.pop('detector_outputs'), item['batch_meta'], item['callback']
+        )
+        return item
 
     def compute_metrics(self, print_results=True, ignore_results_formatting=False):
         if self._metrics_results:
@@ -394,6 +422,7 @@ class SequentialModel:
         self.recognizer_encoder_input = 'input'
         self.recognizer_encoder_output = 'output'
         self.max_seq_len = int(network_info['max_seq_len'])
+        self.decoder_batch_size = int(network_info.get('recognizer_decoder_batch_size', 1))
         self.adapter = create_adapter(network_info['adapter'])
         self.alphabet = network_info['alphabet']
         self.sos_index = int(network_info['sos_index'])
@@ -407,57 +436,75 @@ class SequentialModel:
         }
 
     def predict(self, identifiers, input_data, frame_meta, callback):
+        return self.recognize(identifiers, self.detect(identifiers, input_data), frame_meta, callback)
+
+    def detect(self, identifiers, input_data):
         assert len(identifiers) == 1
+        # outputs are copied, so they are not overwritten by the next image while text is recognized
+        return {name: np.copy(output) for name, output in self.detector.predict(identifiers, input_data).items()}
 
-        detector_outputs = self.detector.predict(identifiers, input_data)
+    def recognize(self, identifiers, detector_outputs, frame_meta, callback):
         text_features = detector_outputs[self.detector.text_feats_out]
 
-        texts = []
-        decoder_exec_net = self.recognizer_decoder.exec_network
-        has_info = hasattr(decoder_exec_net, 'input_info')
-        for feature in text_features:
-            encoder_outputs = self.recognizer_encoder.predict(identifiers, {self.recognizer_encoder_input: feature})
-            if callback:
-                callback(encoder_outputs)
-
-            feature = encoder_outputs[self.recognizer_encoder_output]
-            feature = np.reshape(feature, (feature.shape[0], feature.shape[1], -1))
-            feature = np.transpose(feature, (0, 2, 1))
-            if has_info:
-                hidden_shape = decoder_exec_net.input_info[
-                    self.recognizer_decoder_inputs['prev_hidden']
-                ].input_data.shape
-            else:
-                hidden_shape = decoder_exec_net.inputs[self.recognizer_decoder_inputs['prev_hidden']].shape
-            hidden = np.zeros(hidden_shape)
-            prev_symbol_index = np.ones((1,)) * self.sos_index
-
-            text = str()
-
-            confidence = 1.0
-            for _ in range(self.max_seq_len):
-                input_to_decoder = {
-                    self.recognizer_decoder_inputs['prev_symbol']: prev_symbol_index,
-                    self.recognizer_decoder_inputs['prev_hidden']: hidden,
-                    self.recognizer_decoder_inputs['encoder_outputs']: feature}
-                decoder_outputs = self.recognizer_decoder.predict(identifiers, input_to_decoder)
-                if callback:
-                    callback(decoder_outputs)
-                decoder_output = decoder_outputs[self.recognizer_decoder_outputs['symbols_distribution']]
-                softmaxed = softmax(decoder_output[0])
-                prev_symbol_index = np.argmax(decoder_output, axis=1)
-                confidence *= softmaxed[prev_symbol_index]
-                if prev_symbol_index == self.eos_index:
-                    break
-                hidden = decoder_outputs[self.recognizer_decoder_outputs['cur_hidden']]
-                text += self.alphabet[int(prev_symbol_index)]
-            texts.append(text if confidence >= self.confidence_threshold else '')
+        self.recognizer_decoder.set_batch(self.decoder_batch_size, {self._hidden_input: self._hidden_batch_axis})
+        decoder = BatchedGreedyDecoder(
+            partial(self._decoder_step, identifiers, callback), self.decoder_batch_size, self.max_seq_len,
+            self.eos_index, 'prev_symbol'
+        )
+        texts = [''] * len(text_features)
+        encoded_features = (
+            (feature_id, self._encode(identifiers, feature, callback))
+            for feature_id, feature in enumerate(text_features)
+        )
+        for feature_id, symbols, logits in decoder.decode(encoded_features):
+            confidence = np.prod([softmax(logit)[symbol] for symbol, logit in zip(symbols, logits)])
+            if symbols[-1] == self.eos_index:
+                symbols = symbols[:-1]
+            if confidence >= self.confidence_threshold:
+                texts[feature_id] = ''.join(self.alphabet[symbol] for symbol in symbols)
 
         texts = np.array(texts)
         detector_outputs['texts'] = texts
         output = self.adapter.process(detector_outputs, identifiers, frame_meta)
         return detector_outputs, output
 
+    @property
+    def _hidden_input(self):
+        return self.recognizer_decoder_inputs['prev_hidden']
+
+    @property
+    def _hidden_batch_axis(self):
+        # recurrent state of GRU has [num_layers, batch, hidden_size] layout
+        return 1 if len(self.recognizer_decoder.input_shape(self._hidden_input)) == 3 else 0
+
+    def _encode(self, identifiers, feature, callback):
+        encoder_outputs = self.recognizer_encoder.predict(identifiers, {self.recognizer_encoder_input: feature})
+        if callback:
+            callback(encoder_outputs)
+        feature = encoder_outputs[self.recognizer_encoder_output]
+        feature = np.reshape(feature, (feature.shape[0], feature.shape[1], -1))
+        hidden_shape = list(self.recognizer_decoder.input_shape(self._hidden_input))
+        hidden_shape[self._hidden_batch_axis] = 1
+        return {
+            'encoder_outputs': np.transpose(feature, (0, 2, 1)),
+            'prev_hidden': np.moveaxis(np.zeros(hidden_shape), self._hidden_batch_axis, 0),
+            'prev_symbol': np.ones((1,)) * self.sos_index
+        }
+
+    def _decoder_step(self, identifiers, callback, states):
+        input_to_decoder = {
+            self.recognizer_decoder_inputs['prev_symbol']: states['prev_symbol'],
+            self._hidden_input: np.moveaxis(states['prev_hidden'], 0, self._hidden_batch_axis),
+            self.recognizer_decoder_inputs['encoder_outputs']: states['encoder_outputs']
+        }
+        decoder_outputs = self.recognizer_decoder.predict(identifiers, input_to_decoder)
+        if callback:
+            callback(decoder_outputs)
+        hidden = decoder_outputs[self.recognizer_decoder_outputs['cur_hidden']]
+        return decoder_outputs[self.recognizer_decoder_outputs['symbols_distribution']], {
+            'prev_hidden': np.moveaxis(hidden, self._hidden_batch_axis, 0)
+        }
+
     def release(self):
         self.detector.release()
         self.recognizer_encoder.release()
@@ -598,16 +645,40 @@ class RecognizerDLSDKModel(BaseModel):
     def predict(self, identifiers, input_data):
         return self.exec_network.infer(input_data)
 
+    def input_shape(self, input_name):
+        if hasattr(self.exec_network, 'input_info'):
+            return self.exec_network.input_info[input_name].input_data.shape
+        return self.exec_network.inputs[input_name].shape
+
+    def set_batch(self, batch_size, batch_axes=None):
+        batch_axes = batch_axes or {}
+        has_info = hasattr(self.exec_network, 'input_info')
+        input_shapes = {}
+        for name in self.exec_network.input_info if has_info else self.exec_network.inputs:
+            shape = list(self.input_shape(name))
+            batch_axis = batch_axes.get(name, 0)
+            if shape[batch_axis] != batch_size:
+                shape[batch_axis] = batch_size
+                input_shapes[name] = shape
+        if not input_shapes:
+            return
+        if self.network is None:
+            raise ConfigError('{} batch can not be changed for compiled blob'.format(self.default_model_suffix))
+        self.network.reshape(input_shapes)
+        self.exec_network = self.launcher.ie_core.load_network(self.network, self.launcher.device)
+
     def release(self):
         del self.network
         del self.exec_network
 
     def load_model(self, network_info, launcher, log=False):
+        self.launcher = launcher
         model, weights = self.automatic_model_search(network_info)
         if weights is not None:
             self.network = launcher.read_network(str(model), str(weights))
             self.exec_network = launcher.ie_core.load_network(self.network, launcher.device)
         else:
+            self.network = None
             self.exec_network = launcher.ie_core.import_network(str(model))
         if log:
             self.print_input_output_info()
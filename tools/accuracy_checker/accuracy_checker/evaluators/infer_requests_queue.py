@@ -0,0 +1,73 @@
+"""
+Copyright (c) 2018-2021 Intel Corporation
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from collections import OrderedDict
+from queue import Queue, Empty
+from time import perf_counter
+
+from ..logging import warning
+
+
+class InferRequestsQueue:
+    """
+    Keeps track of free and running asynchronous infer requests.
+    Completion callbacks put finished requests to the queue, so the evaluation thread sleeps
+    until at least one request is done instead of polling requests states.
+    """
+    def __init__(self, infer_requests):
+        self.infer_requests_pool = OrderedDict((ir.request_id, ir) for ir in infer_requests)
+        self.free_requests = list(self.infer_requests_pool)
+        self.queued_requests = set()
+        self._completed_requests = Queue()
+        self.completion_times = {}
+        for async_request in self.infer_requests_pool.values():
+            async_request.set_completion_callback(self._completion_callback)
+
+    def _completion_callback(self, status_code, request_id):
+        if status_code:
+            warning('Request {} failed with status code {}'.format(request_id, status_code))
+        self.completion_times[request_id] = perf_counter()
+        self._completed_requests.put(request_id)
+
+    def has_free_requests(self):
+        return bool(self.free_requests)
+
+    def has_queued_requests(self):
+        return bool(self.queued_requests)
+
+    def get_free_request(self):
+        request_id = self.free_requests.pop(0)
+        self.queued_requests.add(request_id)
+        return self.infer_requests_pool[request_id]
+
+    def wait_ready_requests(self):
+        if not self.queued_requests:
+            return []
+        ready_ids = [self._completed_requests.get()]
+        while True:
+            try:
+                ready_ids.append(self._completed_requests.get_nowait())
+            except Empty:
+                break
+        ready_requests = []
+        for request_id in ready_ids:
+            self.queued_requests.discard(request_id)
+            self.free_requests.append(request_id)
+            ready_requests.append(self.infer_requests_pool[request_id])
+        return ready_requests
+
+    def __len__(self):
+        return len(self.infer_requests_pool)
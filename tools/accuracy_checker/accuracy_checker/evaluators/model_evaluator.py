@@ -16,19 +16,27 @@ limitations under the License.
 
 import copy
 import pickle
+import shutil
+from collections import OrderedDict
+from pathlib import Path
 
 from ..utils import get_path, extract_image_representations, is_path
 from ..dataset import Dataset
 from ..launcher import create_launcher, DummyLauncher, InputFeeder, Launcher
-from ..launcher.loaders import StoredPredictionBatch
+from ..launcher.loaders import (
+    StoredPredictionBatch, IndexedLoader, is_prediction_store, create_prediction_store, append_to_prediction_store
+)
 from ..logging import print_info, warning
 from ..metrics import MetricsExecutor
 from ..postprocessor import PostprocessingExecutor
 from ..preprocessor import PreprocessingExecutor
 from ..adapters import create_adapter, Adapter
 from ..config import ConfigError, StringField
-from ..data_readers import BaseReader, DataRepresentation
+from ..data_readers import BaseReader, DataRepresentation, create_identifier_key
+from ..representation.segmentation_representation import segmentation_mask_cache
 from .base_evaluator import BaseEvaluator
+from .infer_requests_queue import InferRequestsQueue
+from .pipeline_benchmark import no_measurement
 
 
 # pylint: disable=W0223
@@ -48,6 +56,9 @@ class ModelEvaluator(BaseEvaluator):
         self._annotations = []
         self._predictions = []
         self._metrics_results = []
+        self._store_predictions_for_merge = False
+        self._unsharded_subset = None
+        self._benchmark = None
 
     @classmethod
     def from_configs(cls, model_config):
@@ -91,6 +102,7 @@ class ModelEvaluator(BaseEvaluator):
             if input_precision:
                 launcher.update_input_configuration(input_feeder.inputs_config)
             preprocessor.input_shapes = launcher.inputs_info_for_meta()
+            dataset.configure_preprocessing_cache(preprocessor)
         postprocessor = PostprocessingExecutor(dataset_config.get('postprocessing'), dataset_name, dataset.metadata)
         metric_dispatcher = MetricsExecutor(dataset_config.get('metrics', []), dataset)
         if metric_dispatcher.profile_metrics:
@@ -187,33 +199,42 @@ class ModelEvaluator(BaseEvaluator):
             dataset_config['name']
         )
 
-    def _get_batch_input(self, batch_annotation, batch_input):
+    def _preprocess_batch(self, batch_input_ids, batch_annotation, batch_input, batch_identifiers):
         batch_input = self.preprocessor.process(batch_input, batch_annotation)
-        _, batch_meta = extract_image_representations(batch_input)
-        filled_inputs = self.input_feeder.fill_inputs(batch_input)
+        return batch_input_ids, batch_annotation, batch_input, batch_identifiers
+
+    def _get_batch_input(self, batch_input, input_buffers=None):
+        with self._measure('input_fill'):
+            _, batch_meta = extract_image_representations(batch_input)
+            filled_inputs = self.input_feeder.fill_inputs(batch_input, input_buffers)
 
         return filled_inputs, batch_meta
 
-    def process_dataset_async(self, stored_predictions, progress_reporter, *args, **kwargs):
-        def completion_callback(status_code, request_id):
-            if status_code:
-                warning('Request {} failed with status code {}'.format(request_id, status_code))
-            queued_irs.remove(request_id)
-            ready_irs.append(request_id)
+    def set_benchmark(self, benchmark):
+        self._benchmark = benchmark
+
+    def _measure(self, stage):
+        return self._benchmark.measure(stage) if self._benchmark is not None else no_measurement()
 
-        def prepare_dataset(store_only_mode):
+    def _iterate_dataset(self):
+        if self._benchmark is None:
+            return self.dataset.iterate(self._preprocess_batch)
+        return self._benchmark.iterate(
+            self.dataset.iterate(self._benchmark.wrap_preprocessing(self._preprocess_batch))
+        )
+
+    def process_dataset_async(self, stored_predictions, progress_reporter, *args, **kwargs):
+        def prepare_dataset():
             if self.dataset.batch is None:
                 self.dataset.batch = self.launcher.batch
             if progress_reporter:
                 progress_reporter.reset(self.dataset.size)
-            if self._is_stored(stored_predictions) and store_only_mode:
-                self._reset_stored_predictions(stored_predictions)
 
         store_only = kwargs.get('store_only', False)
-        prepare_dataset(store_only)
+        prepare_dataset()
 
         if (
-                self.launcher.allow_reshape_input or self.input_feeder.lstm_inputs or
+                getattr(self.launcher, 'allow_reshape_input', False) or self.input_feeder.lstm_inputs or
                 self.preprocessor.has_multi_infer_transformations or
                 self.dataset.multi_infer
         ):
@@ -223,46 +244,55 @@ class ModelEvaluator(BaseEvaluator):
         if (self._is_stored(stored_predictions) or isinstance(self.launcher, DummyLauncher)) and not store_only:
             return self._load_stored_predictions(stored_predictions, progress_reporter)
 
+        self._prepare_predictions_storing(stored_predictions, store_only, kwargs.get('stored_predictions_format'))
         output_callback = kwargs.get('output_callback')
         metric_config = self._configure_metrics(kwargs, output_callback)
         _, compute_intermediate_metric_res, metric_interval, ignore_results_formatting = metric_config
-        dataset_iterator = iter(enumerate(self.dataset))
-        infer_requests_pool = {ir.request_id: ir for ir in self.launcher.get_async_requests()}
-        free_irs = list(infer_requests_pool)
-        queued_irs, ready_irs = [], []
-        for _, async_request in infer_requests_pool.items():
-            async_request.set_completion_callback(completion_callback)
-
-        while free_irs or queued_irs or ready_irs:
-            self._fill_free_irs(free_irs, queued_irs, infer_requests_pool, dataset_iterator)
-            free_irs[:] = []
-
-            if ready_irs:
-                while ready_irs:
-                    ready_ir_id = ready_irs.pop(0)
-                    ready_data = infer_requests_pool[ready_ir_id].get_result()
-                    (batch_id, batch_input_ids, batch_annotation), batch_meta, batch_raw_predictions = ready_data
-                    batch_identifiers = [annotation.identifier for annotation in batch_annotation]
-                    free_irs.append(ready_ir_id)
-                    if stored_predictions:
-                        self.prepare_prediction_to_store(
-                            batch_raw_predictions, batch_identifiers, batch_meta, stored_predictions
+        dataset_iterator = iter(self._iterate_dataset())
+        infer_requests_queue = InferRequestsQueue(self.launcher.get_async_requests())
+        if self._benchmark is not None:
+            self._benchmark.start(self.dataset.batch, len(infer_requests_queue))
+        # inputs are written to preallocated buffers of infer request, so they can be filled only when request is free
+        fill_on_submit = any(
+            getattr(ir, 'input_buffers', None) is not None for ir in infer_requests_queue.infer_requests_pool.values()
+        )
+        next_batch = self._prepare_next_batch(dataset_iterator, not fill_on_submit)
+
+        while infer_requests_queue and (next_batch is not None or infer_requests_queue.has_queued_requests()):
+            # the next batch is read and preprocessed before waiting, while requests are in flight
+            next_batch = self._fill_free_irs(infer_requests_queue, dataset_iterator, next_batch, fill_on_submit)
+
+            for ready_ir in infer_requests_queue.wait_ready_requests():
+                ready_data = ready_ir.get_result()
+                (batch_id, batch_input_ids, batch_annotation), batch_meta, batch_raw_predictions = ready_data
+                batch_identifiers = [annotation.identifier for annotation in batch_annotation]
+                if self._benchmark is not None:
+                    self._benchmark.infer_completed(
+                        ready_ir.request_id, len(batch_identifiers),
+                        infer_requests_queue.completion_times.get(ready_ir.request_id)
+                    )
+                if stored_predictions:
+                    self.prepare_prediction_to_store(
+                        batch_raw_predictions, batch_identifiers, batch_meta, stored_predictions
+                    )
+                if not store_only:
+                    self._process_batch_results(
+                        batch_raw_predictions, batch_annotation, batch_identifiers,
+                        batch_input_ids, batch_meta, False, output_callback)
+
+                if progress_reporter:
+                    progress_reporter.update(batch_id, len(batch_identifiers))
+                    if compute_intermediate_metric_res and progress_reporter.current % metric_interval == 0:
+                        self.compute_metrics(
+                            print_results=True, ignore_results_formatting=ignore_results_formatting
                         )
-                    if not store_only:
-                        self._process_batch_results(
-                            batch_raw_predictions, batch_annotation, batch_identifiers,
-                            batch_input_ids, batch_meta, False, output_callback)
-
-                    if progress_reporter:
-                        progress_reporter.update(batch_id, len(batch_identifiers))
-                        if compute_intermediate_metric_res and progress_reporter.current % metric_interval == 0:
-                            self.compute_metrics(
-                                print_results=True, ignore_results_formatting=ignore_results_formatting
-                            )
 
         if progress_reporter:
             progress_reporter.finish()
+        if self._benchmark is not None:
+            self._benchmark.finish()
 
+        self.dataset.save_image_info_cache()
         if stored_predictions:
             print_info("prediction objects are save to {}".format(stored_predictions))
 
@@ -277,14 +307,21 @@ class ModelEvaluator(BaseEvaluator):
 
         if self.dataset.batch is None:
             self.dataset.batch = self.launcher.batch
-        if store_only and self._is_stored(stored_predictions):
-            self._reset_stored_predictions(stored_predictions)
+        self._prepare_predictions_storing(stored_predictions, store_only, kwargs.get('stored_predictions_format'))
         output_callback = kwargs.get('output_callback')
         metric_config = self._configure_metrics(kwargs, output_callback)
         enable_profiling, compute_intermediate_metric_res, metric_interval, ignore_results_formatting = metric_config
-        for batch_id, (batch_input_ids, batch_annotation, batch_input, batch_identifiers) in enumerate(self.dataset):
-            filled_inputs, batch_meta = self._get_batch_input(batch_annotation, batch_input)
+        dataset_iterator = self._iterate_dataset()
+        input_buffers = self.launcher.input_buffers()
+        if self._benchmark is not None:
+            self._benchmark.start(self.dataset.batch)
+        for batch_id, (batch_input_ids, batch_annotation, batch_input, batch_identifiers) in dataset_iterator:
+            filled_inputs, batch_meta = self._get_batch_input(batch_input, input_buffers)
+            if self._benchmark is not None:
+                self._benchmark.infer_submitted(0)
             batch_predictions = self.launcher.predict(filled_inputs, batch_meta, **kwargs)
+            if self._benchmark is not None:
+                self._benchmark.infer_completed(0, len(batch_identifiers))
             if stored_predictions:
                 self.prepare_prediction_to_store(batch_predictions, batch_identifiers, batch_meta, stored_predictions)
             if not store_only:
@@ -299,7 +336,10 @@ class ModelEvaluator(BaseEvaluator):
 
         if progress_reporter:
             progress_reporter.finish()
+        if self._benchmark is not None:
+            self._benchmark.finish()
 
+        self.dataset.save_image_info_cache()
         if stored_predictions:
             print_info("prediction objects are save to {}".format(stored_predictions))
         return self._annotations, self._predictions
@@ -309,19 +349,22 @@ class ModelEvaluator(BaseEvaluator):
             enable_profiling=False, output_callback=None):
         if self.adapter:
             self.adapter.output_blob = self.adapter.output_blob or self.launcher.output_blob
-            batch_predictions = self.adapter.process(batch_predictions, batch_identifiers, batch_meta)
+            with self._measure('adapter'):
+                batch_predictions = self.adapter.process(batch_predictions, batch_identifiers, batch_meta)
 
-        annotations, predictions = self.postprocessor.process_batch(
-            batch_annotations, batch_predictions, batch_meta
-        )
-        _, profile_result = self.metric_executor.update_metrics_on_batch(
-            batch_input_ids, annotations, predictions, enable_profiling
-        )
+        with self._measure('postprocess'):
+            annotations, predictions = self.postprocessor.process_batch(
+                batch_annotations, batch_predictions, batch_meta
+            )
+        with self._measure('metric_update'):
+            _, profile_result = self.metric_executor.update_metrics_on_batch(
+                batch_input_ids, annotations, predictions, enable_profiling
+            )
         if output_callback:
             callback_kwargs = {'profiling_result': profile_result} if enable_profiling else {}
             output_callback(annotations, predictions, **callback_kwargs)
 
-        if self.metric_executor.need_store_predictions:
+        if self.metric_executor.need_store_predictions or self._store_predictions_for_merge:
             self._annotations.extend(annotations)
             self._predictions.extend(predictions)
 
@@ -331,12 +374,14 @@ class ModelEvaluator(BaseEvaluator):
             return False
 
         try:
-            get_path(stored_predictions)
+            get_path(stored_predictions, file_or_directory=True)
             return True
         except OSError:
             return False
 
     def _load_stored_predictions(self, stored_predictions, progress_reporter):
+        if not isinstance(self.launcher, DummyLauncher) and is_prediction_store(stored_predictions):
+            return self._replay_prediction_store(stored_predictions, progress_reporter)
         predictions = self.load(stored_predictions, progress_reporter)
         annotations = self.dataset.annotation
         if self.postprocessor.has_processors:
@@ -352,19 +397,111 @@ class ModelEvaluator(BaseEvaluator):
 
         return annotations, predictions
 
-    def _fill_free_irs(self, free_irs, queued_irs, infer_requests_pool, dataset_iterator):
-        for ir_id in free_irs:
-            try:
-                batch_id, (batch_input_ids, batch_annotation, batch_input, _) = next(dataset_iterator)
-            except StopIteration:
-                break
+    def _replay_prediction_store(self, stored_predictions, progress_reporter):
+        """
+        Processes predictions from indexed store batch by batch, so only one stored batch is loaded at once.
+        Only predictions for current dataset (or its subset) are read.
+        """
 
-            batch_input, batch_meta = self._get_batch_input(batch_annotation, batch_input)
-            self.launcher.predict_async(infer_requests_pool[ir_id], batch_input, batch_meta,
-                                        context=tuple([batch_id, batch_input_ids, batch_annotation]))
-            queued_irs.append(ir_id)
+        loader = IndexedLoader(stored_predictions, adapter=self.adapter)
+        annotations = self.dataset.annotation
+        annotation_ids = OrderedDict(
+            (create_identifier_key(annotation.identifier), idx) for idx, annotation in enumerate(annotations)
+        )
+        if progress_reporter:
+            progress_reporter.reset(len(annotations))
+        dataset_processing = self.postprocessor.has_dataset_processors
+        store_results = self.metric_executor.need_store_predictions or dataset_processing
+        processed_ids = []
+        for batch_id, (batch_keys, batch_predictions) in enumerate(loader.iterate(annotation_ids)):
+            batch_input_ids = [annotation_ids[key] for key in batch_keys]
+            batch_annotations = [annotations[idx] for idx in batch_input_ids]
+            if self.postprocessor.has_processors:
+                self.dataset.provide_data_info(batch_annotations, save_cache=False)
+                batch_annotations, batch_predictions = self.postprocessor.process_batch(
+                    batch_annotations, batch_predictions
+                )
+            if not dataset_processing:
+                self.metric_executor.update_metrics_on_batch(batch_input_ids, batch_annotations, batch_predictions)
+            if store_results:
+                processed_ids.extend(batch_input_ids)
+                self._annotations.extend(batch_annotations)
+                self._predictions.extend(batch_predictions)
+            if progress_reporter:
+                progress_reporter.update(batch_id, len(batch_input_ids))
+        self.dataset.save_image_info_cache()
+        if dataset_processing:
+            self._annotations, self._predictions = self.postprocessor.process_dataset(
+                self._annotations, self._predictions
+            )
+            self.metric_executor.update_metrics_on_batch(processed_ids, self._annotations, self._predictions)
+        if progress_reporter:
+            progress_reporter.finish()
 
-        return free_irs, queued_irs
+        return self._annotations, self._predictions
+
+    def _prepare_next_batch(self, dataset_iterator, fill_inputs=True):
+        try:
+            batch_id, (batch_input_ids, batch_annotation, batch_input, _) = next(dataset_iterator)
+        except StopIteration:
+            return None
+        batch_meta = None
+        if fill_inputs:
+            batch_input, batch_meta = self._get_batch_input(batch_input)
+        return batch_id, batch_input_ids, batch_annotation, batch_input, batch_meta
+
+    def _fill_free_irs(self, infer_requests_queue, dataset_iterator, next_batch, fill_on_submit=False):
+        while next_batch is not None and infer_requests_queue.has_free_requests():
+            batch_id, batch_input_ids, batch_annotation, batch_input, batch_meta = next_batch
+            free_ir = infer_requests_queue.get_free_request()
+            if fill_on_submit:
+                batch_input, batch_meta = self._get_batch_input(batch_input, getattr(free_ir, 'input_buffers', None))
+            if self._benchmark is not None:
+                self._benchmark.infer_submitted(free_ir.request_id)
+            self.launcher.predict_async(free_ir, batch_input, batch_meta,
+                                        context=tuple([batch_id, batch_input_ids, batch_annotation]))
+            next_batch = self._prepare_next_batch(dataset_iterator, not fill_on_submit)
+
+        return next_batch
+
+    def select_shard(self, shard_id, num_shards):
+        """
+        Restricts evaluation to contiguous part of dataset for processing it in separated process.
+        """
+
+        self._unsharded_subset = self.dataset.subset
+        data_ids = list(self._unsharded_subset or range(self.dataset.size))
+        shard_size, remainder = divmod(len(data_ids), num_shards)
+        start = shard_id * shard_size + min(shard_id, remainder)
+        end = start + shard_size + int(shard_id < remainder)
+        self.dataset.make_subset(ids=data_ids[start:end])
+        # results of the first shard are merged in place, others are sent to it
+        self._store_predictions_for_merge = shard_id > 0 and not self.metric_executor.supports_partial_state
+
+    def get_partial_state(self):
+        return {
+            'metrics': self.metric_executor.get_partial_state(),
+            'annotations': self._annotations,
+            'predictions': self._predictions
+        }
+
+    def merge_partial_states(self, partial_states):
+        """
+        Merges states of evaluators processed other dataset shards in shards order and restores full dataset.
+        """
+
+        for partial_state in partial_states:
+            self.metric_executor.merge_partial_state(
+                partial_state['metrics'], partial_state['annotations'], partial_state['predictions']
+            )
+            if self.metric_executor.need_store_predictions:
+                self._annotations.extend(partial_state['annotations'])
+                self._predictions.extend(partial_state['predictions'])
+        if self._unsharded_subset:
+            self.dataset.make_subset(ids=self._unsharded_subset)
+        else:
+            self.dataset.reset()
+        self._store_predictions_for_merge = False
 
     def process_single_image(self, image):
         input_data = self._prepare_data_for_single_inference(image)
@@ -458,6 +595,9 @@ class ModelEvaluator(BaseEvaluator):
 
     def prepare_prediction_to_store(self, batch_predictions, batch_identifiers, batch_meta, stored_predictions):
         prediction_to_store = StoredPredictionBatch(batch_predictions, batch_identifiers, batch_meta)
+        if is_prediction_store(stored_predictions):
+            append_to_prediction_store(stored_predictions, prediction_to_store)
+            return
         self.store_predictions(stored_predictions, prediction_to_store)
 
     @property
@@ -496,8 +636,21 @@ class ModelEvaluator(BaseEvaluator):
         with open(stored_predictions, "ab") as content:
             pickle.dump(predictions, content)
 
+    def _prepare_predictions_storing(self, stored_predictions, store_only, stored_predictions_format=None):
+        if not stored_predictions:
+            return
+        if stored_predictions_format == 'indexed':
+            if self._is_stored(stored_predictions):
+                print_info("File {} will be cleared for storing predictions".format(stored_predictions))
+            create_prediction_store(stored_predictions)
+            return
+        if store_only and self._is_stored(stored_predictions):
+            self._reset_stored_predictions(stored_predictions)
+
     @staticmethod
     def _reset_stored_predictions(stored_predictions):
+        if Path(stored_predictions).is_dir():
+            shutil.rmtree(str(stored_predictions))
         with open(stored_predictions, 'wb'):
             print_info("File {} will be cleared for storing predictions".format(stored_predictions))
 
@@ -519,7 +672,9 @@ class ModelEvaluator(BaseEvaluator):
         self._predictions = []
         self._metrics_results = []
         self.dataset.reset(self.postprocessor.has_processors)
+        segmentation_mask_cache.clear()
 
     def release(self):
         self.input_feeder.release()
         self.launcher.release()
+        segmentation_mask_cache.clear()
@@ -0,0 +1,207 @@
+"""
+Copyright (c) 2018-2021 Intel Corporation
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from csv import DictWriter
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+from ..logging import print_info
+from ..utils import check_file_existence
+
+BENCHMARK_STAGES = ['read', 'preprocess', 'input_fill', 'infer', 'adapter', 'postprocess', 'metric_update']
+PERCENTILES = [50, 90, 99]
+
+
+@contextmanager
+def no_measurement():
+    yield
+
+
+class PipelineBenchmark:
+    """
+    Collects per batch durations of evaluation pipeline stages and launcher utilization.
+    Infer latency in async mode is measured from request submission till its completion callback.
+    Launcher is considered busy while at least one infer request is in flight.
+    """
+
+    def __init__(self):
+        self.durations = OrderedDict((stage, []) for stage in BENCHMARK_STAGES)
+        self.batch = None
+        self.num_requests = 1
+        self.num_images = 0
+        self._start_time = None
+        self._end_time = None
+        self._submit_time = {}
+        self._infer_intervals = []
+        self._preprocessing = threading.local()
+
+    def start(self, batch=None, num_requests=1):
+        self.batch = batch
+        self.num_requests = num_requests
+        self._start_time = perf_counter()
+
+    def finish(self):
+        self._end_time = perf_counter()
+
+    def add(self, stage, duration):
+        self.durations[stage].append(duration)
+
+    @contextmanager
+    def measure(self, stage):
+        start = perf_counter()
+        yield
+        self.add(stage, perf_counter() - start)
+
+    def wrap_preprocessing(self, process_batch):
+        def measured_process_batch(*args, **kwargs):
+            start = perf_counter()
+            result = process_batch(*args, **kwargs)
+            duration = perf_counter() - start
+            self.add('preprocess', duration)
+            self._preprocessing.duration = getattr(self._preprocessing, 'duration', 0) + duration
+            return result
+
+        return measured_process_batch
+
+    def iterate(self, dataset_iterator):
+        """
+        Yields batches of dataset iterator measuring time of waiting for the next batch.
+        Preprocessing done in the same thread is excluded from reading time.
+        """
+        dataset_iterator = iter(dataset_iterator)
+        while True:
+            self._preprocessing.duration = 0
+            start = perf_counter()
+            try:
+                batch = next(dataset_iterator)
+            except StopIteration:
+                return
+            self.add('read', max(perf_counter() - start - self._preprocessing.duration, 0))
+            yield batch
+
+    def infer_submitted(self, request_id):
+        self._submit_time[request_id] = perf_counter()
+
+    def infer_completed(self, request_id, batch_size, complete_time=None):
+        complete_time = complete_time or perf_counter()
+        submit_time = self._submit_time.pop(request_id)
+        self.add('infer', complete_time - submit_time)
+        self._infer_intervals.append((submit_time, complete_time))
+        self.num_images += batch_size
+
+    @property
+    def launcher_busy_time(self):
+        busy_time = 0
+        busy_end = None
+        for start, end in sorted(self._infer_intervals):
+            if busy_end is not None and start < busy_end:
+                start = busy_end
+            if end > start:
+                busy_time += end - start
+            busy_end = end if busy_end is None else max(busy_end, end)
+        return busy_time
+
+    @property
+    def wall_time(self):
+        if self._start_time is None:
+            return 0
+        return (self._end_time or perf_counter()) - self._start_time
+
+    @property
+    def throughput(self):
+        return self.num_images / self.wall_time if self.wall_time else 0
+
+    @property
+    def launcher_idle_fraction(self):
+        return max(1 - self.launcher_busy_time / self.wall_time, 0) if self.wall_time else 0
+
+    def stage_statistics(self):
+        statistics = OrderedDict()
+        for stage, durations in self.durations.items():
+            if not durations:
+                continue
+            durations_ms = np.array(durations) * 1000
+            stage_stat = OrderedDict([('count', len(durations)), ('mean_ms', float(np.mean(durations_ms)))])
+            for percentile, value in zip(PERCENTILES, np.percentile(durations_ms, PERCENTILES)):
+                stage_stat['p{}_ms'.format(percentile)] = float(value)
+            stage_stat['total_s'] = float(np.sum(durations))
+            stage_stat['wall_time_fraction'] = stage_stat['total_s'] / self.wall_time if self.wall_time else 0
+            statistics[stage] = stage_stat
+        return statistics
+
+    def summary(self):
+        return OrderedDict([
+            ('batch', self.batch), ('num_requests', self.num_requests), ('num_images', self.num_images),
+            ('wall_time_s', self.wall_time), ('throughput_fps', self.throughput),
+            ('launcher_idle_fraction', self.launcher_idle_fraction)
+        ])
+
+    def print_report(self):
+        print_info('Benchmark results (batch: {}, infer requests: {}):'.format(self.batch, self.num_requests))
+        print_info('{:<15}{:>8}{:>12}{:>12}{:>12}{:>12}{:>12}'.format(
+            'stage', 'count', 'mean, ms', 'p50, ms', 'p90, ms', 'p99, ms', 'total, s'
+        ))
+        for stage, stat in self.stage_statistics().items():
+            print_info('{:<15}{:>8}{:>12.3f}{:>12.3f}{:>12.3f}{:>12.3f}{:>12.3f}'.format(
+                stage, stat['count'], stat['mean_ms'], stat['p50_ms'], stat['p90_ms'], stat['p99_ms'], stat['total_s']
+            ))
+        print_info('throughput: {:.2f} FPS'.format(self.throughput))
+        print_info('launcher idle: {:.2f}%'.format(self.launcher_idle_fraction * 100))
+
+    def write_csv(self, csv_file, processing_info):
+        new_file = not check_file_existence(csv_file)
+        main_info = benchmark_processing_info(processing_info)
+        summary = self.summary()
+        stage_fields = ['stage', 'count', 'mean_ms'] + ['p{}_ms'.format(p) for p in PERCENTILES]
+        field_names = list(main_info) + stage_fields + ['total_s', 'wall_time_fraction'] + list(summary)
+        with open(str(csv_file), 'a+', newline='') as content:
+            writer = DictWriter(content, fieldnames=field_names)
+            if new_file:
+                writer.writeheader()
+            for stage, stat in self.stage_statistics().items():
+                writer.writerow({**main_info, 'stage': stage, **stat, **summary})
+
+    def write_json(self, json_file, processing_info):
+        results = []
+        if check_file_existence(json_file):
+            with open(str(json_file)) as content:
+                results = json.load(content)
+        results.append({
+            **benchmark_processing_info(processing_info), **self.summary(), 'stages': self.stage_statistics()
+        })
+        with open(str(json_file), 'w') as content:
+            json.dump(results, content, indent=4)
+
+
+def benchmark_processing_info(processing_info):
+    model, launcher, device, tags, dataset = processing_info
+    return OrderedDict([
+        ('model', model), ('launcher', launcher), ('device', device.upper()),
+        ('tags', ' '.join(tags) if tags else ''), ('dataset', dataset)
+    ])
+
+
+def benchmark_result_files(csv_result):
+    csv_result = Path(csv_result)
+    return tuple(
+        csv_result.parent / '{}_benchmark{}'.format(csv_result.stem, extension) for extension in ['.csv', '.json']
+    )
@@ -29,6 +29,7 @@ from ..config import ConfigError
 from ..data_readers import BaseReader, REQUIRES_ANNOTATIONS
 from ..progress_reporters import ProgressReporter
 from .module_evaluator import ModuleEvaluator
+from .infer_requests_queue import InferRequestsQueue
 
 
 def create_model_evaluator(config):
@@ -100,16 +101,10 @@ class ModelEvaluator:
 
             return batch_raw_predictions
 
-        def completion_callback(status_code, request_id):
-            if status_code:
-                warning('Request {} failed with status code {}'.format(request_id, status_code))
-            queued_irs.remove(request_id)
-            ready_irs.append(request_id)
-
         self._prepare_to_evaluation(dataset_tag, dump_prediction_to_annotation)
 
         if (
-                self.launcher.allow_reshape_input or self.input_feeder.lstm_inputs or
+                getattr(self.launcher, 'allow_reshape_input', False) or self.input_feeder.lstm_inputs or
                 self.preprocessor.has_multi_infer_transformations or
                 self.dataset.multi_infer
         ):
@@ -133,56 +128,51 @@ class ModelEvaluator:
             check_progress, self.dataset.size
         )
         dataset_iterator = iter(enumerate(self.dataset))
-        free_irs, queued_irs, ready_irs = [], [], []
-        infer_requests_pool = self._prepare_requests_pool(completion_callback)
-        free_irs = list(infer_requests_pool)
-        while free_irs or queued_irs or ready_irs:
-            self._fill_free_irs(free_irs, queued_irs, infer_requests_pool, dataset_iterator, **kwargs)
-            free_irs[:] = []
-
-            if ready_irs:
-                while ready_irs:
-                    ready_ir_id = ready_irs.pop(0)
-                    ready_data = infer_requests_pool[ready_ir_id].get_result()
-                    (
-                        (batch_id, batch_input_ids, batch_annotation, batch_identifiers),
-                        batch_meta,
-                        batch_raw_predictions,
-                    ) = ready_data
-                    batch_predictions = _process_ready_predictions(
-                        batch_raw_predictions, batch_identifiers, batch_meta
+        infer_requests_queue = InferRequestsQueue(self.launcher.get_async_requests())
+        next_batch = self._prepare_next_batch(dataset_iterator)
+        while infer_requests_queue and (next_batch is not None or infer_requests_queue.has_queued_requests()):
+            next_batch = self._fill_free_irs(infer_requests_queue, dataset_iterator, next_batch)
+
+            for ready_ir in infer_requests_queue.wait_ready_requests():
+                ready_data = ready_ir.get_result()
+                (
+                    (batch_id, batch_input_ids, batch_annotation, batch_identifiers),
+                    batch_meta,
+                    batch_raw_predictions,
+                ) = ready_data
+                batch_predictions = _process_ready_predictions(
+                    batch_raw_predictions, batch_identifiers, batch_meta
+                )
+                annotations, predictions = self.postprocessor.process_batch(
+                    batch_annotation, batch_predictions, batch_meta, dump_prediction_to_annotation
+                )
+                if dump_prediction_to_annotation:
+                    threshold = kwargs.get('annotation_conf_threshold', 0.0)
+                    annotations = []
+                    for prediction in predictions:
+                        generated_annotation = prediction.to_annotation(threshold=threshold)
+                        if generated_annotation:
+                            annotations.append(generated_annotation)
+                    self._dumped_annotations.extend(annotations)
+                metrics_result = None
+                if self.metric_executor and calculate_metrics:
+                    metrics_result, _ = self.metric_executor.update_metrics_on_batch(
+                        batch_input_ids, annotations, predictions
                     )
-                    free_irs.append(ready_ir_id)
-                    annotations, predictions = self.postprocessor.process_batch(
-                        batch_annotation, batch_predictions, batch_meta, dump_prediction_to_annotation
+                    if self.metric_executor.need_store_predictions:
+                        self._annotations.extend(annotations)
+                        self._predictions.extend(predictions)
+
+                if output_callback:
+                    output_callback(
+                        batch_raw_predictions,
+                        metrics_result=metrics_result,
+                        element_identifiers=batch_identifiers,
+                        dataset_indices=batch_input_ids
                     )
-                    if dump_prediction_to_annotation:
-                        threshold = kwargs.get('annotation_conf_threshold', 0.0)
-                        annotations = []
-                        for prediction in predictions:
-                            generated_annotation = prediction.to_annotation(threshold=threshold)
-                            if generated_annotation:
-                                annotations.append(generated_annotation)
-                        self._dumped_annotations.extend(annotations)
-                    metrics_result = None
-                    if self.metric_executor and calculate_metrics:
-                        metrics_result, _ = self.metric_executor.update_metrics_on_batch(
-                            batch_input_ids, annotations, predictions
-                        )
-                        if self.metric_executor.need_store_predictions:
-                            self._annotations.extend(annotations)
-                            self._predictions.extend(predictions)
-
-                    if output_callback:
-                        output_callback(
-                            batch_raw_predictions,
-                            metrics_result=metrics_result,
-                            element_identifiers=batch_identifiers,
-                            dataset_indices=batch_input_ids
-                        )
-
-                    if progress_reporter:
-                        progress_reporter.update(batch_id, len(batch_predictions))
+
+                if progress_reporter:
+                    progress_reporter.update(batch_id, len(batch_predictions))
 
         if dump_prediction_to_annotation:
             self.register_dumped_annotations()
@@ -295,36 +285,24 @@ class ModelEvaluator:
         if progress_reporter:
             progress_reporter.finish()
 
-    @staticmethod
-    def _wait_for_any(irs):
-        if not irs:
-            return [], []
-
-        free_indexes = []
-        for ir_id, (_, _, _, _, _, ir) in enumerate(irs):
-            if ir.wait(0) == 0:
-                free_indexes.append(ir_id)
-        result = []
-        free_indexes.sort(reverse=True)
-        for idx in free_indexes:
-            batch_id, batch_input_ids, batch_annotation, batch_identifiers, batch_meta, ir = irs.pop(idx)
-            result.append((batch_id, batch_input_ids, batch_annotation, batch_identifiers, batch_meta, ir.outputs, ir))
-
-        return result, irs
-
-    def _fill_free_irs(self, free_irs, queued_irs, infer_requests_pool, dataset_iterator, **kwargs):
-        for ir_id in free_irs:
-            try:
-                batch_id, (batch_input_ids, batch_annotation, batch_inputs, batch_identifiers) = next(dataset_iterator)
-            except StopIteration:
-                break
-
-            batch_input, batch_meta = self._get_batch_input(batch_inputs, batch_annotation)
-            self.launcher.predict_async(infer_requests_pool[ir_id], batch_input, batch_meta,
-                                        context=tuple([batch_id, batch_input_ids, batch_annotation, batch_identifiers]))
-            queued_irs.append(ir_id)
-
-        return free_irs, queued_irs
+    def _prepare_next_batch(self, dataset_iterator):
+        try:
+            batch_id, (batch_input_ids, batch_annotation, batch_inputs, batch_identifiers) = next(dataset_iterator)
+        except StopIteration:
+            return None
+        batch_input, batch_meta = self._get_batch_input(batch_inputs, batch_annotation)
+        return batch_id, batch_input_ids, batch_annotation, batch_identifiers, batch_input, batch_meta
+
+    def _fill_free_irs(self, infer_requests_queue, dataset_iterator, next_batch):
+        while next_batch is not None and infer_requests_queue.has_free_requests():
+            batch_id, batch_input_ids, batch_annotation, batch_identifiers, batch_input, batch_meta = next_batch
+            self.launcher.predict_async(
+                infer_requests_queue.get_free_request(), batch_input, batch_meta,
+                context=tuple([batch_id, batch_input_ids, batch_annotation, batch_identifiers])
+            )
+            next_batch = self._prepare_next_batch(dataset_iterator)
+
+        return next_batch
 
     @staticmethod
     def _create_progress_reporter(check_progress, dataset_size):
@@ -334,13 +312,6 @@ class ModelEvaluator:
 
         return ProgressReporter.provide('print', dataset_size, **pr_kwargs)
 
-    def _prepare_requests_pool(self, completion_callback):
-        infer_requests_pool = {ir.request_id: ir for ir in self.launcher.get_async_requests()}
-        for _, async_request in infer_requests_pool.items():
-            async_request.set_completion_callback(completion_callback)
-
-        return infer_requests_pool
-
     def compute_metrics(self, print_results=True, ignore_results_formatting=False):
         if not self.metric_executor:
             return []
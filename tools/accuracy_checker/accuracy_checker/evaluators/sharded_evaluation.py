@@ -0,0 +1,87 @@
+"""
+Copyright (c) 2018-2021 Intel Corporation
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import copy
+import multiprocessing
+
+from ..logging import print_info, warning
+from .model_evaluator import ModelEvaluator
+
+
+def evaluate_shard(config_entry, shard_id, num_shards):
+    """
+    Evaluates dataset shard in worker process and returns state for merging.
+    """
+
+    config_entry = copy.deepcopy(config_entry)
+    for dataset_config in config_entry['datasets']:
+        # cache file is updated by the main process only
+        dataset_config.pop('image_info_cache', None)
+    evaluator = ModelEvaluator.from_configs(config_entry)
+    try:
+        evaluator.select_shard(shard_id, num_shards)
+        evaluator.process_dataset(None, None)
+        return evaluator.get_partial_state()
+    finally:
+        evaluator.release()
+
+
+def sharding_unsupported_reason(evaluator, stored_predictions=None, **kwargs):
+    if not isinstance(evaluator, ModelEvaluator):
+        return 'custom evaluators'
+    if stored_predictions:
+        return 'predictions storing and loading'
+    if kwargs.get('store_only'):
+        return 'predictions storing mode'
+    if kwargs.get('profile') or evaluator.metric_executor.profile_metrics:
+        return 'metric profiling'
+    if kwargs.get('intermediate_metrics_results'):
+        return 'intermediate metrics results'
+    return None
+
+
+def process_dataset_sharded(evaluator, config_entry, num_shards, stored_predictions, progress_reporter, **kwargs):
+    """
+    Splits dataset into contiguous shards, evaluates the first one with given evaluator and the rest
+    in worker processes, then merges metrics states of workers into given evaluator.
+    """
+
+    unsupported_reason = sharding_unsupported_reason(evaluator, stored_predictions, **kwargs)
+    if unsupported_reason:
+        warning('Sharded evaluation is not supported for {}. Dataset will be processed in single process.'.format(
+            unsupported_reason
+        ))
+        num_shards = 1
+    num_shards = min(num_shards, evaluator.dataset_size)
+    if num_shards <= 1:
+        return evaluator.process_dataset(
+            stored_predictions=stored_predictions, progress_reporter=progress_reporter, **kwargs
+        )
+
+    print_info('Dataset is split into {} shards, progress is reported for the first one'.format(num_shards))
+    # spawned workers do not inherit launcher state of the main process
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(num_shards - 1) as pool:
+        workers = [
+            pool.apply_async(evaluate_shard, (config_entry, shard_id, num_shards))
+            for shard_id in range(1, num_shards)
+        ]
+        evaluator.select_shard(0, num_shards)
+        evaluator.process_dataset(stored_predictions=None, progress_reporter=progress_reporter, **kwargs)
+        partial_states = [worker.get() for worker in workers]
+    evaluator.merge_partial_states(partial_states)
+
+    return None
@@ -18,9 +18,10 @@ from collections import OrderedDict
 
 
 class AsyncInferRequestWrapper:
-    def __init__(self, request_id, request, completion_callback=None):
+    def __init__(self, request_id, request, completion_callback=None, input_buffers=None):
         self.request_id = request_id
         self.request = request
+        self.input_buffers = input_buffers
         if completion_callback:
             self.request.set_completion_callback(completion_callback, self.request_id)
         self.context = None
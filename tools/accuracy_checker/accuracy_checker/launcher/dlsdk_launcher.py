@@ -45,7 +45,7 @@ from ..utils import (
 from .launcher import Launcher
 from .model_conversion import convert_model
 from ..logging import print_info
-from .input_feeder import PRECISION_TO_DTYPE, DIM_IDS_TO_LAYOUT
+from .input_feeder import PRECISION_TO_DTYPE, DIM_IDS_TO_LAYOUT, InputBuffers, fill_input_buffer
 try:
     from cpuinfo import get_cpu_info
 except ImportError as import_error:
@@ -107,6 +107,10 @@ class DLSDKLauncher(Launcher):
                             "In multi device mode allows setting comma-separated list for numbers "
                             "or one value which will be used for all devices"
             ),
+            'cpu_streams': NumberField(
+                value_type=int, min_value=1, optional=True,
+                description="Number of CPU throughput streams for async mode. CPU_THROUGHPUT_AUTO is used by default."
+            ),
             '_model_optimizer': PathField(optional=True, is_directory=True, description="Model optimizer."),
             '_tf_obj_detection_api_config_dir': PathField(
                 optional=True, is_directory=True, description="TF Object Detection API Config."
@@ -125,7 +129,12 @@ class DLSDKLauncher(Launcher):
             ),
             '_prev_bitstream': PathField(optional=True, description="path to bitstream from previous run (FPGA only)"),
             '_device_config': PathField(optional=True, description='path to file with device configuration'),
-            '_model_is_blob': BoolField(optional=True, description='hint for auto model search')
+            '_model_is_blob': BoolField(optional=True, description='hint for auto model search'),
+            'preallocate_inputs': BoolField(
+                optional=True, default=False,
+                description="Preallocates input tensors for every infer request, fills them in place "
+                            "and binds them to requests without copying."
+            )
         })
 
         return parameters
@@ -158,6 +167,9 @@ class DLSDKLauncher(Launcher):
         self._use_set_blob = False
         self._output_layouts = dict()
         self.preprocessor = preprocessor
+        self._preallocate_inputs = self.get_value_from_config('preallocate_inputs') and Blob is not None
+        self._input_buffers = {}
+        self._bound_input_buffers = {}
 
         if not delayed_model_loading:
             if dlsdk_launcher_config.need_conversion:
@@ -220,6 +232,8 @@ class DLSDKLauncher(Launcher):
             if self._do_reshape:
                 input_shapes = {layer_name: data.shape for layer_name, data in infer_inputs.items()}
                 self._reshape_input(input_shapes)
+            if self._input_buffers and not self._use_set_blob:
+                infer_inputs = self._bind_input_buffers(self.exec_network.requests[0], 0, infer_inputs)
             if self._use_set_blob:
                 has_info = hasattr(self.exec_network, 'input_info')
                 for key, input_data in infer_inputs.items():
@@ -278,6 +292,8 @@ class DLSDKLauncher(Launcher):
 
     def predict_async(self, ir, inputs, metadata=None, context=None, **kwargs):
         infer_inputs = inputs[0]
+        if self._input_buffers:
+            infer_inputs = self._bind_input_buffers(ir.request, ir.request_id, infer_inputs)
         if metadata is not None:
             for meta_ in metadata:
                 meta_['input_shape'] = self.inputs_info_for_meta()
@@ -286,6 +302,33 @@ class DLSDKLauncher(Launcher):
 
         ir.infer(infer_inputs, metadata, context)
 
+    def input_buffers(self, request_id=0):
+        if not self._preallocate_inputs or self._lstm_inputs or self.allow_reshape_input:
+            return None
+        if request_id not in self._input_buffers:
+            self._input_buffers[request_id] = InputBuffers()
+        return self._input_buffers[request_id]
+
+    def _bind_input_buffers(self, request, request_id, infer_inputs):
+        """
+        Sets preallocated input buffers as request blobs, blob is recreated only when buffer for input is changed.
+        Returns inputs which are not bound and should be copied to request.
+        """
+        input_buffers = self._input_buffers.get(request_id)
+        if input_buffers is None:
+            return infer_inputs
+        not_bound_inputs = {}
+        for layer_name, input_data in infer_inputs.items():
+            if input_data not in input_buffers:
+                not_bound_inputs[layer_name] = input_data
+                continue
+            if self._bound_input_buffers.get((request_id, layer_name)) is not input_data:
+                input_info = self.inputs[layer_name]
+                tensor_desc = TensorDesc(input_info.precision, input_data.shape, input_info.layout)
+                request.set_blob(layer_name, Blob(tensor_desc, input_data))
+                self._bound_input_buffers[(request_id, layer_name)] = input_data
+        return not_bound_inputs
+
     def _is_hetero(self):
         return self._device.startswith(HETERO_KEYWORD)
 
@@ -551,17 +594,24 @@ class DLSDKLauncher(Launcher):
     def async_mode(self, flag):
         if flag:
             if 'CPU' in self._devices_list():
-                self.ie_core.set_config({'CPU_THROUGHPUT_STREAMS': 'CPU_THROUGHPUT_AUTO'}, 'CPU')
+                cpu_streams = self.config.get('cpu_streams')
+                self.ie_core.set_config(
+                    {'CPU_THROUGHPUT_STREAMS': str(cpu_streams) if cpu_streams else 'CPU_THROUGHPUT_AUTO'}, 'CPU'
+                )
             if 'GPU' in self._devices_list():
                 self.ie_core.set_config({'GPU_THROUGHPUT_STREAMS': 'GPU_THROUGHPUT_AUTO'}, 'GPU')
         self._async_mode = flag
 
     def get_async_requests(self):
-        return [AsyncInferRequestWrapper(ireq_id, ireq) for ireq_id, ireq in enumerate(self.exec_network.requests)]
+        return [
+            AsyncInferRequestWrapper(ireq_id, ireq, input_buffers=self.input_buffers(ireq_id))
+            for ireq_id, ireq in enumerate(self.exec_network.requests)
+        ]
 
     def _reshape_input(self, shapes):
         if hasattr(self, 'exec_network'):
             del self.exec_network
+        self._bound_input_buffers = {}
         self.network.reshape(shapes)
         self.exec_network = self.ie_core.load_network(self.network, self.device, num_requests=self._num_requests)
 
@@ -789,6 +839,7 @@ class DLSDKLauncher(Launcher):
     def load_network(self, network=None, log=False, preprocessing=None):
         if hasattr(self, 'exec_network'):
             del self.exec_network
+        self._bound_input_buffers = {}
         if network is None:
             self._create_network()
         else:
@@ -812,6 +863,7 @@ class DLSDKLauncher(Launcher):
         self._print_input_output_info()
         if self.preprocessor:
             self._set_preprocess(self.preprocessor)
+        self._bound_input_buffers = {}
         if self.network:
             self.exec_network = self.ie_core.load_network(
                 self.network, self._device, num_requests=self.num_requests
@@ -835,7 +887,11 @@ class DLSDKLauncher(Launcher):
             if layer_name not in self.const_inputs + self.image_info_inputs
         }
 
-    def fit_to_input(self, data, layer_name, layout, precision):
+    def fit_to_input(self, data, layer_name, layout, precision, input_buffers=None):
+        if input_buffers is not None:
+            input_buffer = self._fill_input_buffer(data, layer_name, layout, precision, input_buffers)
+            if input_buffer is not None:
+                return input_buffer
         layer_shape = tuple(self.inputs[layer_name].shape)
         data = self._data_to_blob(layer_shape, data, layout)
         if precision:
@@ -847,6 +903,20 @@ class DLSDKLauncher(Launcher):
                 return data
         return self._align_data_shape(data, layer_name, layout)
 
+    def _fill_input_buffer(self, data, layer_name, layout, precision, input_buffers):
+        if self._use_set_blob or self.disable_resize_to_input or layer_name in self._preprocess_info:
+            return None
+        input_info = self.inputs[layer_name]
+        dtype = PRECISION_TO_DTYPE.get(input_info.precision)
+        if dtype in [None, str] or (precision is not None and np.dtype(precision) != np.dtype(dtype)):
+            return None
+        input_buffer = input_buffers.get(layer_name, input_info.shape, dtype)
+        if not fill_input_buffer(data, layout, input_buffer):
+            return None
+        if len(data) < input_buffer.shape[0]:
+            warning('data batch {} is not equal model input batch_size {}.'.format(len(data), input_buffer.shape[0]))
+        return input_buffer
+
     @staticmethod
     def _data_to_blob(layer_shape, data, layout): # pylint:disable=R0911
         data_shape = np.shape(data)
@@ -986,6 +1056,8 @@ class DLSDKLauncher(Launcher):
         self.disable_resize_to_input = preprocess.ie_processor.has_resize()
 
     def release(self):
+        self._input_buffers = {}
+        self._bound_input_buffers = {}
         if 'network' in self.__dict__:
             del self.network
         if 'exec_network' in self.__dict__:
@@ -33,7 +33,7 @@ class DummyLauncher(Launcher):
         parameters = super().parameters()
         parameters.update({
             'loader': StringField(choices=Loader.providers, description="Loader."),
-            'data_path': PathField(description="Data path."),
+            'data_path': PathField(file_or_directory=True, description="Data path."),
             'provide_identifiers': BoolField(optional=True, default=False),
             'identifiers_list': PathField(optional=True)
         })
@@ -44,7 +44,7 @@ class DummyLauncher(Launcher):
 
         self.validate_config(config_entry)
         print_info('Predictions objects loading started')
-        self.data_path = get_path(self.get_value_from_config('data_path'))
+        self.data_path = get_path(self.get_value_from_config('data_path'), file_or_directory=True)
         identfiers_file = self.get_value_from_config('identifiers_list')
         if identfiers_file is not None:
             kwargs['identifiers'] = read_txt(identfiers_file)
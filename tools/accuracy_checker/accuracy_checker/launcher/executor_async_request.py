@@ -0,0 +1,102 @@
+"""
+Copyright (c) 2018-2021 Intel Corporation
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+from ..config import ConfigError
+from ..utils import get_or_parse_value
+
+
+def auto_num_requests():
+    cpu_count = multiprocessing.cpu_count()
+    for min_request in [4, 5, 3]:
+        if cpu_count % min_request == 0:
+            return max(min_request, cpu_count // min_request)
+    return max(1, cpu_count // 2)
+
+
+def get_num_requests(num_requests):
+    if num_requests is None or num_requests == 'AUTO':
+        return auto_num_requests()
+    num_requests = get_or_parse_value(num_requests, casting_type=int)
+    if len(num_requests) != 1 or num_requests[0] < 1:
+        raise ConfigError('num_requests should be positive integer or AUTO')
+    return num_requests[0]
+
+
+class ExecutorAsyncInferRequest:
+    """
+    Asynchronous infer request for frameworks without native async API.
+    Inference function is run in executor thread and completion callback is called with status code and request id
+    like for OpenVINO infer request, so requests can be used in InferRequestsQueue instead of AsyncInferRequestWrapper.
+    """
+    def __init__(self, request_id, infer_func, executor, completion_callback=None):
+        self.request_id = request_id
+        self._infer_func = infer_func
+        self._executor = executor
+        self._completion_callback = completion_callback
+        self._outputs = None
+        self._error = None
+        self.context = None
+        self.meta = None
+
+    def infer(self, inputs, meta, context=None):
+        if context:
+            self.context = context
+        self.meta = meta
+        self._outputs = None
+        self._error = None
+        self._executor.submit(self._run, inputs)
+
+    def _run(self, inputs):
+        status_code = 0
+        try:
+            self._outputs = self._infer_func(inputs)
+        except Exception as error:  # pylint: disable=W0703
+            self._error = error
+            status_code = 1
+        if self._completion_callback:
+            self._completion_callback(status_code, self.request_id)
+
+    def get_result(self):
+        if self._error is not None:
+            raise self._error
+        return self.context, self.meta, self._outputs
+
+    def set_completion_callback(self, callback):
+        self._completion_callback = callback
+
+
+class ExecutorAsyncRequests:
+    """
+    Pool of asynchronous requests executed by threads, one thread per request.
+    Every request gets own inference function, so requests can use separate sessions or networks
+    if framework objects can not be used from several threads simultaneously.
+    """
+    def __init__(self, infer_funcs):
+        self._executor = ThreadPoolExecutor(max_workers=len(infer_funcs))
+        self.requests = [
+            ExecutorAsyncInferRequest(request_id, infer_func, self._executor)
+            for request_id, infer_func in enumerate(infer_funcs)
+        ]
+
+    def __len__(self):
+        return len(self.requests)
+
+    def release(self):
+        self._executor.shutdown(wait=True)
+        self.requests = []
@@ -63,6 +63,54 @@ PRECISION_TO_DTYPE = {
 INPUT_TYPES_WITHOUT_VALUE = ['IMAGE_INFO', 'ORIG_IMAGE_INFO', 'IGNORE_INPUT', 'LSTM_INPUT']
 
 
+def fill_input_buffer(data, layout, out):
+    """
+    Writes batch of samples to preallocated input tensor, layout transposition and precision conversion
+    are done during copying of every sample, so stacked, transposed and converted batch copies are not created.
+    If batch is smaller than tensor, the last sample is repeated.
+    Returns False if data can not be placed to tensor without reshaping.
+    """
+    if len(layout) != out.ndim or layout[0] != 0 or not 0 < len(data) <= out.shape[0]:
+        return False
+    sample_layout = [dim - 1 for dim in layout[1:]]
+    samples = [np.asarray(sample) for sample in data]
+    if any(sample.ndim != len(sample_layout) for sample in samples):
+        return False
+    if any(tuple(np.take(sample.shape, sample_layout)) != out.shape[1:] for sample in samples):
+        return False
+    for batch_id in range(out.shape[0]):
+        sample = samples[min(batch_id, len(samples) - 1)]
+        np.copyto(out[batch_id], np.transpose(sample, sample_layout), casting='unsafe')
+
+    return True
+
+
+class InputBuffers:
+    """
+    Preallocated input tensors of one infer request. Tensor is allocated once per input layer, shape and precision
+    and then reused for all batches, so launcher can bind it to infer request only once.
+    """
+    def __init__(self):
+        self._buffers = {}
+
+    def get(self, layer_name, shape, dtype):
+        key = (layer_name, tuple(shape), np.dtype(dtype))
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = np.empty(shape, dtype=dtype)
+            self._buffers[key] = buffer
+        return buffer
+
+    def __contains__(self, data):
+        return any(data is buffer for buffer in self._buffers.values())
+
+    def __len__(self):
+        return len(self._buffers)
+
+    def clear(self):
+        self._buffers = {}
+
+
 class InputFeeder:
     def __init__(
             self, inputs_config, network_inputs, prepare_input_data=None, default_layout='NCHW', dummy=False,
@@ -121,7 +169,7 @@ class InputFeeder:
 
         return image_infos
 
-    def fill_non_constant_inputs(self, data_representation_batch):
+    def fill_non_constant_inputs(self, data_representation_batch, input_buffers=None):
         filled_inputs = {}
         if self.image_info_inputs or self.orig_image_info_inputs:
             image_info_inputs = self._fill_image_info_inputs(data_representation_batch)
@@ -165,12 +213,18 @@ class InputFeeder:
 
             filled_inputs[input_layer] = input_batch
 
-        return self._transform_batch(filled_inputs, extract_image_representations(data_representation_batch)[1])
+        return self._transform_batch(
+            filled_inputs, extract_image_representations(data_representation_batch)[1], input_buffers
+        )
 
-    def fill_inputs(self, data_representation_batch):
+    def fill_inputs(self, data_representation_batch, input_buffers=None):
+        """
+        Prepares inputs for inference. If preallocated input buffers of infer request are provided,
+        launcher may write data directly to them instead of creating new arrays.
+        """
         if self.dummy:
             return []
-        inputs = self.fill_non_constant_inputs(data_representation_batch)
+        inputs = self.fill_non_constant_inputs(data_representation_batch, input_buffers)
         for infer_inputs in inputs:
             infer_inputs.update(self.const_inputs)
         return inputs
@@ -261,7 +315,7 @@ class InputFeeder:
         if input_config['type'] == 'IGNORE_INPUT':
             ignore_inputs.append(name)
 
-    def _transform_batch(self, batch_data, meta):
+    def _transform_batch(self, batch_data, meta, input_buffers=None):
         def calculate_num_splits(layers_data, batch_size):
             max_split_num = 1
             for _, data in layers_data.items():
@@ -297,11 +351,12 @@ class InputFeeder:
                     )
             return infers_data
 
+        transform_kwargs = {'input_buffers': input_buffers} if input_buffers is not None else {}
         for layer_name, layer_data in batch_data.items():
             batch_data[layer_name] = self.input_transform_func(
                 layer_data, layer_name,
                 self.layouts_mapping.get(layer_name, LAYER_LAYOUT_TO_IMAGE_LAYOUT[self.default_layout]),
-                self.precision_mapping.get(layer_name)
+                self.precision_mapping.get(layer_name), **transform_kwargs
             )
 
         return [batch_data]
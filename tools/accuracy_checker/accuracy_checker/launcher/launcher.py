@@ -241,6 +241,13 @@ class Launcher(ClassProvider):
     def predict_async(self, *args, **kwargs):
         raise NotImplementedError('Launcher does not support async mode')
 
+    def input_buffers(self, request_id=0):
+        """
+        Returns preallocated input buffers of infer request which can be filled by input feeder in place,
+        or None if launcher does not support it.
+        """
+        return None
+
     def _provide_inputs_info_to_meta(self, meta):
         meta['input_shape'] = self.inputs
 
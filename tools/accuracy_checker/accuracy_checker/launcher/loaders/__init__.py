@@ -19,12 +19,20 @@ from .loader import Loader, StoredPredictionBatch
 from .pickle_loader import PickleLoader
 from .xml_loader import XMLLoader
 from .json_loader import JSONLoader
+from .indexed_loader import (
+    IndexedLoader, is_prediction_store, create_prediction_store, append_to_prediction_store
+)
 
 __all__ = [
     'Loader',
     'PickleLoader',
     'XMLLoader',
     'JSONLoader',
+    'IndexedLoader',
+
+    'is_prediction_store',
+    'create_prediction_store',
+    'append_to_prediction_store',
 
     'StoredPredictionBatch'
 ]
@@ -0,0 +1,217 @@
+"""
+Copyright (c) 2018-2021 Intel Corporation
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import copy
+import json
+import os
+import pickle
+import shutil
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+
+import numpy as np
+
+from ...data_readers import create_identifier_key
+from ...utils import read_json
+from .loader import Loader
+
+HEADER_FILE = 'header.json'
+INDEX_FILE = 'index.pickle'
+BATCHES_FILE = 'batches.pickle'
+OUTPUTS_FILE = 'outputs.bin'
+FORMAT_VERSION = 1
+ARRAY_ALIGNMENT = 64
+
+StoredArray = namedtuple('StoredArray', ['offset', 'dtype', 'shape'])
+
+
+def is_prediction_store(data_path):
+    return Path(data_path).is_dir() and (Path(data_path) / HEADER_FILE).exists()
+
+
+def create_prediction_store(data_path):
+    """
+    Creates empty indexed prediction store in given directory, previously stored predictions are removed.
+    """
+    data_path = Path(data_path)
+    if data_path.is_dir():
+        shutil.rmtree(str(data_path))
+    elif data_path.exists():
+        data_path.unlink()
+    data_path.mkdir(parents=True)
+    for file_name in [INDEX_FILE, BATCHES_FILE, OUTPUTS_FILE]:
+        with (data_path / file_name).open('wb'):
+            pass
+    with (data_path / HEADER_FILE).open('w') as header_file:
+        json.dump({'format_version': FORMAT_VERSION}, header_file)
+
+
+def _store_arrays(data, content):
+    if isinstance(data, np.ndarray) and data.dtype.kind in 'biufc':
+        end = content.seek(0, os.SEEK_END)
+        padding = -end % ARRAY_ALIGNMENT
+        content.write(b'\0' * padding)
+        array = np.ascontiguousarray(data)
+        content.write(array.tobytes())
+        return StoredArray(end + padding, array.dtype.str, array.shape)
+    if isinstance(data, dict):
+        stored = copy.copy(data)
+        for key, value in data.items():
+            stored[key] = _store_arrays(value, content)
+        return stored
+    if isinstance(data, list):
+        return [_store_arrays(value, content) for value in data]
+    if type(data) is tuple:  # pylint: disable=C0123
+        return tuple(_store_arrays(value, content) for value in data)
+    return data
+
+
+def _restore_arrays(data, outputs):
+    if isinstance(data, StoredArray):
+        if not np.prod(data.shape):
+            return np.empty(data.shape, dtype=data.dtype)
+        return np.ndarray(data.shape, dtype=data.dtype, buffer=outputs, offset=data.offset)
+    if isinstance(data, dict):
+        restored = copy.copy(data)
+        for key, value in data.items():
+            restored[key] = _restore_arrays(value, outputs)
+        return restored
+    if isinstance(data, list):
+        return [_restore_arrays(value, outputs) for value in data]
+    if type(data) is tuple:  # pylint: disable=C0123
+        return tuple(_restore_arrays(value, outputs) for value in data)
+    return data
+
+
+def append_to_prediction_store(data_path, prediction_batch):
+    """
+    Appends StoredPredictionBatch to indexed prediction store.
+    Numeric arrays of raw predictions are written to binary outputs file and replaced by their offsets,
+    so batch record and index entry stay small. Index entry is written last, after all batch data is stored.
+    """
+    data_path = Path(data_path)
+    with (data_path / OUTPUTS_FILE).open('ab') as content:
+        raw_predictions = _store_arrays(prediction_batch.raw_predictions, content)
+    with (data_path / BATCHES_FILE).open('ab') as content:
+        batch_offset = content.seek(0, os.SEEK_END)
+        pickle.dump(prediction_batch._replace(raw_predictions=raw_predictions), content)
+    with (data_path / INDEX_FILE).open('ab') as content:
+        pickle.dump((batch_offset, list(prediction_batch.identifiers)), content)
+
+
+class IndexedLoader(Loader):
+    """
+    Class for loading predictions from indexed prediction store created by append_to_prediction_store.
+    Only index of stored batches is kept in memory: raw output tensors are memory-mapped and
+    batches are read and processed by adapter on demand.
+    """
+
+    __provider__ = 'indexed'
+
+    def __init__(self, data_path, *args, **kwargs):
+        super().__init__(data_path, *args, **kwargs)
+        self._data_path = Path(data_path)
+        header = read_json(self._data_path / HEADER_FILE)
+        if header.get('format_version') != FORMAT_VERSION:
+            raise ValueError('Unsupported prediction store format version: {}'.format(header.get('format_version')))
+        self.adapter = kwargs.get('adapter')
+        self._batch_offsets = []
+        self._index = OrderedDict()
+        self._outputs = None
+        self._cached_batch_id = None
+        self._cached_predictions = None
+        self._read_index()
+
+    def _read_index(self):
+        with (self._data_path / INDEX_FILE).open('rb') as content:
+            while True:
+                try:
+                    batch_offset, identifiers = pickle.load(content)
+                except EOFError:
+                    break
+                batch_id = len(self._batch_offsets)
+                self._batch_offsets.append(batch_offset)
+                for identifier in identifiers:
+                    self._index[create_identifier_key(identifier)] = batch_id
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, identifier):
+        return create_identifier_key(identifier) in self._index
+
+    @property
+    def identifiers(self):
+        return list(self._index)
+
+    @property
+    def batches_count(self):
+        return len(self._batch_offsets)
+
+    def _get_outputs(self):
+        if self._outputs is None:
+            outputs_file = self._data_path / OUTPUTS_FILE
+            self._outputs = (
+                np.memmap(str(outputs_file), dtype=np.uint8, mode='c') if outputs_file.stat().st_size else b''
+            )
+        return self._outputs
+
+    def read_batch(self, batch_id):
+        with (self._data_path / BATCHES_FILE).open('rb') as content:
+            content.seek(self._batch_offsets[batch_id])
+            batch = pickle.load(content)
+        return batch._replace(raw_predictions=_restore_arrays(batch.raw_predictions, self._get_outputs()))
+
+    def process_batch(self, batch_id):
+        batch = self.read_batch(batch_id)
+        if not self.adapter:
+            return OrderedDict((create_identifier_key(identifier), batch) for identifier in batch.identifiers)
+        return OrderedDict(
+            (create_identifier_key(prediction.identifier), prediction) for prediction in self.adapter.process(*batch)
+        )
+
+    def __getitem__(self, item):
+        key = create_identifier_key(item)
+        if key not in self._index:
+            raise IndexError('There is no prediction object for "{}" input data'.format(item))
+        batch_id = self._index[key]
+        if batch_id != self._cached_batch_id:
+            self._cached_predictions = None
+            self._cached_predictions = self.process_batch(batch_id)
+            self._cached_batch_id = batch_id
+        return self._cached_predictions[key]
+
+    def iterate(self, identifiers=None):
+        """
+        Yields identifiers keys and predictions batch by batch in storing order.
+        If identifiers are provided, only batches containing them are read and other predictions are skipped.
+        """
+        if identifiers is None:
+            batch_ids = range(self.batches_count)
+        else:
+            keys = [create_identifier_key(identifier) for identifier in identifiers]
+            missing = [key for key in keys if key not in self._index]
+            if missing:
+                raise IndexError('There is no prediction object for "{}" input data'.format(missing[0]))
+            batch_ids = sorted({self._index[key] for key in keys})
+            keys = set(keys)
+        for batch_id in batch_ids:
+            predictions = self.process_batch(batch_id)
+            selected = [
+                (key, prediction) for key, prediction in predictions.items()
+                if self._index.get(key) == batch_id and (identifiers is None or key in keys)
+            ]
+            yield [key for key, _ in selected], [prediction for _, prediction in selected]
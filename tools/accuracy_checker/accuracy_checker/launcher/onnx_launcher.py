@@ -15,13 +15,16 @@ limitations under the License.
 """
 
 import re
+import multiprocessing
+from functools import partial
 from pathlib import Path
 import numpy as np
 import onnxruntime.backend as backend
 import onnxruntime as onnx_rt
 from ..logging import warning
-from ..config import PathField, StringField, ListField, ConfigError
+from ..config import PathField, StringField, ListField, ConfigError, BoolField, BaseField
 from .launcher import Launcher
+from .executor_async_request import ExecutorAsyncRequests, get_num_requests
 from ..utils import contains_all
 from ..logging import print_info
 
@@ -37,6 +40,12 @@ class ONNXLauncher(Launcher):
         self._delayed_model_loading = kwargs.get('delayed_model_loading', False)
 
         self.validate_config(config_entry, delayed_model_loading=self._delayed_model_loading)
+        self.async_mode = self.get_value_from_config('async_mode')
+        self._num_requests = get_num_requests(self.config.get('num_requests')) if self.async_mode else 1
+        self._async_requests = None
+        if self.async_mode:
+            print_info('Async mode activated')
+            print_info('Infer requests number:{}'.format(self._num_requests))
         if not self._delayed_model_loading:
             self.model = self.automatic_model_search()
             self._inference_session = self.create_inference_session(str(self.model))
@@ -58,6 +67,11 @@ class ONNXLauncher(Launcher):
             'execution_providers': ListField(
                 value_type=StringField(description="Execution provider name.", ),
                 default=['CPUExecutionProvider'], optional=True
+            ),
+            'async_mode': BoolField(optional=True, description="Allows asynchronous mode.", default=False),
+            'num_requests': BaseField(
+                optional=True,
+                description="Number of requests (for async mode only), each request uses own inference session."
             )
         })
 
@@ -91,17 +105,19 @@ class ONNXLauncher(Launcher):
 
         return model
 
-    def create_inference_session(self, model):
+    def create_inference_session(self, model, num_threads=None):
         if 'execution_providers' in self.config:
             try:
-                session = self._create_session_via_execution_providers_api(model)
+                session = self._create_session_via_execution_providers_api(model, num_threads)
                 return session
             except AttributeError:
                 warning('Execution Providers API is not supported, onnxruntime switched on Backend API')
-        return self._create_session_via_backend_api(model)
+        return self._create_session_via_backend_api(model, num_threads)
 
-    def _create_session_via_execution_providers_api(self, model):
+    def _create_session_via_execution_providers_api(self, model, num_threads=None):
         session_options = onnx_rt.SessionOptions()
+        if num_threads:
+            session_options.intra_op_num_threads = num_threads
         session = onnx_rt.InferenceSession(model, sess_options=session_options)
         self.execution_providers = self.get_value_from_config('execution_providers')
         available_providers = session.get_providers()
@@ -110,22 +126,26 @@ class ONNXLauncher(Launcher):
 
         return session
 
-    def _create_session_via_backend_api(self, model):
+    def _create_session_via_backend_api(self, model, num_threads=None):
         self.device = re.match(DEVICE_REGEX, self.get_value_from_config('device').lower()).group('device')
-        beckend_rep = backend.prepare(model=str(model), device=self.device.upper())
+        session_kwargs = {'intra_op_num_threads': num_threads} if num_threads else {}
+        beckend_rep = backend.prepare(model=str(model), device=self.device.upper(), **session_kwargs)
         return beckend_rep._session  # pylint: disable=W0212
 
     def predict(self, inputs, metadata=None, **kwargs):
         results = []
         for infer_input in inputs:
-            prediction_list = self._inference_session.run(self.output_names, infer_input)
-            results.append(dict(zip(self.output_names, prediction_list)))
+            results.append(self._infer(infer_input, self._inference_session))
             if metadata is not None:
                 for meta_ in metadata:
                     meta_['input_shape'] = self.inputs_info_for_meta()
 
         return results
 
+    def _infer(self, infer_input, session):
+        prediction_list = session.run(self.output_names, infer_input)
+        return dict(zip(self.output_names, prediction_list))
+
     def fit_to_input(self, data, layer_name, layout, precision):
         layer_shape = self.inputs[layer_name]
         input_precision = self._input_precisions.get(layer_name, np.float32) if not precision else precision
@@ -142,9 +162,25 @@ class ONNXLauncher(Launcher):
             return np.array(data[0]).astype(input_precision)
         return np.array(data).astype(input_precision)
 
-    def predict_async(self, *args, **kwargs):
-        raise ValueError('ONNX Runtime Launcher does not support async mode yet')
+    def predict_async(self, ir, inputs, metadata=None, context=None, **kwargs):
+        if metadata is not None:
+            for meta_ in metadata:
+                meta_['input_shape'] = self.inputs_info_for_meta()
+        ir.infer(inputs[0], metadata, context)
+
+    def get_async_requests(self):
+        if self._async_requests is None:
+            # sessions split CPU threads like inference streams instead of competing for all cores
+            num_threads = max(1, multiprocessing.cpu_count() // self._num_requests)
+            sessions = [self.create_inference_session(str(self.model), num_threads) for _ in range(self._num_requests)]
+            self._async_requests = ExecutorAsyncRequests(
+                [partial(self._infer, session=session) for session in sessions]
+            )
+        return self._async_requests.requests
 
     def release(self):
+        if self._async_requests is not None:
+            self._async_requests.release()
+            self._async_requests = None
         if hasattr(self, '_inference_session'):
             del self._inference_session
@@ -16,12 +16,14 @@ limitations under the License.
 
 import re
 from collections import OrderedDict
+from functools import partial
 import numpy as np
 import cv2
 
-from ..config import PathField, StringField, ConfigError, ListInputsField
+from ..config import PathField, StringField, ConfigError, ListInputsField, BoolField, BaseField
 from ..logging import print_info
 from .launcher import Launcher, LauncherConfigValidator
+from .executor_async_request import ExecutorAsyncRequests, get_num_requests
 from ..utils import get_or_parse_value
 
 DEVICE_REGEX = r'(?P<device>cpu$|gpu|gpu_fp16)?'
@@ -73,7 +75,11 @@ class OpenCVLauncher(Launcher):
                 regex=BACKEND_REGEX, choices=OpenCVLauncher.OPENCV_BACKENDS.keys(),
                 optional=True, default='IE',
                 description="Backend name: {}".format(', '.join(OpenCVLauncher.OPENCV_BACKENDS.keys()))),
-            'inputs': ListInputsField(optional=False, description="Inputs.")
+            'inputs': ListInputsField(optional=False, description="Inputs."),
+            'async_mode': BoolField(optional=True, description="Allows asynchronous mode.", default=False),
+            'num_requests': BaseField(
+                optional=True, description="Number of requests (for async mode only), each request uses own network."
+            )
         })
 
         return parameters
@@ -99,6 +105,13 @@ class OpenCVLauncher(Launcher):
         if self.target is None:
             raise ConfigError('{} is not supported device'.format(selected_device))
 
+        self.async_mode = self.get_value_from_config('async_mode')
+        self._num_requests = get_num_requests(self.config.get('num_requests')) if self.async_mode else 1
+        self._async_requests = None
+        if self.async_mode:
+            print_info('Async mode activated')
+            print_info('Infer requests number:{}'.format(self._num_requests))
+
         if not self._delayed_model_loading:
             self.model = self.get_value_from_config('model')
             self.weights = self.get_value_from_config('weights')
@@ -138,13 +151,7 @@ class OpenCVLauncher(Launcher):
         Returns:
             raw data from network.
         """
-        results = []
-        for input_blobs in inputs:
-            for blob_name in self._inputs_shapes:
-                self.network.setInput(input_blobs[blob_name].astype(np.float32), blob_name)
-            list_prediction = self.network.forward(self.output_names)
-            dict_result = dict(zip(self.output_names, list_prediction))
-            results.append(dict_result)
+        results = [self._infer(input_blobs, self.network) for input_blobs in inputs]
 
         if metadata is not None:
             for meta_ in metadata:
@@ -152,8 +159,30 @@ class OpenCVLauncher(Launcher):
 
         return results
 
-    def predict_async(self, *args, **kwargs):
-        raise ValueError('OpenCV Launcher does not support async mode yet')
+    def _infer(self, input_blobs, network):
+        for blob_name in self._inputs_shapes:
+            network.setInput(input_blobs[blob_name].astype(np.float32), blob_name)
+        list_prediction = network.forward(self.output_names)
+        return dict(zip(self.output_names, list_prediction))
+
+    def predict_async(self, ir, inputs, metadata=None, context=None, **kwargs):
+        if metadata is not None:
+            for meta_ in metadata:
+                meta_['input_shape'] = self.inputs_info_for_meta()
+        ir.infer(inputs[0], metadata, context)
+
+    def get_async_requests(self):
+        if self._async_requests is None:
+            # cv2.dnn.Net can not be used from several threads simultaneously
+            networks = [self.network]
+            for _ in range(self._num_requests - 1):
+                network = self.create_network(self.model, self.weights)
+                network.setInputsNames(list(self._inputs_shapes.keys()))
+                networks.append(network)
+            self._async_requests = ExecutorAsyncRequests(
+                [partial(self._infer, network=network) for network in networks]
+            )
+        return self._async_requests.requests
 
     def create_network(self, model, weights):
         network = cv2.dnn.readNet(str(model), str(weights))
@@ -177,4 +206,7 @@ class OpenCVLauncher(Launcher):
         """
         Releases launcher.
         """
+        if self._async_requests is not None:
+            self._async_requests.release()
+            self._async_requests = None
         del self.network
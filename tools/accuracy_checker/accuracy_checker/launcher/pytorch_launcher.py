@@ -20,8 +20,10 @@ import importlib
 from collections import OrderedDict
 
 import numpy as np
-from ..config import PathField, StringField, DictField, NumberField, ListField
+from ..config import PathField, StringField, DictField, NumberField, ListField, BoolField, BaseField
+from ..logging import print_info
 from .launcher import Launcher
+from .executor_async_request import ExecutorAsyncRequests, get_num_requests
 
 MODULE_REGEX = r'(?:\w+)(?:(?:.\w+)*)'
 DEVICE_REGEX = r'(?P<device>cpu$|cuda)?'
@@ -51,6 +53,10 @@ class PyTorchLauncher(Launcher):
             'batch': NumberField(value_type=float, min_value=1, optional=True, description="Batch size.", default=1),
             'output_names': ListField(
                 optional=True, value_type=str, description='output tensor names'
+            ),
+            'async_mode': BoolField(optional=True, description="Allows asynchronous mode.", default=False),
+            'num_requests': BaseField(
+                optional=True, description="Number of requests (for async mode only), requests share network module."
             )
         })
         return parameters
@@ -81,6 +87,12 @@ class PyTorchLauncher(Launcher):
         # torch modules does not have input information
         self._generate_inputs()
         self.output_names = self.get_value_from_config('output_names') or ['output']
+        self.async_mode = self.get_value_from_config('async_mode')
+        self._num_requests = get_num_requests(self.config.get('num_requests')) if self.async_mode else 1
+        self._async_requests = None
+        if self.async_mode:
+            print_info('Async mode activated')
+            print_info('Infer requests number:{}'.format(self._num_requests))
 
     def _generate_inputs(self):
         config_inputs = self.config.get('inputs')
@@ -134,21 +146,36 @@ class PyTorchLauncher(Launcher):
     def predict(self, inputs, metadata=None, **kwargs):
         results = []
         for batch_input in inputs:
-            outputs = list(self.module(*batch_input.values()))
-            result_dict = {
-                output_name: res.data.cpu().numpy() if self.cuda else res.data.numpy()
-                for output_name, res in zip(self.output_names, outputs)
-            }
-            results.append(result_dict)
+            results.append(self._infer(batch_input))
             for meta_ in metadata:
                 meta_['input_shape'] = {key: list(data.shape) for key, data in batch_input.items()}
 
         return results
 
-    def predict_async(self, *args, **kwargs):
-        raise ValueError('PyTorch Launcher does not support async mode yet')
+    def _infer(self, batch_input):
+        outputs = list(self.module(*batch_input.values()))
+        return {
+            output_name: res.data.cpu().numpy() if self.cuda else res.data.numpy()
+            for output_name, res in zip(self.output_names, outputs)
+        }
+
+    def predict_async(self, ir, inputs, metadata=None, context=None, **kwargs):
+        batch_input = inputs[0]
+        if metadata is not None:
+            for meta_ in metadata:
+                meta_['input_shape'] = {key: list(data.shape) for key, data in batch_input.items()}
+        ir.infer(batch_input, metadata, context)
+
+    def get_async_requests(self):
+        if self._async_requests is None:
+            # torch operators release GIL, so module can be shared between requests threads
+            self._async_requests = ExecutorAsyncRequests([self._infer] * self._num_requests)
+        return self._async_requests.requests
 
     def release(self):
+        if self._async_requests is not None:
+            self._async_requests.release()
+            self._async_requests = None
         del self.module
 
 
@@ -24,8 +24,12 @@ from csv import DictWriter
 import cv2
 
 from .config import ConfigReader
-from .logging import print_info, add_file_handler, exception
+from .dataset import annotation_cache
+from .logging import print_info, add_file_handler, exception, warning
 from .evaluators import ModelEvaluator, ModuleEvaluator
+from .evaluators.sharded_evaluation import process_dataset_sharded
+from .evaluators.pipeline_benchmark import PipelineBenchmark, benchmark_result_files
+from .evaluators.autotuning import TuningCache, DEFAULT_TUNING_CACHE, autotune
 from .progress_reporters import ProgressReporter
 from .utils import get_path, cast_to_bool, check_file_existence, validate_print_interval
 from . import __version__
@@ -132,6 +136,18 @@ def add_dataset_related_args(parser):
         help='file name for saving or reading identifiers subset',
         required=False
     )
+    dataset_related_args.add_argument(
+        '--prefetch',
+        help='number of batches which will be read and preprocessed in advance during inference',
+        type=int,
+        required=False
+    )
+    dataset_related_args.add_argument(
+        '--prefetch_workers',
+        help='number of threads used for data prefetching',
+        type=int,
+        required=False
+    )
 
 
 def add_profiling_related_args(parser):
@@ -156,6 +172,13 @@ def add_profiling_related_args(parser):
         choices=['csv', 'json'],
         required=False
     )
+    profiling_related_args.add_argument(
+        '--profile_storage_limit',
+        help='maximal number of profiling records kept in memory, finished records above the limit '
+             'are written to report immediately',
+        type=int,
+        required=False
+    )
 
 
 def add_tool_settings_args(parser):
@@ -186,6 +209,15 @@ def add_tool_settings_args(parser):
         # since at the first time file does not exist and then created we can not always check existence
         required=False
     )
+    tool_settings_args.add_argument(
+        '--stored_predictions_format',
+        help='format for storing predictions: pickle - single file with pickled prediction batches, '
+             'indexed - directory with index and memory-mapped raw outputs which allows to replay predictions '
+             'batch by batch. Format of existing stored predictions is detected automatically',
+        choices=['pickle', 'indexed'],
+        default='pickle',
+        required=False
+    )
     tool_settings_args.add_argument(
         '--csv_result',
         help='file for results writing',
@@ -211,6 +243,53 @@ def add_tool_settings_args(parser):
         default=False,
         required=False
     )
+    tool_settings_args.add_argument(
+        '--share_datasets',
+        help='allow to reuse loaded annotation for evaluation of several models on the same dataset',
+        type=cast_to_bool,
+        default=True,
+        required=False
+    )
+    tool_settings_args.add_argument(
+        '--shards',
+        help='number of processes for evaluation, each of them processes separated part of dataset. '
+             'Metrics results are merged after processing all parts.',
+        type=int,
+        default=1,
+        required=False
+    )
+    tool_settings_args.add_argument(
+        '--benchmark',
+        help='measures latency of evaluation pipeline stages (data reading, preprocessing, input filling, inference, '
+             'adapter, postprocessing and metric update), throughput and launcher idle time. '
+             'Results are printed and stored to <csv_result>_benchmark.csv and .json if --csv_result is provided',
+        type=cast_to_bool,
+        default=False,
+        required=False
+    )
+    tool_settings_args.add_argument(
+        '--autotune',
+        help='selects number of infer requests, CPU throughput streams and batch size with the best throughput '
+             'of evaluation pipeline on dataset subset before evaluation. '
+             'Selected configuration is stored in tuning cache and reused in next runs',
+        type=cast_to_bool,
+        default=False,
+        required=False
+    )
+    tool_settings_args.add_argument(
+        '--autotune_subsample_size',
+        help='number of dataset samples used for measurement of each configuration during auto-tuning',
+        type=int,
+        default=64,
+        required=False
+    )
+    tool_settings_args.add_argument(
+        '--tuning_cache',
+        help='file for storing auto-tuning results',
+        type=Path,
+        default=DEFAULT_TUNING_CACHE,
+        required=False
+    )
     tool_settings_args.add_argument(
         '-l', '--log_file',
         help='file for additional logging results',
@@ -372,26 +451,47 @@ def main():
         evaluator_kwargs['metrics_interval'] = args.metrics_interval
         evaluator_kwargs['ignore_result_formatting'] = args.ignore_result_formatting
     evaluator_kwargs['store_only'] = args.store_only
+    evaluator_kwargs['stored_predictions_format'] = args.stored_predictions_format
 
     config, mode = ConfigReader.merge(args)
     evaluator_class = EVALUATION_MODE.get(mode)
     if not evaluator_class:
         raise ValueError('Unknown evaluation mode')
+    annotation_cache.enabled = args.share_datasets
+    tuning_cache = TuningCache(args.tuning_cache) if args.autotune else None
+    if tuning_cache is not None and mode != 'models':
+        warning('Auto-tuning is supported only for models evaluation mode')
+        tuning_cache = None
     for config_entry in config[mode]:
         config_entry['_store_only'] = args.store_only
         config_entry['_stored_data'] = args.stored_predictions
         try:
             processing_info = evaluator_class.get_processing_info(config_entry)
             print_processing_info(*processing_info)
+            if tuning_cache is not None:
+                config_entry = autotune(config_entry, tuning_cache, args.autotune_subsample_size)
             evaluator = evaluator_class.from_configs(config_entry)
             if args.profile:
                 _timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
                 profiler_dir = args.profiler_logs_dir / _timestamp
                 print_info('Metric profiling activated. Profiler output will be stored in {}'.format(profiler_dir))
                 evaluator.set_profiling_dir(profiler_dir)
-            evaluator.process_dataset(
-                stored_predictions=args.stored_predictions, progress_reporter=progress_reporter, **evaluator_kwargs
-            )
+            benchmark = None
+            if args.benchmark:
+                benchmark = enable_benchmark(evaluator)
+                if benchmark is not None and args.shards > 1:
+                    warning('Sharded evaluation is not supported in benchmark mode. '
+                            'Dataset will be processed in single process.')
+            if args.shards > 1 and benchmark is None:
+                process_dataset_sharded(
+                    evaluator, config_entry, args.shards, args.stored_predictions, progress_reporter,
+                    **evaluator_kwargs
+                )
+            else:
+                evaluator.process_dataset(
+                    stored_predictions=args.stored_predictions, progress_reporter=progress_reporter,
+                    **evaluator_kwargs
+                )
             if not args.store_only:
                 metrics_results, metrics_meta = evaluator.extract_metrics_results(
                     print_results=True, ignore_results_formatting=args.ignore_result_formatting
@@ -400,6 +500,12 @@ def main():
                     write_csv_result(
                         args.csv_result, processing_info, metrics_results, evaluator.dataset_size, metrics_meta
                     )
+            if benchmark is not None:
+                benchmark.print_report()
+                if args.csv_result:
+                    csv_file, json_file = benchmark_result_files(args.csv_result)
+                    benchmark.write_csv(csv_file, processing_info)
+                    benchmark.write_json(json_file, processing_info)
             evaluator.release()
         except Exception as e:  # pylint:disable=W0703
             exception(e)
@@ -408,6 +514,16 @@ def main():
     sys.exit(return_code)
 
 
+def enable_benchmark(evaluator):
+    if not hasattr(evaluator, 'set_benchmark'):
+        warning('Benchmark mode is not supported for {}'.format(type(evaluator).__name__))
+        return None
+    print_info('Benchmark mode activated')
+    benchmark = PipelineBenchmark()
+    evaluator.set_benchmark(benchmark)
+    return benchmark
+
+
 def print_processing_info(model, launcher, device, tags, dataset):
     print_info('Processing info:')
     print_info('model: {}'.format(model))
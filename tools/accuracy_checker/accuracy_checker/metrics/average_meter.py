@@ -43,6 +43,23 @@ class AverageMeter:
             loss = loss.astype(float)
         return np.divide(loss, increment, out=np.zeros_like(loss), where=increment != 0)
 
+    def update_batch(self, losses, increments):
+        """
+        Accumulates losses and counter increments computed for batch elements stacked along the first axis.
+        Returns per element results like update.
+        """
+
+        losses = np.asarray(losses, dtype=float)
+        increments = np.asarray(increments, dtype=float)
+        if self.accumulator is None and self.total_count is None:
+            self.accumulator = losses.sum(axis=0)
+            self.total_count = increments.sum(axis=0)
+        else:
+            self.accumulator += losses.sum(axis=0)
+            self.total_count += increments.sum(axis=0)
+
+        return list(np.divide(losses, increments, out=np.zeros_like(losses), where=increments != 0))
+
     def evaluate(self):
         if self.total_count is None:
             return 0.0
@@ -54,3 +71,17 @@ class AverageMeter:
     def reset(self):
         self.accumulator = None
         self.total_count = None
+
+    def get_state(self):
+        return self.accumulator, self.total_count
+
+    def merge_state(self, state):
+        accumulator, total_count = state
+        if total_count is None:
+            return
+        if self.total_count is None:
+            self.accumulator = np.array(accumulator, dtype=float)
+            self.total_count = np.array(total_count, dtype=float)
+        else:
+            self.accumulator += accumulator
+            self.total_count += total_count
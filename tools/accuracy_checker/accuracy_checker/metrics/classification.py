@@ -36,6 +36,22 @@ except ImportError as import_error:
     roc_auc_score = UnsupportedPackage("sklearn.metric.roc_auc_score", import_error.msg)
 
 
+def batch_top_k(predictions, k):
+    """
+    Returns top k labels for each prediction of batch as 2D array.
+    Scores of plain classification predictions are stacked for selecting top labels at once, None is returned
+    for other predictions (e.g. sequence classification), so such batches are processed prediction by prediction.
+    """
+    def stackable(prediction):
+        return type(prediction) is ClassificationPrediction and np.ndim(prediction.scores) == 1  # pylint: disable=C0123
+
+    if all(stackable(prediction) for prediction in predictions) and len(
+            {prediction.scores.shape for prediction in predictions}) == 1:
+        scores = np.stack([prediction.scores for prediction in predictions])
+        return np.argpartition(scores, -k, axis=1)[:, -k:]
+    return None
+
+
 class ClassificationAccuracy(PerImageEvaluationMetric):
     """
     Class for evaluating accuracy metric of classification models.
@@ -87,6 +103,16 @@ class ClassificationAccuracy(PerImageEvaluationMetric):
             )
         return accuracy
 
+    def update_batch(self, annotations, predictions):
+        if self.match:
+            return [self.update(annotation, prediction) for annotation, prediction in zip(annotations, predictions)]
+        top_k = batch_top_k(predictions, self.top_k)
+        if top_k is None:
+            return [self.update(annotation, prediction) for annotation, prediction in zip(annotations, predictions)]
+        labels = np.array([annotation.label for annotation in annotations])
+        hits = np.any(top_k == labels[:, np.newaxis], axis=1)
+        return self.accuracy.update_batch(hits, np.ones_like(hits))
+
     def evaluate(self, annotations, predictions):
         if self.profiler:
             self.profiler.finish()
@@ -96,6 +122,15 @@ class ClassificationAccuracy(PerImageEvaluationMetric):
             accuracy = np.mean(self.accuracy)
         return accuracy
 
+    def get_partial_state(self):
+        return self.accuracy.get_state() if not self.match else list(self.accuracy)
+
+    def merge_partial_state(self, partial_state):
+        if not self.match:
+            self.accuracy.merge_state(partial_state)
+        else:
+            self.accuracy.extend(partial_state)
+
     def reset(self):
         if not self.match:
             self.accuracy.reset()
@@ -165,12 +200,28 @@ class ClassificationAccuracyClasses(PerImageEvaluationMetric):
 
         return result
 
+    def update_batch(self, annotations, predictions):
+        top_k = batch_top_k(predictions, self.top_k)
+        if top_k is None:
+            return [self.update(annotation, prediction) for annotation, prediction in zip(annotations, predictions)]
+        labels = np.array([annotation.label for annotation in annotations])
+        hits = np.any(top_k == labels[:, np.newaxis], axis=1)
+        counts = np.zeros((len(labels), len(self.labels)))
+        counts[np.arange(len(labels)), labels] = 1
+        return self.accuracy.update_batch(counts * hits[:, np.newaxis], counts)
+
     def evaluate(self, annotations, predictions):
         self.meta['names'] = list(self.labels.values())
         if self.profiler:
             self.profiler.finish()
         return self.accuracy.evaluate()
 
+    def get_partial_state(self):
+        return self.accuracy.get_state()
+
+    def merge_partial_state(self, partial_state):
+        self.accuracy.merge_state(partial_state)
+
     def reset(self):
         if self.profiler:
             self.profiler.reset()
@@ -267,6 +318,11 @@ class ClassificationF1Score(PerImageEvaluationMetric):
             self.profiler.update(annotation.identifier, annotation.label, prediction.label, self.name, result)
         return result
 
+    def update_batch(self, annotations, predictions):
+        prediction_labels = np.array([prediction.label for prediction in predictions])
+        np.add.at(self.cm, prediction_labels, 1)
+        return list(np.array([annotation.label for annotation in annotations]) == prediction_labels)
+
     def evaluate(self, annotations, predictions):
         cm_diagonal = self.cm.diagonal()
         cm_horizontal_sum = self.cm.sum(axis=1)
@@ -286,6 +342,12 @@ class ClassificationF1Score(PerImageEvaluationMetric):
             self.profiler.finish()
         return f1_score if len(f1_score) == 2 else f1_score[0]
 
+    def get_partial_state(self):
+        return self.cm
+
+    def merge_partial_state(self, partial_state):
+        self.cm += partial_state
+
     def reset(self):
         self.cm = np.zeros((len(self.labels), len(self.labels)))
         if self.profiler:
@@ -383,59 +383,55 @@ def compute_precision_recall(thresholds, matching_results):
 def compute_iou_boxes(annotation, prediction, *args, **kwargs):
     if np.size(annotation) == 0 or np.size(prediction) == 0:
         return []
-    overlap = Overlap.provide('iou')
-    iou = np.zeros((prediction.size // 4, annotation.size // 4), dtype=np.float32)
-    for i, box_a in enumerate(annotation):
-        for j, box_b in enumerate(prediction):
-            iou[j, i] = overlap(box_a, box_b)
 
-    return iou
+    return Overlap.provide('iou').matrix(prediction, annotation).astype(np.float32)
 
 
 def compute_oks(annotation_points, prediction_points, annotation_boxes, annotation_areas):
     if np.size(prediction_points) == 0 or np.size(annotation_points) == 0:
         return []
-    oks = np.zeros((len(prediction_points), len(annotation_points)))
     sigmas = np.array([.26, .25, .25, .35, .35, .79, .79, .72, .72, .62, .62, 1.07, 1.07, .87, .87, .89, .89])/10.0
     variance = (sigmas * 2)**2
-    # compute oks between each detection and ground truth object
-    for gt_idx, gt_points in enumerate(annotation_points):
-        # create bounds for ignore regions(double the gt bbox)
-        xgt = gt_points[:17]
-        ygt = gt_points[17:34]
-        vgt = gt_points[34:]
-        k1 = np.count_nonzero(vgt > 0)
-        x0_bbox, y0_bbox, x1_bbox, y1_bbox = annotation_boxes[gt_idx]
-        area_gt = annotation_areas[gt_idx]
-        w_bbox = x1_bbox - x0_bbox
-        h_bbox = y1_bbox - y0_bbox
-        x0 = x0_bbox - w_bbox
-        x1 = x0_bbox + w_bbox * 2
-        y0 = y0_bbox - h_bbox
-        y1 = y0_bbox + h_bbox * 2
-        for dt_idx, dt_points in enumerate(prediction_points):
-            xdt = dt_points[:17]
-            ydt = dt_points[17:34]
-            if k1 > 0:
-                # measure the per-keypoint distance if keypoints visible
-                x_diff = xdt - xgt
-                y_diff = ydt - ygt
-            else:
-                # measure minimum distance to keypoints in (x0,y0) & (x1,y1)
-                zeros = np.zeros(len(sigmas))
-                x_diff = np.max((zeros, x0 - xdt), axis=0) + np.max((zeros, xdt - x1), axis=0)
-                y_diff = np.max((zeros, y0 - ydt), axis=0) + np.max((zeros, ydt - y1), axis=0)
-            evaluation = (x_diff ** 2 + y_diff ** 2) / variance / (area_gt + np.spacing(1)) / 2
-            if k1 > 0:
-                evaluation = evaluation[vgt > 0]
-            oks[dt_idx, gt_idx] = np.sum(np.exp(- evaluation)) / evaluation.shape[0]
-
-    return oks
+    num_points = len(sigmas)
+    annotation_points = np.asarray(annotation_points)
+    prediction_points = np.asarray(prediction_points)
+    # ground truth objects along the first axis, detections along the second and keypoints along the last one
+    xgt = annotation_points[:, np.newaxis, :num_points]
+    ygt = annotation_points[:, np.newaxis, num_points:2 * num_points]
+    visible = annotation_points[:, 2 * num_points:] > 0
+    xdt = prediction_points[np.newaxis, :, :num_points]
+    ydt = prediction_points[np.newaxis, :, num_points:2 * num_points]
+    has_visible = np.any(visible, axis=1)
+    # bounds for ignore regions (double the gt bbox) are used if ground truth has no visible keypoints
+    x0_bbox, y0_bbox, x1_bbox, y1_bbox = np.asarray(annotation_boxes).reshape(-1, 4).T[:, :, np.newaxis, np.newaxis]
+    w_bbox = x1_bbox - x0_bbox
+    h_bbox = y1_bbox - y0_bbox
+    x0 = x0_bbox - w_bbox
+    x1 = x0_bbox + w_bbox * 2
+    y0 = y0_bbox - h_bbox
+    y1 = y0_bbox + h_bbox * 2
+    x_diff = np.where(
+        has_visible[:, np.newaxis, np.newaxis], xdt - xgt, np.maximum(0, x0 - xdt) + np.maximum(0, xdt - x1)
+    )
+    y_diff = np.where(
+        has_visible[:, np.newaxis, np.newaxis], ydt - ygt, np.maximum(0, y0 - ydt) + np.maximum(0, ydt - y1)
+    )
+    areas = np.asarray(annotation_areas, dtype=float)[:, np.newaxis, np.newaxis]
+    evaluation = (x_diff ** 2 + y_diff ** 2) / variance / (areas + np.spacing(1)) / 2
+    # all keypoints are taken into account for ground truth without visible ones
+    used_points = visible | ~has_visible[:, np.newaxis]
+    similarity = np.sum(np.exp(- evaluation) * used_points[:, np.newaxis, :], axis=-1)
+
+    return (similarity / np.count_nonzero(used_points, axis=-1)[:, np.newaxis]).T
 
 
 def evaluate_image(
         ground_truth, gt_difficult, iscrowd, detections, dt_difficult, scores, iou, thresholds, profile=False
 ):
+    """
+    Greedily matches detections sorted by score with ground truth for all thresholds at once.
+    Ground truth is expected to be ordered with ignored objects last, as prepare_annotations does.
+    """
     thresholds_num = len(thresholds)
     gt_num = len(ground_truth)
     dt_num = len(detections)
@@ -444,30 +440,25 @@ def evaluate_image(
     gt_ignored = gt_difficult
     dt_ignored = np.zeros((thresholds_num, dt_num))
     if np.size(iou):
-        for tind, t in enumerate(thresholds):
-            for dtind, _ in enumerate(detections):
-                # information about best match so far (matched_id = -1 -> unmatched)
-                iou_current = min([t, 1-1e-10])
-                matched_id = -1
-                for gtind, _ in enumerate(ground_truth):
-                    # if this gt already matched, and not a crowd, continue
-                    if gt_matched[tind, gtind] > 0 and not iscrowd[gtind]:
-                        continue
-                    # if dt matched to reg gt, and on ignore gt, stop
-                    if matched_id > -1 and not gt_ignored[matched_id] and gt_ignored[gtind]:
-                        break
-                    # continue to next gt unless better match made
-                    if iou[dtind, gtind] < iou_current:
-                        continue
-                    # if match successful and best so far, store appropriately
-                    iou_current = iou[dtind, gtind]
-                    matched_id = gtind
-                # if match made store id of match for both dt and gt
-                if matched_id == -1:
-                    continue
-                dt_ignored[tind, dtind] = gt_ignored[matched_id]
-                dt_matched[tind, dtind] = 1
-                gt_matched[tind, matched_id] = dtind
+        gt_ignored_mask = np.asarray(gt_ignored, dtype=bool)
+        not_crowd = np.asarray(iscrowd) == 0
+        min_iou = np.minimum(np.asarray(thresholds, dtype=float), 1 - 1e-10)[:, np.newaxis]
+        # detections which do not overlap enough with any ground truth stay unmatched for all thresholds
+        for dtind in np.flatnonzero(np.max(iou, axis=1) >= np.min(min_iou)):
+            # match candidates for each threshold: ground truth which is not matched yet (or crowd) overlapping enough
+            candidates = (iou[dtind] >= min_iou) & ~((gt_matched > 0) & not_crowd)
+            # ignored ground truth is matched only if there are no candidates among regular ones
+            regular = candidates & ~gt_ignored_mask
+            candidates = np.where(regular.any(axis=1, keepdims=True), regular, candidates)
+            matched_thresholds = np.flatnonzero(candidates.any(axis=1))
+            if not matched_thresholds.size:
+                continue
+            # best match so far is replaced by equal one, so the last ground truth with maximal overlap is selected
+            candidates_iou = np.where(candidates[matched_thresholds], iou[dtind], -np.inf)
+            matched_ids = gt_num - 1 - np.argmax(candidates_iou[:, ::-1], axis=1)
+            dt_ignored[matched_thresholds, dtind] = gt_ignored_mask[matched_ids]
+            dt_matched[matched_thresholds, dtind] = 1
+            gt_matched[matched_thresholds, matched_ids] = dtind
     # store results for given image
     results = {
         'dt_matches': dt_matched,
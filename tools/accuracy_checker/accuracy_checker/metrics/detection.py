@@ -62,7 +62,7 @@ class BaseDetectionMetricMixin(Metric):
             ),
             'allow_multiple_matches_per_ignored': BoolField(
                 default=False, description="Allows multiple matches per ignored."),
-            'overlap_method': StringField(choices=['iou', 'ioa'], default='iou'),
+            'overlap_method': StringField(choices=['iou', 'ioa', 'giou'], default='iou'),
             'use_filtered_tp': BoolField(
                 default=False, description="If is True then ignored object are counted during evaluation."
             ),
@@ -153,6 +153,13 @@ class BaseDetectionMetricMixin(Metric):
         if self.profiler:
             self.profiler.finish()
 
+    def get_partial_state(self):
+        # metric value is calculated on full dataset annotations and predictions, there is nothing to accumulate
+        return {}
+
+    def merge_partial_state(self, partial_state):
+        pass
+
     def reset(self):
         label_map = self.config.get('label_map', 'label_map')
         dataset_labels = self.dataset.metadata.get(label_map, {})
@@ -372,6 +379,12 @@ class DetectionAccuracyMetric(BaseDetectionMetricMixin, PerImageEvaluationMetric
 
         return float(np.sum(self.cm.diagonal())) / float(np.maximum(1, np.sum(self.cm)))
 
+    def get_partial_state(self):
+        return self.cm
+
+    def merge_partial_state(self, partial_state):
+        self.cm += partial_state
+
 
 def confusion_matrix(matched_ids, prediction, gt, num_classes, ignore_label=None):
     out_cm = np.zeros([num_classes, num_classes], dtype=np.int32)
@@ -408,20 +421,16 @@ def match_detections_class_agnostic(prediction, gt, min_iou, overlap_method):
     similarity_matrix = calculate_similarity_matrix(predicted_bboxes, gt_bboxes, overlap_method)
 
     matches = []
-    visited_gt = np.zeros(gt_bboxes_num, dtype=np.bool)
+    if not gt_bboxes_num:
+        return matches
+    visited_gt = np.zeros(gt_bboxes_num, dtype=bool)
     for predicted_id in range(predicted_bboxes_num):
-        best_overlap = 0.0
-        best_gt_id = -1
-        for gt_id in range(gt_bboxes_num):
-            if visited_gt[gt_id]:
-                continue
+        # visited ground truth boxes can not be matched, as well as boxes without positive overlap
+        overlaps = np.where(visited_gt, 0.0, similarity_matrix[predicted_id])
+        best_gt_id = int(np.argmax(overlaps))
+        best_overlap = overlaps[best_gt_id]
 
-            overlap_value = similarity_matrix[predicted_id, gt_id]
-            if overlap_value > best_overlap:
-                best_overlap = overlap_value
-                best_gt_id = gt_id
-
-        if best_gt_id >= 0 and best_overlap > min_iou:
+        if best_overlap > 0.0 and best_overlap > min_iou:
             visited_gt[best_gt_id] = True
 
             matches.append((best_gt_id, predicted_original_ids[predicted_id]))
@@ -461,6 +470,11 @@ def fast_match_detections_class_agnostic(prediction, gt, min_iou, overlap_method
 
 def calculate_similarity_matrix(set_a, set_b, overlap):
     similarity = np.zeros([len(set_a), len(set_b)], dtype=np.float32)
+    if not similarity.size:
+        return similarity
+    if isinstance(overlap, Overlap):
+        similarity[:] = overlap.matrix(set_a, set_b)
+        return similarity
     for i, box_a in enumerate(set_a):
         for j, box_b in enumerate(set_b):
             similarity[i, j] = overlap(box_a, box_b)
@@ -527,48 +541,37 @@ def bbox_match(annotation: List[DetectionAnnotation], prediction: List[Detection
     fp = np.zeros_like(prediction_images)
     max_overlapped_dt = defaultdict(list)
     overlaps = np.array([])
+    if not prediction_images.size:
+        return (
+            tp, fp, prediction_boxes[:, 0], number_ground_truth,
+            max_overlapped_dt, prediction_boxes[:, 1:], overlaps
+        )
 
-    for image in range(prediction_images.shape[0]):
-        gt_img = annotation[prediction_images[image]]
-        annotation_difficult = difficult_boxes_annotation[gt_img.identifier]
-        used = used_boxes[gt_img.identifier]
+    image_overlaps, image_max_overlaps, row_in_image = _image_overlaps(
+        annotation, label, prediction_boxes[:, 1:], prediction_images, difficult_boxes_annotation, overlap_evaluator,
+        overlap_thresh, ignore_difficult and allow_multiple_matches_per_ignored, include_boundaries
+    )
 
-        idx = gt_img.labels == label
-        if not np.array(idx).any():
+    def set_false_positive(box_index):
+        is_box_difficult = difficult_boxes_prediction[box_index].any()
+        return int(not ignore_difficult or not is_box_difficult)
+
+    for image in range(prediction_images.shape[0]):
+        image_id = prediction_images[image]
+        if image_id not in image_overlaps:
             fp[image] = 1
             continue
 
-        prediction_box = prediction_boxes[image][1:]
-        annotation_boxes = gt_img.x_mins[idx], gt_img.y_mins[idx], gt_img.x_maxs[idx], gt_img.y_maxs[idx]
-
-        overlaps = overlap_evaluator(prediction_box, annotation_boxes)
-        if ignore_difficult and allow_multiple_matches_per_ignored:
-            ioa = IOA(include_boundaries)
-            ignored = np.where(annotation_difficult == 1)[0]
-            ignored_annotation_boxes = (
-                annotation_boxes[0][ignored], annotation_boxes[1][ignored],
-                annotation_boxes[2][ignored], annotation_boxes[3][ignored]
-            )
-            overlaps[ignored] = ioa.evaluate(prediction_box, ignored_annotation_boxes)
-
-        max_overlap = -np.inf
-
-        not_ignored_overlaps = overlaps[np.where(annotation_difficult == 0)[0]]
-        ignored_overlaps = overlaps[np.where(annotation_difficult == 1)[0]]
-        if not_ignored_overlaps.size:
-            max_overlap = np.max(not_ignored_overlaps)
-
-        if max_overlap < overlap_thresh and ignored_overlaps.size:
-            max_overlap = np.max(ignored_overlaps)
-        max_overlapped = np.where(overlaps == max_overlap)[0]
-
-        def set_false_positive(box_index):
-            is_box_difficult = difficult_boxes_prediction[box_index].any()
-            return int(not ignore_difficult or not is_box_difficult)
+        gt_img = annotation[image_id]
+        annotation_difficult = difficult_boxes_annotation[gt_img.identifier]
+        used = used_boxes[gt_img.identifier]
+        overlaps = image_overlaps[image_id][row_in_image[image]]
+        max_overlap = image_max_overlaps[image_id][row_in_image[image]]
 
         if max_overlap < overlap_thresh:
             fp[image] = set_false_positive(image)
             continue
+        max_overlapped = np.where(overlaps == max_overlap)[0]
         if not annotation_difficult[max_overlapped].any():
             if not used[max_overlapped].any():
                 if not ignore_difficult or use_filtered_tp or not difficult_boxes_prediction[image].any():
@@ -588,6 +591,45 @@ def bbox_match(annotation: List[DetectionAnnotation], prediction: List[Detection
     )
 
 
+def _image_overlaps(annotation, label, prediction_boxes, prediction_images, difficult_boxes_annotation,
+                    overlap_evaluator, overlap_thresh, use_ioa_for_ignored, include_boundaries):
+    """
+    Computes overlap matrices between all predictions and ground truth boxes of each image at once.
+    Returns overlaps and best overlap value per prediction (with fallback to ignored boxes) for images,
+    which have ground truth boxes of given label, and row of each prediction in its image matrix.
+    """
+    image_overlaps, image_max_overlaps = {}, {}
+    row_in_image = np.zeros(prediction_images.shape[0], dtype=int)
+    ioa = IOA(include_boundaries) if use_ioa_for_ignored else None
+    for image_id in np.unique(prediction_images):
+        rows = np.flatnonzero(prediction_images == image_id)
+        row_in_image[rows] = np.arange(rows.size)
+        gt_img = annotation[image_id]
+        idx = gt_img.labels == label
+        if not np.array(idx).any():
+            continue
+        annotation_boxes = np.stack(
+            (gt_img.x_mins[idx], gt_img.y_mins[idx], gt_img.x_maxs[idx], gt_img.y_maxs[idx]), axis=-1
+        )
+        overlaps = overlap_evaluator.matrix(prediction_boxes[rows], annotation_boxes)
+        annotation_difficult = difficult_boxes_annotation[gt_img.identifier]
+        ignored = np.where(annotation_difficult == 1)[0]
+        not_ignored = np.where(annotation_difficult == 0)[0]
+        if ioa is not None:
+            overlaps[:, ignored] = ioa.matrix(prediction_boxes[rows], annotation_boxes[ignored])
+
+        max_overlaps = np.full(rows.size, -np.inf)
+        if not_ignored.size:
+            max_overlaps = np.max(overlaps[:, not_ignored], axis=1)
+        if ignored.size:
+            use_ignored = max_overlaps < overlap_thresh
+            max_overlaps[use_ignored] = np.max(overlaps[:, ignored], axis=1)[use_ignored]
+        image_overlaps[image_id] = overlaps
+        image_max_overlaps[image_id] = max_overlaps
+
+    return image_overlaps, image_max_overlaps, row_in_image
+
+
 def _prepare_annotation_boxes(annotation, ignore_difficult, label):
     used_boxes = {}
     difficult_boxes = {}
@@ -625,12 +667,7 @@ def _prepare_prediction_boxes(label, predictions, ignore_difficult):
     for i, prediction in enumerate(predictions):
         idx = prediction.labels == label
 
-        label_indices = [
-            det + index_counter
-            for det, lab in enumerate(prediction.labels)
-            if lab == label
-        ]
-        all_label_indices.extend(label_indices)
+        all_label_indices.extend(np.flatnonzero(idx) + index_counter)
         index_counter += len(prediction.labels)
 
         prediction_images.append(np.full(prediction.labels[idx].shape, i))
@@ -21,7 +21,7 @@ from ..utils import is_single_metric_source, get_supported_representations
 from ..presenters import BasePresenter
 from ..config import ConfigValidator, NumberField, StringField, ConfigError
 from ..dependency import ClassProvider, UnregisteredProviderException
-from ..utils import zipped_transform, get_parameter_value_from_config, contains_any
+from ..utils import zipped_transform, get_parameter_value_from_config, contains_any, overrides
 
 PerImageMetricResult = namedtuple('PerImageMetricResult', ['metric_name', 'metric_type', 'result', 'direction'])
 
@@ -101,12 +101,47 @@ class Metric(ClassProvider):
     def submit_all(self, annotations, predictions):
         return self.evaluate(annotations, predictions)
 
+    def submit_batch(self, annotations, predictions):
+        direction = self.meta.get('target', 'higher-better')
+        return [
+            PerImageMetricResult(self.name, self.config['type'], result, direction)
+            for result in self.update_batch(annotations, predictions)
+        ]
+
     def update(self, annotation, prediction):
         pass
 
+    def update_batch(self, annotations, predictions):
+        """
+        Updates metric on all annotation and prediction pairs of batch at once and returns list of per-image results.
+        It is optional, metrics which are able to process stacked batch data override it.
+        """
+
+        raise NotImplementedError
+
+    @property
+    def supports_batch_update(self):
+        return bool(overrides(self, 'update_batch', Metric))
+
     def evaluate(self, annotations, predictions):
         raise NotImplementedError
 
+    def get_partial_state(self):
+        """
+        Returns picklable state accumulated by update calls, which can be merged into the same metric
+        evaluated on another part of dataset. None means that metric does not support merging,
+        in this case update should be repeated for annotation and prediction pairs from that part.
+        """
+
+        return None
+
+    def merge_partial_state(self, partial_state):
+        """
+        Accumulates state returned by get_partial_state of the same metric evaluated on another part of dataset.
+        """
+
+        raise NotImplementedError
+
     def configure(self):
         """
         Specifies configuration structure for metric entry.
@@ -147,16 +182,16 @@ class Metric(ClassProvider):
             metric_uri, on_extra_argument=ConfigValidator.ERROR_ON_EXTRA_ARGUMENT, fields=cls.parameters()
         ).validate(config, fetch_only=fetch_only, validation_scheme=cls.validation_scheme())
 
-    def _update_state(self, fn, state_key, default_factory=None):
+    def _update_state(self, fn, state_key, default_factory=None, steps=1):
         iter_key = "{}_global_it".format(state_key)
         if state_key not in self.state:
             default = default_factory() if default_factory else None
             self.state[state_key] = default
             self.state[iter_key] = 0
 
-        self._update_iter += 1
+        self._update_iter += steps
         if self.state[iter_key] < self._update_iter:
-            self.state[iter_key] += 1
+            self.state[iter_key] += steps
             self.state[state_key] = fn(self.state[state_key])
 
     def _resolve_representation_containers(self, annotation, prediction):
@@ -232,6 +267,23 @@ class PerImageEvaluationMetric(Metric):
 
         return PerImageMetricResult(self.name, self.config['type'], metric_result, direction)
 
+    def submit_batch(self, annotations, predictions):
+        if not annotations:
+            return []
+        if self.profiler:
+            # profiler collects report for each image on update
+            return [self.submit(annotation, prediction) for annotation, prediction in zip(annotations, predictions)]
+        if self._has_types(annotations, self.annotation_types) and self._has_types(predictions, self.prediction_types):
+            # representations already have supported types, so resolving them does not change anything
+            return super().submit_batch(annotations, predictions)
+        annotations_, predictions_ = zipped_transform(self._resolve_representation_containers, annotations, predictions)
+        return super().submit_batch(annotations_, predictions_)
+
+    @staticmethod
+    def _has_types(representations, representation_types):
+        type_names = {representation_type.__name__ for representation_type in representation_types}
+        return all(type(representation).__name__ in type_names for representation in representations)
+
     def evaluate(self, annotations, predictions):
         raise NotImplementedError
 
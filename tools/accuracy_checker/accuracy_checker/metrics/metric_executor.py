@@ -41,7 +41,9 @@ class MetricsExecutor:
         self.profile_metrics = False if dataset is None else dataset.config.get('_profile', False)
         if self.profile_metrics:
             profiler_type = dataset.config.get('_report_type', 'csv')
-            self.profiler = ProfilingExecutor(profile_report_type=profiler_type)
+            self.profiler = ProfilingExecutor(
+                profile_report_type=profiler_type, storage_limit=dataset.config.get('_profile_storage_limit')
+            )
             self.profiler.set_dataset_meta(self._dataset.metadata)
 
         self.metrics = []
@@ -89,6 +91,12 @@ class MetricsExecutor:
         results = OrderedDict()
         profile_results = OrderedDict()
 
+        if not profile and self.supports_batch_update:
+            batch_results = [metric.metric_fn.submit_batch(annotation, prediction) for metric in self.metrics]
+            for input_id, object_results in zip(batch_ids, zip(*batch_results)):
+                results[input_id] = list(object_results)
+            return results, profile_results
+
         for input_id, single_annotation, single_prediction in zip(batch_ids, annotation, prediction):
             results[input_id] = self.update_metrics_on_object(single_annotation, single_prediction)
             if profile:
@@ -96,6 +104,41 @@ class MetricsExecutor:
 
         return results, profile_results
 
+    @property
+    def supports_batch_update(self):
+        return all(metric.metric_fn.supports_batch_update for metric in self.metrics)
+
+    @property
+    def supports_partial_state(self):
+        return all(metric.metric_fn.get_partial_state() is not None for metric in self.metrics)
+
+    def get_partial_state(self):
+        """
+        Returns accumulated states of metrics for merging with evaluation results on other dataset parts.
+        """
+
+        return [metric.metric_fn.get_partial_state() for metric in self.metrics]
+
+    def merge_partial_state(self, metrics_states, annotations=None, predictions=None):
+        """
+        Merges metrics states collected on other part of dataset.
+        Metrics which do not support merging are updated on annotation and prediction pairs of this part.
+
+        Args:
+            metrics_states: list of metrics states returned by get_partial_state.
+            annotations: list of annotation objects of dataset part.
+            predictions: list of prediction objects of dataset part.
+        """
+
+        for metric, metric_state in zip(self.metrics, metrics_states):
+            if metric_state is not None:
+                metric.metric_fn.merge_partial_state(metric_state)
+                continue
+            if annotations is None or predictions is None:
+                raise ValueError('annotations and predictions required for merging {} metric'.format(metric.name))
+            for annotation, prediction in zip(annotations, predictions):
+                metric.metric_fn.submit(annotation, prediction)
+
     def iterate_metrics(self, annotations, predictions):
         for name, metric_type, functor, reference, threshold, presenter in self.metrics:
             yield presenter, EvaluationResult(
@@ -148,7 +191,9 @@ class MetricsExecutor:
 
     def enable_profiling(self, dataset, report_type=None):
         profiler_type = dataset.config.get('_report_type', 'csv') if report_type is None else report_type
-        self.profiler = ProfilingExecutor(profile_report_type=profiler_type)
+        self.profiler = ProfilingExecutor(
+            profile_report_type=profiler_type, storage_limit=dataset.config.get('_profile_storage_limit')
+        )
         self.profiler.set_dataset_meta(self._dataset.metadata)
         for metric in self.metrics:
             annotation_source = metric.metric_fn.config.get('annotation_source', '')
@@ -65,9 +65,11 @@ class MetricProfiler(ClassProvider):
                 self.__provider__, report_type)
         self.out_dir = Path()
         self.dump_iterations = dump_iterations
+        self.storage_limit = None
         self.storage = OrderedDict()
         self.write_result = self.write_csv_result if report_type == 'csv' else self.write_json_result
         self._last_profile = None
+        self._records_written = False
 
     def register_metric(self, metric_name):
         self.fields.append('{}_result'.format(metric_name))
@@ -92,13 +94,36 @@ class MetricProfiler(ClassProvider):
                 self.storage[last_identifier].update(profiling_data)
             else:
                 self.storage[last_identifier] = profiling_data
-            finished = len(self.fields) == len(self.storage[last_identifier])
+            finished = self._is_finished(self.storage[last_identifier])
         if len(self.storage) % self.dump_iterations == 0 and finished:
             self.write_result()
+        elif self.storage_limit and len(self.storage) >= self.storage_limit:
+            self.spill_storage()
+
+    def _is_finished(self, record):
+        return isinstance(record, list) or len(self.fields) == len(record)
+
+    def spill_storage(self):
+        """
+        Writes finished records to report for releasing memory, records waiting results of other metrics are kept.
+        """
+
+        finished_records = OrderedDict()
+        for identifier, record in self.storage.items():
+            if not self._is_finished(record):
+                break
+            finished_records[identifier] = record
+        if not finished_records:
+            return
+        for identifier in finished_records:
+            del self.storage[identifier]
+        self.write_result(finished_records)
 
     def finish(self):
         if self.storage:
             self.write_result()
+        if self.report_type == 'json' and self._records_written:
+            self.finalize_json_result()
 
     def reset(self):
         self._reset_storage()
@@ -106,12 +131,18 @@ class MetricProfiler(ClassProvider):
     def _reset_storage(self):
         self.storage = OrderedDict()
 
-    def write_csv_result(self):
+    def _take_records(self, records):
+        if records is None:
+            records = self.storage
+            self._reset_storage()
+        return records
+
+    def write_csv_result(self, records=None):
         out_path = self.out_dir / self.report_file
         new_file = not out_path.exists()
 
         data_to_store = []
-        for value in self.storage.values():
+        for value in self._take_records(records).values():
             if isinstance(value, list):
                 data_to_store.extend(value)
             else:
@@ -123,32 +154,45 @@ class MetricProfiler(ClassProvider):
                 writer.writeheader()
             writer.writerows(data_to_store)
 
-        self._reset_storage()
-
-    def write_json_result(self):
+    @property
+    def records_file(self):
+        return self.out_dir / '{}l'.format(self.report_file)
+
+    def write_json_result(self, records=None):
+        """
+        Appends records to JSON Lines file, report in JSON format is assembled from it by finalize_json_result.
+        File left by previous run is overwritten by the first records.
+        """
+
+        with open(str(self.records_file), 'a' if self._records_written else 'w') as f:
+            self._records_written = True
+            for record in self._take_records(records).values():
+                f.write(json.dumps(record))
+                f.write('\n')
+
+    def finalize_json_result(self):
         out_path = self.out_dir / self.report_file
-        new_file = not out_path.exists()
-        if not new_file:
-            with open(str(out_path), 'r') as f:
-                out_dict = json.load(f)
-            out_dict['report'].extend(list(self.storage.values()))
-        else:
-            out_dict = {
-                'processing_info': {
-                    'model': self.model_name,
-                    'dataset': self.dataset,
-                    'framework': self.framework,
-                    'device': self.device,
-                    'tags': self.tags
-                },
-                'report': list(self.storage.values()),
-                'report_type': self.__provider__,
-                'dataset_meta': self.dataset_meta
+        header = {
+            'processing_info': {
+                'model': self.model_name,
+                'dataset': self.dataset,
+                'framework': self.framework,
+                'device': self.device,
+                'tags': self.tags
             }
-        with open(str(out_path), 'w') as f:
-            json.dump(out_dict, f)
-
-        self._reset_storage()
+        }
+        footer = {'report_type': self.__provider__, 'dataset_meta': self.dataset_meta}
+        # report is written record by record to avoid loading all records into memory
+        with open(str(out_path), 'w') as out_file:
+            out_file.write('{}, "report": ['.format(json.dumps(header)[:-1]))
+            with open(str(self.records_file), 'r') as records:
+                for record_id, record in enumerate(records):
+                    if record_id:
+                        out_file.write(', ')
+                    out_file.write(record.rstrip('\n'))
+            out_file.write('], {}'.format(json.dumps(footer)[1:]))
+        self.records_file.unlink()
+        self._records_written = False
 
     def set_output_dir(self, out_dir):
         self.out_dir = out_dir
@@ -21,10 +21,11 @@ PorfilerID = namedtuple('ProfilerID', ['type', 'annotation_source', 'prediction_
 
 
 class ProfilingExecutor:
-    def __init__(self, profile_report_type='csv'):
+    def __init__(self, profile_report_type='csv', storage_limit=None):
         self.profilers = OrderedDict()
         self._profiler_by_metric = OrderedDict()
         self.profile_report_type = profile_report_type
+        self.storage_limit = storage_limit
 
     def register_profiler_for_metric(self, metric_type, metric_name, annotation_source='', prediction_source=''):
         profiler = None
@@ -39,6 +40,7 @@ class ProfilingExecutor:
                         profiler_id.type, report_type=self.profile_report_type, name=profiler_id.name
                     )
                     self.profilers[profiler_id].set_dataset_meta(self.dataset_meta)
+                    self.profilers[profiler_id].storage_limit = self.storage_limit
                 self.profilers[profiler_id].register_metric(metric_name)
                 self._profiler_by_metric[metric_name] = self.profilers[profiler_id]
                 return self.profilers[profiler_id]
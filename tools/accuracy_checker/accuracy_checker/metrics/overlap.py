@@ -43,6 +43,19 @@ class Overlap(ClassProvider):
     def evaluate(self, prediction_box, annotation_boxes):
         raise NotImplementedError
 
+    def matrix(self, prediction_boxes, annotation_boxes):
+        """
+        Computes overlap for every pair of boxes in one broadcasted call.
+        Boxes are given as arrays with shape [N, 4] and [M, 4] in (x_min, y_min, x_max, y_max) format,
+        result has shape [N, M] and each element equal to evaluate(prediction_boxes[i], annotation_boxes[j]).
+        """
+        prediction_boxes = np.asarray(prediction_boxes).reshape(-1, 4)
+        annotation_boxes = np.asarray(annotation_boxes).reshape(-1, 4)
+        return self.evaluate(
+            tuple(prediction_boxes[:, coord, np.newaxis] for coord in range(4)),
+            tuple(annotation_boxes[:, coord] for coord in range(4))
+        )
+
     def area(self, box):
         x0, y0, x1, y1 = box
         return (x1 - x0 + self.boundary) * (y1 - y0 + self.boundary)
@@ -69,3 +82,30 @@ class IOA(Overlap):
             intersections_area, prediction_area, out=np.zeros_like(intersections_area, dtype=float),
             where=prediction_area != 0
         )
+
+
+class GIOU(Overlap):
+    __provider__ = 'giou'
+
+    @staticmethod
+    def enclosings(prediction_box, annotation_boxes):
+        px_min, py_min, px_max, py_max = prediction_box
+        ax_mins, ay_mins, ax_maxs, ay_maxs = annotation_boxes
+
+        return (
+            np.minimum(ax_mins, px_min), np.minimum(ay_mins, py_min),
+            np.maximum(ax_maxs, px_max), np.maximum(ay_maxs, py_max)
+        )
+
+    def evaluate(self, prediction_box, annotation_boxes):
+        intersections_area = self.area(self.intersections(prediction_box, annotation_boxes))
+        unions = self.area(prediction_box) + self.area(annotation_boxes) - intersections_area
+        enclosings_area = self.area(self.enclosings(prediction_box, annotation_boxes))
+        iou = np.divide(
+            intersections_area, unions, out=np.zeros_like(intersections_area, dtype=float), where=unions != 0
+        )
+        penalty = np.divide(
+            enclosings_area - unions, enclosings_area, out=np.zeros_like(enclosings_area, dtype=float),
+            where=enclosings_area != 0
+        )
+        return iou - penalty
@@ -92,6 +92,37 @@ class BaseRegressionMetric(PerImageEvaluationMetric):
 
         return diff
 
+    def update_batch(self, annotations, predictions):
+        diff = self._calculate_batch_diff(annotations, predictions)
+        if diff is None:
+            return [self.update(annotation, prediction) for annotation, prediction in zip(annotations, predictions)]
+        self.magnitude.extend(diff)
+        return list(diff)
+
+    def _calculate_batch_diff(self, annotations, predictions):
+        """
+        Applies element-wise value differ to stacked values of regression representations.
+        Returns None if batch values can not be stacked or metric differ is not element-wise.
+        """
+
+        if self.value_differ not in ELEMENTWISE_DIFFERS or isinstance(self.magnitude, dict):
+            return None
+        # pylint: disable=C0123
+        if not all(type(annotation) is RegressionAnnotation for annotation in annotations):
+            return None
+        if not all(type(prediction) is RegressionPrediction for prediction in predictions):
+            return None
+        annotation_values = [np.asarray(annotation.value) for annotation in annotations]
+        prediction_values = [np.asarray(prediction.value) for prediction in predictions]
+        values = annotation_values + prediction_values
+        if len({value.shape for value in values}) != 1 or not values[0].size:
+            return None
+        if any(value.dtype.kind not in 'biuf' for value in values):
+            return None
+        diff = self.value_differ(np.stack(annotation_values), np.stack(prediction_values)).reshape(len(annotations), -1)
+
+        return diff.mean(axis=1) if diff.shape[1] > 1 else diff[:, 0]
+
     def _calculate_diff_regression_rep(self, annotation, prediction):
         if isinstance(annotation.value, dict):
             if not isinstance(prediction.value, dict):
@@ -289,6 +320,14 @@ class RootMeanSquaredError(BaseRegressionMetric):
         self.magnitude.append(rmse)
         return rmse
 
+    def update_batch(self, annotations, predictions):
+        diff = self._calculate_batch_diff(annotations, predictions)
+        if diff is None:
+            return [self.update(annotation, prediction) for annotation, prediction in zip(annotations, predictions)]
+        rmse = np.sqrt(diff)
+        self.magnitude.extend(rmse)
+        return list(rmse)
+
 
 class MeanAbsoluteErrorOnInterval(BaseRegressionOnIntervals):
     __provider__ = 'mae_on_interval'
@@ -633,6 +672,10 @@ def mape_differ(annotation_val, prediction_val):
     return np.abs(annotation_val - prediction_val) / annotation_val
 
 
+# differs which are applied to values independently, so they can process stacked batch values
+ELEMENTWISE_DIFFERS = (mae_differ, mse_differ, log10_differ, mape_differ)
+
+
 class AngleError(BaseRegressionMetric):
     __provider__ = 'angle_error'
 
@@ -33,6 +33,7 @@ class SegmentationMetric(PerImageEvaluationMetric):
     prediction_types = (SegmentationPrediction, )
 
     CONFUSION_MATRIX_KEY = 'segmentation_confusion_matrix'
+    IMAGE_CONFUSION_MATRIX_KEY = 'segmentation_confusion_matrix_per_image'
 
     @classmethod
     def parameters(cls):
@@ -62,31 +63,84 @@ class SegmentationMetric(PerImageEvaluationMetric):
             self.profiler.names = self.dataset.labels
 
     def update(self, annotation, prediction):
+        return self._accumulate(self._image_confusion_matrices([annotation], [prediction]))[0]
+
+    def update_batch(self, annotations, predictions):
+        """
+        Accumulates confusion matrices of batch images.
+        Returns per-image confusion matrices, subclasses convert them to per-image results.
+        """
+
+        return self._accumulate(self._image_confusion_matrices(annotations, predictions))
+
+    def _accumulate(self, hist):
+        batch_cm = hist.sum(axis=0)
         n_classes = len(self.dataset.labels)
-        prediction_mask = np.argmax(prediction.mask, axis=0) if self.use_argmax else prediction.mask.astype('int64')
+        self._update_state(
+            lambda confusion_matrix: confusion_matrix + batch_cm, self.CONFUSION_MATRIX_KEY,
+            lambda: np.zeros((n_classes, n_classes)), steps=len(hist)
+        )
+        return hist
+
+    def _image_confusion_matrices(self, annotations, predictions):
+        """
+        Computes confusion matrices of all batch images with single bincount call.
+        Matrices are kept in state shared by segmentation metrics, so masks are processed once per image
+        for all metrics with the same use_argmax and ignore_label settings.
+        """
+
+        batch_key = (
+            self._update_iter, self.use_argmax, self.ignore_label,
+            [annotation.identifier for annotation in annotations]
+        )
+        shared_matrices = self.state.get(self.IMAGE_CONFUSION_MATRIX_KEY)
+        if shared_matrices is not None and shared_matrices[0] == batch_key:
+            return shared_matrices[1]
 
-        def confusion_matrix():
+        n_classes = len(self.dataset.labels)
+        labels_true, labels_pred, valid_counts = [], [], []
+        for annotation, prediction in zip(annotations, predictions):
+            prediction_mask = (
+                np.argmax(prediction.mask, axis=0) if self.use_argmax else prediction.mask.astype('int64')
+            )
             label_true = annotation.mask.flatten()
             label_pred = prediction_mask.flatten()
             mask = (label_true >= 0) & (label_true < n_classes) & (label_pred < n_classes) & (label_pred >= 0)
-            hist = np.bincount(n_classes * label_true[mask].astype(int) + label_pred[mask], minlength=n_classes ** 2)
-            hist = hist.reshape(n_classes, n_classes)
-            if self.ignore_label is not None:
-                hist[self.ignore_label, :] = 0
-                hist[:, self.ignore_label] = 0
-
-            return hist
-
-        def accumulate(confusion_matrixs):
-            return confusion_matrixs + cm
-
-        cm = confusion_matrix()
-
-        self._update_state(accumulate, self.CONFUSION_MATRIX_KEY, lambda: np.zeros((n_classes, n_classes)))
-        return cm
+            labels_true.append(label_true[mask].astype(int))
+            labels_pred.append(label_pred[mask])
+            valid_counts.append(len(labels_true[-1]))
+        image_ids = np.repeat(np.arange(len(valid_counts)), valid_counts)
+        hist = np.bincount(
+            (image_ids * n_classes + np.concatenate(labels_true)) * n_classes + np.concatenate(labels_pred),
+            minlength=len(valid_counts) * n_classes ** 2
+        ).reshape(-1, n_classes, n_classes)
+        if self.ignore_label is not None:
+            hist[:, self.ignore_label, :] = 0
+            hist[:, :, self.ignore_label] = 0
+        hist.setflags(write=False)
+        self.state[self.IMAGE_CONFUSION_MATRIX_KEY] = (batch_key, hist)
+
+        return hist
+
+    def get_partial_state(self):
+        return {'confusion_matrix': self.state.get(self.CONFUSION_MATRIX_KEY)}
+
+    def merge_partial_state(self, partial_state):
+        partial_cm = partial_state['confusion_matrix']
+        if partial_cm is None:
+            return
+        # confusion matrix is shared between segmentation metrics, so it is merged only once like on update
+        self._update_state(
+            lambda confusion_matrix: confusion_matrix + partial_cm, self.CONFUSION_MATRIX_KEY,
+            lambda: np.zeros_like(partial_cm)
+        )
 
     def reset(self):
-        self.state = {}
+        if self.state is None:
+            self.state = {}
+        # state is shared between segmentation metrics, so it is cleared in place for keeping sharing after reset
+        for key in [key for key in self.state if key.startswith(self.CONFUSION_MATRIX_KEY)]:
+            del self.state[key]
         self._update_iter = 0
         if self.profiler:
             self.profiler.reset()
@@ -97,11 +151,18 @@ class SegmentationAccuracy(SegmentationMetric):
 
     def update(self, annotation, prediction):
         cm = super().update(annotation, prediction)
-        result = np.diag(cm).sum() / cm.sum()
+        result = self._image_result(cm)
         if self.profiler:
             self.profiler.update(annotation.identifier, self.name, cm, result, prediction.mask)
         return result
 
+    def update_batch(self, annotations, predictions):
+        return [self._image_result(cm) for cm in super().update_batch(annotations, predictions)]
+
+    @staticmethod
+    def _image_result(cm):
+        return np.diag(cm).sum() / cm.sum()
+
     def evaluate(self, annotations, predictions):
         confusion_matrix = self.state[self.CONFUSION_MATRIX_KEY]
         if self.profiler:
@@ -114,14 +175,21 @@ class SegmentationIOU(SegmentationMetric):
 
     def update(self, annotation, prediction):
         cm = super().update(annotation, prediction)
+        iou = self._image_result(cm)
+        if self.profiler:
+            self.profiler.update(annotation.identifier, self.name, cm, iou, prediction.mask)
+
+        return iou
+
+    def update_batch(self, annotations, predictions):
+        return [self._image_result(cm) for cm in super().update_batch(annotations, predictions)]
+
+    def _image_result(self, cm):
         diagonal = np.diag(cm).astype(float)
         union = cm.sum(axis=1) + cm.sum(axis=0) - diagonal
         iou = np.divide(diagonal, union, out=np.full_like(diagonal, np.nan), where=union != 0)
         if self.ignore_label is not None:
             iou = np.delete(iou, self.ignore_label)
-        if self.profiler:
-            self.profiler.update(annotation.identifier, self.name, cm, iou, prediction.mask)
-
         return iou
 
     def evaluate(self, annotations, predictions):
@@ -148,13 +216,20 @@ class SegmentationMeanAccuracy(SegmentationMetric):
 
     def update(self, annotation, prediction):
         cm = super().update(annotation, prediction)
-        diagonal = np.diag(cm).astype(float)
-        per_class_count = cm.sum(axis=1)
-        acc_cls = np.divide(diagonal, per_class_count, out=np.full_like(diagonal, np.nan), where=per_class_count != 0)
+        acc_cls = self._image_result(cm)
         if self.profiler:
             self.profiler.update(annotation.identifier, self.name, cm, acc_cls, prediction.mask)
         return acc_cls
 
+    def update_batch(self, annotations, predictions):
+        return [self._image_result(cm) for cm in super().update_batch(annotations, predictions)]
+
+    @staticmethod
+    def _image_result(cm):
+        diagonal = np.diag(cm).astype(float)
+        per_class_count = cm.sum(axis=1)
+        return np.divide(diagonal, per_class_count, out=np.full_like(diagonal, np.nan), where=per_class_count != 0)
+
     def evaluate(self, annotations, predictions):
         confusion_matrix = self.state[self.CONFUSION_MATRIX_KEY]
         diagonal = np.diag(confusion_matrix)
@@ -175,17 +250,24 @@ class SegmentationFWAcc(SegmentationMetric):
 
     def update(self, annotation, prediction):
         cm = super().update(annotation, prediction)
-        diagonal = np.diag(cm).astype(float)
-        union = cm.sum(axis=1) + cm.sum(axis=0) - diagonal
-        iou = np.divide(diagonal, union, out=np.zeros_like(diagonal), where=union != 0)
-        freq = cm.sum(axis=1) / cm.sum()
-        result = (freq[freq > 0] * iou[freq > 0]).sum()
+        result = self._image_result(cm)
 
         if self.profiler:
             self.profiler.update(annotation.identifier, self.name, cm, result, prediction.mask)
 
         return result
 
+    def update_batch(self, annotations, predictions):
+        return [self._image_result(cm) for cm in super().update_batch(annotations, predictions)]
+
+    @staticmethod
+    def _image_result(cm):
+        diagonal = np.diag(cm).astype(float)
+        union = cm.sum(axis=1) + cm.sum(axis=0) - diagonal
+        iou = np.divide(diagonal, union, out=np.zeros_like(diagonal), where=union != 0)
+        freq = cm.sum(axis=1) / cm.sum()
+        return (freq[freq > 0] * iou[freq > 0]).sum()
+
     def evaluate(self, annotations, predictions):
         confusion_matrix = self.state[self.CONFUSION_MATRIX_KEY]
         diagonal = np.diag(confusion_matrix)
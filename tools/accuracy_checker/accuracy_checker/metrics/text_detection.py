@@ -14,7 +14,6 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
-import math
 from collections import namedtuple
 import numpy as np
 from .metric import PerImageEvaluationMetric
@@ -24,23 +23,42 @@ from ..utils import polygon_from_points
 
 
 def calculte_recall_precision_matrix(gt_rects, prediction_rects):
-    num_gt = len(gt_rects)
-    num_det = len(prediction_rects)
-    output_shape = [num_gt, num_det]
-    recall_mat = np.empty(output_shape)
-    precision_mat = np.empty(output_shape)
-
-    for gt_id, gt_rect in enumerate(gt_rects):
-        for pred_id, pred_rect in enumerate(prediction_rects):
-            intersected_area = rect_area(gt_rect, pred_rect)
-            rg_dimensions = (gt_rect.xmax - gt_rect.xmin + 1) * (gt_rect.ymax - gt_rect.ymin + 1)
-            rd_dimensions = (pred_rect.xmax - pred_rect.xmin + 1) * (pred_rect.ymax - pred_rect.ymin + 1)
-            recall_mat[gt_id, pred_id] = 0 if rg_dimensions == 0 else intersected_area / rg_dimensions
-            precision_mat[gt_id, pred_id] = 0 if rd_dimensions == 0 else intersected_area / rd_dimensions
+    gt_rects = rects_array(gt_rects)
+    prediction_rects = rects_array(prediction_rects)
+    intersected_area = rect_area(
+        Rectangle(*gt_rects.T[:, :, np.newaxis]), Rectangle(*prediction_rects.T[:, np.newaxis, :])
+    )
+    rg_dimensions = rect_dimensions(Rectangle(*gt_rects.T))[:, np.newaxis]
+    rd_dimensions = rect_dimensions(Rectangle(*prediction_rects.T))[np.newaxis, :]
+    output_shape = (len(gt_rects), len(prediction_rects))
+    recall_mat = np.divide(
+        intersected_area, rg_dimensions, out=np.zeros(output_shape),
+        where=np.broadcast_to(rg_dimensions != 0, output_shape)
+    )
+    precision_mat = np.divide(
+        intersected_area, rd_dimensions, out=np.zeros(output_shape),
+        where=np.broadcast_to(rd_dimensions != 0, output_shape)
+    )
 
     return recall_mat, precision_mat
 
 
+def polygons_bounds_overlap(gt_polygons, prediction_polygons):
+    """
+    Checks which pairs of polygons have bounding boxes overlapping with non-zero area.
+    Polygons without such overlap have zero intersection area, so shapely intersection may be skipped for them.
+    """
+    gt_bounds, prediction_bounds = (
+        np.array([polygon.bounds or (np.nan, ) * 4 for polygon in polygons], dtype=float).reshape(-1, 4)
+        for polygons in (gt_polygons, prediction_polygons)
+    )
+    gx_min, gy_min, gx_max, gy_max = gt_bounds.T[:, :, np.newaxis]
+    px_min, py_min, px_max, py_max = prediction_bounds.T[:, np.newaxis, :]
+
+    return (np.minimum(gx_max, px_max) > np.maximum(gx_min, px_min)) & (
+        np.minimum(gy_max, py_max) > np.maximum(gy_min, py_min))
+
+
 def get_union(detection_polygon, annotation_polygon):
     area_prediction = detection_polygon.area
     area_annotation = annotation_polygon.area
@@ -61,16 +79,17 @@ Rectangle = namedtuple('Rectangle', 'xmin ymin xmax ymax')
 Point = namedtuple('Point', 'x y')
 
 
+# rectangle helpers accept both scalar coordinates and arrays of coordinates for broadcasted computation
 def rect_center(r):
-    x = float(r.xmin) + float(r.xmax - r.xmin + 1) / 2.
-    y = float(r.ymin) + float(r.ymax - r.ymin + 1) / 2.
+    x = np.asarray(r.xmin, dtype=float) + np.asarray(r.xmax - r.xmin + 1, dtype=float) / 2.
+    y = np.asarray(r.ymin, dtype=float) + np.asarray(r.ymax - r.ymin + 1, dtype=float) / 2.
     return Point(x, y)
 
 
 def rect_point_distance(r1, r2):
-    distx = math.fabs(r1.x - r2.x)
-    disty = math.fabs(r1.y - r2.y)
-    return math.sqrt(distx * distx + disty * disty)
+    distx = np.abs(r1.x - r2.x)
+    disty = np.abs(r1.y - r2.y)
+    return np.sqrt(distx * distx + disty * disty)
 
 
 def rect_center_distance(r1, r2):
@@ -80,21 +99,28 @@ def rect_center_distance(r1, r2):
 def rect_diag(r):
     w = (r.xmax - r.xmin + 1)
     h = (r.ymax - r.ymin + 1)
-    return math.sqrt(h * h + w * w)
+    return np.sqrt(np.asarray(h * h + w * w, dtype=float))
+
+
+def rect_dimensions(r):
+    return (r.xmax - r.xmin + 1) * (r.ymax - r.ymin + 1)
 
 
 def rect_area(a, b):
-    dx = min(a.xmax, b.xmax) - max(a.xmin, b.xmin) + 1
-    dy = min(a.ymax, b.ymax) - max(a.ymin, b.ymin) + 1
-    if (dx >= 0) and (dy >= 0):
-        return dx*dy
-    return 0.
+    dx = np.minimum(a.xmax, b.xmax) - np.maximum(a.xmin, b.xmin) + 1
+    dy = np.minimum(a.ymax, b.ymax) - np.maximum(a.ymin, b.ymin) + 1
+    return np.where((dx >= 0) & (dy >= 0), dx * dy, 0.)
 
 
 def rect_from_points(points):
     return Rectangle(*points)
 
 
+def rects_array(rects):
+    rects = np.asarray(rects).reshape(-1, 4)
+    return rects.astype(float) if np.issubdtype(rects.dtype, np.floating) else rects
+
+
 class FocusedTextLocalizationMetric(PerImageEvaluationMetric):
     annotation_types = (TextDetectionAnnotation, )
     prediction_types = (TextDetectionPrediction, DetectionPrediction, )
@@ -149,8 +175,8 @@ class FocusedTextLocalizationMetric(PerImageEvaluationMetric):
         self.recall_sum = 0
 
     def update(self, annotation, prediction):
-        gt_rects = list(map(rect_from_points, annotation.boxes))
-        prediction_rects = list(map(rect_from_points, prediction.boxes))
+        gt_rects = rects_array(annotation.boxes)
+        prediction_rects = rects_array(prediction.boxes)
         num_gt = len(gt_rects)
         num_det = len(prediction_rects)
         gt_difficult_mask = np.full(num_gt, False)
@@ -225,19 +251,10 @@ class FocusedTextLocalizationMetric(PerImageEvaluationMetric):
         raise NotImplementedError()
 
     def _update_difficult_prediction_mask(self, gt_difficult_inds, dt_difficult_mask, gt_rects, dt_rects):
-        for det_id, detection_rect in enumerate(dt_rects):
-            for gt_difficult_id in gt_difficult_inds:
-                gt_difficult_rect = gt_rects[gt_difficult_id]
-                intersected_area = rect_area(gt_difficult_rect, detection_rect)
-                width = detection_rect.xmax - detection_rect.xmin + 1
-                height = detection_rect.ymax - detection_rect.ymin + 1
-                rd_dimensions = width * height
-                if rd_dimensions == 0:
-                    precision = 0
-                else:
-                    precision = intersected_area / rd_dimensions
-                if precision > self.area_precision_constrain:
-                    dt_difficult_mask[det_id] = True
+        if np.size(gt_difficult_inds) == 0 or np.size(dt_rects) == 0:
+            return dt_difficult_mask
+        _, precision_mat = calculte_recall_precision_matrix(rects_array(gt_rects)[gt_difficult_inds], dt_rects)
+        dt_difficult_mask[np.any(precision_mat > self.area_precision_constrain, axis=0)] = True
 
         return dt_difficult_mask
 
@@ -245,80 +262,42 @@ class FocusedTextLocalizationMetric(PerImageEvaluationMetric):
             self, gt_rects, prediction_rects, gt_difficult_mask, prediction_difficult_mask, gt_rect_mat, det_rect_mat,
             recall_mat, precision_mat
     ):
-        def match_rects(row, col, recall_mat, precision_mat):
-            cont = 0
-            for j in range(len(recall_mat[0])):
-                recall_constrain_pass = recall_mat[row, j] >= self.area_recall_constrain
-                precision_constrain_pass = precision_mat[row, j] >= self.area_precision_constrain
-                if recall_constrain_pass and precision_constrain_pass:
-                    cont += 1
-            if cont != 1:
-                return False
-            cont = 0
-            for i in range(len(recall_mat)):
-                recall_constrain_pass = recall_mat[i, col] >= self.area_recall_constrain
-                precision_constrain_pass = precision_mat[i, col] >= self.area_precision_constrain
-                if recall_constrain_pass and precision_constrain_pass:
-                    cont += 1
-            if cont != 1:
-                return False
-
-            recall_constrain_pass = recall_mat[row, col] >= self.area_recall_constrain
-            precision_constrain_pass = precision_mat[row, col] >= self.area_precision_constrain
-
-            if recall_constrain_pass and precision_constrain_pass:
-                return True
-            return False
-
-        recall_accum = 0
-        precision_accum = 0
-        for gt_id, gt_rect in enumerate(gt_rects):
-            for pred_id, pred_rect in enumerate(prediction_rects):
-                both_not_matched = not gt_rect_mat[gt_id] and not det_rect_mat[pred_id]
-                difficult = gt_difficult_mask[gt_id] and prediction_difficult_mask[pred_id]
-                if both_not_matched and not difficult:
-                    match = match_rects(gt_id, pred_id, recall_mat, precision_mat)
-                    if match:
-                        norm_distance = rect_center_distance(gt_rect, pred_rect)
-                        norm_distance /= rect_diag(gt_rect) + rect_diag(pred_rect)
-                        norm_distance *= 2.0
-                        if norm_distance < self.center_diff_threshold:
-                            gt_rect_mat[gt_id] = self.one_to_one_match_score
-                            det_rect_mat[pred_id] = 1
-                            recall_accum += 1
-                            precision_accum += 1
-
-        return recall_accum, precision_accum, det_rect_mat, gt_rect_mat
+        matched = (recall_mat >= self.area_recall_constrain) & (precision_mat >= self.area_precision_constrain)
+        # pair is matched only if both ground truth and prediction have no other matches
+        matched &= (np.count_nonzero(matched, axis=1) == 1)[:, np.newaxis] & (np.count_nonzero(matched, axis=0) == 1)
+        matched &= ~(gt_difficult_mask[:, np.newaxis] & prediction_difficult_mask)
+        matched &= (gt_rect_mat == 0)[:, np.newaxis] & (det_rect_mat == 0)
+        gt_ids, pred_ids = np.nonzero(matched)
+        gt_matched_rects = Rectangle(*rects_array(gt_rects)[gt_ids].T)
+        pred_matched_rects = Rectangle(*rects_array(prediction_rects)[pred_ids].T)
+        norm_distance = rect_center_distance(gt_matched_rects, pred_matched_rects)
+        norm_distance /= rect_diag(gt_matched_rects) + rect_diag(pred_matched_rects)
+        norm_distance *= 2.0
+        close_enough = norm_distance < self.center_diff_threshold
+        gt_rect_mat[gt_ids[close_enough]] = self.one_to_one_match_score
+        det_rect_mat[pred_ids[close_enough]] = 1
+        matches_num = int(np.count_nonzero(close_enough))
+
+        return matches_num, matches_num, det_rect_mat, gt_rect_mat
 
     def _one_to_many_match(
             self, gt_rects, gt_difficult_mask, pred_difficult_mask, gt_rect_mat, det_rect_mat, recall_mat, precision_mat
     ):
-        def match_rects(gt_id, recall_mat, precision_mat, gt_rect_mat, det_rect_mat, pred_difficult_mask):
-            many_sum = 0
-            det_rects = []
-            for det_num in range(len(recall_mat[0])):
-                if gt_rect_mat[gt_id] == 0 and det_rect_mat[det_num] == 0 and pred_difficult_mask[det_num]:
-                    if precision_mat[gt_id, det_num] >= self.area_precision_constrain:
-                        many_sum += recall_mat[gt_id, det_num]
-                        det_rects.append(det_num)
-            if many_sum >= self.area_recall_constrain:
-                return True, det_rects
-            return False, []
-
         recall_accum = 0
         precision_accum = 0
-
-        for gt_id, _ in enumerate(gt_rects):
-            if not gt_difficult_mask[gt_id]:
-                match, matches_det = match_rects(
-                    gt_id, recall_mat, precision_mat, gt_rect_mat, det_rect_mat, pred_difficult_mask
-                )
-                if match:
-                    gt_rect_mat[gt_id] = 1
-                    recall_accum += self.one_to_many_match_score
-                    precision_accum += self.one_to_many_match_score * len(matches_det)
-                    for det_id in matches_det:
-                        det_rect_mat[det_id] = 1
+        candidates = (precision_mat >= self.area_precision_constrain) & pred_difficult_mask
+        gt_ids = np.flatnonzero(~gt_difficult_mask & (
+            (gt_rect_mat == 0) & np.any(candidates, axis=1) | (self.area_recall_constrain <= 0)
+        ))
+        # matched predictions are excluded from further matching, so ground truth is processed in order
+        for gt_id in gt_ids:
+            matches_det = np.flatnonzero(candidates[gt_id] & (det_rect_mat == 0) & (gt_rect_mat[gt_id] == 0))
+            many_sum = np.cumsum(recall_mat[gt_id, matches_det])[-1] if matches_det.size else 0
+            if many_sum >= self.area_recall_constrain:
+                gt_rect_mat[gt_id] = 1
+                recall_accum += self.one_to_many_match_score
+                precision_accum += self.one_to_many_match_score * len(matches_det)
+                det_rect_mat[matches_det] = 1
 
         return recall_accum, precision_accum, det_rect_mat, gt_rect_mat
 
@@ -326,32 +305,21 @@ class FocusedTextLocalizationMetric(PerImageEvaluationMetric):
             self, prediction_rects, prediction_difficult_mask, gt_difficult_mask, gt_rect_mat, det_rect_mat,
             recall_mat, precision_mat
     ):
-        def match_rects(det_id, recall_mat, precision_mat, gt_rect_mat, det_rect_mat, gt_difficult_mask):
-            many_sum = 0
-            gt_rects = []
-            for gt_id in range(len(recall_mat)):
-                if gt_rect_mat[gt_id] == 0 and det_rect_mat[det_id] == 0 and not gt_difficult_mask[gt_id]:
-                    if recall_mat[gt_id, det_id] >= self.area_recall_constrain:
-                        many_sum += precision_mat[gt_id, det_id]
-                        gt_rects.append(gt_id)
-            if many_sum >= self.area_precision_constrain:
-                return True, gt_rects
-            return False, []
-
         recall_accum = 0
         precision_accum = 0
-
-        for pred_id, _ in enumerate(prediction_rects):
-            if not prediction_difficult_mask[pred_id]:
-                match, matches_gt = match_rects(
-                    pred_id, recall_mat, precision_mat, gt_rect_mat, det_rect_mat, gt_difficult_mask
-                )
-                if match:
-                    det_rect_mat[pred_id] = 1
-                    recall_accum += self.many_to_one_match_score * len(matches_gt)
-                    precision_accum += self.many_to_one_match_score
-                    for gt_id in matches_gt:
-                        gt_rect_mat[gt_id] = 1
+        candidates = (recall_mat >= self.area_recall_constrain) & ~gt_difficult_mask[:, np.newaxis]
+        pred_ids = np.flatnonzero(~prediction_difficult_mask & (
+            (det_rect_mat == 0) & np.any(candidates, axis=0) | (self.area_precision_constrain <= 0)
+        ))
+        # matched ground truth is excluded from further matching, so predictions are processed in order
+        for pred_id in pred_ids:
+            matches_gt = np.flatnonzero(candidates[:, pred_id] & (gt_rect_mat == 0) & (det_rect_mat[pred_id] == 0))
+            many_sum = np.cumsum(precision_mat[matches_gt, pred_id])[-1] if matches_gt.size else 0
+            if many_sum >= self.area_precision_constrain:
+                det_rect_mat[pred_id] = 1
+                recall_accum += self.many_to_one_match_score * len(matches_gt)
+                precision_accum += self.many_to_one_match_score
+                gt_rect_mat[matches_gt] = 1
 
         return recall_accum, precision_accum, det_rect_mat, gt_rect_mat
 
@@ -456,9 +424,14 @@ class IncidentalSceneTextLocalizationMetric(PerImageEvaluationMetric):
             prediction_difficult_inds = prediction.metadata.get('difficult_boxes', [])
             gt_difficult_mask[gt_difficult_inds] = True
             prediction_difficult_mask[prediction_difficult_inds] = True
+            difficult_overlap = polygons_bounds_overlap(
+                [gt_polygons[idx] for idx in gt_difficult_inds], prediction_polygons
+            )
+            if self.area_precision_constrain <= 0:
+                difficult_overlap[:] = True
             for det_id, detection_polygon in enumerate(prediction_polygons):
-                for gt_difficult_id in gt_difficult_inds:
-                    gt_difficult_polygon = gt_polygons[gt_difficult_id]
+                for difficult_id in np.flatnonzero(difficult_overlap[:, det_id]):
+                    gt_difficult_polygon = gt_polygons[gt_difficult_inds[difficult_id]]
                     intersected_area = get_intersection_area(gt_difficult_polygon,
                                                              detection_polygon)
                     pd_dimensions = detection_polygon.area
@@ -469,25 +442,24 @@ class IncidentalSceneTextLocalizationMetric(PerImageEvaluationMetric):
                         break
 
         if num_gt > 0 and num_det > 0:
-            iou_matrix = np.empty((num_gt, num_det))
-            gt_matched = np.zeros(num_gt, np.int8)
-            det_matched = np.zeros(num_det, np.int8)
-
-            for gt_id, gt_polygon in enumerate(gt_polygons):
-                for pred_id, pred_polygon in enumerate(prediction_polygons):
-                    iou_matrix[gt_id, pred_id] = get_intersection_over_union(pred_polygon, gt_polygon)
-                    not_matched_before = gt_matched[gt_id] == 0 and det_matched[pred_id] == 0
-                    not_difficult = not gt_difficult_mask[gt_id] and not prediction_difficult_mask[pred_id]
-                    if not_matched_before and not_difficult:
-                        iou_big_enough = iou_matrix[gt_id, pred_id] >= self.iou_constrain
-                        if not self.word_spotting:
-                            transcriptions_equal = True
-                        else:
-                            transcriptions_equal = gt_texts[gt_id].lower() == prediction_texts[pred_id].lower()
-                        if iou_big_enough and transcriptions_equal:
-                            gt_matched[gt_id] = 1
-                            det_matched[pred_id] = 1
-                            num_det_matched += 1
+            det_matched = np.zeros(num_det, bool)
+            candidates = ~gt_difficult_mask[:, np.newaxis] & ~prediction_difficult_mask
+            if self.iou_constrain > 0:
+                # polygons without overlapping bounding boxes have zero intersection over union
+                candidates &= polygons_bounds_overlap(gt_polygons, prediction_polygons)
+            if self.word_spotting:
+                candidates &= (
+                    np.array([text.lower() for text in gt_texts])[:, np.newaxis] ==
+                    np.array([text.lower() for text in prediction_texts])
+                )
+
+            for gt_id in np.flatnonzero(np.any(candidates, axis=1)):
+                for pred_id in np.flatnonzero(candidates[gt_id] & ~det_matched):
+                    iou = get_intersection_over_union(prediction_polygons[pred_id], gt_polygons[gt_id])
+                    if iou >= self.iou_constrain:
+                        det_matched[pred_id] = True
+                        num_det_matched += 1
+                        break
 
         num_ignored_gt = np.sum(gt_difficult_mask)
         num_ignored_pred = np.sum(prediction_difficult_mask)
@@ -46,6 +46,214 @@ def set_scores(prediction, scores):
 def set_box_scores(prediction, scores):
     prediction.bbox_scores = scores
 
+NMS_BLOCK_SIZE = 64
+
+
+def pairwise_overlap(boxes_a, boxes_b, include_boundaries=True, use_min_area=False, diou=False):
+    """
+    Computes overlap matrix between two sets of boxes.
+    Args:
+        boxes_a, boxes_b: tuples of x_mins, y_mins, x_maxs, y_maxs and areas arrays.
+        include_boundaries: shows if boundaries are included.
+        use_min_area: use minimum area of two boxes as base area instead of union.
+        diou: subtract normalized distance between boxes centers (Distance-IoU).
+    Returns:
+        matrix with overlap of boxes_a[i] and boxes_b[j] on position [i, j].
+    """
+    b = 1 if include_boundaries else 0
+    x1_a, y1_a, x2_a, y2_a, areas_a = (value[:, np.newaxis] for value in boxes_a)
+    x1_b, y1_b, x2_b, y2_b, areas_b = (value[np.newaxis] for value in boxes_b)
+
+    intersection = np.minimum(x2_a, x2_b)
+    intersection -= np.maximum(x1_a, x1_b)
+    h = np.minimum(y2_a, y2_b)
+    h -= np.maximum(y1_a, y1_b)
+    if b:
+        intersection += b
+        h += b
+    np.maximum(intersection, 0, out=intersection)
+    np.maximum(h, 0, out=h)
+    intersection *= h
+    if use_min_area:
+        base_area = np.minimum(areas_a, areas_b)
+    else:
+        base_area = areas_a + areas_b
+        base_area -= intersection
+    overlap = np.divide(
+        intersection, base_area, out=np.zeros_like(intersection, dtype=float), where=base_area != 0
+    )
+    if diou:
+        cw = np.maximum(x2_a, x2_b) - np.minimum(x1_a, x1_b)
+        ch = np.maximum(y2_a, y2_b) - np.minimum(y1_a, y1_b)
+        c_area = cw ** 2 + ch ** 2 + 1e-16
+        d_area = ((x2_b + x1_b) - (x2_a + x1_a)) ** 2 / 4 + ((y2_b + y1_b) - (y2_a + y1_a)) ** 2 / 4
+        overlap = overlap - pow(d_area / c_area, 0.6)
+
+    return overlap
+
+
+def _greedy_nms(boxes, thresh, overlap_kwargs):
+    """
+    Greedy NMS for boxes sorted by score, returns positions of kept boxes.
+    Remaining candidates are processed by blocks: boxes of the block are resolved using the block overlap matrix,
+    then the kept ones suppress the rest of candidates with single matrix operation, so number of numpy calls
+    depends on number of blocks instead of number of kept boxes.
+    """
+    boxes = np.stack(boxes)
+    positions = np.arange(boxes.shape[1])
+    keep = []
+    while positions.size:
+        block = boxes[:, :NMS_BLOCK_SIZE]
+        block_suppression = pairwise_overlap(block, block, **overlap_kwargs) > thresh
+        block_suppressed = np.zeros(block.shape[1], dtype=bool)
+        block_keep = []
+        for idx in range(block.shape[1]):
+            if block_suppressed[idx]:
+                continue
+            block_keep.append(idx)
+            block_suppressed[idx + 1:] |= block_suppression[idx, idx + 1:]
+        keep.append(positions[block_keep])
+        boxes, positions = boxes[:, NMS_BLOCK_SIZE:], positions[NMS_BLOCK_SIZE:]
+        if positions.size:
+            remaining = ~(pairwise_overlap(block[:, block_keep], boxes, **overlap_kwargs) > thresh).any(axis=0)
+            boxes, positions = boxes[:, remaining], positions[remaining]
+
+    return np.concatenate(keep) if keep else positions
+
+
+def _score_order(scores, groups=None, keep_top_k=None):
+    order = scores.argsort()[::-1]
+    if groups is None:
+        return order[:keep_top_k] if keep_top_k else order
+    order = order[np.argsort(groups[order], kind='stable')]
+    if keep_top_k:
+        sorted_groups = groups[order]
+        group_starts = np.r_[0, np.flatnonzero(sorted_groups[1:] != sorted_groups[:-1]) + 1]
+        group_sizes = np.diff(np.r_[group_starts, len(order)])
+        rank = np.arange(len(order)) - np.repeat(group_starts, group_sizes)
+        order = order[rank < keep_top_k]
+    return order
+
+
+def nms_keep_indices(
+        x1, y1, x2, y2, scores, thresh, groups=None, include_boundaries=True, keep_top_k=None, use_min_area=False,
+        diou=False
+):
+    """
+    Greedy (hard or Distance-IoU) NMS.
+    Args:
+        x1, y1, x2, y2: boxes coordinates.
+        scores: boxes scores.
+        thresh: overlap threshold, boxes with overlap greater than threshold are suppressed.
+        groups: optional integer array (e.g. labels or combined image and label ids of batch), boxes from
+            different groups do not suppress each other, so per-class NMS for whole batch is done by single call.
+        include_boundaries: shows if boundaries are included.
+        keep_top_k: only keep_top_k boxes with highest scores (per group) are considered.
+        use_min_area: use minimum area of two boxes as base area to calculate overlap.
+        diou: use Distance-IoU as overlap.
+    Returns:
+        indices of kept boxes, sorted by group and score in descending order.
+    """
+    scores = np.asarray(scores)
+    if not scores.size:
+        return np.array([], dtype=int)
+    if groups is not None:
+        groups = np.asarray(groups)
+    order = _score_order(scores, groups, keep_top_k)
+    b = 1 if include_boundaries else 0
+    # overlap is computed in place, so integer coordinates are converted to float
+    x1, y1, x2, y2 = (np.asarray(value, dtype=float)[order] for value in (x1, y1, x2, y2))
+    boxes = (x1, y1, x2, y2, (x2 - x1 + b) * (y2 - y1 + b))
+    overlap_kwargs = {'include_boundaries': include_boundaries, 'use_min_area': use_min_area, 'diou': diou}
+    if groups is None:
+        return order[_greedy_nms(boxes, thresh, overlap_kwargs)]
+    sorted_groups = groups[order]
+    bounds = np.r_[0, np.flatnonzero(sorted_groups[1:] != sorted_groups[:-1]) + 1, len(order)]
+    keep = [
+        start + _greedy_nms(tuple(value[start:end] for value in boxes), thresh, overlap_kwargs)
+        for start, end in zip(bounds[:-1], bounds[1:])
+    ]
+
+    return order[np.concatenate(keep)]
+
+
+def nms_keep_mask(x1, y1, x2, y2, scores, thresh, **kwargs):
+    """
+    Returns boolean mask of boxes kept by nms_keep_indices.
+    """
+    keep = np.zeros(len(scores), dtype=bool)
+    keep[nms_keep_indices(x1, y1, x2, y2, scores, thresh, **kwargs)] = True
+    return keep
+
+
+def soft_nms(boxes, scores, keep_top_k=200, sigma=0.5, min_score=0):
+    """
+    Gaussian Soft-NMS.
+    Args:
+        boxes: array with [x_min, y_min, x_max, y_max] rows.
+        scores: boxes scores.
+        keep_top_k: maximal number of kept boxes, only keep_top_k boxes with highest scores are considered.
+        sigma: parameter of gaussian score decay.
+        min_score: scores lower than this value are not kept, zero scores are never kept.
+    Returns:
+        indices of kept boxes and their updated scores.
+    """
+    if len(boxes) == 0:  # pylint: disable=len-as-condition
+        return np.array([], dtype=np.int32), np.array([], dtype=np.float32)
+
+    if len(boxes) > keep_top_k:
+        indices = np.argsort(-scores)[:keep_top_k]
+        scores = scores[indices]
+        boxes = boxes[indices]
+    else:
+        scores = np.copy(scores)
+        indices = np.arange(len(scores))
+
+    similarity_matrix = _matrix_iou(boxes, boxes)
+
+    out_ids = []
+    out_scores = []
+    for _ in range(min(keep_top_k, len(scores))):
+        bbox_id = np.argmax(scores)
+        bbox_score = scores[bbox_id]
+        # kept boxes have zero score, so they are not selected again
+        if bbox_score <= 0 or bbox_score < min_score:
+            break
+
+        out_ids.append(indices[bbox_id])
+        out_scores.append(bbox_score)
+        scores[bbox_id] = 0.0
+
+        iou_values = similarity_matrix[bbox_id]
+        scores *= np.exp(np.negative(np.square(iou_values) / sigma))
+
+    return np.array(out_ids, dtype=np.int32), np.array(out_scores, dtype=np.float32)
+
+
+def _matrix_iou(set_a, set_b):
+    intersect_xmin = np.maximum(set_a[:, 0].reshape([-1, 1]), set_b[:, 0].reshape([1, -1]))
+    intersect_ymin = np.maximum(set_a[:, 1].reshape([-1, 1]), set_b[:, 1].reshape([1, -1]))
+    intersect_xmax = np.minimum(set_a[:, 2].reshape([-1, 1]), set_b[:, 2].reshape([1, -1]))
+    intersect_ymax = np.minimum(set_a[:, 3].reshape([-1, 1]), set_b[:, 3].reshape([1, -1]))
+
+    intersect_widths = np.maximum(0.0, intersect_xmax - intersect_xmin)
+    intersect_heights = np.maximum(0.0, intersect_ymax - intersect_ymin)
+
+    intersect_areas = intersect_widths * intersect_heights
+    areas_set_a = ((set_a[:, 2] - set_a[:, 0]) * (set_a[:, 3] - set_a[:, 1])).reshape([-1, 1])
+    areas_set_b = ((set_b[:, 2] - set_b[:, 0]) * (set_b[:, 3] - set_b[:, 1])).reshape([1, -1])
+
+    areas_set_a[np.less(areas_set_a, 0.0)] = 0.0
+    areas_set_b[np.less(areas_set_b, 0.0)] = 0.0
+
+    union_areas = areas_set_a + areas_set_b - intersect_areas
+
+    overlaps = intersect_areas / union_areas
+    overlaps[np.less_equal(union_areas, 0.0)] = 0.0
+
+    return overlaps
+
+
 class NMS(Postprocessor):
     __provider__ = 'nms'
 
@@ -79,57 +287,25 @@ class NMS(Postprocessor):
 
     def process_image(self, annotations, predictions):
         for prediction in predictions:
-            scores = get_scores(prediction)
-            keep = self.nms(
-                prediction.x_mins, prediction.y_mins, prediction.x_maxs, prediction.y_maxs, scores,
-                self.overlap, self.include_boundaries, self.keep_top_k, self.use_min_area
+            keep = nms_keep_mask(
+                prediction.x_mins, prediction.y_mins, prediction.x_maxs, prediction.y_maxs, get_scores(prediction),
+                self.overlap, include_boundaries=self.include_boundaries, keep_top_k=self.keep_top_k,
+                use_min_area=self.use_min_area
             )
-            prediction.remove([box for box in range(len(prediction.x_mins)) if box not in keep])
+            prediction.remove(~keep)
 
         return annotations, predictions
 
     @staticmethod
     def nms(x1, y1, x2, y2, scores, thresh, include_boundaries=True, keep_top_k=None, use_min_area=False):
         """
-        Pure Python NMS baseline.
+        Greedy NMS, returns indices of kept boxes sorted by score.
         """
-        b = 1 if include_boundaries else 0
-
-        areas = (x2 - x1 + b) * (y2 - y1 + b)
-        order = scores.argsort()[::-1]
-
-        if keep_top_k:
-            order = order[:keep_top_k]
+        return nms_keep_indices(
+            x1, y1, x2, y2, scores, thresh, include_boundaries=include_boundaries, keep_top_k=keep_top_k,
+            use_min_area=use_min_area
+        )
 
-        keep = []
-
-        while order.size > 0:
-            i = order[0]
-            keep.append(i)
-
-            xx1 = np.maximum(x1[i], x1[order[1:]])
-            yy1 = np.maximum(y1[i], y1[order[1:]])
-            xx2 = np.minimum(x2[i], x2[order[1:]])
-            yy2 = np.minimum(y2[i], y2[order[1:]])
-
-            w = np.maximum(0.0, xx2 - xx1 + b)
-            h = np.maximum(0.0, yy2 - yy1 + b)
-            intersection = w * h
-
-            if use_min_area:
-                base_area = np.minimum(areas[i], areas[order[1:]])
-            else:
-                base_area = (areas[i] + areas[order[1:]] - intersection)
-
-            overlap = np.divide(
-                intersection,
-                base_area,
-                out=np.zeros_like(intersection, dtype=float),
-                where=base_area != 0
-            )
-            order = order[np.where(overlap <= thresh)[0] + 1] # pylint: disable=W0143
-
-        return keep
 
 class SoftNMS(Postprocessor):
     __provider__ = 'soft_nms'
@@ -166,70 +342,21 @@ class SoftNMS(Postprocessor):
             if not prediction.size:
                 continue
 
-            scores = get_scores(prediction)
             keep, new_scores = self._nms(
-                np.c_[prediction.x_mins, prediction.y_mins, prediction.x_maxs, prediction.y_maxs], scores,
+                np.c_[prediction.x_mins, prediction.y_mins, prediction.x_maxs, prediction.y_maxs],
+                get_scores(prediction)
             )
-            prediction.remove([box for box in range(len(prediction.x_mins)) if box not in keep])
-            set_scores(prediction, new_scores)
+            removed = np.ones(prediction.size, dtype=bool)
+            removed[keep] = False
+            prediction.remove(removed)
+            # kept boxes stay in original order, while updated scores are sorted by score
+            set_scores(prediction, new_scores[np.argsort(keep)])
 
         return annotations, predictions
 
-    @staticmethod
-    def _matrix_iou(set_a, set_b):
-        intersect_xmin = np.maximum(set_a[:, 0].reshape([-1, 1]), set_b[:, 0].reshape([1, -1]))
-        intersect_ymin = np.maximum(set_a[:, 1].reshape([-1, 1]), set_b[:, 1].reshape([1, -1]))
-        intersect_xmax = np.minimum(set_a[:, 2].reshape([-1, 1]), set_b[:, 2].reshape([1, -1]))
-        intersect_ymax = np.minimum(set_a[:, 3].reshape([-1, 1]), set_b[:, 3].reshape([1, -1]))
-
-        intersect_widths = np.maximum(0.0, intersect_xmax - intersect_xmin)
-        intersect_heights = np.maximum(0.0, intersect_ymax - intersect_ymin)
-
-        intersect_areas = intersect_widths * intersect_heights
-        areas_set_a = ((set_a[:, 2] - set_a[:, 0]) * (set_a[:, 3] - set_a[:, 1])).reshape([-1, 1])
-        areas_set_b = ((set_b[:, 2] - set_b[:, 0]) * (set_b[:, 3] - set_b[:, 1])).reshape([1, -1])
-
-        areas_set_a[np.less(areas_set_a, 0.0)] = 0.0
-        areas_set_b[np.less(areas_set_b, 0.0)] = 0.0
-
-        union_areas = areas_set_a + areas_set_b - intersect_areas
-
-        overlaps = intersect_areas / union_areas
-        overlaps[np.less_equal(union_areas, 0.0)] = 0.0
-
-        return overlaps
-
     def _nms(self, input_bboxes, input_scores):
-        if len(input_bboxes) == 0:  # pylint: disable=len-as-condition
-            return [], []
-
-        if len(input_bboxes) > self.keep_top_k:
-            indices = np.argsort(-input_scores)[:self.keep_top_k]
-            scores = input_scores[indices]
-            bboxes = input_bboxes[indices]
-        else:
-            scores = np.copy(input_scores)
-            indices = np.arange(len(scores))
-            bboxes = input_bboxes
-
-        similarity_matrix = self._matrix_iou(bboxes, bboxes)
-
-        out_ids = []
-        out_scores = []
-        for _ in range(self.keep_top_k):
-            bbox_id = np.argmax(scores)
-            bbox_score = scores[bbox_id]
-            if bbox_score < self.min_score:
-                break
-
-            out_ids.append(indices[bbox_id])
-            out_scores.append(bbox_score)
-            scores[bbox_id] = 0.0
+        return soft_nms(input_bboxes, input_scores, self.keep_top_k, self.sigma, self.min_score)
 
-            iou_values = similarity_matrix[bbox_id]
-            scores *= np.exp(np.negative(np.square(iou_values) / self.sigma))
-
-        return np.array(out_ids, dtype=np.int32), np.array(out_scores, dtype=np.float32)
 
 class DIoUNMS(Postprocessor):
     __provider__ = 'diou_nms'
@@ -259,56 +386,20 @@ class DIoUNMS(Postprocessor):
 
     def process_image(self, annotations, predictions):
         for prediction in predictions:
-            scores = get_scores(prediction)
-            keep = self.diou_nms(
-                prediction.x_mins, prediction.y_mins, prediction.x_maxs, prediction.y_maxs, scores,
-                self.overlap, self.include_boundaries, self.keep_top_k
+            keep = nms_keep_mask(
+                prediction.x_mins, prediction.y_mins, prediction.x_maxs, prediction.y_maxs, get_scores(prediction),
+                self.overlap, include_boundaries=self.include_boundaries, keep_top_k=self.keep_top_k, diou=True
             )
-            prediction.remove([box for box in range(len(prediction.x_mins)) if box not in keep])
+            prediction.remove(~keep)
 
         return annotations, predictions
 
     @staticmethod
     def diou_nms(x1, y1, x2, y2, scores, thresh, include_boundaries=True, keep_top_k=None, use_min_area=False):
-
-        b = 1 if include_boundaries else 0
-
-        areas = (x2 - x1 + b) * (y2 - y1 + b)
-        order = scores.argsort()[::-1]
-
-        if keep_top_k:
-            order = order[:keep_top_k]
-
-        keep = []
-
-        while order.size > 0:
-            i = order[0]
-            keep.append(i)
-
-            xx1 = np.maximum(x1[i], x1[order[1:]])
-            yy1 = np.maximum(y1[i], y1[order[1:]])
-            xx2 = np.minimum(x2[i], x2[order[1:]])
-            yy2 = np.minimum(y2[i], y2[order[1:]])
-
-            w = np.maximum(0.0, xx2 - xx1 + b)
-            h = np.maximum(0.0, yy2 - yy1 + b)
-            intersection = w * h
-
-            cw = np.maximum(x2[i], x2[order[1:]]) - np.minimum(x1[i], x1[order[1:]])
-            ch = np.maximum(y2[i], y2[order[1:]]) - np.minimum(y1[i], y1[order[1:]])
-            c_area = cw**2 + ch**2 + 1e-16
-            d_1 = ((x2[order[1:]] + x1[order[1:]]) - (x2[i] + x1[i]))**2 / 4
-            d_2 = ((y2[order[1:]] + y1[order[1:]]) - (y2[i] + y1[i]))**2 / 4
-            d_area = d_1 + d_2
-
-            base_area = (areas[i] + areas[order[1:]] - intersection)
-
-            overlap = np.divide(
-                intersection,
-                base_area,
-                out=np.zeros_like(intersection, dtype=float),
-                where=base_area != 0
-            ) - pow(d_area / c_area, 0.6)
-            order = order[np.where(overlap <= thresh)[0] + 1] # pylint: disable=W0143
-
-        return keep
+        """
+        Greedy NMS with Distance-IoU overlap, returns indices of kept boxes sorted by score.
+        """
+        return nms_keep_indices(
+            x1, y1, x2, y2, scores, thresh, include_boundaries=include_boundaries, keep_top_k=keep_top_k,
+            use_min_area=use_min_area, diou=True
+        )
@@ -28,6 +28,7 @@ class PreprocessingExecutor:
     ):
         self.processors = []
         self.dataset_meta = dataset_meta
+        self._input_shapes = None
         self._multi_infer_transformations = False
         self.ie_processor = None
         if enable_ie_preprocessing:
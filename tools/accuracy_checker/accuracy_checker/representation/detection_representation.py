@@ -20,6 +20,15 @@ from ..utils import remove_difficult
 from .base_representation import BaseRepresentation
 
 
+def removal_indexes(indexes):
+    """
+    Converts boolean mask of removed boxes (e.g. inverted NMS keep mask) to sorted indexes.
+    """
+    if isinstance(indexes, np.ndarray) and indexes.dtype == bool:
+        return np.flatnonzero(indexes)
+    return indexes
+
+
 class Detection(BaseRepresentation):
     def __init__(self, identifier='', labels=None, x_mins=None, y_mins=None, x_maxs=None, y_maxs=None, metadata=None):
         super().__init__(identifier, metadata)
@@ -31,6 +40,7 @@ class Detection(BaseRepresentation):
         self.y_maxs = np.array(y_maxs) if y_maxs is not None else np.array([])
 
     def remove(self, indexes):
+        indexes = removal_indexes(indexes)
         self.labels = np.delete(self.labels, indexes)
         self.x_mins = np.delete(self.x_mins, indexes)
         self.y_mins = np.delete(self.y_mins, indexes)
@@ -88,6 +98,7 @@ class DetectionPrediction(Detection):
         self.scores = np.array(scores) if scores is not None else np.array([])
 
     def remove(self, indexes):
+        indexes = removal_indexes(indexes)
         super().remove(indexes)
         self.scores = np.delete(self.scores, indexes)
 
@@ -120,6 +131,7 @@ class AttributeDetectionPrediction(DetectionPrediction):
         self.bbox_scores = np.array(bbox_scores) if bbox_scores is not None else np.array([])
 
     def remove(self, indexes):
+        indexes = removal_indexes(indexes)
         super().remove(indexes)
         self.bbox_scores = np.delete(self.bbox_scores, indexes)
 
@@ -17,7 +17,8 @@ limitations under the License.
 from enum import Enum
 from pathlib import Path
 from copy import deepcopy
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+from threading import Lock
 import warnings
 import cv2 as cv
 
@@ -53,6 +54,64 @@ LOADERS_MAPPING = {
 }
 
 
+class SegmentationMaskCache:
+    """
+    Bounded LRU cache of decoded ground truth segmentation masks and mask readers.
+    Annotations do not keep loaded masks for limiting memory consumption on large datasets,
+    so the cache allows to decode each mask once when it is used by several postprocessors and metrics.
+    Cached masks are read-only, cache is cleared by evaluator when evaluation is finished.
+    """
+
+    DEFAULT_SIZE_LIMIT = 512 * 1024 * 1024
+
+    def __init__(self, size_limit=DEFAULT_SIZE_LIMIT):
+        self.size_limit = size_limit
+        self._masks = OrderedDict()
+        self._readers = {}
+        self._size = 0
+        self._lock = Lock()
+
+    def get_reader(self, key, reader_factory):
+        with self._lock:
+            reader = self._readers.get(key)
+        if reader is None:
+            reader = reader_factory()
+            with self._lock:
+                self._readers[key] = reader
+        return reader
+
+    def get_mask(self, key, mask_loader):
+        with self._lock:
+            mask = self._masks.get(key)
+            if mask is not None:
+                self._masks.move_to_end(key)
+                return mask
+        mask = mask_loader()
+        if not isinstance(mask, np.ndarray) or mask.nbytes > self.size_limit:
+            return mask
+        mask.setflags(write=False)
+        with self._lock:
+            if key not in self._masks:
+                self._masks[key] = mask
+                self._size += mask.nbytes
+            while self._size > self.size_limit:
+                _, evicted = self._masks.popitem(last=False)
+                self._size -= evicted.nbytes
+        return mask
+
+    def clear(self):
+        with self._lock:
+            self._masks.clear()
+            self._readers.clear()
+            self._size = 0
+
+    def __len__(self):
+        return len(self._masks)
+
+
+segmentation_mask_cache = SegmentationMaskCache()
+
+
 class SegmentationRepresentation(BaseRepresentation):
     pass
 
@@ -89,20 +148,32 @@ class SegmentationAnnotation(SegmentationRepresentation):
     def mask(self, value):
         self._mask = value
 
+    def _mask_data_source(self):
+        data_source = self.metadata.get('segmentation_masks_source') or self.metadata.get('additional_data_source')
+        if data_source is None:
+            data_source = self.metadata['data_source']
+        return data_source
+
+    def _create_loader(self, data_source):
+        loader_config = self.LOADERS.get(self._mask_loader)
+        if isinstance(loader_config, str):
+            loader = BaseReader.provide(loader_config, data_source)
+        else:
+            loader = BaseReader.provide(loader_config['type'], data_source, config=loader_config)
+        if self._mask_loader == GTMaskLoader.PILLOW:
+            loader.convert_to_rgb = False
+        return loader
+
+    def _read_mask(self, loader):
+        return loader.read(self._mask_path).astype(np.uint8)
+
     def _load_mask(self):
         if self._mask is None:
-            loader_config = self.LOADERS.get(self._mask_loader)
-            data_source = self.metadata.get('segmentation_masks_source') or self.metadata.get('additional_data_source')
-            if data_source is None:
-                data_source = self.metadata['data_source']
-            if isinstance(loader_config, str):
-                loader = BaseReader.provide(loader_config, data_source)
-            else:
-                loader = BaseReader.provide(loader_config['type'], data_source, config=loader_config)
-            if self._mask_loader == GTMaskLoader.PILLOW:
-                loader.convert_to_rgb = False
-            mask = loader.read(self._mask_path)
-            return mask.astype(np.uint8)
+            data_source = self._mask_data_source()
+            loader_key = (type(self).__name__, self._mask_loader, str(data_source))
+            loader = segmentation_mask_cache.get_reader(loader_key, lambda: self._create_loader(data_source))
+            mask_key = loader_key + (str(self._mask_path), )
+            return segmentation_mask_cache.get_mask(mask_key, lambda: self._read_mask(loader))
 
         return self._mask
 
@@ -348,17 +419,14 @@ class OAR3DTilingSegmentationAnnotation(SegmentationAnnotation):
     def __init__(self, identifier, path_to_mask):
         super().__init__(identifier, path_to_mask, GTMaskLoader.NUMPY)
 
-    def _load_mask(self):
-        if self._mask is None:
-            loader_config = self.LOADERS.get(self._mask_loader)
-            data_source = self.metadata.get('segmentation_masks_source')
-            if data_source is None:
-                data_source = self.metadata['data_source']
-            loader = BaseReader.provide(loader_config, data_source)
-            mask = loader.read(self._mask_path)
-            return mask
+    def _mask_data_source(self):
+        data_source = self.metadata.get('segmentation_masks_source')
+        if data_source is None:
+            data_source = self.metadata['data_source']
+        return data_source
 
-        return self._mask
+    def _read_mask(self, loader):
+        return loader.read(self._mask_path)
 
 
 class SalientRegionAnnotation(SegmentationAnnotation):
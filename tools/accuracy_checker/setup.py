@@ -119,6 +119,7 @@ setup(
         "console_scripts": [
             "accuracy_check=accuracy_checker.main:main",
             "convert_annotation=accuracy_checker.annotation_converters.convert:main",
+            "convert_annotation_format=accuracy_checker.annotation_converters.convert:convert_annotation_format",
     ]},
     zip_safe=False,
     python_requires='>=3.5',
@@ -17,7 +17,7 @@ limitations under the License.
 import numpy as np
 import pytest
 
-from accuracy_checker.adapters import SSDAdapter, Adapter
+from accuracy_checker.adapters import SSDAdapter, Adapter, YoloV2Adapter, YoloV3Adapter, YoloV3ONNX
 from accuracy_checker.config import ConfigError
 from .common import make_representation
 
@@ -119,3 +119,70 @@ def test_vehicle_attributes_adapter_raise_config_error_on_extra_args():
     }
     with pytest.raises(ConfigError):
         Adapter.provide('vehicle_attributes', adapter_config)
+
+
+class TestYoloAdapters:
+    @staticmethod
+    def reference_parse(predictions, cells, num, box_size, anchors, threshold=0.001):
+        boxes = []
+        for x in range(cells):
+            for y in range(cells):
+                for n in range(num):
+                    bbox = predictions[n * box_size:(n + 1) * box_size, y, x]
+                    if bbox[4] < threshold:
+                        continue
+                    center_x, center_y = (bbox[0] + x) / cells, (bbox[1] + y) / cells
+                    width = np.exp(bbox[2]) * anchors[2 * n] / cells
+                    height = np.exp(bbox[3]) * anchors[2 * n + 1] / cells
+                    label = np.argmax(bbox[5:])
+                    boxes.append((
+                        label, bbox[5 + label] * bbox[4], center_x - width / 2, center_y - height / 2,
+                        center_x + width / 2, center_y + height / 2
+                    ))
+        return [np.array(values) for values in zip(*boxes)]
+
+    def test_yolo_v2_decodes_boxes_in_grid_order(self):
+        anchors = [1.0, 2.0, 3.0, 1.5]
+        predictions = np.random.RandomState(0).uniform(0, 1, (1, 2 * 8, 3, 3)).astype(np.float32)
+        adapter = YoloV2Adapter(
+            {'type': 'yolo_v2', 'classes': 3, 'num': 2, 'cells': 3, 'anchors': '1.0,2.0,3.0,1.5'}, output_blob='out'
+        )
+
+        prediction = adapter.process([{'out': predictions}], ['image'], [{}])[0]
+        expected = self.reference_parse(predictions[0], 3, 2, 8, anchors)
+
+        assert np.array_equal(prediction.labels, expected[0])
+        for actual, expected_values in zip(
+                (prediction.scores, prediction.x_mins, prediction.y_mins, prediction.x_maxs, prediction.y_maxs),
+                expected[1:]
+        ):
+            assert actual == pytest.approx(expected_values)
+
+    def test_yolo_v3_output_formats_give_same_boxes(self):
+        predictions = np.random.RandomState(1).uniform(0, 1, (2, 3 * 7, 4, 4)).astype(np.float32)
+        config = {'type': 'yolo_v3', 'classes': 2, 'outputs': ['out'], 'cells': [4], 'threshold': 0.3}
+        meta = [{'input_shape': {'data': (1, 3, 128, 128)}}] * 2
+
+        bhw_predictions = YoloV3Adapter(config).process([{'out': predictions}], ['0', '1'], meta)
+        hwb_predictions = YoloV3Adapter(dict(config, output_format='HWB')).process(
+            [{'out': np.transpose(predictions, (0, 2, 3, 1))}], ['0', '1'], meta
+        )
+
+        assert [prediction.size for prediction in bhw_predictions] == [
+            np.sum(predictions[b, [4, 11, 18]] >= 0.3) for b in range(2)
+        ]
+        assert np.array_equal(bhw_predictions, hwb_predictions)
+
+    def test_yolo_v3_onnx_stops_on_first_invalid_index(self):
+        boxes = np.array([[[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11]]], dtype=np.float32)
+        scores = np.array([[[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]]], dtype=np.float32)
+        indices = np.array([[[0, 1, 2], [0, 0, 1], [-1, -1, -1], [0, 1, 0]]])
+        adapter = YoloV3ONNX({'type': 'yolo_v3_onnx', 'boxes_out': 'boxes', 'scores_out': 'scores',
+                              'indices_out': 'indices'})
+
+        prediction = adapter.process([{'boxes': boxes, 'scores': scores, 'indices': indices}], ['image'], [{}])[0]
+
+        assert np.array_equal(prediction.labels, [1, 0])
+        assert prediction.scores == pytest.approx([0.6, 0.2])
+        assert np.array_equal(prediction.x_mins, [9, 5])
+        assert np.array_equal(prediction.y_maxs, [10, 6])
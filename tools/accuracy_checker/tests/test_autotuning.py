@@ -0,0 +1,122 @@
+"""
+Copyright (c) 2018-2021 Intel Corporation
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from unittest.mock import Mock
+
+from accuracy_checker.evaluators import autotuning
+from accuracy_checker.evaluators.autotuning import (
+    TuningCache, autotune, apply_tuned_parameters, search_best_parameters, tuning_axes
+)
+
+
+def mock_dlsdk_launcher(mocker):
+    launcher_parameters = {'framework': None, 'device': None, 'batch': None, 'num_requests': None, 'cpu_streams': None}
+    mocker.patch.object(autotuning.Launcher, 'resolve', return_value=Mock(parameters=Mock(
+        return_value=launcher_parameters
+    )))
+
+
+def config_entry(framework='opencv', device='CPU'):
+    return {
+        'name': 'model',
+        'launchers': [{'framework': framework, 'device': device, 'model': 'model.onnx'}],
+        'datasets': [{'name': 'dataset', 'batch': 4}]
+    }
+
+
+class TestAutotuning:
+    def test_axes_for_launcher_with_async_mode(self):
+        axes = tuning_axes(config_entry()['launchers'][0], cpu_count=2)
+
+        assert axes == [('num_requests', [1, 2, 4])]
+
+    def test_axes_for_dlsdk_launcher_on_cpu(self, mocker):
+        mock_dlsdk_launcher(mocker)
+        axes = tuning_axes(config_entry('dlsdk')['launchers'][0], cpu_count=2)
+
+        assert axes == [('num_requests', [1, 2, 4]), ('cpu_streams', [1, 2]), ('batch', [1, 2, 4, 8])]
+
+    def test_axes_without_streams_for_not_cpu_device(self, mocker):
+        mock_dlsdk_launcher(mocker)
+        axes = tuning_axes(config_entry('dlsdk', 'GPU')['launchers'][0], cpu_count=1)
+
+        assert [name for name, _ in axes] == ['num_requests', 'batch']
+
+    def test_search_measures_sum_of_axes_sizes(self, mocker):
+        mock_dlsdk_launcher(mocker)
+        axes = tuning_axes(config_entry('dlsdk')['launchers'][0], cpu_count=32)
+        measured = []
+
+        def measure(parameters):
+            measured.append(parameters)
+            return parameters['num_requests'] * 10 + parameters.get('cpu_streams', 0) - abs(parameters['batch'] - 4)
+
+        best_parameters, best_throughput = search_best_parameters(axes, measure)
+
+        assert best_parameters == {'num_requests': 64, 'cpu_streams': 32, 'batch': 4}
+        assert best_throughput == 672
+        assert len(measured) <= 7 + 6 + 4
+        assert all(parameters.get('cpu_streams', 1) <= parameters['num_requests'] for parameters in measured)
+
+    def test_search_tunes_each_axis_with_best_previous_values(self):
+        throughput = {(1, 1): 10, (2, 1): 30, (4, 1): 20, (2, 2): 40, (2, 4): 35}
+
+        def measure(parameters):
+            return throughput[(parameters['num_requests'], parameters['batch'])]
+
+        best_parameters, _ = search_best_parameters([('num_requests', [1, 2, 4]), ('batch', [1, 2, 4])], measure)
+
+        assert best_parameters == {'num_requests': 2, 'batch': 2}
+
+    def test_apply_tuned_parameters(self):
+        config = config_entry('dlsdk')
+
+        tuned_config = apply_tuned_parameters(config, {'num_requests': 2, 'batch': 8})
+
+        assert tuned_config['launchers'][0]['async_mode']
+        assert tuned_config['launchers'][0]['num_requests'] == 2
+        assert tuned_config['launchers'][0]['batch'] == 8
+        assert 'batch' not in tuned_config['datasets'][0]
+        assert config == config_entry('dlsdk')
+
+    def test_best_configuration_is_selected_and_reused_from_cache(self, mocker, tmp_path):
+        throughput = {1: 100, 2: 150, 4: 120}
+        measure = mocker.patch.object(
+            autotuning, 'measure_throughput',
+            side_effect=lambda config, size: throughput[config['launchers'][0]['num_requests']]
+        )
+        mocker.patch.object(autotuning.multiprocessing, 'cpu_count', return_value=2)
+        cache_file = tmp_path / 'cache' / 'tuning.json'
+
+        tuned_config = autotune(config_entry(), TuningCache(cache_file), 16)
+        cached_config = autotune(config_entry(), TuningCache(cache_file), 16)
+
+        assert measure.call_count == 3
+        assert all(call[0][1] == 16 for call in measure.call_args_list)
+        assert tuned_config['launchers'][0]['num_requests'] == 2
+        assert cached_config == tuned_config
+
+    def test_failed_configuration_is_skipped(self, mocker, tmp_path):
+        def measure(config, _):
+            if config['launchers'][0]['num_requests'] == 2:
+                raise RuntimeError('out of memory')
+            return config['launchers'][0]['num_requests']
+        mocker.patch.object(autotuning, 'measure_throughput', side_effect=measure)
+        mocker.patch.object(autotuning.multiprocessing, 'cpu_count', return_value=2)
+
+        tuned_config = autotune(config_entry(), TuningCache(tmp_path / 'tuning.json'))
+
+        assert tuned_config['launchers'][0]['num_requests'] == 4
@@ -0,0 +1,184 @@
+"""
+Copyright (c) 2018-2021 Intel Corporation
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import numpy as np
+import pytest
+
+from accuracy_checker.data_readers import DataRepresentation
+from accuracy_checker.evaluators.custom_evaluators.batched_decoding import BatchedGreedyDecoder
+from accuracy_checker.evaluators.custom_evaluators.im2latex_evaluator import Im2latexEvaluator, SequentialModel
+from accuracy_checker.representation import CharacterRecognitionAnnotation
+
+EOS = 0
+NUM_TOKENS = 5
+SEQUENCES = [[1, 2, 0], [3, 0], [4, 4, 4, 1, 0], [2, 0], [1, 1, 0]]
+
+
+class FakeDecoderStep:
+    """
+    Emits predefined token sequence for every sample, decoder position is stored in recurrent state.
+    """
+    def __init__(self):
+        self.batch_sizes = []
+        self.fed_tokens = []
+
+    def __call__(self, states):
+        self.batch_sizes.append(len(states['position']))
+        self.fed_tokens.append(states['token'].copy())
+        logits = np.zeros((len(states['position']), NUM_TOKENS))
+        for slot, (sample, position) in enumerate(zip(states['sample'], states['position'])):
+            sequence = SEQUENCES[sample]
+            logits[slot, sequence[min(position, len(sequence) - 1)]] = 1
+        return logits, {'position': states['position'] + 1}
+
+
+class FakeIm2latexEncoder:
+    def predict(self, inputs):
+        sample = inputs['imgs'][:, :1, 0, 0]
+        zeros = np.zeros((1, 1))
+        return {'row_enc_out': sample, 'hidden': zeros, 'context': zeros, 'init_0': zeros}
+
+
+class FakeIm2latexDecoder:
+    """
+    Emits SEQUENCES[sample] shifted by 3 (vocabulary tokens) with eos at the end, sample id is passed in encoder output.
+    """
+    def predict(self, inputs):
+        samples, positions = inputs['row_enc_out'][:, 0].astype(int), inputs['dec_st_h'][:, 0].astype(int)
+        logits = np.zeros((len(samples), NUM_TOKENS + 3))
+        for slot, (sample, position) in enumerate(zip(samples, positions)):
+            sequence = SEQUENCES[sample]
+            token = sequence[min(position, len(sequence) - 1)]
+            logits[slot, token + 3 if token != EOS else 2] = 1
+        return {
+            'logit': logits, 'dec_st_h_t': inputs['dec_st_h'] + 1, 'dec_st_c_t': inputs['dec_st_c'],
+            'output': inputs['output_prev']
+        }
+
+
+class FakeIm2latexDataset:
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+
+    def __iter__(self):
+        for start in range(0, len(SEQUENCES), self.batch_size):
+            ids = list(range(start, min(start + self.batch_size, len(SEQUENCES))))
+            annotations = [CharacterRecognitionAnnotation('image{}'.format(idx), expected_phrase(idx)) for idx in ids]
+            inputs = [DataRepresentation(np.full((2, 2, 1), idx)) for idx in ids]
+            yield ids, annotations, inputs, [annotation.identifier for annotation in annotations]
+
+    @property
+    def metadata(self):
+        return {}
+
+    @property
+    def size(self):
+        return len(SEQUENCES)
+
+
+class PassThroughPreprocessing:
+    @staticmethod
+    def process(inputs, annotations):
+        return inputs
+
+
+def expected_phrase(sample):
+    return ' '.join(str(token + 3) for token in SEQUENCES[sample] if token != EOS)
+
+
+def create_im2latex_evaluator(dataset_batch_size, decoder_batch_size):
+    model = SequentialModel.__new__(SequentialModel)
+    model.vocab = {token + 3: str(token + 3) for token in range(NUM_TOKENS)}
+    model.sos_index, model.eos_index, model.max_seq_len = 0, 2, 10
+    model.recognizer_encoder, model.recognizer_decoder = FakeIm2latexEncoder(), FakeIm2latexDecoder()
+    model.decoder = BatchedGreedyDecoder(model._decoder_step, decoder_batch_size, 10, model.eos_index, 'tgt')
+    return Im2latexEvaluator(FakeIm2latexDataset(dataset_batch_size), PassThroughPreprocessing(), None, None, model)
+
+
+def samples():
+    return [
+        (sample, {'sample': np.array([sample]), 'position': np.zeros(1, dtype=int), 'token': np.array([[9]])})
+        for sample in range(len(SEQUENCES))
+    ]
+
+
+class TestBatchedGreedyDecoder:
+    @pytest.mark.parametrize('batch_size', [1, 2, 3, 8])
+    def test_sequences_are_equal_to_sequential_decoding(self, batch_size):
+        step = FakeDecoderStep()
+        decoder = BatchedGreedyDecoder(step, batch_size, max_seq_len=10, eos_index=EOS, token_state='token')
+
+        results = {key: (tokens, logits) for key, tokens, logits in decoder.decode(samples())}
+
+        assert {key: tokens for key, (tokens, _) in results.items()} == dict(enumerate(SEQUENCES))
+        assert all(len(logits) == len(SEQUENCES[key]) for key, (_, logits) in results.items())
+        assert set(step.batch_sizes) == {batch_size}
+
+    def test_finished_sequence_slot_is_taken_by_pending_sample(self):
+        step = FakeDecoderStep()
+        decoder = BatchedGreedyDecoder(step, 2, max_seq_len=10, eos_index=EOS, token_state='token')
+
+        finish_order = [key for key, _, _ in decoder.decode(samples())]
+
+        assert finish_order == [1, 0, 3, 2, 4]
+        assert len(step.batch_sizes) == 8
+
+    def test_selected_token_is_fed_to_next_step(self):
+        step = FakeDecoderStep()
+        decoder = BatchedGreedyDecoder(step, 1, max_seq_len=10, eos_index=EOS, token_state='token')
+
+        list(decoder.decode(samples()[:1]))
+
+        assert [int(tokens[0, 0]) for tokens in step.fed_tokens] == [9, 1, 2]
+
+    def test_sequence_is_limited_by_max_seq_len(self):
+        decoder = BatchedGreedyDecoder(FakeDecoderStep(), 2, max_seq_len=2, eos_index=EOS, token_state='token')
+
+        results = {key: tokens for key, tokens, _ in decoder.decode(samples())}
+
+        assert results[2] == [4, 4]
+        assert results[1] == [3, 0]
+
+    def test_state_with_different_shape_raises_value_error(self):
+        decoder = BatchedGreedyDecoder(FakeDecoderStep(), 2, max_seq_len=2, eos_index=EOS, token_state='token')
+        wrong_samples = samples()[:2]
+        wrong_samples[1][1]['token'] = np.array([[9, 9]])
+
+        with pytest.raises(ValueError):
+            list(decoder.decode(wrong_samples))
+
+
+class TestIm2latexBatchedDecoding:
+    @pytest.mark.parametrize('dataset_batch_size', [1, 2])
+    @pytest.mark.parametrize('decoder_batch_size', [1, 2, 3])
+    def test_predictions_are_matched_to_own_annotations(self, dataset_batch_size, decoder_batch_size):
+        evaluator = create_im2latex_evaluator(dataset_batch_size, decoder_batch_size)
+
+        evaluator.process_dataset(None, None)
+
+        assert len(evaluator._annotations) == len(SEQUENCES)
+        for annotation, prediction in zip(evaluator._annotations, evaluator._predictions):
+            assert prediction.identifier == annotation.identifier
+            assert prediction.label == annotation.label
+
+    def test_samples_finish_out_of_order(self):
+        evaluator = create_im2latex_evaluator(1, 2)
+
+        evaluator.process_dataset(None, None)
+
+        assert [annotation.identifier for annotation in evaluator._annotations] == [
+            'image1', 'image0', 'image3', 'image2', 'image4'
+        ]
@@ -0,0 +1,84 @@
+"""
+Copyright (c) 2018-2021 Intel Corporation
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import threading
+import time
+
+import pytest
+
+from accuracy_checker.evaluators.custom_evaluators.cascade_pipeline import CascadePipeline, PipelineStage
+
+
+class TestCascadePipeline:
+    @pytest.mark.parametrize('pipelined', [True, False])
+    def test_results_are_in_input_order(self, pipelined):
+        def slow_for_even(item):
+            time.sleep(0.01 if item % 2 == 0 else 0)
+            return item * 10
+
+        pipeline = CascadePipeline([
+            PipelineStage('add', lambda item: item + 1), PipelineStage('multiply', slow_for_even, num_workers=3)
+        ])
+
+        assert list(pipeline.run(range(10), pipelined)) == [(item + 1) * 10 for item in range(10)]
+        assert [stat['processed'] for stat in pipeline.stage_statistics().values()] == [10, 10]
+
+    def test_next_stage_processes_previous_item_simultaneously(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def first_stage(item):
+            if item == 1:
+                barrier.wait()
+            return item
+
+        def second_stage(item):
+            if item == 0:
+                barrier.wait()
+            return item
+
+        pipeline = CascadePipeline([PipelineStage('first', first_stage), PipelineStage('second', second_stage)])
+
+        assert list(pipeline.run(range(3))) == [0, 1, 2]
+
+    def test_skipped_stage_passes_item_unchanged(self):
+        pipeline = CascadePipeline([
+            PipelineStage('first', lambda item: item), PipelineStage('second', lambda item: -item, skip=lambda x: x > 1)
+        ])
+
+        assert list(pipeline.run(range(4))) == [0, -1, 2, 3]
+        assert pipeline.stage_statistics()['second']['processed'] == 2
+
+    def test_stage_error_is_raised(self):
+        def fail_on_second(item):
+            if item == 2:
+                raise ValueError('stage error')
+            return item
+
+        pipeline = CascadePipeline([PipelineStage('first', lambda item: item), PipelineStage('second', fail_on_second)])
+        threads_count = threading.active_count()
+
+        with pytest.raises(ValueError):
+            list(pipeline.run(range(100)))
+        assert threading.active_count() == threads_count
+
+    def test_utilization(self):
+        pipeline = CascadePipeline([PipelineStage('sleep', lambda item: time.sleep(0.01))])
+
+        list(pipeline.run(range(5)))
+        statistics = pipeline.stage_statistics()['sleep']
+
+        assert statistics['busy_time'] >= 0.05
+        assert 0 < statistics['utilization'] <= 1
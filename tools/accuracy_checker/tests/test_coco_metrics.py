@@ -0,0 +1,266 @@
+"""
+Copyright (c) 2018-2021 Intel Corporation
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pytest
+import numpy as np
+from accuracy_checker.metrics import (
+    MSCOCOAveragePrecision, MSCOCORecall, MSCOCOKeypointsPrecision, MSCOCOKeypointsRecall
+)
+from accuracy_checker.metrics.coco_metrics import compute_iou_boxes, compute_oks, evaluate_image, COCO_THRESHOLDS
+from accuracy_checker.metrics.overlap import Overlap
+from accuracy_checker.representation import (
+    DetectionAnnotation, DetectionPrediction, PoseEstimationAnnotation, PoseEstimationPrediction
+)
+from tests.common import DummyDataset
+
+SIGMAS = np.array([.26, .25, .25, .35, .35, .79, .79, .72, .72, .62, .62, 1.07, 1.07, .87, .87, .89, .89]) / 10.0
+
+
+def reference_iou_boxes(annotation, prediction, *args, **kwargs):
+    if np.size(annotation) == 0 or np.size(prediction) == 0:
+        return []
+    overlap = Overlap.provide('iou')
+    iou = np.zeros((prediction.size // 4, annotation.size // 4), dtype=np.float32)
+    for i, box_a in enumerate(annotation):
+        for j, box_b in enumerate(prediction):
+            iou[j, i] = overlap(box_a, box_b)
+
+    return iou
+
+
+def reference_oks(annotation_points, prediction_points, annotation_boxes, annotation_areas):
+    if np.size(prediction_points) == 0 or np.size(annotation_points) == 0:
+        return []
+    oks = np.zeros((len(prediction_points), len(annotation_points)))
+    variance = (SIGMAS * 2) ** 2
+    for gt_idx, gt_points in enumerate(annotation_points):
+        xgt, ygt, vgt = gt_points[:17], gt_points[17:34], gt_points[34:]
+        k1 = np.count_nonzero(vgt > 0)
+        x0_bbox, y0_bbox, x1_bbox, y1_bbox = annotation_boxes[gt_idx]
+        w_bbox, h_bbox = x1_bbox - x0_bbox, y1_bbox - y0_bbox
+        x0, x1 = x0_bbox - w_bbox, x0_bbox + w_bbox * 2
+        y0, y1 = y0_bbox - h_bbox, y0_bbox + h_bbox * 2
+        for dt_idx, dt_points in enumerate(prediction_points):
+            xdt, ydt = dt_points[:17], dt_points[17:34]
+            if k1 > 0:
+                x_diff, y_diff = xdt - xgt, ydt - ygt
+            else:
+                zeros = np.zeros(len(SIGMAS))
+                x_diff = np.max((zeros, x0 - xdt), axis=0) + np.max((zeros, xdt - x1), axis=0)
+                y_diff = np.max((zeros, y0 - ydt), axis=0) + np.max((zeros, ydt - y1), axis=0)
+            evaluation = (x_diff ** 2 + y_diff ** 2) / variance / (annotation_areas[gt_idx] + np.spacing(1)) / 2
+            if k1 > 0:
+                evaluation = evaluation[vgt > 0]
+            oks[dt_idx, gt_idx] = np.sum(np.exp(- evaluation)) / evaluation.shape[0]
+
+    return oks
+
+
+def reference_evaluate_image(
+        ground_truth, gt_difficult, iscrowd, detections, dt_difficult, scores, iou, thresholds, profile=False
+):
+    gt_matched = np.zeros((len(thresholds), len(ground_truth)))
+    dt_matched = np.zeros((len(thresholds), len(detections)))
+    dt_ignored = np.zeros((len(thresholds), len(detections)))
+    if np.size(iou):
+        for tind, t in enumerate(thresholds):
+            for dtind, _ in enumerate(detections):
+                iou_current = min([t, 1 - 1e-10])
+                matched_id = -1
+                for gtind, _ in enumerate(ground_truth):
+                    if gt_matched[tind, gtind] > 0 and not iscrowd[gtind]:
+                        continue
+                    if matched_id > -1 and not gt_difficult[matched_id] and gt_difficult[gtind]:
+                        break
+                    if iou[dtind, gtind] < iou_current:
+                        continue
+                    iou_current = iou[dtind, gtind]
+                    matched_id = gtind
+                if matched_id == -1:
+                    continue
+                dt_ignored[tind, dtind] = gt_difficult[matched_id]
+                dt_matched[tind, dtind] = 1
+                gt_matched[tind, matched_id] = dtind
+    results = {
+        'dt_matches': dt_matched,
+        'gt_matches': gt_matched,
+        'gt_ignore': gt_difficult,
+        'dt_ignore': np.logical_or(dt_ignored, dt_difficult),
+        'scores': scores
+    }
+    if profile:
+        results.update({'dt': detections, 'gt': ground_truth, 'iou': iou})
+
+    return results
+
+
+def random_boxes(rng, size):
+    corners = np.sort(rng.randint(0, 40, size=(size, 2, 2)), axis=1).astype(float)
+    return corners.transpose(0, 2, 1).reshape(size, 4)
+
+
+def random_image(rng, num_gt, num_dt, num_labels=2):
+    gt_boxes = random_boxes(rng, num_gt)
+    # part of predictions are duplicated to have equal overlaps with several objects
+    num_duplicates = min(num_dt // 4, num_gt)
+    dt_boxes = np.concatenate((random_boxes(rng, num_dt - num_duplicates), gt_boxes[:num_duplicates] + 1))
+    annotation = DetectionAnnotation(
+        'image', rng.randint(0, num_labels, num_gt), *gt_boxes.T,
+        metadata={'iscrowd': list(rng.choice([0, 0, 0, 1], num_gt)), 'difficult_boxes': [0] if num_gt else []}
+    )
+    prediction = DetectionPrediction(
+        'image', rng.randint(0, num_labels, num_dt), np.round(rng.uniform(size=num_dt), 1), *dt_boxes.T
+    )
+
+    return annotation, prediction
+
+
+def random_keypoints(rng, num_gt, num_dt, num_labels=2):
+    gt_x, gt_y = rng.uniform(0, 100, size=(2, num_gt, 17))
+    visibility = rng.choice([0, 1, 2], size=(num_gt, 17))
+    visibility[:num_gt // 3] = 0
+    dt_x = np.concatenate((gt_x + rng.normal(0, 3, size=gt_x.shape), rng.uniform(0, 100, size=(num_gt, 17))))
+    dt_y = np.concatenate((gt_y + rng.normal(0, 3, size=gt_y.shape), rng.uniform(0, 100, size=(num_gt, 17))))
+    # every label is present in annotation, keypoints preparation does not support absent ones
+    labels = rng.permutation(np.arange(num_gt) % num_labels)
+    num_dt = min(num_dt, 2 * num_gt)
+    annotation = PoseEstimationAnnotation('image', gt_x, gt_y, visibility, labels)
+    annotation.metadata['iscrowd'] = list(rng.choice([0, 0, 0, 1], num_gt))
+    prediction = PoseEstimationPrediction(
+        'image', dt_x[:num_dt], dt_y[:num_dt], np.full((num_dt, 17), 2), rng.uniform(size=2 * num_gt)[:num_dt],
+        np.concatenate((labels, rng.randint(0, num_labels, num_gt)))[:num_dt]
+    )
+
+    return annotation, prediction
+
+
+def metric_dataset(num_labels=2):
+    return DummyDataset(label_map={label: str(label) for label in range(num_labels)})
+
+
+def create_metric(metric_cls, **kwargs):
+    provider = metric_cls.__provider__
+    config = {'type': provider, 'name': provider}
+    config.update(**kwargs)
+    return metric_cls(config, metric_dataset(), provider)
+
+
+def assert_matching_equal(result, expected):
+    assert result.keys() == expected.keys()
+    for key, value in expected.items():
+        assert np.array_equal(result[key], value), key
+
+
+class TestCOCOSimilarity:
+    @pytest.mark.parametrize('num_gt, num_dt', [(1, 1), (5, 20), (12, 100), (7, 3)])
+    def test_iou_boxes_equal_to_pairwise_computation(self, num_gt, num_dt):
+        rng = np.random.RandomState(num_gt * num_dt)
+        annotation, prediction = random_boxes(rng, num_gt), random_boxes(rng, num_dt)
+
+        iou = compute_iou_boxes(annotation, prediction)
+
+        assert iou.dtype == np.float32
+        assert np.array_equal(iou, reference_iou_boxes(annotation, prediction))
+
+    def test_iou_boxes_empty(self):
+        assert compute_iou_boxes(np.zeros((0, 4)), random_boxes(np.random.RandomState(0), 3)) == []
+        assert compute_iou_boxes(random_boxes(np.random.RandomState(0), 3), []) == []
+
+    @pytest.mark.parametrize('num_gt, num_dt', [(1, 1), (6, 10), (15, 30)])
+    def test_oks_equal_to_pairwise_computation(self, num_gt, num_dt):
+        rng = np.random.RandomState(num_gt * num_dt)
+        gt_points = np.concatenate((rng.uniform(0, 100, (num_gt, 34)), rng.choice([0, 1, 2], (num_gt, 17))), axis=1)
+        gt_points[::2, 34:] = 0
+        dt_points = np.concatenate((rng.uniform(0, 100, (num_dt, 34)), np.full((num_dt, 17), 2)), axis=1)
+        boxes = random_boxes(rng, num_gt)
+        areas = rng.uniform(10, 1000, num_gt)
+
+        oks = compute_oks(gt_points, dt_points, boxes, areas)
+
+        assert oks.shape == (num_dt, num_gt)
+        assert np.allclose(oks, reference_oks(gt_points, dt_points, boxes, areas), rtol=1e-12, atol=0)
+
+    def test_oks_empty(self):
+        assert compute_oks([], np.ones((2, 51)), [], []) == []
+        assert compute_oks(np.ones((2, 51)), [], np.ones((2, 4)), np.ones(2)) == []
+
+
+class TestCOCOEvaluateImage:
+    @pytest.mark.parametrize('seed', range(10))
+    def test_matching_equal_to_per_threshold_loop(self, seed):
+        rng = np.random.RandomState(seed)
+        num_gt, num_dt = rng.randint(1, 15), rng.randint(1, 40)
+        # quantized overlaps produce ties between ground truth objects and exact threshold hits
+        iou = np.round(rng.uniform(size=(num_dt, num_gt)), 1).astype(np.float32)
+        gt_difficult = np.sort(rng.uniform(size=num_gt) < 0.3)
+        iscrowd = (rng.uniform(size=num_gt) < 0.3).astype(int) * gt_difficult
+        dt_difficult = rng.uniform(size=num_dt) < 0.1
+        args = (
+            np.zeros((num_gt, 4)), gt_difficult, iscrowd, np.zeros((num_dt, 4)), dt_difficult,
+            rng.uniform(size=num_dt), iou, COCO_THRESHOLDS['0.5:0.05:0.95']
+        )
+
+        assert_matching_equal(evaluate_image(*args, profile=True), reference_evaluate_image(*args, profile=True))
+
+    def test_no_overlaps(self):
+        args = (np.zeros((0, 4)), np.array([], dtype=bool), np.array([]), np.zeros((3, 4)), np.zeros(3, dtype=bool),
+                np.ones(3), [], [0.5, 0.75])
+
+        assert_matching_equal(evaluate_image(*args), reference_evaluate_image(*args))
+
+
+class TestCOCOMetricsRegression:
+    @staticmethod
+    def evaluate(metric_cls, images, mocker=None, **kwargs):
+        if mocker:
+            mocker.patch('accuracy_checker.metrics.coco_metrics.compute_iou_boxes', reference_iou_boxes)
+            mocker.patch('accuracy_checker.metrics.coco_metrics.compute_oks', reference_oks)
+            mocker.patch('accuracy_checker.metrics.coco_metrics.evaluate_image', reference_evaluate_image)
+        metric = create_metric(metric_cls, **kwargs)
+        per_image = [metric.update(annotation, prediction) for annotation, prediction in images]
+        return per_image, metric.evaluate(*zip(*images))
+
+    @pytest.mark.parametrize('metric_cls', [MSCOCOAveragePrecision, MSCOCORecall])
+    @pytest.mark.parametrize('max_detections', [20, 100])
+    def test_detection_metrics_equal_to_loop_implementation(self, metric_cls, max_detections, mocker):
+        rng = np.random.RandomState(max_detections)
+        images = [random_image(rng, rng.randint(0, 20), rng.randint(1, 120)) for _ in range(8)]
+
+        per_image, result = self.evaluate(metric_cls, images, max_detections=max_detections)
+        expected_per_image, expected = self.evaluate(metric_cls, images, mocker, max_detections=max_detections)
+
+        assert np.array_equal(per_image, expected_per_image, equal_nan=True)
+        assert np.array_equal(result, expected, equal_nan=True)
+
+    @pytest.mark.parametrize('metric_cls', [MSCOCOKeypointsPrecision, MSCOCOKeypointsRecall])
+    def test_keypoints_metrics_equal_to_loop_implementation(self, metric_cls, mocker):
+        rng = np.random.RandomState(0)
+        images = [random_keypoints(rng, rng.randint(2, 10), rng.randint(1, 20)) for _ in range(8)]
+
+        per_image, result = self.evaluate(metric_cls, images)
+        expected_per_image, expected = self.evaluate(metric_cls, images, mocker)
+
+        assert np.allclose(per_image, expected_per_image, equal_nan=True)
+        assert np.allclose(result, expected, equal_nan=True)
+
+    def test_perfect_detection(self):
+        boxes = np.array([[0, 0, 10, 10], [20, 20, 40, 30]], dtype=float)
+        annotation = DetectionAnnotation('image', [0, 1], *boxes.T)
+        prediction = DetectionPrediction('image', [0, 1], [0.9, 0.8], *boxes.T)
+
+        _, result = self.evaluate(MSCOCOAveragePrecision, [(annotation, prediction)])
+
+        assert np.allclose(result, [1.0, 1.0])
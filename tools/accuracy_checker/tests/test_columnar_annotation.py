@@ -0,0 +1,130 @@
+"""
+Copyright (c) 2018-2021 Intel Corporation
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pytest
+import numpy as np
+
+from accuracy_checker.annotation_converters.columnar_annotation import (
+    ColumnarAnnotation, save_columnar_annotation, is_columnar_annotation
+)
+from accuracy_checker.dataset import read_annotation, AnnotationProvider
+from accuracy_checker.representation import (
+    ClassificationAnnotation, DetectionAnnotation, SegmentationAnnotation, ReIdentificationAnnotation
+)
+from accuracy_checker.representation.segmentation_representation import GTMaskLoader
+from .common import make_representation
+
+
+def save_and_load(annotation, annotation_dir):
+    save_columnar_annotation(annotation, annotation_dir)
+    return ColumnarAnnotation(annotation_dir)
+
+
+class TestColumnarAnnotation:
+    def test_detection_annotation_round_trip(self, tmp_path):
+        annotation = make_representation(['0 0 0 5 5; 1 2 2 10 10', '', '2 1 1 3 3'], True)
+        annotation[0].metadata['difficult_boxes'] = [1]
+        loaded = save_and_load(annotation, tmp_path / 'detection')
+
+        assert len(loaded) == len(annotation)
+        for original, restored in zip(annotation, loaded):
+            assert isinstance(restored, DetectionAnnotation)
+            assert original == restored
+        assert loaded[0].metadata == {'difficult_boxes': [1]}
+        assert loaded[1].metadata == {}
+
+    def test_classification_annotation_round_trip(self, tmp_path):
+        annotation = [ClassificationAnnotation('image_{}.jpg'.format(idx), idx % 3) for idx in range(5)]
+        loaded = save_and_load(annotation, tmp_path / 'classification')
+
+        assert [ann.identifier for ann in loaded] == [ann.identifier for ann in annotation]
+        assert [ann.label for ann in loaded] == [ann.label for ann in annotation]
+        assert all(isinstance(ann.label, int) for ann in loaded)
+
+    def test_segmentation_annotation_round_trip(self, tmp_path):
+        annotation = [
+            SegmentationAnnotation('image_{}.png'.format(idx), 'mask_{}.png'.format(idx), GTMaskLoader.OPENCV)
+            for idx in range(3)
+        ]
+        loaded = save_and_load(annotation, tmp_path / 'segmentation')
+
+        for original, restored in zip(annotation, loaded):
+            assert restored.identifier == original.identifier
+            assert restored._mask_path == original._mask_path
+            assert restored._mask_loader == GTMaskLoader.OPENCV
+
+    def test_reid_annotation_round_trip(self, tmp_path):
+        annotation = [ReIdentificationAnnotation('{}.jpg'.format(idx), idx % 2, idx // 2, idx < 2) for idx in range(4)]
+        loaded = save_and_load(annotation, tmp_path / 'reid')
+
+        assert [ann.camera_id for ann in loaded] == [ann.camera_id for ann in annotation]
+        assert [ann.person_id for ann in loaded] == [ann.person_id for ann in annotation]
+        assert [ann.query for ann in loaded] == [ann.query for ann in annotation]
+
+    def test_mixed_representations_keep_order(self, tmp_path):
+        annotation = [
+            ClassificationAnnotation('a', 1),
+            DetectionAnnotation('b', [1], [0], [0], [1], [1]),
+            ClassificationAnnotation('c', 2)
+        ]
+        loaded = save_and_load(annotation, tmp_path / 'mixed')
+
+        assert [type(ann) for ann in loaded] == [type(ann) for ann in annotation]
+        assert [ann.identifier for ann in loaded] == ['a', 'b', 'c']
+
+    def test_representations_created_lazily_and_cached(self, tmp_path):
+        annotation = [ClassificationAnnotation(str(idx), idx) for idx in range(10)]
+        loaded = save_and_load(annotation, tmp_path / 'lazy')
+
+        assert not loaded._representations
+        first = loaded[3]
+        first.metadata['image_size'] = [(10, 10, 3)]
+        assert list(loaded._representations) == [3]
+        assert loaded[3] is first
+        assert loaded[3].metadata['image_size'] == [(10, 10, 3)]
+
+    def test_negative_index_and_slice(self, tmp_path):
+        annotation = [ClassificationAnnotation(str(idx), idx) for idx in range(5)]
+        loaded = save_and_load(annotation, tmp_path / 'slice')
+
+        assert loaded[-1].identifier == '4'
+        assert [ann.identifier for ann in loaded[1:3]] == ['1', '2']
+        with pytest.raises(IndexError):
+            _ = loaded[5]
+
+    def test_numeric_columns_are_memory_mapped(self, tmp_path):
+        annotation = make_representation(['0 0 0 5 5; 1 2 2 10 10'], True)
+        loaded = save_and_load(annotation, tmp_path / 'mmap')
+        _ = loaded[0]
+        group = loaded._groups[0]
+
+        assert all(isinstance(column, np.memmap) for name, column in group._columns.items() if name.endswith('.npy'))
+
+    def test_read_annotation_detects_columnar_format(self, tmp_path):
+        annotation = [ClassificationAnnotation(str(idx), idx) for idx in range(3)]
+        save_columnar_annotation(annotation, tmp_path / 'annotation')
+
+        assert is_columnar_annotation(tmp_path / 'annotation')
+        assert isinstance(read_annotation(tmp_path / 'annotation'), ColumnarAnnotation)
+
+    def test_annotation_provider_over_columnar_annotation(self, tmp_path):
+        annotation = [ClassificationAnnotation(str(idx), idx) for idx in range(3)]
+        loaded = save_and_load(annotation, tmp_path / 'provider')
+        provider = AnnotationProvider(loaded, {})
+
+        assert provider.identifiers == ['0', '1', '2']
+        assert provider['1'].label == 1
+        assert list(loaded._representations) == [1]
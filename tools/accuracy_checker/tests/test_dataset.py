@@ -16,12 +16,18 @@ limitations under the License.
 
 import copy
 from pathlib import Path
+import cv2
+import numpy as np
 import pytest
 from .common import make_representation
 from accuracy_checker.config import ConfigError
 from accuracy_checker.annotation_converters.format_converter import ConverterReturn
 
-from accuracy_checker.dataset import Dataset
+from accuracy_checker.dataset import (
+    Dataset, DataProvider, AnnotationProvider, ImageInfoCache, PreprocessingCache, annotation_cache
+)
+from accuracy_checker.data_readers import BaseReader, DataRepresentation
+from accuracy_checker.preprocessor import PreprocessingExecutor
 
 def copy_dataset_config(config):
     new_config = copy.deepcopy(config)
@@ -55,6 +61,13 @@ class TestDataset:
         with pytest.raises(ConfigError):
             Dataset(local_dataset)
 
+    @pytest.mark.parametrize('multi_infer', [False, True])
+    def test_multi_infer_is_taken_from_data_provider(self, mocker, multi_infer):
+        dataset = Dataset.__new__(Dataset)
+        dataset.data_provider = mocker.Mock(multi_infer=multi_infer)
+
+        assert dataset.multi_infer is multi_infer
+
 
 @pytest.mark.usefixtures('mock_path_exists')
 class TestAnnotationConversion:
@@ -384,3 +397,288 @@ class TestAnnotationConversion:
         assert len(dataset.data_provider) == 1
         assert dataset.identifiers() == ['1']
         assert dataset.data_provider.full_size == 2
+
+
+@pytest.mark.usefixtures('mock_path_exists')
+class TestAnnotationCache:
+    dataset_config = {
+        'name': 'custom',
+        'data_source': 'custom',
+        'metrics': [{'type': 'map'}],
+        'annotation_conversion': {'converter': 'wider', 'annotation_file': Path('file')}
+    }
+
+    def setup_method(self):
+        annotation_cache.enabled = True
+
+    def teardown_method(self):
+        annotation_cache.enabled = False
+        annotation_cache.clear()
+
+    def mock_converter(self, mocker):
+        return mocker.patch(
+            'accuracy_checker.annotation_converters.WiderFormatConverter.convert',
+            return_value=ConverterReturn(make_representation("0 0 0 5 5", True), {'label_map': {0: 'face'}}, None)
+        )
+
+    def test_annotation_converted_once_for_same_dataset(self, mocker):
+        annotation_converter_mock = self.mock_converter(mocker)
+        other_model_config = copy_dataset_config(self.dataset_config)
+        other_model_config.update({'name': 'other', 'metrics': [{'type': 'recall'}], 'batch': 2})
+
+        first_dataset = Dataset(copy_dataset_config(self.dataset_config))
+        second_dataset = Dataset(other_model_config)
+
+        annotation_converter_mock.assert_called_once_with()
+        assert second_dataset.data_provider.identifiers == first_dataset.data_provider.identifiers
+        assert second_dataset.metadata == first_dataset.metadata
+
+    def test_datasets_get_independent_annotation(self, mocker):
+        self.mock_converter(mocker)
+        first_dataset = Dataset(copy_dataset_config(self.dataset_config))
+        first_dataset.annotation[0].metadata['image_size'] = [(10, 10, 3)]
+
+        second_dataset = Dataset(copy_dataset_config(self.dataset_config))
+
+        assert 'image_size' not in second_dataset.annotation[0].metadata
+
+    def test_reload_annotation_on_reset_uses_cache(self, mocker):
+        annotation_converter_mock = self.mock_converter(mocker)
+        dataset = Dataset(copy_dataset_config(self.dataset_config))
+
+        dataset.reset(reload_annotation=True)
+
+        annotation_converter_mock.assert_called_once_with()
+
+    def test_annotation_affecting_parameters_change_key(self, mocker):
+        annotation_converter_mock = self.mock_converter(mocker)
+        other_subset_config = copy_dataset_config(self.dataset_config)
+        other_subset_config['subsample_size'] = 1
+
+        Dataset(copy_dataset_config(self.dataset_config))
+        Dataset(other_subset_config)
+
+        assert annotation_converter_mock.call_count == 2
+
+    def test_cache_disabled(self, mocker):
+        annotation_cache.enabled = False
+        annotation_converter_mock = self.mock_converter(mocker)
+
+        Dataset(copy_dataset_config(self.dataset_config))
+        Dataset(copy_dataset_config(self.dataset_config))
+
+        assert annotation_converter_mock.call_count == 2
+        assert not annotation_cache
+
+
+class MockReader:
+    data_source = None
+    name = 'mock_reader'
+
+    def __call__(self, identifier):
+        return identifier
+
+
+class TestDataPrefetching:
+    @staticmethod
+    def make_data_provider(num_images, batch, prefetch=0, prefetch_workers=1):
+        annotation = make_representation(['0 0 0 5 5'] * num_images, True)
+        for idx, ann in enumerate(annotation):
+            ann.identifier = idx
+        dataset_config = {'name': 'custom', 'prefetch': prefetch, 'prefetch_workers': prefetch_workers}
+        return DataProvider(
+            MockReader(), AnnotationProvider(annotation, {}), dataset_config=dataset_config, batch=batch
+        )
+
+    def test_iterate_without_prefetch(self, mocker):
+        mocker.patch('accuracy_checker.dataset.set_image_metadata')
+        data_provider = self.make_data_provider(5, 2)
+        batches = list(data_provider.iterate())
+        assert [batch_id for batch_id, _ in batches] == [0, 1, 2]
+        assert [batch[3] for _, batch in batches] == [[0, 1], [2, 3], [4]]
+
+    def test_prefetch_keeps_batch_order(self, mocker):
+        mocker.patch('accuracy_checker.dataset.set_image_metadata')
+        data_provider = self.make_data_provider(7, 2, prefetch=3, prefetch_workers=4)
+        batches = list(data_provider.iterate())
+        assert [batch_id for batch_id, _ in batches] == [0, 1, 2, 3]
+        assert [batch[3] for _, batch in batches] == [[0, 1], [2, 3], [4, 5], [6]]
+        assert [batch[2] for _, batch in batches] == [[0, 1], [2, 3], [4, 5], [6]]
+
+    def test_prefetch_applies_batch_processing(self, mocker):
+        mocker.patch('accuracy_checker.dataset.set_image_metadata')
+        data_provider = self.make_data_provider(3, 1, prefetch=2)
+
+        def process_batch(batch_input_ids, batch_annotation, batch_input, batch_identifiers):
+            return batch_input_ids, batch_annotation, [data * 10 for data in batch_input], batch_identifiers
+
+        batches = list(data_provider.iterate(process_batch))
+        assert [batch[2] for _, batch in batches] == [[0], [10], [20]]
+
+    def test_prefetch_propagates_reading_error(self, mocker):
+        mocker.patch('accuracy_checker.dataset.set_image_metadata')
+        data_provider = self.make_data_provider(3, 1, prefetch=2)
+        data_provider.data_reader = mocker.Mock(side_effect=ValueError, data_source=None)
+        with pytest.raises(ValueError):
+            list(data_provider.iterate())
+
+
+class TestImageInfoCache:
+    def test_cache_returns_stored_image_size(self, tmp_path):
+        (tmp_path / 'image.jpg').write_bytes(b'data')
+        cache = ImageInfoCache(tmp_path / 'cache.pickle')
+        cache.update('image.jpg', tmp_path, [(10, 20, 3)])
+
+        assert cache.get('image.jpg', tmp_path) == [(10, 20, 3)]
+
+    def test_cache_is_persistent(self, tmp_path):
+        (tmp_path / 'image.jpg').write_bytes(b'data')
+        cache = ImageInfoCache(tmp_path / 'cache.pickle')
+        cache.update('image.jpg', tmp_path, [(10, 20, 3)])
+        cache.save()
+
+        assert ImageInfoCache(tmp_path / 'cache.pickle').get('image.jpg', tmp_path) == [(10, 20, 3)]
+
+    def test_cache_entry_invalidated_after_file_change(self, tmp_path):
+        (tmp_path / 'image.jpg').write_bytes(b'data')
+        cache = ImageInfoCache(tmp_path / 'cache.pickle')
+        cache.update('image.jpg', tmp_path, [(10, 20, 3)])
+        (tmp_path / 'image.jpg').write_bytes(b'changed data')
+
+        assert cache.get('image.jpg', tmp_path) is None
+
+    def test_cache_ignores_not_file_identifiers(self, tmp_path):
+        cache = ImageInfoCache(tmp_path / 'cache.pickle')
+        cache.update(['image_1.jpg', 'image_2.jpg'], tmp_path, [(10, 20, 3)])
+
+        assert not len(cache)
+
+
+class TestProvideDataInfo:
+    @staticmethod
+    def make_images(data_source):
+        for idx in range(2):
+            cv2.imwrite(str(data_source / 'image_{}.jpg'.format(idx)), np.zeros((10 + idx, 20, 3), dtype=np.uint8))
+
+    @staticmethod
+    def make_data_provider(data_source, config=None):
+        annotation = make_representation(['0 0 0 5 5', '0 1 1 10 10'], True)
+        annotation[0].identifier = 'image_0.jpg'
+        annotation[1].identifier = 'image_1.jpg'
+        dataset_config = {'name': 'custom', **(config or {})}
+        reader = BaseReader.provide('opencv_imread', data_source)
+        return DataProvider(reader, AnnotationProvider(annotation, {}), dataset_config=dataset_config), annotation
+
+    def test_provide_data_info_reads_image_headers_only(self, tmp_path, mocker):
+        self.make_images(tmp_path)
+        data_provider, annotation = self.make_data_provider(tmp_path)
+        imread_mock = mocker.patch('cv2.imread')
+
+        data_provider.provide_data_info(annotation)
+
+        assert not imread_mock.called
+        assert annotation[0].metadata['image_size'] == [(10, 20, 3)]
+        assert annotation[1].metadata['image_size'] == [(11, 20, 3)]
+
+    def test_provide_data_info_uses_image_info_cache(self, tmp_path, mocker):
+        self.make_images(tmp_path)
+        config = {'image_info_cache': str(tmp_path / 'cache.pickle')}
+        data_provider, _ = self.make_data_provider(tmp_path, config)
+        for _ in data_provider.iterate():
+            pass
+        data_provider.save_image_info_cache()
+        data_provider, annotation = self.make_data_provider(tmp_path, config)
+        header_reader_mock = mocker.patch.object(data_provider.data_reader, 'read_image_size')
+        imread_mock = mocker.patch('cv2.imread')
+
+        data_provider.provide_data_info(annotation)
+
+        assert not header_reader_mock.called
+        assert not imread_mock.called
+        assert annotation[1].metadata['image_size'] == [(11, 20, 3)]
+
+
+class TestPreprocessingCache:
+    @staticmethod
+    def make_image(data_source, name='image.jpg', height=10):
+        cv2.imwrite(str(data_source / name), np.zeros((height, 20, 3), dtype=np.uint8))
+
+    def test_cached_data_is_memory_mapped(self, tmp_path):
+        self.make_image(tmp_path)
+        cache = PreprocessingCache(tmp_path / 'cache')
+        representation = DataRepresentation(np.ones((4, 4, 3), dtype=np.float32), identifier='image.jpg')
+        representation.metadata['scale'] = 2
+
+        cache.put('image.jpg', tmp_path, representation, {'image_size': [(10, 20, 3)]})
+        cached_representation, annotation_meta = PreprocessingCache(tmp_path / 'cache').get('image.jpg', tmp_path)
+
+        assert isinstance(cached_representation.data, np.memmap)
+        assert np.array_equal(cached_representation.data, representation.data)
+        assert cached_representation.metadata == representation.metadata
+        assert annotation_meta == {'image_size': [(10, 20, 3)]}
+
+    def test_entry_is_invalidated_on_source_file_change(self, tmp_path):
+        self.make_image(tmp_path)
+        cache = PreprocessingCache(tmp_path / 'cache')
+        cache.put('image.jpg', tmp_path, DataRepresentation(np.ones((4, 4)), identifier='image.jpg'), {})
+        self.make_image(tmp_path, height=12)
+
+        assert cache.get('image.jpg', tmp_path) is None
+        assert not len(cache)
+        assert not list((tmp_path / 'cache').iterdir())
+
+    def test_entry_is_not_found_for_other_context(self, tmp_path):
+        self.make_image(tmp_path)
+        cache = PreprocessingCache(tmp_path / 'cache')
+        cache.set_context(preprocessing=[{'type': 'resize', 'size': 224}])
+        cache.put('image.jpg', tmp_path, DataRepresentation(np.ones((4, 4)), identifier='image.jpg'), {})
+        cache.set_context(preprocessing=[{'type': 'resize', 'size': 256}])
+
+        assert cache.get('image.jpg', tmp_path) is None
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        for idx in range(3):
+            self.make_image(tmp_path, 'image_{}.jpg'.format(idx))
+        cache = PreprocessingCache(tmp_path / 'cache', size_limit=2 * 1024 + 1500)
+        for idx in range(2):
+            cache.put(
+                'image_{}.jpg'.format(idx), tmp_path, DataRepresentation(np.ones(128), identifier=idx), {}
+            )
+        assert cache.get('image_0.jpg', tmp_path) is not None
+
+        cache.put('image_2.jpg', tmp_path, DataRepresentation(np.ones(128), identifier=2), {})
+
+        assert len(cache) == 2
+        assert cache.total_size <= cache.size_limit
+        assert cache.get('image_1.jpg', tmp_path) is None
+        assert cache.get('image_0.jpg', tmp_path) is not None
+
+    def test_cached_batch_skips_reading_and_preprocessing(self, tmp_path, mocker):
+        for idx in range(2):
+            self.make_image(tmp_path, 'image_{}.jpg'.format(idx), 10 + idx)
+        preprocessing = [{'type': 'resize', 'size': 4}]
+        config = {'preprocessing_cache': str(tmp_path / 'cache'), 'preprocessing': preprocessing}
+        preprocessor = PreprocessingExecutor(preprocessing)
+
+        def process_batch(batch_input_ids, batch_annotation, batch_input, batch_identifiers):
+            batch_input = preprocessor.process(batch_input, batch_annotation)
+            return batch_input_ids, batch_annotation, batch_input, batch_identifiers
+
+        data_provider, _ = TestProvideDataInfo.make_data_provider(tmp_path, config)
+        data_provider.configure_preprocessing_cache(preprocessor)
+        _, (_, _, expected_input, _) = next(iter(data_provider.iterate(process_batch)))
+        data_provider, annotation = TestProvideDataInfo.make_data_provider(tmp_path, config)
+        data_provider.configure_preprocessing_cache(preprocessor)
+        data_provider.batch = 2
+        imread_mock = mocker.patch('cv2.imread', side_effect=cv2.imread)
+        process_batch_mock = mocker.Mock(side_effect=process_batch)
+
+        _, (_, batch_annotation, batch_input, _) = next(iter(data_provider.iterate(process_batch_mock)))
+
+        assert imread_mock.call_count == 1
+        assert process_batch_mock.call_args[0][3] == ['image_1.jpg']
+        assert np.array_equal(batch_input[0].data, expected_input[0].data)
+        assert batch_input[0].data.shape == (4, 4, 3)
+        assert batch_annotation[0].metadata['image_size'] == [(10, 20, 3)]
+        assert batch_annotation[0].metadata['data_source'] == tmp_path
+        assert annotation[0] is batch_annotation[0]
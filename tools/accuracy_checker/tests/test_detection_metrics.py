@@ -17,8 +17,10 @@ limitations under the License.
 import pytest
 import numpy as np
 from accuracy_checker.metrics import DetectionMAP
-from accuracy_checker.metrics.detection import Recall, bbox_match
-from accuracy_checker.metrics.overlap import IOU, IOA
+from accuracy_checker.metrics.detection import (
+    Recall, bbox_match, calculate_similarity_matrix, match_detections_class_agnostic
+)
+from accuracy_checker.metrics.overlap import IOU, IOA, GIOU
 from tests.common import (make_representation, single_class_dataset, multi_class_dataset,
                           multi_class_dataset_without_background)
 
@@ -30,6 +32,40 @@ def _test_metric_wrapper(metric_cls, dataset, **kwargs):
     return metric_cls(config, dataset, provider)
 
 
+class TestOverlapMatrix:
+    @pytest.mark.parametrize('overlap_type', [IOU, IOA, GIOU])
+    @pytest.mark.parametrize('include_boundaries', [True, False])
+    def test_matrix_equal_to_pairwise_evaluation(self, overlap_type, include_boundaries):
+        rng = np.random.RandomState(42)
+        set_a = np.sort(rng.randint(0, 30, size=(10, 2, 2)), axis=1).transpose(0, 2, 1).reshape(10, 4)
+        set_b = np.sort(rng.randint(0, 30, size=(7, 2, 2)), axis=1).transpose(0, 2, 1).reshape(7, 4)
+        overlap = overlap_type(include_boundaries)
+
+        expected = np.zeros((10, 7), dtype=np.float32)
+        for i, box_a in enumerate(set_a):
+            for j, box_b in enumerate(set_b):
+                expected[i, j] = overlap(box_a, box_b)
+
+        assert np.array_equal(calculate_similarity_matrix(set_a, set_b, overlap), expected)
+
+    def test_empty_set(self):
+        assert calculate_similarity_matrix(np.zeros((0, 4)), np.array([[0, 0, 5, 5]]), IOU(False)).shape == (0, 1)
+
+    def test_giou(self):
+        overlap = GIOU(False)
+
+        assert overlap([0, 0, 5, 5], [0, 0, 5, 5]) == 1
+        assert overlap([0, 0, 5, 5], [10, 0, 15, 5]) == pytest.approx(-1 / 3)
+
+    def test_match_detections_class_agnostic_greedy_by_score(self):
+        gt = make_representation("0 0 0 10 10; 0 20 20 30 30", is_ground_truth=True)[0]
+        pred = make_representation("0 0 0 10 10; 0 1 1 10 10; 0 20 20 30 31", score=[0.5, 0.9, 0.7])[0]
+
+        matches = match_detections_class_agnostic(pred, gt, 0.5, IOU(False))
+
+        assert matches == [(0, 1), (1, 2)]
+
+
 class TestBoxMatch:
     def test_single(self):
         gt = "0 0 0 5 5"
@@ -17,7 +17,9 @@ limitations under the License.
 import pytest
 import numpy as np
 from accuracy_checker.launcher import DummyLauncher
-from accuracy_checker.launcher.loaders import StoredPredictionBatch
+from accuracy_checker.launcher.loaders import (
+    StoredPredictionBatch, IndexedLoader, create_prediction_store, append_to_prediction_store, is_prediction_store
+)
 from accuracy_checker.adapters import ClassificationAdapter
 from accuracy_checker.representation import ClassificationPrediction
 
@@ -81,3 +83,72 @@ class TestDummyLauncher:
         assert isinstance(prediction[0], ClassificationPrediction)
         assert prediction[0].identifier == expected_prediction.identifier
         assert np.array_equal(prediction[0].scores, expected_prediction.scores)
+
+
+def make_prediction_store(store_dir, batches):
+    create_prediction_store(store_dir)
+    for identifiers, scores in batches:
+        append_to_prediction_store(
+            store_dir, StoredPredictionBatch([{'prediction': scores}], identifiers, [{}] * len(identifiers))
+        )
+
+
+class TestIndexedLoader:
+    def test_stored_batch_has_memory_mapped_outputs(self, tmp_path):
+        scores = np.array([[0.1, 0.9], [0.7, 0.3]], dtype=np.float32)
+        make_prediction_store(tmp_path / 'store', [(['a', 'b'], scores)])
+        assert is_prediction_store(tmp_path / 'store')
+
+        loader = IndexedLoader(tmp_path / 'store')
+        batch = loader.read_batch(0)
+
+        assert len(loader) == 2
+        assert batch.identifiers == ['a', 'b']
+        assert isinstance(batch.raw_predictions[0]['prediction'].base, np.memmap)
+        assert np.array_equal(batch.raw_predictions[0]['prediction'], scores)
+        assert loader['b'].identifiers == batch.identifiers
+
+    def test_access_by_identifier_with_adapter(self, tmp_path):
+        make_prediction_store(tmp_path / 'store', [
+            (['a'], np.array([[0.1, 0.9]])), (['b', 'c'], np.array([[0.8, 0.2], [0.3, 0.7]]))
+        ])
+        loader = IndexedLoader(tmp_path / 'store', adapter=ClassificationAdapter({'type': 'classification'}))
+
+        assert loader['c'].identifier == 'c'
+        assert loader['c'].label == 1
+        assert loader['b'].label == 0
+        assert loader['a'].label == 1
+
+    def test_access_to_non_existing_identifier(self, tmp_path):
+        make_prediction_store(tmp_path / 'store', [(['a'], np.array([[0.1, 0.9]]))])
+        loader = IndexedLoader(tmp_path / 'store')
+
+        with pytest.raises(IndexError):
+            loader['b'] # pylint: disable=W0104
+        with pytest.raises(IndexError):
+            list(loader.iterate(['a', 'b']))
+
+    def test_iterate_subset_reads_only_required_batches(self, tmp_path, mocker):
+        make_prediction_store(tmp_path / 'store', [
+            (['a'], np.array([[0.1, 0.9]])), (['b', 'c'], np.array([[0.8, 0.2], [0.3, 0.7]])),
+            (['d'], np.array([[0.6, 0.4]]))
+        ])
+        loader = IndexedLoader(tmp_path / 'store', adapter=ClassificationAdapter({'type': 'classification'}))
+        read_batch_spy = mocker.spy(loader, 'read_batch')
+
+        batches = list(loader.iterate(['c', 'a']))
+
+        assert [identifiers for identifiers, _ in batches] == [['a'], ['c']]
+        assert [prediction.label for _, predictions in batches for prediction in predictions] == [1, 1]
+        assert read_batch_spy.call_count == 2
+
+    def test_dummy_launcher_with_indexed_loader(self, tmp_path):
+        make_prediction_store(tmp_path / 'store', [(['a', 'b'], np.array([[0.1, 0.9], [0.8, 0.2]]))])
+        launcher = DummyLauncher(
+            {'framework': 'dummy', 'loader': 'indexed', 'data_path': str(tmp_path / 'store')},
+            adapter=ClassificationAdapter({'type': 'classification'})
+        )
+
+        predictions = launcher.predict(['b', 'a'])
+
+        assert [prediction.label for prediction in predictions] == [0, 1]
@@ -18,7 +18,7 @@ import pytest
 import re
 import numpy as np
 from accuracy_checker.config import ConfigError
-from accuracy_checker.launcher.input_feeder import InputFeeder
+from accuracy_checker.launcher.input_feeder import InputFeeder, InputBuffers, fill_input_buffer
 from accuracy_checker.data_readers import DataRepresentation
 
 # InputInfo from openvino is needed here, but there is no appropriate API
@@ -400,3 +400,59 @@ class TestInputFeeder:
         with pytest.raises(ConfigError):
             InputFeeder([{'name': 'im_info', 'type': 'IMAGE_INFO', 'precision': 'U2'}],
                         {'input': (1, 3, 10, 10), 'im_info': (1, 3)})
+
+
+class TestFillInputBuffer:
+    def test_fill_input_buffer_transposes_and_converts_samples(self):
+        data = [np.random.rand(4, 5, 3) * 255, np.random.rand(4, 5, 3) * 255]
+        buffer = np.empty((2, 3, 4, 5), dtype=np.float32)
+
+        assert fill_input_buffer(data, (0, 3, 1, 2), buffer)
+        assert np.array_equal(buffer, np.transpose(np.array(data), (0, 3, 1, 2)).astype(np.float32))
+
+    def test_fill_input_buffer_with_integer_precision(self):
+        data = [np.full((2, 2, 3), 10.7)]
+        buffer = np.empty((1, 3, 2, 2), dtype=np.uint8)
+
+        assert fill_input_buffer(data, (0, 3, 1, 2), buffer)
+        assert np.array_equal(buffer, np.full((1, 3, 2, 2), 10, dtype=np.uint8))
+
+    def test_fill_input_buffer_repeats_last_sample_for_incomplete_batch(self):
+        data = [np.zeros((2, 2, 3)), np.ones((2, 2, 3))]
+        buffer = np.empty((4, 3, 2, 2), dtype=np.float32)
+
+        assert fill_input_buffer(data, (0, 3, 1, 2), buffer)
+        assert np.array_equal(buffer[0], np.zeros((3, 2, 2)))
+        assert np.array_equal(buffer[1:], np.ones((3, 3, 2, 2)))
+
+    def test_fill_input_buffer_returns_false_if_shape_does_not_match(self):
+        buffer = np.empty((1, 3, 2, 2), dtype=np.float32)
+
+        assert not fill_input_buffer([np.zeros((3, 3, 3))], (0, 3, 1, 2), buffer)
+        assert not fill_input_buffer([np.zeros((2, 2, 3))] * 2, (0, 3, 1, 2), buffer)
+        assert not fill_input_buffer([np.zeros((2, 2, 3))], (0, 2, 1), buffer)
+
+    def test_input_buffers_reuse_buffer_for_the_same_shape_and_precision(self):
+        buffers = InputBuffers()
+        buffer = buffers.get('input', (1, 3, 2, 2), np.float32)
+
+        assert buffers.get('input', [1, 3, 2, 2], np.float32) is buffer
+        assert buffers.get('input', (2, 3, 2, 2), np.float32) is not buffer
+        assert buffers.get('input', (1, 3, 2, 2), np.uint8) is not buffer
+        assert buffer in buffers
+        assert np.zeros((1, 3, 2, 2), dtype=np.float32) not in buffers
+        assert len(buffers) == 3
+
+    def test_input_feeder_passes_input_buffers_to_transform_function(self):
+        buffers = InputBuffers()
+
+        def fit_to_input(data, layer_name, layout, precision, input_buffers=None):
+            buffer = input_buffers.get(layer_name, (len(data), 3, 10, 10), np.float32)
+            fill_input_buffer(data, layout, buffer)
+            return buffer
+
+        input_feeder = InputFeeder([], {'input': InputInfo_test(shape=(1, 3, 10, 10))}, fit_to_input)
+        result = input_feeder.fill_inputs([DataRepresentation(np.ones((10, 10, 3)), identifier='0')], buffers)[0]
+
+        assert result['input'] in buffers
+        assert np.array_equal(result['input'], np.ones((1, 3, 10, 10)))
@@ -14,6 +14,7 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import numpy as np
 import pytest
 from accuracy_checker.config import ConfigError
 from accuracy_checker.metrics import ClassificationAccuracy, MetricsExecutor, PerImageMetricResult
@@ -24,9 +25,12 @@ from accuracy_checker.representation import (
     ContainerAnnotation,
     ContainerPrediction,
     DetectionAnnotation,
-    DetectionPrediction
+    DetectionPrediction,
+    RegressionAnnotation,
+    RegressionPrediction,
+    SequenceClassificationPrediction
 )
-from .common import DummyDataset
+from .common import DummyDataset, make_segmentation_representation
 
 
 class TestMetric:
@@ -556,3 +560,152 @@ class TestMetricExtraArgs:
         metric_config = {'type': 'frequency_weighted_accuracy', 'something_extra': 'extra'}
         with pytest.raises(ConfigError):
             Metric.provide('frequency_weighted_accuracy', metric_config, None)
+
+
+class TestMetricPartialStateMerge:
+    @staticmethod
+    def split_evaluation(metrics_config, annotations, predictions, dataset=None, split=1):
+        main_executor = MetricsExecutor(metrics_config, dataset)
+        worker_executor = MetricsExecutor(metrics_config, dataset)
+        main_executor.update_metrics_on_batch(range(split), annotations[:split], predictions[:split])
+        worker_executor.update_metrics_on_batch(
+            range(split, len(annotations)), annotations[split:], predictions[split:]
+        )
+        main_executor.merge_partial_state(
+            worker_executor.get_partial_state(), annotations[split:], predictions[split:]
+        )
+
+        return [result.evaluated_value for _, result in main_executor.iterate_metrics(annotations, predictions)]
+
+    def test_accuracy_partial_state_merge(self):
+        annotations = [ClassificationAnnotation('identifier', label) for label in [3, 2, 1]]
+        predictions = [ClassificationPrediction('identifier', [1.0, 1.0, 1.0, 4.0]) for _ in range(3)]
+
+        assert self.split_evaluation([{'type': 'accuracy', 'top_k': 1}], annotations, predictions) == [
+            pytest.approx(1 / 3)
+        ]
+
+    def test_accuracy_per_class_partial_state_merge(self):
+        annotations = [ClassificationAnnotation('identifier', label) for label in [1, 0, 1]]
+        predictions = [ClassificationPrediction('identifier', [1.0, 2.0]) for _ in range(3)]
+        dataset = DummyDataset(label_map={0: '0', 1: '1'})
+
+        results = self.split_evaluation([{'type': 'accuracy_per_class'}], annotations, predictions, dataset)
+
+        assert results[0] == pytest.approx([0.0, 1.0])
+
+    def test_merge_with_empty_part(self):
+        annotations = [ClassificationAnnotation('identifier', 3)]
+        predictions = [ClassificationPrediction('identifier', [1.0, 1.0, 1.0, 4.0])]
+
+        assert self.split_evaluation([{'type': 'accuracy', 'top_k': 1}], annotations, predictions) == [
+            pytest.approx(1.0)
+        ]
+
+    def test_metric_without_partial_state_is_updated_on_merged_pairs(self):
+        annotations = [RegressionAnnotation('identifier', value) for value in [1.0, 2.0, 3.0]]
+        predictions = [RegressionPrediction('identifier', value) for value in [2.0, 2.0, 2.0]]
+        executor = MetricsExecutor([{'type': 'mae'}], None)
+        assert not executor.supports_partial_state
+
+        results = self.split_evaluation([{'type': 'mae'}], annotations, predictions)
+
+        assert results[0] == pytest.approx([2 / 3, np.std([1.0, 0.0, 1.0])])
+
+    def test_merge_without_pairs_for_unsupported_metric_raises_value_error(self):
+        executor = MetricsExecutor([{'type': 'mae'}], None)
+
+        with pytest.raises(ValueError):
+            executor.merge_partial_state(executor.get_partial_state())
+
+
+class TestMetricBatchUpdate:
+    @staticmethod
+    def compare_with_per_object_update(metrics_config, annotations, predictions, dataset=None):
+        batch_executor = MetricsExecutor(metrics_config, dataset)
+        object_executor = MetricsExecutor(metrics_config, dataset)
+        assert batch_executor.supports_batch_update
+
+        batch_results, _ = batch_executor.update_metrics_on_batch(range(len(annotations)), annotations, predictions)
+        for input_id, (annotation, prediction) in enumerate(zip(annotations, predictions)):
+            object_results = object_executor.update_metrics_on_object(annotation, prediction)
+            for batch_result, object_result in zip(batch_results[input_id], object_results):
+                assert batch_result.metric_name == object_result.metric_name
+                assert np.allclose(batch_result.result, object_result.result, equal_nan=True)
+
+        batch_values = [
+            result.evaluated_value for _, result in batch_executor.iterate_metrics(annotations, predictions)
+        ]
+        object_values = [
+            result.evaluated_value for _, result in object_executor.iterate_metrics(annotations, predictions)
+        ]
+        for batch_value, object_value in zip(batch_values, object_values):
+            assert np.allclose(batch_value, object_value, equal_nan=True)
+
+    def test_classification_metrics_batch_update(self):
+        scores = np.random.RandomState(0).rand(16, 4)
+        annotations = [ClassificationAnnotation(idx, idx % 4) for idx in range(16)]
+        predictions = [ClassificationPrediction(idx, image_scores) for idx, image_scores in enumerate(scores)]
+        metrics_config = [
+            {'type': 'accuracy', 'top_k': 1, 'name': 'top1'}, {'type': 'accuracy', 'top_k': 3, 'name': 'top3'},
+            {'type': 'accuracy_per_class', 'top_k': 2}, {'type': 'classification_f1-score'}
+        ]
+        dataset = DummyDataset(label_map={0: '0', 1: '1', 2: '2', 3: '3'})
+
+        self.compare_with_per_object_update(metrics_config, annotations, predictions, dataset)
+
+    @pytest.mark.parametrize('metric_type', ['accuracy', 'accuracy_per_class'])
+    def test_not_stackable_predictions_are_updated_one_by_one(self, metric_type):
+        scores = np.random.RandomState(0).rand(4, 4, 4)
+        annotations = [ClassificationAnnotation(idx, idx % 4) for idx in range(4)]
+        predictions = [SequenceClassificationPrediction(idx, image_scores) for idx, image_scores in enumerate(scores)]
+        dataset = DummyDataset(label_map={0: '0', 1: '1', 2: '2', 3: '3'})
+        config = {'type': metric_type, 'top_k': 2}
+        batch_metric = Metric.provide(metric_type, config, dataset)
+        object_metric = Metric.provide(metric_type, config, dataset)
+
+        batch_results = batch_metric.update_batch(annotations, predictions)
+        object_results = [object_metric.update(annotation, prediction) for annotation, prediction in zip(
+            annotations, predictions
+        )]
+
+        assert np.allclose(batch_results, object_results)
+        assert np.allclose(batch_metric.evaluate(annotations, predictions), object_metric.evaluate(
+            annotations, predictions
+        ))
+
+    def test_segmentation_metrics_batch_update(self):
+        random_state = np.random.RandomState(0)
+        annotations, predictions = [], []
+        for height in [4, 4, 6]:
+            annotations.extend(
+                make_segmentation_representation(random_state.randint(0, 3, size=(height, 5)), True)
+            )
+            predictions.extend(make_segmentation_representation(random_state.rand(3, height, 5), False))
+        metrics_config = [
+            {'type': 'segmentation_accuracy'}, {'type': 'mean_iou', 'ignore_label': 0}, {'type': 'mean_accuracy'},
+            {'type': 'frequency_weighted_accuracy'}
+        ]
+        dataset = DummyDataset(label_map={0: '0', 1: '1', 2: '2'})
+
+        self.compare_with_per_object_update(metrics_config, annotations, predictions, dataset)
+
+    def test_regression_metrics_batch_update(self):
+        values = np.random.RandomState(0).rand(2, 8) + 0.5
+        annotations = [RegressionAnnotation(idx, value) for idx, value in enumerate(values[0])]
+        predictions = [RegressionPrediction(idx, value) for idx, value in enumerate(values[1])]
+        metrics_config = [{'type': 'mae'}, {'type': 'mse'}, {'type': 'rmse'}, {'type': 'mape'}, {'type': 'log10_error'}]
+
+        self.compare_with_per_object_update(metrics_config, annotations, predictions)
+
+    def test_executor_without_batch_update_for_all_metrics_updates_per_object(self, mocker):
+        annotations = [RegressionAnnotation(idx, 1.0) for idx in range(2)]
+        predictions = [RegressionPrediction(idx, 2.0) for idx in range(2)]
+        executor = MetricsExecutor([{'type': 'mae'}, {'type': 'mae_on_interval', 'end': 1}], None)
+        submit_batch_spy = mocker.spy(executor.metrics[0].metric_fn, 'submit_batch')
+
+        results, _ = executor.update_metrics_on_batch(range(2), annotations, predictions)
+
+        assert not executor.supports_batch_update
+        assert not submit_batch_spy.called
+        assert [result.result for result in results[1]] == [1.0, 1.0]
@@ -0,0 +1,104 @@
+"""
+Copyright (c) 2018-2021 Intel Corporation
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import numpy as np
+
+from accuracy_checker.metrics.metric_profiler.classifcation_metric_profiler import ClassificationMetricProfiler
+
+
+def create_profiler(out_dir, report_type='json', metrics=('accuracy', ), dump_iterations=100):
+    profiler = ClassificationMetricProfiler(dump_iterations, report_type)
+    profiler.fields = ['identifier', 'annotation_label', 'prediction_label']
+    for metric in metrics:
+        profiler.register_metric(metric)
+    profiler.set_output_dir(out_dir)
+    profiler.set_dataset_meta({'label_map': {0: 'cat', 1: 'dog'}})
+    profiler.set_processing_info(('model', 'framework', 'cpu', None, 'dataset'))
+    return profiler
+
+
+def update(profiler, identifier, metric='accuracy'):
+    profiler.update(identifier, 1, np.array([1]), metric, np.array(1), np.array([0.2, 0.8]))
+
+
+class TestMetricProfiler:
+    def test_json_report_layout(self, tmp_path):
+        profiler = create_profiler(tmp_path, dump_iterations=2)
+        for identifier in ['0.jpg', '1.jpg', '2.jpg']:
+            update(profiler, identifier)
+        profiler.finish()
+
+        report = json.loads((tmp_path / profiler.report_file).read_text())
+
+        assert list(report) == ['processing_info', 'report', 'report_type', 'dataset_meta']
+        assert report['processing_info']['model'] == 'model'
+        assert report['report_type'] == 'classification'
+        assert [record['identifier'] for record in report['report']] == ['0.jpg', '1.jpg', '2.jpg']
+        assert report['report'][0]['accuracy_result'] == 1.0
+
+    def test_json_records_appended_without_rewriting(self, tmp_path):
+        profiler = create_profiler(tmp_path, dump_iterations=1)
+        update(profiler, '0.jpg')
+        update(profiler, '1.jpg')
+
+        assert not (tmp_path / profiler.report_file).exists()
+        records = profiler.records_file.read_text().splitlines()
+        assert [json.loads(record)['identifier'] for record in records] == ['0.jpg', '1.jpg']
+
+    def test_json_records_file_is_removed_after_report(self, tmp_path):
+        profiler = create_profiler(tmp_path, dump_iterations=1)
+        update(profiler, '0.jpg')
+        profiler.finish()
+
+        assert (tmp_path / profiler.report_file).exists()
+        assert not profiler.records_file.exists()
+
+    def test_second_run_in_same_dir_does_not_include_previous_records(self, tmp_path):
+        first_profiler = create_profiler(tmp_path, dump_iterations=1)
+        update(first_profiler, '0.jpg')
+        first_profiler.finish()
+        interrupted_profiler = create_profiler(tmp_path, dump_iterations=1)
+        update(interrupted_profiler, '1.jpg')
+
+        profiler = create_profiler(tmp_path, dump_iterations=1)
+        update(profiler, '2.jpg')
+        update(profiler, '3.jpg')
+        profiler.finish()
+
+        report = json.loads((tmp_path / profiler.report_file).read_text())
+        assert [record['identifier'] for record in report['report']] == ['2.jpg', '3.jpg']
+
+    def test_json_report_is_not_created_without_records(self, tmp_path):
+        profiler = create_profiler(tmp_path)
+        profiler.finish()
+
+        assert not (tmp_path / profiler.report_file).exists()
+
+    def test_spill_storage_keeps_not_finished_records(self, tmp_path):
+        profiler = create_profiler(tmp_path, report_type='csv', metrics=('accuracy', 'accuracy_per_class'))
+        profiler.storage_limit = 2
+        update(profiler, '0.jpg')
+        update(profiler, '0.jpg', 'accuracy_per_class')
+        update(profiler, '1.jpg')
+
+        assert list(profiler.storage) == ['1.jpg']
+        assert len((tmp_path / profiler.report_file).read_text().splitlines()) == 2
+
+        update(profiler, '1.jpg', 'accuracy_per_class')
+        profiler.finish()
+
+        assert len((tmp_path / profiler.report_file).read_text().splitlines()) == 3
@@ -14,9 +14,18 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+from threading import Barrier, Timer
 from unittest.mock import Mock, MagicMock
 
+import numpy as np
+import pytest
+
+from accuracy_checker.adapters import ClassificationAdapter
 from accuracy_checker.evaluators import ModelEvaluator
+from accuracy_checker.evaluators.infer_requests_queue import InferRequestsQueue
+from accuracy_checker.launcher.executor_async_request import ExecutorAsyncRequests
+from accuracy_checker.launcher.loaders import StoredPredictionBatch, create_prediction_store, append_to_prediction_store
+from accuracy_checker.representation import ClassificationAnnotation
 
 
 class TestModelEvaluator:
@@ -46,6 +55,9 @@ class TestModelEvaluator:
         self.dataset.__iter__.return_value = [
             (range(1), self.annotations[0], data, [0]),
             (range(1), self.annotations[1], data, [1])]
+        self.dataset.iterate = Mock(
+            side_effect=lambda process_batch=None: enumerate(self.dataset.__iter__.return_value)
+        )
 
         self.postprocessor.process_batch = Mock(side_effect=[
             ([annotation_container_0], [annotation_container_0]), ([annotation_container_1], [annotation_container_1])
@@ -114,6 +126,32 @@ class TestModelEvaluator:
         assert not self.postprocessor.process_dataset.called
         assert not self.postprocessor.full_process.called
 
+    def test_process_dataset_with_loading_indexed_predictions_by_batches(self, tmp_path):
+        store_dir = tmp_path / 'store'
+        create_prediction_store(store_dir)
+        for identifier in [1, 0, 2]:
+            append_to_prediction_store(store_dir, StoredPredictionBatch(
+                [{'prediction': np.array([[0.1, 0.9]])}], [identifier], [{}]
+            ))
+        annotations = [ClassificationAnnotation(0, 1), ClassificationAnnotation(1, 0)]
+        self.dataset.annotation = annotations
+        self.evaluator.adapter = ClassificationAdapter({'type': 'classification'})
+        self.postprocessor.has_processors = False
+        self.postprocessor.has_dataset_processors = False
+        self.metric.need_store_predictions = False
+
+        self.evaluator.process_dataset(str(store_dir), None)
+
+        assert not self.evaluator.load.called
+        assert not self.launcher.predict.called
+        assert self.metric.update_metrics_on_batch.call_count == 2
+        first_batch_ids, first_batch_annotations, first_batch_predictions = (
+            self.metric.update_metrics_on_batch.call_args_list[0][0]
+        )
+        assert first_batch_ids == [1]
+        assert first_batch_annotations == [annotations[1]]
+        assert first_batch_predictions[0].identifier == 1
+
     def test_process_dataset_with_loading_predictions_and_without_dataset_processors(self, mocker):
         mocker.patch('accuracy_checker.evaluators.model_evaluator.get_path')
         self.postprocessor.has_dataset_processors = False
@@ -170,6 +208,9 @@ class TestModelEvaluatorAsync:
         self.dataset.__iter__.return_value = [
             (range(1), self.annotations[0], data, [0]),
             (range(1), self.annotations[1], data, [1])]
+        self.dataset.iterate = Mock(
+            side_effect=lambda process_batch=None: enumerate(self.dataset.__iter__.return_value)
+        )
         self.dataset.multi_infer = False
 
         self.postprocessor.process_batch = Mock(side_effect=[
@@ -277,3 +318,208 @@ class TestModelEvaluatorAsync:
         assert self.launcher.predict.called
         assert not self.launcher.predict_async.called
         assert self.metric.update_metrics_on_batch.call_count == len(self.annotations)
+
+
+class FakeAsyncRequest:
+    def __init__(self, request_id, delay=0.01, input_buffers=None):
+        self.request_id = request_id
+        self.delay = delay
+        self.input_buffers = input_buffers
+        self.callback = None
+        self.context = None
+        self.meta = None
+
+    def set_completion_callback(self, callback):
+        self.callback = callback
+
+    def infer(self, inputs, meta, context=None):
+        self.context = context
+        self.meta = meta
+        Timer(self.delay, self.callback, args=(0, self.request_id)).start()
+
+    def get_result(self):
+        return self.context, self.meta, []
+
+
+class TestInferRequestsQueue:
+    def test_wait_ready_requests_returns_completed_requests(self):
+        requests = [FakeAsyncRequest(idx) for idx in range(2)]
+        requests_queue = InferRequestsQueue(requests)
+        first_request = requests_queue.get_free_request()
+        first_request.infer([], [])
+
+        ready_requests = requests_queue.wait_ready_requests()
+
+        assert ready_requests == [first_request]
+        assert not requests_queue.has_queued_requests()
+        assert requests_queue.free_requests == [1, 0]
+
+    def test_wait_ready_requests_without_queued_requests_does_not_block(self):
+        requests_queue = InferRequestsQueue([FakeAsyncRequest(0)])
+
+        assert requests_queue.wait_ready_requests() == []
+
+    def test_evaluator_processes_all_batches_with_blocking_wait(self):
+        data = MagicMock(data=MagicMock(), metadata=MagicMock(), identifier=0)
+        batches = []
+        for idx in range(5):
+            annotation = MagicMock()
+            annotation.identifier = idx
+            batches.append((range(idx, idx + 1), [annotation], data, [idx]))
+        dataset = MagicMock()
+        dataset.iterate = Mock(side_effect=lambda process_batch=None: enumerate(batches))
+        dataset.multi_infer = False
+        launcher = MagicMock()
+        launcher.allow_reshape_input = False
+        requests = [FakeAsyncRequest(idx) for idx in range(2)]
+        launcher.get_async_requests = Mock(return_value=requests)
+        launcher.predict_async = Mock(
+            side_effect=lambda ir, inputs, meta, context=None: ir.infer(inputs, meta, context)
+        )
+        input_feeder = MagicMock()
+        input_feeder.lstm_inputs = []
+        preprocessor = Mock()
+        preprocessor.has_multi_infer_transformations = False
+        postprocessor = Mock()
+        postprocessor.process_batch = Mock(side_effect=lambda ann, pred, meta: (ann, pred))
+        metric = Mock()
+        metric.update_metrics_on_batch = Mock(return_value=[{}, {}])
+        evaluator = ModelEvaluator(
+            launcher, input_feeder, None, preprocessor, postprocessor, dataset, metric, True
+        )
+
+        evaluator.process_dataset(None, None)
+
+        assert launcher.predict_async.call_count == len(batches)
+        processed_ids = sorted(call[0][0][0] for call in metric.update_metrics_on_batch.call_args_list)
+        assert processed_ids == list(range(len(batches)))
+
+    def test_evaluator_fills_inputs_to_buffers_of_acquired_request(self):
+        data = MagicMock(data=MagicMock(), metadata=MagicMock(), identifier=0)
+        batches = []
+        for idx in range(3):
+            annotation = MagicMock()
+            annotation.identifier = idx
+            batches.append((range(idx, idx + 1), [annotation], data, [idx]))
+        dataset = MagicMock()
+        dataset.iterate = Mock(side_effect=lambda process_batch=None: enumerate(batches))
+        dataset.multi_infer = False
+        launcher = MagicMock()
+        launcher.allow_reshape_input = False
+        requests = [FakeAsyncRequest(idx, input_buffers='buffers_{}'.format(idx)) for idx in range(2)]
+        launcher.get_async_requests = Mock(return_value=requests)
+        submitted = []
+
+        def predict_async(ir, inputs, meta, context=None):
+            submitted.append((ir.input_buffers, inputs))
+            ir.infer(inputs, meta, context)
+
+        launcher.predict_async = Mock(side_effect=predict_async)
+        input_feeder = MagicMock()
+        input_feeder.lstm_inputs = []
+        input_feeder.fill_inputs = Mock(side_effect=lambda batch, input_buffers=None: input_buffers)
+        preprocessor = Mock()
+        preprocessor.has_multi_infer_transformations = False
+        postprocessor = Mock()
+        postprocessor.process_batch = Mock(side_effect=lambda ann, pred, meta: (ann, pred))
+        metric = Mock()
+        metric.update_metrics_on_batch = Mock(return_value=[{}, {}])
+        evaluator = ModelEvaluator(
+            launcher, input_feeder, None, preprocessor, postprocessor, dataset, metric, True
+        )
+
+        evaluator.process_dataset(None, None)
+
+        assert len(submitted) == len(batches)
+        assert all(buffers == inputs for buffers, inputs in submitted)
+
+
+class TestExecutorAsyncRequests:
+    def test_requests_are_completed_through_infer_requests_queue(self):
+        async_requests = ExecutorAsyncRequests([lambda inputs: {'output': inputs['input'] * 2}] * 2)
+        requests_queue = InferRequestsQueue(async_requests.requests)
+        for idx in range(2):
+            requests_queue.get_free_request().infer({'input': idx}, [{'id': idx}], context=(idx, ))
+
+        results = []
+        while requests_queue.has_queued_requests():
+            results.extend(ready_ir.get_result() for ready_ir in requests_queue.wait_ready_requests())
+        async_requests.release()
+
+        assert sorted(results, key=lambda result: result[0]) == [
+            ((0, ), [{'id': 0}], {'output': 0}), ((1, ), [{'id': 1}], {'output': 2})
+        ]
+        assert requests_queue.has_free_requests()
+
+    def test_requests_run_in_parallel(self):
+        barrier = Barrier(2, timeout=5)
+        async_requests = ExecutorAsyncRequests([lambda inputs: barrier.wait()] * 2)
+        requests_queue = InferRequestsQueue(async_requests.requests)
+        for idx in range(2):
+            requests_queue.get_free_request().infer({}, None, context=(idx, ))
+
+        ready_requests = []
+        while requests_queue.has_queued_requests():
+            ready_requests.extend(requests_queue.wait_ready_requests())
+        async_requests.release()
+
+        assert sorted(result for _, _, result in (ir.get_result() for ir in ready_requests)) == [0, 1]
+
+    def test_inference_error_is_raised_on_getting_result(self):
+        def infer(inputs):
+            raise RuntimeError('inference failed')
+
+        async_requests = ExecutorAsyncRequests([infer])
+        requests_queue = InferRequestsQueue(async_requests.requests)
+        requests_queue.get_free_request().infer({}, None, context=(0, ))
+
+        ready_request = requests_queue.wait_ready_requests()[0]
+        async_requests.release()
+
+        with pytest.raises(RuntimeError):
+            ready_request.get_result()
+
+
+class TestModelEvaluatorSharding:
+    def setup_method(self):
+        self.dataset = MagicMock(subset=None, size=5)
+        self.metric = Mock(supports_partial_state=False, need_store_predictions=False)
+        self.evaluator = ModelEvaluator(Mock(), Mock(), Mock(), Mock(), Mock(), self.dataset, self.metric, False)
+
+    def test_shards_cover_dataset(self):
+        shards = []
+        for shard_id in range(3):
+            self.evaluator.select_shard(shard_id, 3)
+            shards.append(self.dataset.make_subset.call_args[1]['ids'])
+
+        assert shards == [[0, 1], [2, 3], [4]]
+
+    def test_shards_of_subset(self):
+        self.dataset.subset = [1, 3, 5, 7]
+
+        self.evaluator.select_shard(1, 2)
+
+        self.dataset.make_subset.assert_called_with(ids=[5, 7])
+
+    def test_predictions_kept_for_merge_only_in_not_first_shard_without_metrics_merge(self):
+        self.evaluator.select_shard(0, 2)
+        assert not self.evaluator._store_predictions_for_merge
+
+        self.evaluator.select_shard(1, 2)
+        assert self.evaluator._store_predictions_for_merge
+
+        self.metric.supports_partial_state = True
+        self.evaluator.select_shard(1, 2)
+        assert not self.evaluator._store_predictions_for_merge
+
+    def test_merge_partial_states(self):
+        self.metric.need_store_predictions = True
+        self.evaluator.select_shard(0, 2)
+        partial_state = {'metrics': [{}], 'annotations': ['annotation'], 'predictions': ['prediction']}
+
+        self.evaluator.merge_partial_states([partial_state])
+
+        self.metric.merge_partial_state.assert_called_once_with([{}], ['annotation'], ['prediction'])
+        assert self.evaluator._annotations == ['annotation']
+        assert self.evaluator._predictions == ['prediction']
+        self.dataset.reset.assert_called_once()
@@ -22,6 +22,7 @@ import numpy as np
 
 from accuracy_checker.launcher.launcher import create_launcher
 from accuracy_checker.config import ConfigError
+from accuracy_checker.evaluators.infer_requests_queue import InferRequestsQueue
 
 
 def get_opencv_test_caffe_model(models_dir):
@@ -76,6 +77,39 @@ class TestOpenCVLauncher:
         res = opencv_test_model.predict([{'input': input_blob.astype(np.float32)}], [{}])
         assert np.argmax(res[0]['fc3']) == 7
 
+    def test_infer_async_with_several_requests(self, data_dir, models_dir):
+        config = {
+            "framework": "opencv",
+            "model": str(models_dir / "samplenet.onnx"),
+            "adapter": "classification",
+            "device": "cpu",
+            "backend": "ocv",
+            "inputs": [{"name": "input", "type": "INPUT", "shape": "(3, 32, 32)"}],
+            "async_mode": True,
+            "num_requests": 2
+        }
+        opencv_test_model = create_launcher(config)
+        _, _, h, w = opencv_test_model.inputs['input']
+        img_raw = cv2.imread(str(data_dir / '1.jpg'))
+        img_rgb = cv2.cvtColor(img_raw, cv2.COLOR_BGR2RGB)
+        input_blob = np.transpose([cv2.resize(img_rgb, (w, h))], (0, 3, 1, 2)).astype(np.float32)
+        requests_queue = InferRequestsQueue(opencv_test_model.get_async_requests())
+        assert len(requests_queue) == 2
+
+        for request_id in range(2):
+            meta = [{}]
+            opencv_test_model.predict_async(
+                requests_queue.get_free_request(), [{'input': input_blob}], meta, context=(request_id, )
+            )
+            assert meta[0]['input_shape'] == {'input': (1, 3, 32, 32)}
+        results = []
+        while requests_queue.has_queued_requests():
+            results.extend(ready_ir.get_result() for ready_ir in requests_queue.wait_ready_requests())
+        opencv_test_model.release()
+
+        assert sorted(context for context, _, _ in results) == [(0, ), (1, )]
+        assert all(np.argmax(outputs['fc3']) == 7 for _, _, outputs in results)
+
 
 @pytest.mark.usefixtures('mock_path_exists')
 class TestOpenCVLauncherConfig:
@@ -0,0 +1,127 @@
+"""
+Copyright (c) 2018-2021 Intel Corporation
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import csv
+import json
+from unittest.mock import Mock, MagicMock
+
+import pytest
+
+from accuracy_checker.evaluators import ModelEvaluator
+from accuracy_checker.evaluators import pipeline_benchmark
+from accuracy_checker.evaluators.pipeline_benchmark import PipelineBenchmark, benchmark_result_files
+
+PROCESSING_INFO = ('model', 'opencv', 'cpu', ['FP32'], 'dataset')
+
+
+class TestPipelineBenchmark:
+    def test_stage_statistics(self):
+        benchmark = PipelineBenchmark()
+        for duration in range(1, 101):
+            benchmark.add('infer', duration / 1000)
+
+        statistics = benchmark.stage_statistics()
+
+        assert list(statistics) == ['infer']
+        assert statistics['infer']['count'] == 100
+        assert statistics['infer']['mean_ms'] == pytest.approx(50.5)
+        assert statistics['infer']['p50_ms'] == pytest.approx(50.5)
+        assert statistics['infer']['p90_ms'] == pytest.approx(90.1)
+        assert statistics['infer']['p99_ms'] == pytest.approx(99.01)
+        assert statistics['infer']['total_s'] == pytest.approx(5.05)
+
+    def test_reading_time_excludes_preprocessing(self, mocker):
+        timer = mocker.patch.object(pipeline_benchmark, 'perf_counter', side_effect=[0, 1, 4, 5, 6])
+        benchmark = PipelineBenchmark()
+        process_batch = benchmark.wrap_preprocessing(lambda batch: batch)
+
+        batches = list(benchmark.iterate(process_batch(batch) for batch in ['batch']))
+
+        assert batches == ['batch']
+        assert benchmark.durations['preprocess'] == [3]
+        assert benchmark.durations['read'] == [2]
+        assert timer.call_count == 5
+
+    def test_launcher_idle_fraction_counts_overlapped_requests_once(self, mocker):
+        mocker.patch.object(pipeline_benchmark, 'perf_counter', side_effect=[0, 2, 3, 10])
+        benchmark = PipelineBenchmark()
+        benchmark.start(batch=1, num_requests=2)
+        benchmark.infer_submitted(0)
+        benchmark.infer_submitted(1)
+        benchmark.infer_completed(0, 1, complete_time=5)
+        benchmark.infer_completed(1, 1, complete_time=6)
+        benchmark.finish()
+
+        assert benchmark.durations['infer'] == [3, 3]
+        assert benchmark.launcher_busy_time == 4
+        assert benchmark.launcher_idle_fraction == pytest.approx(0.6)
+        assert benchmark.throughput == pytest.approx(0.2)
+
+    def test_write_results(self, tmp_path):
+        benchmark = PipelineBenchmark()
+        benchmark.start(batch=2)
+        for stage in ['read', 'infer']:
+            benchmark.add(stage, 0.01)
+        benchmark.finish()
+        csv_file, json_file = benchmark_result_files(tmp_path / 'results.v1.csv')
+
+        for _ in range(2):
+            benchmark.write_csv(csv_file, PROCESSING_INFO)
+            benchmark.write_json(json_file, PROCESSING_INFO)
+
+        assert csv_file == tmp_path / 'results.v1_benchmark.csv'
+        assert json_file == tmp_path / 'results.v1_benchmark.json'
+        with open(str(csv_file)) as content:
+            rows = list(csv.DictReader(content))
+        assert [row['stage'] for row in rows] == ['read', 'infer'] * 2
+        assert rows[0]['device'] == 'CPU'
+        assert rows[0]['batch'] == '2'
+        with open(str(json_file)) as content:
+            results = json.load(content)
+        assert len(results) == 2
+        assert list(results[0]['stages']) == ['read', 'infer']
+
+
+class TestModelEvaluatorBenchmark:
+    def test_all_stages_are_measured_in_sync_mode(self):
+        annotations = [MagicMock(identifier=idx) for idx in range(3)]
+        dataset = MagicMock(batch=1, size=3)
+        dataset.iterate = Mock(side_effect=lambda process_batch=None: (
+            (idx, process_batch([idx], [annotation], [Mock()], [idx])) for idx, annotation in enumerate(annotations)
+        ))
+        launcher = MagicMock()
+        launcher.input_buffers = Mock(return_value=None)
+        input_feeder = MagicMock()
+        input_feeder.fill_inputs = Mock(return_value=[{}])
+        preprocessor = Mock()
+        preprocessor.process = Mock(side_effect=lambda batch_input, batch_annotation: batch_input)
+        postprocessor = Mock()
+        postprocessor.process_batch = Mock(side_effect=lambda ann, pred, meta: (ann, pred))
+        metric = Mock()
+        metric.update_metrics_on_batch = Mock(return_value=[{}, {}])
+        metric.need_store_predictions = False
+        evaluator = ModelEvaluator(
+            launcher, input_feeder, MagicMock(), preprocessor, postprocessor, dataset, metric, False
+        )
+        benchmark = PipelineBenchmark()
+        evaluator.set_benchmark(benchmark)
+
+        evaluator.process_dataset(None, None)
+
+        assert all(len(durations) == 3 for durations in benchmark.durations.values())
+        assert benchmark.num_images == 3
+        assert benchmark.summary()['batch'] == 1
+        assert benchmark.wall_time > 0
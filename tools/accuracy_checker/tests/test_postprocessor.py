@@ -19,6 +19,7 @@ import pytest
 
 from accuracy_checker.config import ConfigError
 from accuracy_checker.postprocessor import PostprocessingExecutor
+from accuracy_checker.postprocessor.nms import DIoUNMS, NMS, nms_keep_indices, nms_keep_mask, pairwise_overlap, soft_nms
 
 from accuracy_checker.representation import (
     DetectionAnnotation,
@@ -1018,6 +1019,124 @@ class TestPostprocessor:
         assert np.array_equal(annotation[0].mask, expected_annotation_mask)
 
 
+class TestNMSEngine:
+    @staticmethod
+    def reference_nms(x1, y1, x2, y2, scores, thresh):
+        areas = (x2 - x1 + 1) * (y2 - y1 + 1)
+        order = scores.argsort()[::-1]
+        keep = []
+        while order.size > 0:
+            i = order[0]
+            keep.append(i)
+            w = np.maximum(0.0, np.minimum(x2[i], x2[order[1:]]) - np.maximum(x1[i], x1[order[1:]]) + 1)
+            h = np.maximum(0.0, np.minimum(y2[i], y2[order[1:]]) - np.maximum(y1[i], y1[order[1:]]) + 1)
+            intersection = w * h
+            overlap = intersection / (areas[i] + areas[order[1:]] - intersection)
+            order = order[np.where(overlap <= thresh)[0] + 1]
+        return keep
+
+    @staticmethod
+    def make_boxes(size, seed=0):
+        rng = np.random.RandomState(seed)
+        x_mins, y_mins = rng.uniform(0, 100, size), rng.uniform(0, 100, size)
+        widths, heights = rng.uniform(5, 40, size), rng.uniform(5, 40, size)
+        return x_mins, y_mins, x_mins + widths, y_mins + heights, rng.uniform(0, 1, size)
+
+    def test_matches_greedy_nms_for_several_blocks(self):
+        boxes = self.make_boxes(500)
+
+        assert list(nms_keep_indices(*boxes, 0.3)) == self.reference_nms(*boxes, 0.3)
+
+    def test_empty_input(self):
+        assert nms_keep_indices(np.array([]), np.array([]), np.array([]), np.array([]), np.array([]), 0.5).size == 0
+
+    def test_per_class_nms_for_batch_with_groups(self):
+        boxes = self.make_boxes(300, seed=1)
+        labels = np.random.RandomState(1).randint(0, 4, 300)
+        expected = []
+        for label in range(4):
+            indices = np.flatnonzero(labels == label)
+            expected.extend(indices[self.reference_nms(*(value[indices] for value in boxes), 0.3)])
+
+        assert sorted(nms_keep_indices(*boxes, 0.3, groups=labels)) == sorted(expected)
+
+    def test_keep_top_k_is_applied_per_group(self):
+        x_mins = np.array([0, 20, 40, 0, 20, 40])
+        scores = np.array([0.9, 0.8, 0.7, 0.6, 0.5, 0.4])
+        boxes = (x_mins, np.zeros(6), x_mins + 10, np.full(6, 10), scores)
+
+        keep = nms_keep_indices(*boxes, 0.5, groups=np.array([0, 0, 0, 1, 1, 1]), keep_top_k=2)
+
+        assert list(keep) == [0, 1, 3, 4]
+
+    def test_keep_mask_removes_suppressed_boxes(self):
+        prediction = make_representation('0.9 0 0 0 10 10; 0.8 0 1 1 10 10; 0.7 1 20 20 30 30')[0]
+        keep = nms_keep_mask(
+            prediction.x_mins, prediction.y_mins, prediction.x_maxs, prediction.y_maxs, prediction.scores, 0.5
+        )
+
+        prediction.remove(~keep)
+
+        assert list(keep) == [True, False, True]
+        assert prediction == make_representation('0.9 0 0 0 10 10; 0.7 1 20 20 30 30')[0]
+
+    def test_nms_postprocessor(self):
+        config = [{'type': 'nms', 'overlap': 0.5}]
+        prediction = make_representation('0.8 0 1 1 10 10; 0.9 0 0 0 10 10; 0.7 1 20 20 30 30')[0]
+        expected = make_representation('0.9 0 0 0 10 10; 0.7 1 20 20 30 30')[0]
+
+        postprocess_data(PostprocessingExecutor(config), [None], [prediction])
+
+        assert prediction == expected
+
+    def test_nms_static_method_returns_indices_sorted_by_score(self):
+        boxes = self.make_boxes(50, seed=2)
+
+        assert list(NMS.nms(*boxes, 0.3)) == self.reference_nms(*boxes, 0.3)
+
+    def test_integer_coordinates(self):
+        x1, y1 = np.array([0, 1, 20]), np.array([0, 1, 20])
+        x2, y2 = np.array([10, 10, 30]), np.array([10, 10, 30])
+        scores = np.array([0.9, 0.8, 0.7])
+
+        assert list(NMS.nms(x1, y1, x2, y2, scores, 0.5)) == [0, 2]
+        assert list(DIoUNMS.diou_nms(x1, y1, x2, y2, scores, 0.5)) == [0, 2]
+        assert list(nms_keep_indices(x1, y1, x2, y2, scores, 0.5, include_boundaries=False)) == [0, 2]
+
+    def test_integer_coordinates_pairwise_overlap(self):
+        boxes = (np.array([0, 5]), np.array([0, 0]), np.array([10, 15]), np.array([10, 10]), np.array([100, 100]))
+
+        overlap = pairwise_overlap(boxes, boxes, include_boundaries=False)
+
+        assert overlap == pytest.approx(np.array([[1, 50 / 150], [50 / 150, 1]]))
+
+    def test_soft_nms_with_default_keep_top_k(self):
+        config = [{'type': 'soft_nms'}]
+        prediction = make_representation('0.5 0 0 0 10 10; 0.9 1 20 20 30 30; 0.7 2 40 40 50 50')[0]
+
+        postprocess_data(PostprocessingExecutor(config), [None], [prediction])
+
+        assert list(prediction.labels) == [0, 1, 2]
+        assert prediction.scores == pytest.approx([0.5, 0.9, 0.7])
+
+    def test_soft_nms_does_not_select_box_twice(self):
+        boxes = np.array([[0, 0, 10, 10], [20, 20, 30, 30], [40, 40, 50, 50]])
+
+        keep, scores = soft_nms(boxes, np.array([0.5, 0.9, 0.7]))
+
+        assert list(keep) == [1, 2, 0]
+        assert scores == pytest.approx([0.9, 0.7, 0.5])
+
+    def test_soft_nms_keeps_scores_aligned_with_boxes(self):
+        config = [{'type': 'soft_nms', 'keep_top_k': 2}]
+        prediction = make_representation('0.5 0 0 0 10 10; 0.9 1 20 20 30 30; 0.7 2 40 40 50 50')[0]
+
+        postprocess_data(PostprocessingExecutor(config), [None], [prediction])
+
+        assert list(prediction.labels) == [1, 2]
+        assert prediction.scores == pytest.approx([0.9, 0.7])
+
+
 class TestPostprocessorExtraArgs:
     def test_cast_to_int_raise_config_error_on_extra_args(self):
         config = {'type': 'cast_to_int', 'something_extra': 'extra'}
@@ -0,0 +1,131 @@
+"""
+Copyright (c) 2018-2021 Intel Corporation
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import numpy as np
+
+from accuracy_checker.adapters import create_adapter
+from accuracy_checker.evaluators.custom_evaluators.asr_encoder_prediction_joint_evaluator import ASRModel
+
+NUM_SYMBOLS = 29
+BLANK = 28
+HIDDEN_SIZE = 320
+
+
+class FakePrediction:
+    input_layers = ['input.1', '1', '2']
+    output_layers = ['151', '152', '153']
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, identifiers, input_data):
+        self.calls += 1
+        label = input_data['input.1'][0][0]
+        hidden = np.tanh(input_data['1'] + 0.1 * label)
+        cell = np.tanh(input_data['2'] - 0.05 * label)
+        g = np.sin(hidden[:1, :, :NUM_SYMBOLS] * 5 + cell[:1, :, :NUM_SYMBOLS] * 3 + label) * 2
+        outputs = {'151': hidden, '152': cell, '153': g}
+        return outputs, outputs['151']
+
+
+class FakeJoint:
+    input_layers = ['0', '1']
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict(self, identifiers, input_data):
+        self.batch_sizes.append(len(input_data['0']))
+        logits = (input_data['0'] + input_data['1'])[:, :, np.newaxis, :]
+        return {'logits': logits}, logits
+
+
+def create_model():
+    model = ASRModel.__new__(ASRModel)
+    model.prediction = FakePrediction()
+    model.joint = FakeJoint()
+    model.adapter = create_adapter('dumb_decoder')
+    model._blank_id = BLANK
+    model._sos = -1
+    model._max_symbols_per_step = 30
+    return model
+
+
+def sequential_greedy_decode(model, x):
+    hidden = (np.zeros([2, 1, HIDDEN_SIZE]), np.zeros([2, 1, HIDDEN_SIZE]))
+    label = []
+    for time_idx in range(x.shape[0]):
+        f = np.expand_dims(np.expand_dims(x[time_idx, ...], 0), 0)
+        not_blank = True
+        symbols_added = 0
+        while not_blank and symbols_added < model._max_symbols_per_step:
+            last_label = model._get_last_symb(label)
+            last_label = BLANK if last_label == model._sos else last_label
+            last_label = last_label - 1 if last_label > BLANK else last_label
+            g, _ = model.prediction.predict(None, {'input.1': [[last_label]], '1': hidden[0], '2': hidden[1]})
+            hidden_prime = (g['151'], g['152'])
+            _, logits = model.joint.predict(None, {'0': f, '1': g['153']})
+            k = np.argmax(logits[0, 0, 0, :])
+            if k == BLANK:
+                not_blank = False
+            else:
+                label.append(k)
+                hidden = hidden_prime
+            symbols_added += 1
+    return label
+
+
+def encoder_outputs(lengths):
+    rng = np.random.RandomState(0)
+    outputs = []
+    for length in lengths:
+        output = rng.randn(length, NUM_SYMBOLS)
+        output[:, BLANK] += 3
+        outputs.append(output)
+    return outputs
+
+
+class TestRNNTGreedyDecoding:
+    def test_batched_decoding_is_equal_to_sequential(self):
+        sequences = encoder_outputs([40, 25, 60])
+        model = create_model()
+        expected = [sequential_greedy_decode(create_model(), sequence) for sequence in sequences]
+
+        labels = model._greedy_decode(sequences)
+
+        assert labels == expected
+        assert any(labels)
+        assert set(model.joint.batch_sizes) == {3}
+
+    def test_prediction_is_not_recomputed_after_blank(self):
+        sequences = encoder_outputs([50])
+        reference_model = create_model()
+        expected = sequential_greedy_decode(reference_model, sequences[0])
+        model = create_model()
+
+        labels = model._greedy_decode(sequences)
+
+        assert labels == [expected]
+        assert model.prediction.calls == len(expected) + 1
+        assert reference_model.prediction.calls == len(model.joint.batch_sizes)
+
+    def test_decoder_returns_prediction_for_each_utterance(self):
+        model = create_model()
+
+        raw_outputs, predictions = model.decoder(['a.wav', 'b.wav'], encoder_outputs([10, 20]))
+
+        assert raw_outputs == [[], []]
+        assert [prediction[0].identifier for prediction in predictions] == ['a.wav', 'b.wav']
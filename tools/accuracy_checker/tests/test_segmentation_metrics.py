@@ -204,3 +204,86 @@ class TestSegmentationFWAcc:
         dispatcher = MetricsExecutor(create_config(self.name), dataset)
         metric_result, _ = dispatcher.update_metrics_on_batch(range(len(annotations)), annotations, predictions)
         assert metric_result[0][0].result == 0.5125
+
+
+class TestSegmentationPartialStateMerge:
+    def test_shared_confusion_matrix_merged_once(self):
+        annotations = (
+            make_segmentation_representation(np.array([[1, 0, 3, 0, 0], [0, 0, 0, 0, 0]]), True) +
+            make_segmentation_representation(np.array([[0, 0, 3, 3, 1], [0, 0, 0, 0, 0]]), True)
+        )
+        predictions = (
+            make_segmentation_representation(np.array([[1, 2, 3, 2, 3], [0, 0, 0, 0, 0]]), False) +
+            make_segmentation_representation(np.array([[0, 1, 3, 2, 1], [0, 0, 0, 0, 0]]), False)
+        )
+        config = create_config('segmentation_accuracy') + create_config('mean_iou')
+        dispatcher = MetricsExecutor(config, multi_class_dataset())
+        dispatcher.update_metrics_on_batch(range(2), annotations, predictions)
+        expected = [result for _, result in dispatcher.iterate_metrics(annotations, predictions)]
+
+        main_dispatcher = MetricsExecutor(config, multi_class_dataset())
+        worker_dispatcher = MetricsExecutor(config, multi_class_dataset())
+        main_dispatcher.update_metrics_on_batch(range(1), annotations[:1], predictions[:1])
+        worker_dispatcher.update_metrics_on_batch(range(1, 2), annotations[1:], predictions[1:])
+        main_dispatcher.merge_partial_state(worker_dispatcher.get_partial_state())
+
+        for (_, result), expected_result in zip(main_dispatcher.iterate_metrics(annotations, predictions), expected):
+            assert result.evaluated_value == pytest.approx(expected_result.evaluated_value)
+
+
+class TestSharedConfusionMatrix:
+    @staticmethod
+    def make_batch():
+        annotations = (
+            make_segmentation_representation(np.array([[1, 0, 3, 0, 0], [0, 0, 0, 0, 0]]), True) +
+            make_segmentation_representation(np.array([[0, 0, 3, 3, 1], [0, 0, 0, 0, 0]]), True)
+        )
+        predictions = (
+            make_segmentation_representation(np.array([[1, 2, 3, 2, 3], [0, 0, 0, 0, 0]]), False) +
+            make_segmentation_representation(np.array([[0, 1, 3, 2, 1], [0, 0, 0, 0, 0]]), False)
+        )
+        return annotations, predictions
+
+    def test_image_confusion_matrix_computed_once_for_all_metrics(self, mocker):
+        annotations, predictions = self.make_batch()
+        names = ['segmentation_accuracy', 'mean_iou', 'mean_accuracy', 'frequency_weighted_accuracy']
+        config = [entry for name in names for entry in create_config(name)]
+        dispatcher = MetricsExecutor(config, multi_class_dataset())
+        bincount_spy = mocker.spy(np, 'bincount')
+
+        dispatcher.update_metrics_on_batch(range(2), annotations, predictions)
+        dispatcher.update_metrics_on_batch(range(2), annotations, predictions)
+
+        assert bincount_spy.call_count == 2
+        for name, (_, result) in zip(names, dispatcher.iterate_metrics(annotations, predictions)):
+            single_dispatcher = MetricsExecutor(create_config(name), multi_class_dataset())
+            for _ in range(2):
+                for annotation, prediction in zip(annotations, predictions):
+                    single_dispatcher.update_metrics_on_batch(range(1), [annotation], [prediction])
+            _, expected = next(single_dispatcher.iterate_metrics(annotations, predictions))
+            assert result.evaluated_value == pytest.approx(expected.evaluated_value)
+
+    def test_image_confusion_matrix_is_not_shared_for_different_settings(self):
+        annotations, predictions = self.make_batch()
+        config = create_config('mean_iou') + [{'type': 'mean_iou', 'use_argmax': False, 'ignore_label': 0}]
+        dispatcher = MetricsExecutor(config, multi_class_dataset())
+
+        metric_results, _ = dispatcher.update_metrics_on_batch(range(2), annotations, predictions)
+
+        assert len(metric_results[0][0].result) == len(metric_results[0][1].result) + 1
+
+    def test_sharing_is_kept_after_reset(self, mocker):
+        annotations, predictions = self.make_batch()
+        dispatcher = MetricsExecutor(
+            create_config('segmentation_accuracy') + create_config('mean_iou'), multi_class_dataset()
+        )
+        dispatcher.update_metrics_on_batch(range(2), annotations, predictions)
+        _, expected = next(dispatcher.iterate_metrics(annotations, predictions))
+        dispatcher.reset()
+        bincount_spy = mocker.spy(np, 'bincount')
+
+        dispatcher.update_metrics_on_batch(range(2), annotations, predictions)
+
+        assert bincount_spy.call_count == 1
+        _, result = next(dispatcher.iterate_metrics(annotations, predictions))
+        assert result.evaluated_value == pytest.approx(expected.evaluated_value)
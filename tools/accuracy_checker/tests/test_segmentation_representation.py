@@ -14,10 +14,15 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import cv2
 import numpy as np
 import pytest
 
 from .common import make_segmentation_representation, make_instance_segmentation_representation
+from accuracy_checker.representation import SegmentationAnnotation
+from accuracy_checker.representation.segmentation_representation import (
+    GTMaskLoader, SegmentationMaskCache, segmentation_mask_cache
+)
 from accuracy_checker.utils import UnsupportedPackage
 
 try:
@@ -291,3 +296,57 @@ class TestCoCoInstanceSegmentationRepresentation:
 
         with pytest.warns(Warning):
             assert len(prediction.to_polygon()) == 0
+
+
+class TestSegmentationMaskCache:
+    @staticmethod
+    def make_annotation(data_source, name='mask.png', value=1):
+        cv2.imwrite(str(data_source / name), np.full((4, 6), value, dtype=np.uint8))
+        annotation = SegmentationAnnotation(name, name, GTMaskLoader.OPENCV)
+        annotation.metadata['data_source'] = data_source
+        return annotation
+
+    def test_mask_is_decoded_once(self, tmp_path, mocker):
+        segmentation_mask_cache.clear()
+        annotation = self.make_annotation(tmp_path)
+        imread_spy = mocker.spy(cv2, 'imread')
+
+        first_mask = annotation.mask
+        second_mask = annotation.mask
+
+        assert imread_spy.call_count == 1
+        assert second_mask is first_mask
+        assert not first_mask.flags.writeable
+        assert np.array_equal(first_mask, np.ones((4, 6, 3), dtype=np.uint8))
+        segmentation_mask_cache.clear()
+
+    def test_reader_is_reused_for_annotations(self, tmp_path, mocker):
+        segmentation_mask_cache.clear()
+        annotations = [self.make_annotation(tmp_path, 'mask_{}.png'.format(idx), idx) for idx in range(3)]
+        create_loader_spy = mocker.spy(SegmentationAnnotation, '_create_loader')
+
+        masks = [annotation.mask for annotation in annotations]
+
+        assert create_loader_spy.call_count == 1
+        for idx, mask in enumerate(masks):
+            assert np.all(mask == idx)
+        segmentation_mask_cache.clear()
+
+    def test_least_recently_used_masks_are_evicted(self):
+        cache = SegmentationMaskCache(size_limit=2 * 16)
+        for idx in range(2):
+            cache.get_mask(idx, lambda: np.zeros(16, dtype=np.uint8))
+        cache.get_mask(0, lambda: pytest.fail('mask should be cached'))
+
+        cache.get_mask(2, lambda: np.zeros(16, dtype=np.uint8))
+
+        assert len(cache) == 2
+        assert cache.get_mask(1, lambda: np.ones(16, dtype=np.uint8))[0] == 1
+
+    def test_mask_is_not_cached_if_exceeds_limit(self):
+        cache = SegmentationMaskCache(size_limit=8)
+
+        mask = cache.get_mask('mask', lambda: np.zeros(16, dtype=np.uint8))
+
+        assert not len(cache)
+        assert mask.flags.writeable
@@ -0,0 +1,137 @@
+"""
+Copyright (c) 2018-2021 Intel Corporation
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import pytest
+import numpy as np
+from accuracy_checker.metrics import text_detection
+from accuracy_checker.metrics.text_detection import (
+    FocusedTextLocalizationHMean, FocusedTextLocalizationRecall, FocusedTextLocalizationPrecision,
+    IncidentalSceneTextLocalizationHMean, IncidentalSceneTextLocalizationRecall,
+    calculte_recall_precision_matrix, polygons_bounds_overlap
+)
+from accuracy_checker.representation import TextDetectionAnnotation, TextDetectionPrediction
+from tests.common import DummyDataset
+
+pytest.importorskip('shapely')
+
+
+def create_metric(metric_cls, **kwargs):
+    provider = metric_cls.__provider__
+    config = {'type': provider, 'name': provider}
+    config.update(**kwargs)
+    return metric_cls(config, DummyDataset(label_map={0: 'text'}), provider)
+
+
+def quads(boxes):
+    return np.array([[[x0, y0], [x1, y0], [x1, y1], [x0, y1]] for x0, y0, x1, y1 in boxes], dtype=float)
+
+
+def text_representations(gt_boxes, prediction_boxes, gt_texts=None, prediction_texts=None, difficult=None):
+    annotation = TextDetectionAnnotation('image', quads(gt_boxes), gt_texts or [''] * len(gt_boxes))
+    prediction = TextDetectionPrediction(
+        'image', quads(prediction_boxes), prediction_texts or [''] * len(prediction_boxes)
+    )
+    if difficult is not None:
+        annotation.metadata['difficult_boxes'] = difficult
+
+    return annotation, prediction
+
+
+class TestRecallPrecisionMatrix:
+    @pytest.mark.parametrize('dtype', [int, np.float64])
+    def test_equal_to_pairwise_computation(self, dtype):
+        rng = np.random.RandomState(0)
+        corners = rng.randint(0, 50, size=(2, 30, 2))
+        gt_rects = np.concatenate((corners[0, :10], corners[0, :10] + rng.randint(-2, 20, (10, 2))), axis=1)
+        prediction_rects = np.concatenate((corners[1], corners[1] + rng.randint(-2, 20, (30, 2))), axis=1)
+        gt_rects, prediction_rects = gt_rects.astype(dtype), prediction_rects.astype(dtype)
+
+        recall_mat, precision_mat = calculte_recall_precision_matrix(gt_rects, prediction_rects)
+
+        for gt_id, (gx0, gy0, gx1, gy1) in enumerate(gt_rects):
+            for pred_id, (px0, py0, px1, py1) in enumerate(prediction_rects):
+                dx = min(gx1, px1) - max(gx0, px0) + 1
+                dy = min(gy1, py1) - max(gy0, py0) + 1
+                area = dx * dy if dx >= 0 and dy >= 0 else 0.
+                gt_area = (gx1 - gx0 + 1) * (gy1 - gy0 + 1)
+                prediction_area = (px1 - px0 + 1) * (py1 - py0 + 1)
+                assert recall_mat[gt_id, pred_id] == (0 if gt_area == 0 else area / gt_area)
+                assert precision_mat[gt_id, pred_id] == (0 if prediction_area == 0 else area / prediction_area)
+
+    def test_empty(self):
+        recall_mat, precision_mat = calculte_recall_precision_matrix([], [[0, 0, 5, 5]])
+
+        assert recall_mat.shape == (0, 1)
+        assert precision_mat.shape == (0, 1)
+
+
+class TestFocusedTextLocalization:
+    def test_one_to_one_match(self):
+        annotation, prediction = text_representations([[0, 0, 10, 10], [20, 20, 40, 30]], [[20, 20, 40, 30]])
+
+        assert create_metric(FocusedTextLocalizationRecall).update(annotation, prediction) == 0.5
+        assert create_metric(FocusedTextLocalizationPrecision).update(annotation, prediction) == 1
+        assert create_metric(FocusedTextLocalizationHMean).update(annotation, prediction) == pytest.approx(2 / 3)
+
+    def test_many_to_one_match(self):
+        annotation, prediction = text_representations([[0, 0, 9, 9], [10, 0, 19, 9]], [[0, 0, 19, 9]])
+        metric = create_metric(FocusedTextLocalizationHMean)
+
+        assert metric.update(annotation, prediction) == 1
+        assert metric.evaluate([annotation], [prediction]) == 1
+
+    def test_prediction_on_difficult_annotation_is_ignored(self):
+        annotation, prediction = text_representations(
+            [[0, 0, 9, 9], [20, 0, 29, 9]], [[0, 0, 9, 9], [20, 0, 29, 9]], difficult=[1]
+        )
+        metric = create_metric(FocusedTextLocalizationPrecision)
+
+        assert metric.update(annotation, prediction) == 1
+        assert metric.num_valid_detections == 1
+
+
+class TestIncidentalSceneTextLocalization:
+    def test_greedy_match(self):
+        annotation, prediction = text_representations(
+            [[0, 0, 10, 10], [20, 0, 30, 10], [50, 50, 60, 60]], [[1, 0, 11, 10], [20, 0, 30, 10], [100, 0, 110, 10]]
+        )
+        metric = create_metric(IncidentalSceneTextLocalizationRecall)
+
+        assert metric.update(annotation, prediction) == pytest.approx(2 / 3)
+
+    def test_word_spotting_requires_equal_transcriptions(self):
+        annotation, prediction = text_representations(
+            [[0, 0, 10, 10], [20, 0, 30, 10]], [[0, 0, 10, 10], [20, 0, 30, 10]], ['Text', 'word'], ['text', 'other']
+        )
+        metric = create_metric(IncidentalSceneTextLocalizationHMean, word_spotting=True)
+
+        assert metric.update(annotation, prediction) == 0.5
+
+    def test_intersection_is_not_computed_for_distant_polygons(self, mocker):
+        annotation, prediction = text_representations(
+            [[0, 0, 10, 10], [100, 100, 110, 110]], [[100, 100, 110, 110], [0, 10, 10, 20], [200, 0, 210, 10]]
+        )
+        iou_spy = mocker.spy(text_detection, 'get_intersection_over_union')
+
+        assert create_metric(IncidentalSceneTextLocalizationRecall).update(annotation, prediction) == 0.5
+        assert iou_spy.call_count == 1
+
+    def test_polygons_bounds_overlap(self):
+        polygons = [text_detection.polygon_from_points(quad) for quad in quads([[0, 0, 10, 10], [10, 0, 20, 10]])]
+
+        assert np.array_equal(
+            polygons_bounds_overlap(polygons, polygons[:1] + polygons), [[True, True, False], [False, False, True]]
+        )